@@ -124,3 +124,11 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Derlenmiş mesafe matrisi (python manage.py build_distance_artifact).
+# Dosya yoksa mesafeler Station tablosundan bellekte kurulur.
+DISTANCE_ARTIFACT_PATH = config('DISTANCE_ARTIFACT_PATH', default=str(BASE_DIR / 'distance_matrix.bin'))
+
+# Ön işlenmiş yol ağı (python manage.py build_road_network). Dosya varsa
+# istasyon mesafeleri elle girilmiş tablo yerine bu ağdan hesaplanır.
+ROAD_NETWORK_PATH = config('ROAD_NETWORK_PATH', default=str(BASE_DIR / 'road_network.npz'))
@@ -1,4 +1,5 @@
 import json
+from datetime import time as clock_time
 
 from django.contrib.auth import authenticate, get_user_model, login as django_login
 from django.contrib.sessions.models import Session
@@ -8,6 +9,8 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods, require_POST
 
 from yoneticiekrani.models import Cargo, Station
+from yoneticiekrani.spatial_index import MAX_STATION_DISTANCE_KM, nearest_station
+from yoneticiekrani.time_windows import parse_clock
 
 # Varsayılan istasyon listesi (DB boşsa otomatik doldurulacak)
 STATION_SEED = [
@@ -185,6 +188,8 @@ def _cargo_payload(cargo):
 		"weight": cargo.weight,
 		"quantity": cargo.quantity,
 		"targetDate": target_date_str,
+		"windowStart": cargo.window_start.strftime("%H:%M") if cargo.window_start else None,
+		"windowEnd": cargo.window_end.strftime("%H:%M") if cargo.window_end else None,
 		"createdAt": cargo.created_at.isoformat(),
 		"station": {
 			"id": cargo.station.id,
@@ -228,10 +233,25 @@ def cargo(request):
 	if data is None:
 		return JsonResponse({"message": "Geçersiz JSON."}, status=400)
 
-	try:
-		station_id = int(data.get("station_id"))
-	except (TypeError, ValueError):
-		return JsonResponse({"message": "Geçerli bir istasyon seçin."}, status=400)
+	if data.get("station_id") in (None, "") and data.get("lat") is not None and data.get("lng") is not None:
+		# Haritadan seçilen ham konum: en yakın istasyona bağla
+		try:
+			lat, lng = float(data.get("lat")), float(data.get("lng"))
+		except (TypeError, ValueError):
+			return JsonResponse({"message": "Geçerli bir konum girin."}, status=400)
+		if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+			return JsonResponse({"message": "Geçerli bir konum girin."}, status=400)
+		nearest = nearest_station(lat, lng)
+		if nearest is None:
+			return JsonResponse(
+				{"message": f"{MAX_STATION_DISTANCE_KM:.0f} km içinde istasyon bulunamadı."}, status=404
+			)
+		station_id = nearest["id"]
+	else:
+		try:
+			station_id = int(data.get("station_id"))
+		except (TypeError, ValueError):
+			return JsonResponse({"message": "Geçerli bir istasyon seçin."}, status=400)
 
 	station = Station.objects.filter(id=station_id).first()
 	if station is None:
@@ -256,6 +276,20 @@ def cargo(request):
 		# Tarih seçilmediyse yarına ata
 		target_date = (timezone.now() + timezone.timedelta(days=1)).date()
 
+	# Alım penceresi (isteğe bağlı, "HH:MM")
+	windows = []
+	try:
+		for key in ("window_start", "window_end"):
+			minutes = parse_clock(data.get(key))
+			if minutes is not None and not 0 <= minutes < 24 * 60:
+				raise ValueError(key)
+			windows.append(None if minutes is None else clock_time(int(minutes // 60), int(minutes % 60)))
+	except ValueError:
+		return JsonResponse({"message": "Alım penceresi HH:MM formatında olmalı."}, status=400)
+	window_start, window_end = windows
+	if window_start and window_end and window_end < window_start:
+		return JsonResponse({"message": "Alım penceresi bitişi başlangıçtan önce olamaz."}, status=400)
+
 	cargo_obj = Cargo.objects.create(
 		sender=user,
 		station=station,
@@ -263,6 +297,8 @@ def cargo(request):
 		quantity=quantity,
 		status="pending",
 		target_date=target_date,
+		window_start=window_start,
+		window_end=window_end,
 	)
 
 	return JsonResponse(
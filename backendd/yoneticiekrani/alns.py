@@ -0,0 +1,503 @@
+"""
+Uyarlamalı Geniş Komşuluk Araması (ALNS)
+
+Clarke-Wright çözümünden başlar; süre dolana kadar her iterasyonda bir
+"yok et" operatörü ile birkaç ziyareti plandan çıkarır, bir "onar"
+operatörü ile tekrar yerleştirir. Yeni plan benzetimli tavlama
+(simulated annealing) kriteriyle kabul edilir; sıcaklık geçen süreye
+göre geometrik olarak düşer.
+
+Operatör ağırlıkları Ropke & Pisinger şemasıyla uyarlanır: her segment
+sonunda ağırlık = (1 - r) * ağırlık + r * puan / kullanım.
+
+En iyi plan her an saklanır; best_result() arama sürerken de son en
+iyi RoutingResult'ı döndürür. target_gap verilirse en iyi planın alt
+sınıra göre açığı bu yüzdeye indiğinde arama erken biter.
+"""
+
+import math
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .bounds import gap_percent
+from .local_search import deadline_from_budget, route_distance, time_is_up
+from .routing_algorithm import ClarkeWrightVRP, RoutingResult
+
+
+@dataclass
+class Plan:
+    """ALNS çözümü: paralel rota / araç listeleri ve atanamayan ziyaretler."""
+    routes: List[List[int]] = field(default_factory=list)
+    vehicles: List[Dict] = field(default_factory=list)
+    unassigned: List[int] = field(default_factory=list)
+
+    def copy(self) -> "Plan":
+        return Plan(
+            routes=[list(route) for route in self.routes],
+            vehicles=list(self.vehicles),
+            unassigned=list(self.unassigned),
+        )
+
+    def drop_empty_routes(self) -> None:
+        kept = [(v, r) for v, r in zip(self.vehicles, self.routes) if r]
+        self.vehicles = [v for v, _ in kept]
+        self.routes = [r for _, r in kept]
+
+
+class ALNSVRP(ClarkeWrightVRP):
+    """
+    Clarke-Wright ile başlatılan, süre sınırlı ALNS çözücü.
+
+    Araç, kiralama ve çoklu sefer kuralları ClarkeWrightVRP ile aynıdır;
+    sefer sırası ve boş gidişler _sequence_trips ile hesaplanır.
+    """
+
+    TIME_LIMIT_MS = 2000          # Varsayılan arama süresi
+    SEED_BUDGET_SHARE = 0.1       # Sürenin başlangıç çözümüne ayrılan payı
+    MAX_REMOVE_RATIO = 0.3        # Bir iterasyonda çıkarılacak en fazla ziyaret oranı
+    REMOVAL_DETERMINISM = 3       # Kötü / ilişkili çıkarmada seçim keskinliği (p)
+    SEGMENT_LENGTH = 50           # Ağırlık güncelleme aralığı (iterasyon)
+    REACTION_FACTOR = 0.2         # Ağırlıkların yeni puana tepki hızı
+    SCORE_GLOBAL_BEST = 33.0      # Yeni en iyi çözüm
+    SCORE_IMPROVED = 9.0          # Mevcut çözümden iyi
+    SCORE_ACCEPTED = 13.0         # Daha kötü ama kabul edildi
+    START_ACCEPT_WORSE = 0.05     # Başta %5 kötü çözüm 0.5 olasılıkla kabul edilir
+    END_TEMPERATURE_RATIO = 0.001 # Son sıcaklık / ilk sıcaklık
+    UNASSIGNED_PENALTY = 10000.0  # Atanamayan ziyaret başına ceza
+
+    target_gap: Optional[float] = None
+    target_bound: float = 0.0
+
+    def solve(self, allow_rental: bool = True, allow_multi_trip: bool = True,
+              time_budget_ms: Optional[float] = None,
+              time_limit_ms: Optional[float] = None,
+              target_gap: Optional[float] = None,
+              max_vehicles: Optional[int] = None,
+              departure_time=None) -> RoutingResult:
+        """
+        Args:
+            time_budget_ms: Başlangıç (Clarke-Wright) çözümünün iyileştirme bütçesi
+            time_limit_ms: Toplam arama süresi (None: TIME_LIMIT_MS)
+            target_gap: Bu optimallik açığına (%) ulaşılınca dur (None: süre dolana kadar)
+            max_vehicles: En fazla araç sayısı (kiralık dahil)
+            departure_time: Kalkış saati; verilirse sefer süreleri de maliyete girer
+        """
+        if not self.cargos:
+            return RoutingResult(success=True, message="Taşınacak kargo bulunmuyor.")
+
+        self._set_departure(departure_time)
+        if time_limit_ms is None:
+            time_limit_ms = self.TIME_LIMIT_MS
+        started = time.perf_counter()
+        deadline = deadline_from_budget(time_limit_ms)
+
+        allow_rental = self._limit_fleet(max_vehicles, allow_rental, allow_multi_trip)
+        self.allow_rental = allow_rental
+        self.allow_multi_trip = allow_multi_trip
+        self._template = self._prepare_result(allow_rental)
+        self._route_km: Dict[Tuple[int, ...], float] = {}
+        self.target_gap = target_gap
+        self.target_bound = self._lower_bound(self.nodes) if target_gap is not None else 0.0
+        self._next_rental_id = 999 + len(self.nodes) + 1
+
+        seed_budget = time_limit_ms * self.SEED_BUDGET_SHARE
+        if time_budget_ms is not None:
+            seed_budget = min(seed_budget, time_budget_ms)
+        sequenced, unassigned = self._construct(allow_rental, allow_multi_trip, seed_budget)
+
+        current = Plan(
+            routes=[list(route) for _, route, _, _ in sequenced],
+            vehicles=[vehicle for vehicle, _, _, _ in sequenced],
+            unassigned=list(unassigned),
+        )
+        current_cost = self._plan_cost(current)
+        self.best, self.best_cost = current.copy(), current_cost
+        self.stats = {"iterations": 0, "seed_cost": current_cost, "improvements": 0}
+
+        self._search(current, current_cost, started, time_limit_ms, deadline)
+
+        self.stats["best_cost"] = self.best_cost
+        self.stats["elapsed_ms"] = (time.perf_counter() - started) * 1000
+        return self.best_result()
+
+    def best_result(self) -> RoutingResult:
+        """Şimdiye kadarki en iyi planı RoutingResult olarak döndür."""
+        plan = self.best
+        result = replace(
+            self._template,
+            warnings=list(self._template.warnings),
+            unassigned_cargos=list(self._template.unassigned_cargos),
+        )
+
+        # Arama sırasında eklenen kiralık araçları sırayla yeniden numaralandır
+        owned = {id(vehicle) for vehicle in self.vehicles}
+        renamed: Dict[int, Dict] = {}
+        vehicles = []
+        for vehicle in plan.vehicles:
+            if id(vehicle) not in owned:
+                if id(vehicle) not in renamed:
+                    renamed[id(vehicle)] = dict(vehicle, id=1000 + len(renamed))
+                vehicle = renamed[id(vehicle)]
+            vehicles.append(vehicle)
+
+        sequenced = self._sequence_trips(list(zip(vehicles, plan.routes)))
+        result = self._finish_result(result, sequenced, list(plan.unassigned))
+        result.search_stats = dict(getattr(self, "stats", {}))
+        return result
+
+    # ============================================
+    # ARAMA DÖNGÜSÜ
+    # ============================================
+
+    def _search(self, current: Plan, current_cost: float, started: float,
+                time_limit_ms: float, deadline: Optional[float]) -> None:
+        """Süre dolana kadar yok et / onar / kabul et."""
+        destroy_ops: List[Callable[[Plan, int], None]] = [
+            self._random_removal, self._worst_removal, self._related_removal, self._route_removal,
+        ]
+        repair_ops: List[Callable[[Plan], None]] = [self._greedy_repair, self._regret_repair]
+        destroy_weights = [1.0] * len(destroy_ops)
+        repair_weights = [1.0] * len(repair_ops)
+        destroy_scores = [0.0] * len(destroy_ops)
+        repair_scores = [0.0] * len(repair_ops)
+        destroy_uses = [0] * len(destroy_ops)
+        repair_uses = [0] * len(repair_ops)
+
+        start_temperature = -self.START_ACCEPT_WORSE * max(current_cost, 1.0) / math.log(0.5)
+        end_temperature = start_temperature * self.END_TEMPERATURE_RATIO
+        limit = max(time_limit_ms / 1000.0, 1e-9)
+        max_remove = max(1, int(len(self.nodes) * self.MAX_REMOVE_RATIO))
+        rng = self.rng
+        iteration = 0
+
+        while self.nodes and not time_is_up(deadline) and not self._target_reached():
+            iteration += 1
+            d = rng.choices(range(len(destroy_ops)), weights=destroy_weights)[0]
+            r = rng.choices(range(len(repair_ops)), weights=repair_weights)[0]
+
+            candidate = current.copy()
+            destroy_ops[d](candidate, rng.randint(1, max_remove))
+            candidate.drop_empty_routes()
+            repair_ops[r](candidate)
+            candidate_cost = self._plan_cost(candidate)
+
+            progress = min(1.0, (time.perf_counter() - started) / limit)
+            temperature = start_temperature * (end_temperature / start_temperature) ** progress
+
+            score = 0.0
+            if candidate_cost < self.best_cost - 1e-9:
+                candidate, candidate_cost = self._polish(candidate, candidate_cost)
+                self.best, self.best_cost = candidate.copy(), candidate_cost
+                self.stats["improvements"] += 1
+                current, current_cost = candidate, candidate_cost
+                score = self.SCORE_GLOBAL_BEST
+            elif candidate_cost < current_cost - 1e-9:
+                current, current_cost = candidate, candidate_cost
+                score = self.SCORE_IMPROVED
+            elif candidate_cost < math.inf and rng.random() < math.exp(
+                    -(candidate_cost - current_cost) / max(temperature, 1e-9)):
+                current, current_cost = candidate, candidate_cost
+                score = self.SCORE_ACCEPTED
+
+            destroy_scores[d] += score
+            repair_scores[r] += score
+            destroy_uses[d] += 1
+            repair_uses[r] += 1
+
+            if iteration % self.SEGMENT_LENGTH == 0:
+                self._update_weights(destroy_weights, destroy_scores, destroy_uses)
+                self._update_weights(repair_weights, repair_scores, repair_uses)
+
+            self.stats["iterations"] = iteration
+
+        self.stats["destroy_weights"] = {op.__name__.strip("_"): w for op, w in zip(destroy_ops, destroy_weights)}
+        self.stats["repair_weights"] = {op.__name__.strip("_"): w for op, w in zip(repair_ops, repair_weights)}
+
+    def _target_reached(self) -> bool:
+        """En iyi plan tüm ziyaretleri taşıyor ve açık hedefin altında mı?"""
+        if self.target_gap is None or self.best.unassigned:
+            return False
+        gap = gap_percent(self.best_cost, self.target_bound)
+        if gap is None or gap > self.target_gap:
+            return False
+        self.stats["stopped_at_gap"] = gap
+        return True
+
+    def _update_weights(self, weights: List[float], scores: List[float], uses: List[int]) -> None:
+        """Segment sonunda ağırlıkları puanlara göre güncelle ve sayaçları sıfırla."""
+        reaction = self.REACTION_FACTOR
+        for k in range(len(weights)):
+            if uses[k]:
+                weights[k] = max(0.05, (1 - reaction) * weights[k] + reaction * scores[k] / uses[k])
+            scores[k] = 0.0
+            uses[k] = 0
+
+    def _polish(self, plan: Plan, cost: float) -> Tuple[Plan, float]:
+        """Yeni en iyi planın rota sıralarını kesin / yerel arama ile düzelt."""
+        polished = plan.copy()
+        polished.routes = [self._optimize_route_order(route) for route in polished.routes]
+        polished_cost = self._plan_cost(polished)
+        if polished_cost < cost:
+            return polished, polished_cost
+        return plan, cost
+
+    # ============================================
+    # AMAÇ FONKSİYONU
+    # ============================================
+
+    def _km(self, route: List[int]) -> float:
+        """Rota mesafesi (önbellekli)."""
+        key = tuple(route)
+        km = self._route_km.get(key)
+        if km is None:
+            if len(self._route_km) > 200000:
+                self._route_km.clear()
+            km = self._route_km[key] = route_distance(route, self.dist, self.DEPOT)
+        return km
+
+    def _plan_cost(self, plan: Plan) -> float:
+        """
+        Toplam maliyet: yakıt (boş gidiş dahil) + araç başına bir kez
+        kiralama + sefer süresi (kalkış saati verildiyse) + atanamayan
+        ziyaret cezası. Günlük mesafe limitini,
+        zaman pencerelerini veya vardiyayı aşan plan geçersizdir (sonsuz).
+        """
+        pairs = list(zip(plan.vehicles, plan.routes))
+        sequenced = self._sequence_trips(pairs)
+        if (self.allow_multi_trip or self.time_constrained) and not self._daily_limits_ok(sequenced):
+            return math.inf
+
+        distance = sum(self._km(route) + deadhead for _, route, _, deadhead in sequenced)
+        rental = sum(vehicle.get("rental_cost", 0) for vehicle, _, number, _ in sequenced if number == 1)
+        return (distance * self.FUEL_COST_PER_KM + rental + self._plan_time_cost(sequenced)
+                + self.UNASSIGNED_PENALTY * len(plan.unassigned))
+
+    # ============================================
+    # YOK ET OPERATÖRLERİ
+    # ============================================
+
+    def _assigned_nodes(self, plan: Plan) -> List[int]:
+        return [node for route in plan.routes for node in route]
+
+    def _remove_nodes(self, plan: Plan, nodes: List[int]) -> None:
+        removed = set(nodes)
+        plan.routes = [[node for node in route if node not in removed] for route in plan.routes]
+        plan.unassigned.extend(nodes)
+
+    def _pick_skewed(self, ranked: List[int]) -> int:
+        """Sıralı listeden baştakilere ağırlık vererek seç: ⌊y^p · n⌋."""
+        return ranked[int(self.rng.random() ** self.REMOVAL_DETERMINISM * len(ranked))]
+
+    def _random_removal(self, plan: Plan, count: int) -> None:
+        """Rastgele ziyaretleri çıkar."""
+        nodes = self._assigned_nodes(plan)
+        self._remove_nodes(plan, self.rng.sample(nodes, min(count, len(nodes))))
+
+    def _worst_removal(self, plan: Plan, count: int) -> None:
+        """Rotadan çıkarılınca en çok mesafe kazandıran ziyaretleri çıkar."""
+        dist = self.dist
+        for _ in range(count):
+            gains = []
+            for route in plan.routes:
+                for pos, node in enumerate(route):
+                    after = route[pos + 1] if pos + 1 < len(route) else self.DEPOT
+                    if pos == 0:
+                        gain = dist[node][after]
+                    else:
+                        before = route[pos - 1]
+                        gain = dist[before][node] + dist[node][after] - dist[before][after]
+                    gains.append((gain, node))
+            if not gains:
+                return
+            gains.sort(reverse=True)
+            self._remove_nodes(plan, [self._pick_skewed([node for _, node in gains])])
+
+    def _related_removal(self, plan: Plan, count: int) -> None:
+        """Birbirine yakın ziyaretleri birlikte çıkar (Shaw)."""
+        remaining = self._assigned_nodes(plan)
+        if not remaining:
+            return
+        dist = self.dist
+        removed = [self.rng.choice(remaining)]
+        remaining.remove(removed[0])
+        while remaining and len(removed) < count:
+            anchor = self.rng.choice(removed)
+            remaining.sort(key=lambda node: dist[anchor][node])
+            node = self._pick_skewed(remaining)
+            remaining.remove(node)
+            removed.append(node)
+        self._remove_nodes(plan, removed)
+
+    def _route_removal(self, plan: Plan, count: int) -> None:
+        """Rastgele bir rotayı (ve gerekirse aracını) tamamen boşalt."""
+        if plan.routes:
+            self._remove_nodes(plan, list(self.rng.choice(plan.routes)))
+
+    # ============================================
+    # ONAR OPERATÖRLERİ
+    # ============================================
+
+    def _insertion_options(self, plan: Plan, loads: List[float], node: int,
+                           cache: Dict[Tuple[int, int], Tuple[float, int]]) -> List[Tuple[float, int, int]]:
+        """
+        Ziyaretin rota başına en ucuz ekleme seçenekleri. Zaman kısıtı
+        varsa her pozisyon rota çizelgesiyle O(1) kontrol edilir; aracın
+        günlük mesafe limitini aşan seçenekler elenir.
+
+        Returns:
+            [(maliyet, rota_indeksi, pozisyon), ...] - rota_indeksi -1: yeni rota
+        """
+        dist = self.dist
+        demand = self.demand[node]
+        options = []
+
+        for r, route in enumerate(plan.routes):
+            if loads[r] + demand > plan.vehicles[r]["capacity"]:
+                continue
+            cached = cache.get((node, r))
+            if cached is None:
+                row = dist[node]
+                schedule = self._route_schedule(route) if self.time_constrained else None
+                best, best_pos = math.inf, -1
+                if schedule is None or self.time_model.can_insert(schedule, 0, node):
+                    best, best_pos = row[route[0]], 0  # yeni başlangıç durağı
+                for pos in range(1, len(route) + 1):
+                    before = route[pos - 1]
+                    after = route[pos] if pos < len(route) else self.DEPOT
+                    delta = dist[before][node] + row[after] - dist[before][after]
+                    if delta < best and (schedule is None or self.time_model.can_insert(schedule, pos, node)):
+                        best, best_pos = delta, pos
+                cached = cache[(node, r)] = (best, best_pos)
+            if cached[1] >= 0 and self._insertion_vehicle_ok(plan, r, cached[1], node):
+                options.append((cached[0], r, cached[1]))
+
+        new_route = self._new_route_cost(plan, node)
+        if new_route is not None:
+            options.append((new_route[0], -1, 0))
+        return options
+
+    def _insertion_vehicle_ok(self, plan: Plan, r: int, pos: int, node: int) -> bool:
+        """
+        Eklemeden sonra aracın seferleri günlük mesafe limitinde mi? Pozisyon
+        O(1) zaman kontrolü filo vardiyasına göredir; aracın kendi vardiyası,
+        hızı ve sonraki seferleri için seferler O(n) doğrulanır.
+        """
+        vehicle = plan.vehicles[r]
+        route = plan.routes[r]
+        routes = [
+            other for other_vehicle, other in zip(plan.vehicles, plan.routes)
+            if other_vehicle is vehicle and other is not route
+        ]
+        if not routes and not self.time_constrained:
+            return True
+        routes.append(route[:pos] + [node] + route[pos:])
+        return self._vehicle_trips_ok(vehicle, routes)
+
+    def _vehicle_trips_ok(self, vehicle: Dict, routes: List[List[int]]) -> bool:
+        """Aracın seferleri günlük mesafe limitine, pencerelere ve vardiyaya uyuyor mu?"""
+        ordered = self._order_trips(vehicle, routes)
+        if len(ordered) > 1:
+            depot_row = self.dist[self.DEPOT]
+            km = sum(self._km(route) for route in ordered) + sum(depot_row[route[0]] for route in ordered[1:])
+            if km > (vehicle.get("max_daily_distance") or self.MAX_DAILY_DISTANCE_KM) + 1e-9:
+                return False
+        return not self.time_constrained or self._vehicle_time_ok(vehicle, ordered)
+
+    def _new_route_cost(self, plan: Plan, node: int) -> Optional[Tuple[float, Dict]]:
+        """Ziyareti yeni bir rotada taşımanın (maliyet, araç) çifti."""
+        demand = self.demand[node]
+        base = self.dist[node][self.DEPOT] * self.FUEL_COST_PER_KM
+        used = {id(vehicle) for vehicle in plan.vehicles}
+
+        free = [v for v in self.vehicles if id(v) not in used and v["capacity"] >= demand
+                and self._vehicle_time_ok(v, [[node]])]
+        if free:
+            vehicle = min(free, key=lambda v: (v["capacity"], v.get("rental_cost", 0)))
+            return base + vehicle.get("rental_cost", 0), vehicle
+
+        options = []
+        if self.allow_multi_trip:
+            trips: Dict[int, Tuple[Dict, List[List[int]]]] = {}
+            for vehicle, route in zip(plan.vehicles, plan.routes):
+                trips.setdefault(id(vehicle), (vehicle, []))[1].append(route)
+            reusable = [
+                (len(routes), v) for v, routes in trips.values()
+                if v["capacity"] >= demand and self._vehicle_trips_ok(v, routes + [[node]])
+            ]
+            if reusable:
+                _, vehicle = min(reusable, key=lambda item: item[0])
+                deadhead = self.dist[self.DEPOT][node] * self.FUEL_COST_PER_KM
+                options.append((base + deadhead, vehicle))
+        if (self.allow_rental and demand <= self.RENTAL_CAPACITY and self._rental_open(plan)
+                and self._vehicle_time_ok({"capacity": self.RENTAL_CAPACITY}, [[node]])):
+            options.append((base + self.RENTAL_COST, None))
+
+        if not options:
+            return None
+        return min(options, key=lambda option: option[0])
+
+    def _rental_open(self, plan: Plan) -> bool:
+        """Araç sayısı sınırı yeni bir kiralık araca izin veriyor mu?"""
+        if self.rental_limit is None:
+            return True
+        owned = {id(vehicle) for vehicle in self.vehicles}
+        rented = {id(vehicle) for vehicle in plan.vehicles if id(vehicle) not in owned}
+        return len(rented) < self.rental_limit
+
+    def _insert(self, plan: Plan, loads: List[float], node: int, r: int, pos: int,
+                cache: Dict[Tuple[int, int], Tuple[float, int]]) -> None:
+        """Ziyareti yerleştir; değişen rotanın önbellek kayıtlarını sil."""
+        if r == -1:
+            _, vehicle = self._new_route_cost(plan, node)
+            if vehicle is None:
+                self._next_rental_id += 1
+                vehicle = {
+                    "id": self._next_rental_id,
+                    "capacity": self.RENTAL_CAPACITY,
+                    "is_rented": True,
+                    "rental_cost": self.RENTAL_COST,
+                }
+            plan.routes.append([node])
+            plan.vehicles.append(vehicle)
+            loads.append(self.demand[node])
+        else:
+            plan.routes[r].insert(pos, node)
+            loads[r] += self.demand[node]
+            for key in [key for key in cache if key[1] == r]:
+                del cache[key]
+        plan.unassigned.remove(node)
+
+    def _repair(self, plan: Plan, regret: bool) -> None:
+        """Atanamayan ziyaretleri açgözlü veya regret-2 sırasıyla yerleştir."""
+        loads = [sum(self.demand[node] for node in route) for route in plan.routes]
+        cache: Dict[Tuple[int, int], Tuple[float, int]] = {}
+        self.rng.shuffle(plan.unassigned)
+
+        while plan.unassigned:
+            chosen = None
+            chosen_key = None
+            for node in plan.unassigned:
+                options = self._insertion_options(plan, loads, node, cache)
+                if not options:
+                    continue
+                options.sort()
+                if regret:
+                    second = options[1][0] if len(options) > 1 else math.inf
+                    key = (-(second - options[0][0]), options[0][0])
+                else:
+                    key = (options[0][0],)
+                if chosen_key is None or key < chosen_key:
+                    chosen_key = key
+                    chosen = (node, options[0][1], options[0][2])
+            if chosen is None:
+                return
+            self._insert(plan, loads, *chosen, cache)
+
+    def _greedy_repair(self, plan: Plan) -> None:
+        """En ucuz eklemeyi her adımda uygula."""
+        self._repair(plan, regret=False)
+
+    def _regret_repair(self, plan: Plan) -> None:
+        """En iyi ve ikinci en iyi seçenek farkı en büyük olanı önce yerleştir."""
+        self._repair(plan, regret=True)
@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class YoneticiekraniConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "yoneticiekrani"
+
+    def ready(self):
+        from django.conf import settings
+
+        from . import signals  # noqa: F401  (sinyal alıcılarını kaydet)
+        from .distance_artifact import ArtifactDistanceProvider
+        from .distance_providers import StationDistanceProvider, road_network_path, set_distance_provider
+
+        # Station tablosu ilk rota hesabında okunur (burada sorgu yok);
+        # yol ağı (build_road_network) varsa mesafeler ondan hesaplanır,
+        # derlenmiş matris dosyası varsa (build_distance_artifact) o eşlenir
+        provider = StationDistanceProvider(network_path=road_network_path())
+        path = getattr(settings, "DISTANCE_ARTIFACT_PATH", None)
+        if path:
+            provider = ArtifactDistanceProvider(str(path), fallback=provider)
+        set_distance_provider(provider)
@@ -0,0 +1,95 @@
+"""
+Toplu (Çok Günlü) Rota Hesabı
+
+Bir tarih aralığının her günü bağımsız bir VRP'dir. Günler tek filo
+listesiyle süreç havuzuna dağıtılır; sonuçlar bittikçe üretilir, böylece
+HTTP yanıtı (NDJSON) ve yönetim komutu ilk günü beklemeden gösterebilir.
+Girdisi değişmeyen günler rota önbelleğinden döner.
+"""
+
+import time
+from datetime import date
+from typing import Dict, Iterator, List, Optional
+
+from .route_cache import RouteResultCache, ROUTE_RESULT_CACHE, iter_cached_calculate
+
+MAX_BATCH_DAYS = 31  # Toplu rota hesabında izin verilen en uzun tarih aralığı
+
+
+def iter_batch_routes(vehicles: List[Dict], cargos_by_date: Dict[date, List[Dict]],
+                      workers: Optional[int] = None, use_cache: bool = True,
+                      cache: RouteResultCache = ROUTE_RESULT_CACHE,
+                      **options) -> Iterator[Dict]:
+    """
+    Her günü eşzamanlı çöz, sonuçları bittikçe üret.
+
+    Args:
+        cargos_by_date: {tarih: bekleyen kargo listesi}; kargosu olmayan
+                        günler çözülmeden hemen döner
+        workers: Süreç sayısı (None: CPU sayısı)
+        use_cache: False ise paylaşılan önbellek kullanılmaz
+        options: calculate_routes seçenekleri
+
+    Yields:
+        {"type": "day", "target_date", "cargo_count", "result"} satırları,
+        en sonda {"type": "summary", ...}. Özet maliyeti yalnızca taşınan
+        kargoları kapsar; kargo bırakan günler "partial_days"ta listelenir.
+    """
+    started = time.perf_counter()
+    days = sorted(cargos_by_date)
+    summary = {
+        "type": "summary",
+        "days": len(days),
+        "solved_days": 0,
+        "cache_hits": 0,
+        "total_cost": 0.0,
+        "total_distance": 0.0,
+        "complete": True,
+        "partial_days": [],
+        "unassigned_count": 0,
+        "unassigned_weight": 0.0,
+    }
+
+    jobs = []
+    job_days = []
+    for day in days:
+        cargos = cargos_by_date[day]
+        if not cargos:
+            yield {
+                "type": "day",
+                "target_date": str(day),
+                "cargo_count": 0,
+                "result": {
+                    "success": True,
+                    "complete": True,
+                    "message": f"{day} tarihinde taşınacak kargo bulunmuyor.",
+                    "routes": [],
+                    "total_cost": 0,
+                },
+            }
+            continue
+        jobs.append((vehicles, cargos, options))
+        job_days.append(day)
+
+    # Önbellek kapalıysa bu çağrıya özel boş bir önbellek kullanılır
+    solve_cache = cache if use_cache else RouteResultCache(maxsize=len(jobs) or 1)
+    for index, result in iter_cached_calculate(jobs, workers=workers, cache=solve_cache):
+        summary["solved_days"] += 1
+        summary["cache_hits"] += int(result.get("cache_hit", False))
+        summary["total_cost"] += result.get("total_cost", 0.0)
+        summary["total_distance"] += result.get("total_distance", 0.0)
+        if not result.get("complete", True):
+            summary["complete"] = False
+            summary["partial_days"].append(str(job_days[index]))
+            summary["unassigned_count"] += len(result.get("unassigned_cargos", []))
+            summary["unassigned_weight"] += result.get("unassigned_weight", 0.0)
+        yield {
+            "type": "day",
+            "target_date": str(job_days[index]),
+            "cargo_count": len(jobs[index][1]),
+            "result": result,
+        }
+
+    summary["partial_days"].sort()
+    summary["elapsed_ms"] = (time.perf_counter() - started) * 1000
+    yield summary
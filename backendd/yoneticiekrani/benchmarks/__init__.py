@@ -0,0 +1,13 @@
+"""
+Rota Çözücü Kıyaslama Paketi
+
+- instances: rastgele açık VRP örnekleri ve CVRPLIB .vrp okuyucu
+- runner: çözüm modlarını sabit tohumlarla çalıştırma, süre / bellek
+  ölçümü, JSON / CSV rapor ve iki raporun karşılaştırılması
+
+Yönetim komutları: run_benchmark, compare_benchmarks
+"""
+
+from .instances import BenchmarkInstance, generate_instance, load_cvrplib
+from .runner import compare_reports, load_report, run_benchmark, write_report
+
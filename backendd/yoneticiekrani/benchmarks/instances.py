@@ -0,0 +1,264 @@
+"""
+Kıyaslama Örnekleri
+
+1. generate_instance: Umuttepe merkezli bir alanda rastgele (veya
+   kümeli) istasyonlar; mesafe = öklid × dolambaç katsayısı. Aynı tohum
+   her zaman aynı örneği üretir.
+2. load_cvrplib: Standart CVRPLIB .vrp dosyası (EUC_2D, CEIL_2D veya
+   EXPLICIT ağırlıklar). CVRPLIB örnekleri kapalı turdur; çözücümüz açık
+   rota (Umuttepe'de biten) kurduğu için maliyetler yayınlanan en iyi
+   değerlerle değil, raporlar arasında karşılaştırılmalıdır.
+"""
+
+import math
+import os
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy yoksa matris saf Python ile kurulur
+    np = None
+
+from ..distance_providers import MatrixDistanceProvider
+from ..routing_algorithm import Cargo, cargos_from_dicts
+
+GENERATOR_MIN_STATIONS = 12
+GENERATOR_MAX_STATIONS = 2000
+GENERATOR_AREA_KM = 60.0          # Kare alanın kenarı (depo merkezde)
+GENERATOR_DETOUR = 1.3            # Kuş uçuşu -> yol mesafesi katsayısı
+GENERATOR_CAPACITIES = (500, 750, 1000)
+GENERATOR_TRIPS_PER_VEHICLE = 2   # Filo boyutu: talep / (ortalama kapasite · sefer)
+
+_NUMBER = re.compile(r"^-?\d+(\.\d+)?$")
+
+
+@dataclass
+class BenchmarkInstance:
+    """Kıyaslama örneği: istasyonlar, depolu mesafe matrisi, kargolar ve filo."""
+    name: str
+    names: List[str]
+    matrix: List[List[float]]                 # 0. satır/sütun depo
+    cargos: List[Dict]
+    vehicles: List[Dict]
+    coords: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    options: Dict = field(default_factory=dict)   # solve() seçenekleri
+    source: str = "generated"
+
+    @property
+    def station_count(self) -> int:
+        return len(self.names)
+
+    def provider(self) -> MatrixDistanceProvider:
+        """Çözücüye verilecek mesafe sağlayıcısı."""
+        return MatrixDistanceProvider(self.names, self.matrix, self.coords)
+
+    def cargo_objects(self) -> List[Cargo]:
+        return cargos_from_dicts(self.cargos)
+
+
+ROUNDINGS = {
+    "tenth": (lambda value: round(value, 1)),          # Üretici: 0.1 km
+    "nint": (lambda value: float(math.floor(value + 0.5))),   # TSPLIB EUC_2D
+    "ceil": (lambda value: float(math.ceil(value))),          # TSPLIB CEIL_2D
+}
+
+
+def _euclidean_matrix(points: List[Tuple[float, float]], scale: float = 1.0,
+                      rounding: Optional[str] = None) -> List[List[float]]:
+    """Noktalar arası öklid mesafe matrisi (scale ile çarpılmış, ROUNDINGS'e göre yuvarlanmış)."""
+    if np is not None:
+        xy = np.asarray(points, dtype=float)
+        dist = np.hypot(xy[:, None, 0] - xy[None, :, 0], xy[:, None, 1] - xy[None, :, 1]) * scale
+        if rounding == "tenth":
+            dist = np.round(dist, 1)
+        elif rounding == "nint":
+            dist = np.floor(dist + 0.5)
+        elif rounding == "ceil":
+            dist = np.ceil(dist)
+        return dist.tolist()
+    rounder = ROUNDINGS[rounding] if rounding else (lambda value: value)
+    return [
+        [rounder(math.hypot(ax - bx, ay - by) * scale) for bx, by in points]
+        for ax, ay in points
+    ]
+
+
+def generate_instance(stations: int, seed: int = 0, clustered: bool = False,
+                      area_km: float = GENERATOR_AREA_KM,
+                      detour: float = GENERATOR_DETOUR) -> BenchmarkInstance:
+    """
+    Rastgele açık VRP örneği.
+
+    Args:
+        stations: İstasyon sayısı (GENERATOR_MIN_STATIONS..GENERATOR_MAX_STATIONS)
+        clustered: İstasyonlar √n/2 merkez etrafında kümelenir
+    """
+    if not GENERATOR_MIN_STATIONS <= stations <= GENERATOR_MAX_STATIONS:
+        raise ValueError(
+            f"İstasyon sayısı {GENERATOR_MIN_STATIONS}-{GENERATOR_MAX_STATIONS} arasında olmalı"
+        )
+    rng = random.Random(seed)
+    half = area_km / 2
+
+    if clustered:
+        centers = [(rng.uniform(-half, half), rng.uniform(-half, half))
+                   for _ in range(max(2, int(math.sqrt(stations) / 2)))]
+        spread = area_km / 12
+        points = []
+        for _ in range(stations):
+            cx, cy = rng.choice(centers)
+            points.append((min(half, max(-half, rng.gauss(cx, spread))),
+                           min(half, max(-half, rng.gauss(cy, spread)))))
+    else:
+        points = [(rng.uniform(-half, half), rng.uniform(-half, half)) for _ in range(stations)]
+
+    names = [f"S{k:04d}" for k in range(1, stations + 1)]
+    matrix = _euclidean_matrix([(0.0, 0.0)] + points, detour, "tenth")
+
+    cargos = []
+    for name in names:
+        for _ in range(rng.randint(1, 3)):
+            cargos.append({
+                "id": len(cargos) + 1,
+                "station_name": name,
+                "weight": round(rng.uniform(5, 120), 1),
+                "quantity": 1,
+                "sender_id": 0,
+            })
+
+    total = sum(c["weight"] for c in cargos)
+    average = sum(GENERATOR_CAPACITIES) / len(GENERATOR_CAPACITIES)
+    count = max(3, math.ceil(total / (average * GENERATOR_TRIPS_PER_VEHICLE)))
+    vehicles = [
+        {"id": k + 1, "capacity": GENERATOR_CAPACITIES[k % len(GENERATOR_CAPACITIES)],
+         "is_rented": False, "rental_cost": 0}
+        for k in range(count)
+    ]
+
+    kind = "c" if clustered else "r"
+    return BenchmarkInstance(
+        name=f"gen-{kind}{stations}-s{seed}",
+        names=names,
+        matrix=matrix,
+        cargos=cargos,
+        vehicles=vehicles,
+        coords=dict(zip(names, points)),
+        options={"allow_rental": True, "allow_multi_trip": True},
+        source="generated",
+    )
+
+
+# ============================================
+# CVRPLIB
+# ============================================
+
+def _explicit_matrix(values: List[float], dimension: int, fmt: str) -> List[List[float]]:
+    """EDGE_WEIGHT_SECTION sayılarından tam matris."""
+    matrix = [[0.0] * dimension for _ in range(dimension)]
+    it = iter(values)
+    if fmt == "FULL_MATRIX":
+        for i in range(dimension):
+            for j in range(dimension):
+                matrix[i][j] = next(it)
+        return matrix
+
+    if fmt == "LOWER_ROW":
+        cells = ((i, j) for i in range(dimension) for j in range(i))
+    elif fmt == "LOWER_DIAG_ROW":
+        cells = ((i, j) for i in range(dimension) for j in range(i + 1))
+    elif fmt == "UPPER_ROW":
+        cells = ((i, j) for i in range(dimension) for j in range(i + 1, dimension))
+    elif fmt == "UPPER_DIAG_ROW":
+        cells = ((i, j) for i in range(dimension) for j in range(i, dimension))
+    else:
+        raise ValueError(f"Desteklenmeyen EDGE_WEIGHT_FORMAT: {fmt}")
+    for i, j in cells:
+        matrix[i][j] = matrix[j][i] = next(it)
+    return matrix
+
+
+def load_cvrplib(path: str) -> BenchmarkInstance:
+    """
+    CVRPLIB (TSPLIB biçimi) .vrp dosyasını oku.
+
+    Araç sayısı VEHICLES başlığından, yoksa isimdeki "-kN" ekinden, o da
+    yoksa ⌈toplam talep / kapasite⌉'den alınır. Araçların günlük mesafe
+    limiti yoktur; kiralama kapalı, çoklu sefer açıktır.
+    """
+    header: Dict[str, str] = {}
+    sections: Dict[str, List[List[str]]] = {}
+    current: Optional[str] = None
+
+    with open(path, encoding="utf-8") as handle:
+        for raw in handle:
+            line = raw.strip()
+            if not line:
+                continue
+            if line == "EOF":
+                break
+            keyword = line.split()[0].rstrip(":").upper()
+            if keyword.endswith("_SECTION"):
+                current = keyword
+                sections[current] = []
+            elif ":" in line and not _NUMBER.match(keyword):
+                key, _, value = line.partition(":")
+                header[key.strip().upper()] = value.strip()
+                current = None
+            elif current is not None:
+                sections[current].append(line.split())
+
+    dimension = int(header["DIMENSION"])
+    capacity = float(header["CAPACITY"])
+    weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+
+    coords_by_id = {int(row[0]): (float(row[1]), float(row[2]))
+                    for row in sections.get("NODE_COORD_SECTION", [])}
+    demand_by_id = {int(row[0]): float(row[1]) for row in sections.get("DEMAND_SECTION", [])}
+    depots = [int(value) for row in sections.get("DEPOT_SECTION", []) for value in row if int(value) > 0]
+    depot_id = depots[0] if depots else 1
+    node_ids = [depot_id] + [k for k in range(1, dimension + 1) if k != depot_id]
+
+    if weight_type in ("EUC_2D", "CEIL_2D"):
+        rounding = "nint" if weight_type == "EUC_2D" else "ceil"
+        matrix = _euclidean_matrix([coords_by_id[k] for k in node_ids], 1.0, rounding)
+    elif weight_type == "EXPLICIT":
+        values = [float(value) for row in sections.get("EDGE_WEIGHT_SECTION", []) for value in row]
+        full = _explicit_matrix(values, dimension, header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX").upper())
+        matrix = [[full[a - 1][b - 1] for b in node_ids] for a in node_ids]
+    else:
+        raise ValueError(f"Desteklenmeyen EDGE_WEIGHT_TYPE: {weight_type}")
+
+    name = header.get("NAME") or os.path.splitext(os.path.basename(path))[0]
+    names = [f"N{k}" for k in node_ids[1:]]
+    cargos = [
+        {"id": k, "station_name": f"N{k}", "weight": demand_by_id.get(k, 0.0), "quantity": 1, "sender_id": 0}
+        for k in node_ids[1:] if demand_by_id.get(k, 0.0) > 0
+    ]
+
+    total = sum(c["weight"] for c in cargos)
+    match = re.search(r"-k(\d+)", name)
+    if header.get("VEHICLES"):
+        count = int(header["VEHICLES"])
+    elif match:
+        count = int(match.group(1))
+    else:
+        count = max(1, math.ceil(total / capacity))
+    vehicles = [
+        {"id": k + 1, "capacity": capacity, "is_rented": False, "rental_cost": 0,
+         "max_daily_distance": math.inf}
+        for k in range(count)
+    ]
+
+    return BenchmarkInstance(
+        name=name,
+        names=names,
+        matrix=matrix,
+        cargos=cargos,
+        vehicles=vehicles,
+        coords={f"N{k}": coords_by_id[k] for k in node_ids[1:] if k in coords_by_id},
+        options={"allow_rental": False, "allow_multi_trip": True},
+        source="cvrplib",
+    )
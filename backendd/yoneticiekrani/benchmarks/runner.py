@@ -0,0 +1,207 @@
+"""
+Kıyaslama Çalıştırıcı
+
+Her (örnek, mod, tohum) için çözücü bir kez ölçümlü çalıştırılır: süre
+perf_counter ile, tepe bellek isteğe bağlı ikinci bir tracemalloc
+geçişiyle ölçülür (tracemalloc süreyi bozduğu için iki ölçüm ayrıdır).
+
+Rapor JSON (.json) veya CSV (.csv) olarak yazılır; compare_reports iki
+raporu (örnek, mod, tohum) üzerinden eşleyip maliyet, süre ve bellek
+değişimini verir.
+"""
+
+import csv
+import json
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from ..routing_algorithm import _solver_class
+from .instances import BenchmarkInstance
+
+DEFAULT_SEEDS = (0, 1, 2)
+DEFAULT_TIME_LIMIT_MS = 2000      # alns / exact için arama süresi
+TIMED_MODES = ("alns", "exact")   # time_limit_ms alan modlar
+
+REPORT_FIELDS = (
+    "instance", "stations", "mode", "seed", "elapsed_ms", "peak_memory_kb",
+    "total_cost", "total_distance", "vehicles_used", "routes", "unassigned",
+    "lower_bound", "gap_percent",
+)
+NUMERIC_FIELDS = {
+    "stations": int, "seed": int, "vehicles_used": int, "routes": int, "unassigned": int,
+    "elapsed_ms": float, "peak_memory_kb": float, "total_cost": float,
+    "total_distance": float, "lower_bound": float, "gap_percent": float,
+}
+
+
+def _solve(instance: BenchmarkInstance, mode: str, seed: int, time_limit_ms: float):
+    solver = _solver_class(mode)(
+        instance.vehicles, instance.cargo_objects(), seed=seed,
+        distance_provider=instance.provider()
+    )
+    options = dict(instance.options)
+    if mode in TIMED_MODES:
+        options["time_limit_ms"] = time_limit_ms
+    return solver.solve(**options)
+
+
+def run_instance(instance: BenchmarkInstance, mode: str, seed: int = 0,
+                 time_limit_ms: float = DEFAULT_TIME_LIMIT_MS,
+                 measure_memory: bool = True) -> Dict:
+    """Tek örnek/mod/tohum ölçümü (rapor satırı)."""
+    started = time.perf_counter()
+    result = _solve(instance, mode, seed, time_limit_ms)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    peak_kb = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            _solve(instance, mode, seed, time_limit_ms)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_kb = round(peak / 1024, 1)
+
+    return {
+        "instance": instance.name,
+        "stations": instance.station_count,
+        "mode": mode,
+        "seed": seed,
+        "elapsed_ms": round(elapsed_ms, 1),
+        "peak_memory_kb": peak_kb,
+        "total_cost": round(result.total_cost, 2),
+        "total_distance": round(result.total_distance, 2),
+        "vehicles_used": sum(1 for route in result.routes if route.trip_number == 1),
+        "routes": len(result.routes),
+        "unassigned": len(result.unassigned_cargos),
+        "lower_bound": round(result.lower_bound, 2),
+        "gap_percent": None if result.gap_percent is None else round(result.gap_percent, 2),
+    }
+
+
+def run_benchmark(instances: Iterable[BenchmarkInstance], modes: Sequence[str],
+                  seeds: Sequence[int] = DEFAULT_SEEDS,
+                  time_limit_ms: float = DEFAULT_TIME_LIMIT_MS,
+                  measure_memory: bool = True, progress=None) -> Dict:
+    """
+    Tüm örnek × mod × tohum kombinasyonlarını çalıştır.
+
+    Args:
+        progress: Her satırdan sonra çağrılır (ör. komut çıktısı için)
+
+    Returns:
+        {"meta": {...}, "results": [satır, ...]}
+    """
+    results = []
+    for instance in instances:
+        for mode in modes:
+            for seed in seeds:
+                row = run_instance(instance, mode, seed, time_limit_ms, measure_memory)
+                results.append(row)
+                if progress is not None:
+                    progress(row)
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "modes": list(modes),
+            "seeds": list(seeds),
+            "time_limit_ms": time_limit_ms,
+        },
+        "results": results,
+    }
+
+
+# ============================================
+# RAPOR
+# ============================================
+
+def write_report(report: Dict, path: str) -> None:
+    """Uzantıya göre JSON veya CSV yaz (CSV'de meta bilgisi yazılmaz)."""
+    if os.path.splitext(path)[1].lower() == ".csv":
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(report["results"])
+        return
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, ensure_ascii=False, indent=2)
+
+
+def load_report(path: str) -> Dict:
+    """write_report çıktısını oku."""
+    if os.path.splitext(path)[1].lower() != ".csv":
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+
+    results = []
+    with open(path, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            for key, cast in NUMERIC_FIELDS.items():
+                value = row.get(key)
+                row[key] = cast(value) if value not in (None, "") else None
+            results.append(row)
+    return {"meta": {}, "results": results}
+
+
+def _ratio(new: Optional[float], base: Optional[float]) -> Optional[float]:
+    if new is None or not base:
+        return None
+    return round(new / base, 3)
+
+
+def compare_reports(base: Dict, new: Dict) -> Dict:
+    """
+    İki raporu (örnek, mod, tohum) üzerinden karşılaştır.
+
+    Returns:
+        {"rows": [...], "summary": {mod: {...}}, "missing": [...]}
+        cost_delta_percent > 0 maliyetin arttığını, time_ratio > 1
+        yavaşladığını gösterir.
+    """
+    def key(row):
+        return row["instance"], row["mode"], int(row["seed"])
+
+    base_rows = {key(row): row for row in base["results"]}
+    rows = []
+    missing = []
+    for row in new["results"]:
+        old = base_rows.get(key(row))
+        if old is None:
+            missing.append(key(row))
+            continue
+        delta = None
+        if old["total_cost"]:
+            delta = round((row["total_cost"] - old["total_cost"]) / old["total_cost"] * 100, 2)
+        rows.append({
+            "instance": row["instance"],
+            "mode": row["mode"],
+            "seed": row["seed"],
+            "base_cost": old["total_cost"],
+            "new_cost": row["total_cost"],
+            "cost_delta_percent": delta,
+            "unassigned_delta": row["unassigned"] - old["unassigned"],
+            "time_ratio": _ratio(row["elapsed_ms"], old["elapsed_ms"]),
+            "memory_ratio": _ratio(row.get("peak_memory_kb"), old.get("peak_memory_kb")),
+        })
+
+    summary = {}
+    for mode in sorted({row["mode"] for row in rows}):
+        group = [row for row in rows if row["mode"] == mode]
+        deltas = [row["cost_delta_percent"] for row in group if row["cost_delta_percent"] is not None]
+        times = [row["time_ratio"] for row in group if row["time_ratio"] is not None]
+        memories = [row["memory_ratio"] for row in group if row["memory_ratio"] is not None]
+        summary[mode] = {
+            "count": len(group),
+            "mean_cost_delta_percent": round(sum(deltas) / len(deltas), 2) if deltas else None,
+            "worst_cost_delta_percent": max(deltas) if deltas else None,
+            "mean_time_ratio": round(sum(times) / len(times), 3) if times else None,
+            "mean_memory_ratio": round(sum(memories) / len(memories), 3) if memories else None,
+        }
+    return {"rows": rows, "summary": summary, "missing": missing}
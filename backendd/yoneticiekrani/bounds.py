@@ -0,0 +1,106 @@
+"""
+Alt Sınırlar (Lower Bounds)
+
+Bir planın maliyeti için ucuz ve geçerli alt sınırlar. Çözücü sonucu
+bu sınırla karşılaştırılarak optimallik açığı (gap) raporlanır.
+
+- Mesafe: Açık rotaların birleşimi depoda birleşen yollardır, yani
+  {depo} ∪ duraklar üzerinde bir yayılan ağaçtır; toplam mesafe
+  MST ağırlığından küçük olamaz. Ayrıca her durağın tam bir ardılı
+  (sonraki durak veya depo) vardır; en kısa çıkış kenarlarının toplamı
+  da bir sınırdır. İkisinin büyüğü kullanılır.
+- Araç sayısı: ⌈toplam talep / C⌉ ve C/2'den ağır ziyaret sayısı
+  (ikisi aynı araca sığamaz).
+- Kiralama: Çoklu sefer yoksa özmal filoya sığmayan talep ve araç
+  sayısı açığı kadar kiralık araç gerekir. Çoklu seferde araç sayısı
+  açığı kadar rota ya kiralık araçla ya da boş gidişli ek seferle
+  taşınır; her biri en az bu iki maliyetin küçüğü kadar tutar.
+"""
+
+import math
+from typing import List, Optional, Sequence
+
+DEPOT = 0
+
+
+def mst_weight(nodes: Sequence[int], dist: Sequence[Sequence[float]], depot: int = DEPOT) -> float:
+    """
+    {depo} ∪ nodes üzerinde en küçük yayılan ağaç ağırlığı (Prim, O(n²)).
+
+    Kenar ağırlığı min(d(a,b), d(b,a)) alınır; matris simetrik değilse de
+    sınır geçerli kalır.
+    """
+    vertices = [depot] + list(nodes)
+    n = len(vertices)
+    if n < 2:
+        return 0.0
+
+    in_tree = [False] * n
+    best = [math.inf] * n
+    best[0] = 0.0
+    total = 0.0
+    for _ in range(n):
+        u = min((k for k in range(n) if not in_tree[k]), key=best.__getitem__)
+        in_tree[u] = True
+        total += best[u]
+        a = vertices[u]
+        row = dist[a]
+        for k in range(n):
+            if not in_tree[k]:
+                b = vertices[k]
+                weight = min(row[b], dist[b][a])
+                if weight < best[k]:
+                    best[k] = weight
+    return total
+
+
+def min_successor_bound(nodes: Sequence[int], dist: Sequence[Sequence[float]], depot: int = DEPOT) -> float:
+    """Her durağın en kısa çıkış kenarı (başka durak veya depo) toplamı."""
+    total = 0.0
+    for i in nodes:
+        row = dist[i]
+        total += min([row[depot]] + [row[j] for j in nodes if j != i])
+    return total
+
+
+def distance_lower_bound(nodes: Sequence[int], dist: Sequence[Sequence[float]], depot: int = DEPOT) -> float:
+    """Açık rotaların toplam mesafesi için alt sınır."""
+    if not nodes:
+        return 0.0
+    return max(mst_weight(nodes, dist, depot), min_successor_bound(nodes, dist, depot))
+
+
+def vehicle_lower_bound(demands: Sequence[float], capacity: float) -> int:
+    """Gereken en az rota (araç seferi) sayısı."""
+    if not demands or capacity <= 0:
+        return 0
+    by_volume = math.ceil(sum(demands) / capacity - 1e-9)
+    heavy = sum(1 for demand in demands if demand > capacity / 2)
+    return max(by_volume, heavy)
+
+
+def rental_lower_bound(demands: Sequence[float], owned_capacities: List[float], max_capacity: float,
+                       rental_capacity: float, allow_rental: bool, allow_multi_trip: bool) -> int:
+    """
+    Gereken en az kiralık araç sayısı.
+
+    Çoklu seferde özmal araçlar tekrar kullanılabildiği için sınır 0'dır.
+    """
+    if not allow_rental or allow_multi_trip:
+        return 0
+    shortage = sum(demands) - sum(owned_capacities)
+    by_volume = math.ceil(shortage / rental_capacity - 1e-9) if shortage > 0 else 0
+    by_count = vehicle_lower_bound(demands, max_capacity) - len(owned_capacities)
+    return max(0, by_volume, by_count)
+
+
+def extra_route_lower_bound(demands: Sequence[float], owned_count: int, max_capacity: float) -> int:
+    """Özmal araçların ilk seferlerine sığmayan en az rota sayısı."""
+    return max(0, vehicle_lower_bound(demands, max_capacity) - owned_count)
+
+
+def gap_percent(cost: float, lower_bound: float) -> Optional[float]:
+    """Optimallik açığı: (maliyet - alt sınır) / maliyet · 100."""
+    if cost <= 0:
+        return 0.0 if lower_bound <= 0 else None
+    return max(0.0, (cost - lower_bound) / cost * 100)
@@ -0,0 +1,153 @@
+"""
+Kargo Seçimi (Çoklu Sırt Çantası)
+
+Araç sayısı sınırlı ve toplam talep filonun kapasitesini aşıyorsa
+bugün hangi kargoların taşınacağına karar verilir. Her araç (tek sefer)
+bir sırt çantasıdır; amaç taşınan değerin (öncelik puanı, yoksa
+ağırlık) en büyük olmasıdır.
+
+Çoklu sırt çantası NP-zordur; araçlar büyükten küçüğe sırayla ele
+alınır ve her biri kalan kargolar üzerinde 0/1 sırt çantası DP'si ile
+kesin olarak doldurulur. Ağırlıklar tamsayı birimlere YUKARI
+yuvarlanır, kapasite AŞAĞI yuvarlanır; seçilen her paketleme gerçek
+kapasiteye sığar. Kalite için kesirli (Dantzig) üst sınır raporlanır.
+Eşit değerde daha fazla ağırlık taşıyan seçim tercih edilir.
+"""
+
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy yoksa saf Python DP kullanılır
+    np = None
+
+KNAPSACK_RESOLUTION_KG = 1.0   # DP ağırlık birimi (en ince)
+KNAPSACK_MAX_UNITS = 20000     # Araç başına DP tablosu genişliği üst sınırı
+
+
+def knapsack(weights: Sequence[float], values: Sequence[float], capacity: float) -> List[int]:
+    """
+    0/1 sırt çantası - O(n · C) DP.
+
+    Returns:
+        Seçilen öğe indeksleri (toplam ağırlık <= capacity)
+    """
+    unit = max(KNAPSACK_RESOLUTION_KG, capacity / KNAPSACK_MAX_UNITS)
+    size = int(math.floor(capacity / unit + 1e-9))
+    units = [int(math.ceil(w / unit - 1e-9)) for w in weights]
+
+    if np is not None:
+        taken = _knapsack_rows_numpy(units, values, size)
+    else:
+        best = [0.0] * (size + 1)
+        taken = []
+        for w, value in zip(units, values):
+            row = bytearray(size + 1)
+            if 0 < value and w <= size:
+                for c in range(size, w - 1, -1):
+                    candidate = best[c - w] + value
+                    if candidate > best[c]:
+                        best[c] = candidate
+                        row[c] = 1
+            taken.append(row)
+
+    chosen = []
+    c = size
+    for k in range(len(units) - 1, -1, -1):
+        if taken[k][c]:
+            chosen.append(k)
+            c -= units[k]
+    chosen.reverse()
+    return chosen
+
+
+def _knapsack_rows_numpy(units: List[int], values: Sequence[float], size: int) -> List:
+    """Her öğe için "alındı" satırları; kapasite ekseni tek vektör işlemiyle güncellenir."""
+    best = np.zeros(size + 1)
+    taken = []
+    for w, value in zip(units, values):
+        row = np.zeros(size + 1, dtype=bool)
+        if 0 < value and w <= size:
+            candidate = best[:size + 1 - w] + value
+            better = candidate > best[w:]
+            best[w:] = np.where(better, candidate, best[w:])
+            row[w:] = better
+        taken.append(row)
+    return taken
+
+
+def fractional_bound(weights: Sequence[float], values: Sequence[float], capacity: float) -> float:
+    """Toplam kapasiteli kesirli sırt çantası değeri (Dantzig üst sınırı)."""
+    bound = 0.0
+    remaining = capacity
+    ratio = sorted(
+        ((v / w if w > 0 else math.inf, w, v) for w, v in zip(weights, values) if v > 0),
+        reverse=True
+    )
+    for _, w, v in ratio:
+        if remaining <= 0:
+            break
+        take = min(1.0, remaining / w) if w > 0 else 1.0
+        bound += v * take
+        remaining -= w * take
+    return bound
+
+
+def select_cargos(cargos: List, capacities: Sequence[float],
+                  value: Optional[Callable] = None) -> Tuple[List, List, Dict]:
+    """
+    Kapasitelere (araç başına bir sefer) sığan en değerli kargo kümesi.
+
+    Args:
+        cargos: Cargo listesi (total_weight = ağırlık × adet kullanılır)
+        capacities: Araç kapasiteleri
+        value: Kargo değeri (None: priority verilmişse o, yoksa ağırlık)
+
+    Returns:
+        (taşınacak, ertelenen, {"value", "upper_bound", "carried_weight",
+        "deferred_weight", "bins"})
+    """
+    if value is None:
+        value = _default_value
+    values = [value(c) for c in cargos]
+    remaining = list(range(len(cargos)))
+    bins = []
+
+    # Eşit değerde ağır seçim: ağırlık, hiçbir değer farkını aşmayacak
+    # kadar küçük bir katsayıyla eklenir
+    positive = [v for v in values if v > 0]
+    tie = 1e-6 * min(positive, default=1.0) / max(sum(c.total_weight for c in cargos), 1.0)
+    scores = [v + tie * c.total_weight for v, c in zip(values, cargos)]
+
+    for capacity in sorted(capacities, reverse=True):
+        if not remaining:
+            break
+        chosen = knapsack([cargos[k].total_weight for k in remaining],
+                          [scores[k] for k in remaining], capacity)
+        packed = [remaining[k] for k in chosen]
+        bins.append({
+            "capacity": capacity,
+            "load": sum(cargos[k].total_weight for k in packed),
+            "cargo_ids": [cargos[k].id for k in packed],
+        })
+        packed_set = set(packed)
+        remaining = [k for k in remaining if k not in packed_set]
+
+    deferred_set = set(remaining)
+    selected = [c for k, c in enumerate(cargos) if k not in deferred_set]
+    deferred = [cargos[k] for k in remaining]
+    stats = {
+        "value": sum(values[k] for k in range(len(cargos)) if k not in deferred_set),
+        "upper_bound": fractional_bound([c.total_weight for c in cargos], values, sum(capacities)),
+        "carried_weight": sum(c.total_weight for c in selected),
+        "deferred_weight": sum(c.total_weight for c in deferred),
+        "bins": bins,
+    }
+    return selected, deferred, stats
+
+
+def _default_value(cargo) -> float:
+    """Öncelik puanı verilmişse o, yoksa ağırlık."""
+    priority = getattr(cargo, "priority", None)
+    return cargo.total_weight if priority is None else priority
@@ -0,0 +1,238 @@
+"""
+Mesafe Matrisi Dosyası (Bellek Eşlemeli)
+
+Binlerce istasyonda liste-listesi matris her gunicorn işçisinde onlarca
+MB tutar ve her açılışta yeniden kurulur. build_distance_artifact komutu
+matrisi bir kez derler ve sürümlü ikili dosyaya yazar:
+
+    [0:24)   önek: MAGIC, biçim, başlık uzunluğu, veri ofseti, (boş)
+    [24:..)  başlık (JSON): version, created_at, size, names, ids, lats, lons
+    [ofset)  size × size float32 (little-endian, satır düzeni; 0 = depo)
+
+İşçiler veriyi numpy.memmap ile açar; sayfalar işletim sisteminin sayfa
+önbelleğinden paylaşılır, işçi başına bellek ve açılış süresi ağ
+boyutundan bağımsız kalır. Dosya atomik olarak değiştirilir (os.replace);
+her matrix() çağrısında stat ile sürüm değişikliği yakalanıp dosya
+yeniden eşlenir. İstenen istasyonların id ve koordinatları Station
+tablosundakilerle karşılaştırılır; dosyada olmayan veya yazıldıktan
+sonra (hangi süreçte olursa olsun) değişen istasyonlar için yedek
+sağlayıcı kullanılır.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy yoksa mmap + memoryview ile okunur
+    np = None
+
+from .distance_providers import DistanceProvider, StationDistanceProvider, station_rows
+
+ARTIFACT_MAGIC = b"KDMX"
+ARTIFACT_FORMAT = 1
+ARTIFACT_PREFIX = struct.Struct("<4sHIQ6x")   # magic, biçim, başlık uzunluğu, veri ofseti
+ARTIFACT_ALIGN = 64                           # Veri bloğu hizası (bayt)
+
+
+def read_header(path: str) -> Tuple[Dict, int]:
+    """Dosya başlığı ve veri ofseti (veri okunmaz)."""
+    with open(path, "rb") as handle:
+        magic, fmt, header_len, offset = ARTIFACT_PREFIX.unpack(handle.read(ARTIFACT_PREFIX.size))
+        if magic != ARTIFACT_MAGIC or fmt != ARTIFACT_FORMAT:
+            raise ValueError(f"{path} mesafe matrisi dosyası değil (biçim {fmt})")
+        header = json.loads(handle.read(header_len).decode("utf-8"))
+    return header, offset
+
+
+def write_artifact(path: str, snapshot: Dict, version: Optional[int] = None) -> Dict:
+    """
+    StationDistanceProvider.snapshot() çıktısını dosyaya yaz.
+
+    Sürüm verilmezse mevcut dosyanınkinin bir fazlası olur. Önce geçici
+    dosyaya yazılır, sonra os.replace ile yerine konur; açık eşlemeler
+    eski dosyayı görmeye devam eder, sonraki stat yeni sürümü yakalar.
+
+    Returns:
+        Yazılan başlık
+    """
+    if version is None:
+        try:
+            version = read_header(path)[0]["version"] + 1
+        except (OSError, ValueError, KeyError):
+            version = 1
+
+    names = snapshot["names"]
+    size = len(names)
+    header = {
+        "version": version,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "size": size,
+        "dtype": "float32",
+        "names": names,
+        "ids": [snapshot["ids"].get(name) for name in names],
+        "lats": snapshot["lats"],
+        "lons": snapshot["lons"],
+    }
+    payload = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    offset = -(-(ARTIFACT_PREFIX.size + len(payload)) // ARTIFACT_ALIGN) * ARTIFACT_ALIGN
+
+    temp_path = f"{path}.tmp{os.getpid()}"
+    with open(temp_path, "wb") as handle:
+        handle.write(ARTIFACT_PREFIX.pack(ARTIFACT_MAGIC, ARTIFACT_FORMAT, len(payload), offset))
+        handle.write(payload)
+        handle.write(b"\0" * (offset - ARTIFACT_PREFIX.size - len(payload)))
+        if np is not None:
+            np.asarray(snapshot["matrix"], dtype="<f4").tofile(handle)
+        else:
+            cells = struct.Struct(f"<{size}f")
+            for row in snapshot["matrix"]:
+                handle.write(cells.pack(*row))
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temp_path, path)
+    return header
+
+
+class ArtifactDistanceProvider(DistanceProvider):
+    """
+    Bellek eşlemeli mesafe matrisi dosyasından sağlayıcı.
+
+    Args:
+        path: build_distance_artifact çıktısı (henüz yoksa yedek kullanılır)
+        fallback: Dosyada olmayan / sonradan değişen istasyonlar için
+    """
+
+    def __init__(self, path: str, fallback: Optional[DistanceProvider] = None):
+        self.path = path
+        self.fallback = fallback or StationDistanceProvider()
+        self.version: Optional[int] = None
+        self._lock = threading.RLock()
+        self._stat_key = None
+        self._close()
+
+    def _close(self) -> None:
+        self._data = None
+        self._mmap = None
+        self._size = 0
+        self._index: Dict[str, int] = {}
+        self._ids: List[Optional[int]] = []
+        self._points: List[Tuple[float, float]] = []
+        self._stale: Dict[str, bool] = {}   # İsim -> Station tablosu dosyadan farklı mı
+        self.version = None
+
+    def _open(self, header: Dict, offset: int) -> None:
+        size = header["size"]
+        if np is not None:
+            data = np.memmap(self.path, dtype="<f4", mode="r", offset=offset, shape=(size, size))
+            mapped = None
+        else:
+            with open(self.path, "rb") as handle:
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            data = memoryview(mapped)[offset:offset + 4 * size * size].cast("f")
+        self._close()
+        self._data = data
+        self._mmap = mapped
+        self._size = size
+        self._index = {name: k for k, name in enumerate(header["names"])}
+        self._ids = header["ids"]
+        self._points = list(zip(header["lats"], header["lons"]))
+        self.version = header["version"]
+
+    def refresh(self) -> bool:
+        """Dosya değiştiyse yeniden eşle; kullanılabilir bir dosya varsa True."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            with self._lock:
+                self._stat_key = None
+                self._close()
+            return False
+
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if key == self._stat_key:
+            return self._data is not None
+        with self._lock:
+            if key != self._stat_key:
+                try:
+                    header, offset = read_header(self.path)
+                    if header["version"] != self.version:
+                        self._open(header, offset)
+                except (OSError, ValueError, KeyError):
+                    self._close()
+                self._stat_key = key
+            return self._data is not None
+
+    def prepare(self) -> None:
+        if not self.refresh():
+            self.fallback.prepare()
+
+    def cache_token(self) -> Optional[int]:
+        return self.version if self.refresh() else None
+
+    def _check_stations(self, names: Sequence[str]) -> None:
+        """
+        names'in Station kayıtlarını dosya başlığıyla karşılaştır.
+
+        id'si veya koordinatı farklı olan, dosyada olmayan ya da dosyadaki
+        id'siyle artık bulunmayan istasyonlar bayatlamış sayılır; yedek
+        sağlayıcı başka süreçteki değişikliği görmemiş olabileceğinden
+        tablodaki koordinatla güncellenir. Veritabanına ulaşılamazsa
+        dosyadaki istasyonlar geçerli kabul edilir.
+        """
+        rows = station_rows(names)
+        if rows is None:
+            self._stale.update((name, name not in self._index) for name in names)
+            return
+        found = set()
+        for station_id, name, lat, lon in rows:
+            found.add(name)
+            k = self._index.get(name)
+            stale = k is None or self._ids[k] != station_id or self._points[k] != (lat, lon)
+            if stale and self.fallback.locate(name) != (lat, lon):
+                self.fallback.add_station(name, lat, lon, station_id)
+            self._stale[name] = stale
+        for name in names:
+            if name in found:
+                continue
+            k = self._index.get(name)
+            self._stale[name] = k is None or self._ids[k] is not None
+            if k is not None and self._ids[k] is not None and self.fallback.locate(name) == self._points[k]:
+                self.fallback.remove_station(name, self._ids[k])
+
+    def add_station(self, name: str, latitude: float, longitude: float,
+                    station_id: Optional[int] = None) -> None:
+        self.fallback.add_station(name, latitude, longitude, station_id)
+
+    def remove_station(self, name: str, station_id: Optional[int] = None) -> None:
+        self.fallback.remove_station(name, station_id)
+
+    def matrix(self, names: Sequence[str]) -> List[List[float]]:
+        if not self.refresh():
+            return self.fallback.matrix(names)
+        with self._lock:
+            self._check_stations(list(set(names)))
+            if any(self._stale[name] for name in names):
+                return self.fallback.matrix(names)
+            index = self._index
+            rows = [0] + [index[name] for name in names]
+            data = self._data
+            if np is not None:
+                # Değerler 0.1 km çözünürlükte yazıldı; float32 kırıntısı atılır
+                return np.round(data[np.ix_(rows, rows)].astype(np.float64), 1).tolist()
+            size = self._size
+            return [[round(data[a * size + b], 1) for b in rows] for a in rows]
+
+    def locate(self, name: str) -> Optional[Tuple[float, float]]:
+        if self.refresh():
+            with self._lock:
+                if name not in self._stale:
+                    self._check_stations([name])
+                if not self._stale[name]:
+                    return tuple(self._points[self._index[name]])
+        return self.fallback.locate(name)
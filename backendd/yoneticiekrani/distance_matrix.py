@@ -17,6 +17,8 @@ Google Maps'ten alınan gerçek yol mesafeleri.
 11: Başiskele
 """
 
+import math
+
 # İlçe isimleri ve indeksleri
 DISTRICTS = [
     "İzmit",      # 0 - Merkez (Umuttepe burada)
@@ -89,27 +91,72 @@ DEPOT_DISTANCES = {
 }
 
 
-def get_distance(from_district: str, to_district: str) -> float:
-    """İki ilçe arasındaki mesafeyi döndürür."""
+# İlçe adı -> indeks (DISTRICTS.index() taramasından kaçınmak için)
+DISTRICT_INDEX = {name: idx for idx, name in enumerate(DISTRICTS)}
+
+# Yol mesafesi bilinmeyen çiftler için kuş uçuşu -> yol katsayısı
+# (yukarıdaki 78 bilinen çiftin yol / haversine oranlarının medyanı)
+ROAD_DETOUR_FACTOR = 1.22
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(a: tuple, b: tuple) -> float:
+    """İki (enlem, boylam) noktası arasındaki büyük daire mesafesi (km)."""
+    lat1, lon1 = math.radians(a[0]), math.radians(a[1])
+    lat2, lon2 = math.radians(b[0]), math.radians(b[1])
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+def known_distance(from_district: str, to_district: str):
+    """Elle girilmiş yol mesafesi; çift tabloda yoksa None."""
+    if from_district == to_district:
+        return 0
     if from_district == DEPOT_NAME:
-        return DEPOT_DISTANCES.get(to_district, 0)
+        return DEPOT_DISTANCES.get(to_district)
     if to_district == DEPOT_NAME:
-        return DEPOT_DISTANCES.get(from_district, 0)
-    
-    try:
-        i = DISTRICTS.index(from_district)
-        j = DISTRICTS.index(to_district)
-        return DISTANCE_MATRIX[i][j]
-    except (ValueError, IndexError):
-        return 0
+        return DEPOT_DISTANCES.get(from_district)
+
+    i = DISTRICT_INDEX.get(from_district)
+    j = DISTRICT_INDEX.get(to_district)
+    if i is None or j is None:
+        return None
+    return DISTANCE_MATRIX[i][j]
+
+
+def get_distance(from_district: str, to_district: str) -> float:
+    """
+    İki ilçe arasındaki mesafeyi döndürür.
+
+    Tabloda olmayan çift için koordinatlardan haversine × ROAD_DETOUR_FACTOR
+    kullanılır; koordinatı da bilinmeyen isim KeyError verir (sessizce 0
+    dönmek yeni istasyonu bedava gösteriyordu).
+    """
+    known = known_distance(from_district, to_district)
+    if known is not None:
+        return known
+    points = [DEPOT_COORDS if name == DEPOT_NAME else DISTRICT_COORDS.get(name)
+              for name in (from_district, to_district)]
+    if None in points:
+        raise KeyError(f"Mesafe bilinmiyor: {from_district} -> {to_district}")
+    return round(haversine_km(*points) * ROAD_DETOUR_FACTOR, 1)
 
 
 def get_district_index(name: str) -> int:
     """İlçe adından indeks döndürür."""
-    try:
-        return DISTRICTS.index(name)
-    except ValueError:
-        return -1
+    return DISTRICT_INDEX.get(name, -1)
+
+
+def build_distance_matrix(names: list) -> list:
+    """
+    Verilen istasyonlar için depolu birleşik mesafe matrisi oluşturur.
+
+    0. satır/sütun Umuttepe (depo), 1..n satır/sütunlar names sırasıyla
+    istasyonlardır. Çözücü isimlerle değil bu matristeki indekslerle çalışır.
+    """
+    nodes = [DEPOT_NAME] + list(names)
+    return [[get_distance(a, b) if a != b else 0 for b in nodes] for a in nodes]
 
 
 def get_all_distances_from_depot() -> dict:
@@ -0,0 +1,499 @@
+"""
+Mesafe Sağlayıcıları
+
+Çözücü mesafe ve koordinatları bir sağlayıcıdan alır:
+
+    matrix(names) -> depolu birleşik matris (0: Umuttepe, 1..n: names)
+    locate(name)  -> (enlem, boylam) veya None (bilinmiyorsa)
+    planar_points(names) -> mekânsal indeks için düzlem koordinatları (km)
+
+Django uygulaması açılışta StationDistanceProvider'ı süreç varsayılanı
+yapar (apps.py): Station tablosundaki her istasyon için bilinen yol
+mesafesi, yoksa haversine × ROAD_DETOUR_FACTOR. Django dışında varsayılan
+Kocaeli ilçelerinin elle girilmiş matrisidir (distance_matrix.py).
+Kıyaslama örnekleri gibi başka ağlar çözücüye distance_provider
+argümanıyla veya set_distance_provider ile süreç genelinde verilir.
+"""
+
+import math
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy yoksa satırlar saf Python ile hesaplanır
+    np = None
+
+from .distance_matrix import (
+    DEPOT_COORDS,
+    DEPOT_NAME,
+    DISTRICT_COORDS,
+    DISTRICTS,
+    EARTH_RADIUS_KM,
+    ROAD_DETOUR_FACTOR,
+    build_distance_matrix,
+    haversine_km,
+    known_distance,
+)
+from .spatial_index import project
+
+KNOWN_NAMES = [DEPOT_NAME] + DISTRICTS   # Elle girilmiş yol mesafesi olan düğümler
+MAX_SNAP_KM = 2.0   # İstasyon yol ağına en fazla bu kadar uzaksa ağa bağlanır
+
+
+class DistanceProvider:
+    """Sağlayıcı arayüzü."""
+
+    geographic = True   # locate() (enlem, boylam) döndürür; False: düzlem (x, y)
+
+    def matrix(self, names: Sequence[str]) -> List[List[float]]:
+        """names için depolu birleşik mesafe matrisi (km)."""
+        raise NotImplementedError
+
+    def locate(self, name: str) -> Optional[Tuple[float, float]]:
+        """İstasyon koordinatı (bilinmiyorsa None)."""
+        return None
+
+    def coords(self, name: str) -> Tuple[float, float]:
+        """İstasyon koordinatı (bilinmiyorsa (0, 0))."""
+        return self.locate(name) or (0.0, 0.0)
+
+    def planar_points(self, names: Sequence[str]) -> Optional[List[Tuple[float, float]]]:
+        """Mekânsal indeks için düzlem koordinatları (km); biri bilinmiyorsa None."""
+        points = []
+        for name in names:
+            point = self.locate(name)
+            if point is None:
+                return None
+            points.append(project(*point) if self.geographic else tuple(point))
+        return points
+
+    def prepare(self) -> None:
+        """Süreç havuzu açılmadan önce çağrılır; işçiler hazır veriyi devralır."""
+
+    def cache_token(self):
+        """Rota önbelleği anahtarına katılan veri sürümü (ör. matris dosyası); varsayılan: yok."""
+        return None
+
+    def add_station(self, name: str, latitude: float, longitude: float,
+                    station_id: Optional[int] = None) -> None:
+        """İstasyon eklendi / güncellendi (signals.py); varsayılan: yok say."""
+
+    def remove_station(self, name: str, station_id: Optional[int] = None) -> None:
+        """İstasyon silindi (signals.py); varsayılan: yok say."""
+
+
+class DistrictDistanceProvider(DistanceProvider):
+    """Elle girilmiş ilçe matrisi (distance_matrix.py)."""
+
+    def matrix(self, names: Sequence[str]) -> List[List[float]]:
+        return build_distance_matrix(list(names))
+
+    def locate(self, name: str) -> Optional[Tuple[float, float]]:
+        if name == DEPOT_NAME:
+            return DEPOT_COORDS
+        return DISTRICT_COORDS.get(name)
+
+
+class MatrixDistanceProvider(DistanceProvider):
+    """
+    Hazır tam matristen sağlayıcı (kıyaslama örnekleri, CVRPLIB).
+
+    Args:
+        names: Matris sırasıyla istasyon isimleri (depo hariç)
+        matrix: (n+1)×(n+1) matris; 0. satır/sütun depo
+        coords: {isim: (x, y)} düzlem koordinatları (isteğe bağlı)
+    """
+
+    geographic = False
+
+    def __init__(self, names: Sequence[str], matrix: Sequence[Sequence[float]],
+                 coords: Dict[str, Tuple[float, float]] = None):
+        self.index = {DEPOT_NAME: 0}
+        self.index.update({name: i for i, name in enumerate(names, start=1)})
+        self.full = matrix
+        self.points = coords or {}
+
+    def matrix(self, names: Sequence[str]) -> List[List[float]]:
+        rows = [0] + [self.index[name] for name in names]
+        full = self.full
+        return [[float(full[a][b]) if a != b else 0.0 for b in rows] for a in rows]
+
+    def locate(self, name: str) -> Optional[Tuple[float, float]]:
+        if name == DEPOT_NAME:
+            return (0.0, 0.0)   # Kıyaslama örneklerinde depo orijindedir
+        return self.points.get(name)
+
+
+def haversine_rows(lats, lons, to_lats, to_lons):
+    """
+    (lats, lons) noktalarından (to_lats, to_lons) noktalarına haversine
+    mesafeleri (km, len(lats) × len(to_lats)); NumPy dizileriyle tek
+    vektör işlemi.
+    """
+    lat1 = np.radians(np.asarray(lats, dtype=float))[:, None]
+    lon1 = np.radians(np.asarray(lons, dtype=float))[:, None]
+    lat2 = np.radians(np.asarray(to_lats, dtype=float))[None, :]
+    lon2 = np.radians(np.asarray(to_lons, dtype=float))[None, :]
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def station_rows(names: Optional[Sequence[str]] = None) -> Optional[List[Tuple]]:
+    """Station tablosundan (id, isim, enlem, boylam); veritabanına ulaşılamazsa None."""
+    from django.db import DatabaseError
+    from .models import Station   # Çözücü modülleri Django'suz da içe aktarılabilsin
+
+    queryset = Station.objects.all()
+    if names is not None:
+        queryset = queryset.filter(name__in=list(names))
+    try:
+        return list(queryset.values_list("id", "name", "latitude", "longitude"))
+    except DatabaseError:
+        return None
+
+
+class StationDistanceProvider(DistanceProvider):
+    """
+    Station tablosundan kurulan mesafe matrisi.
+
+    Yol ağı (road_network, ROAD_NETWORK_PATH) verilmişse her istasyon en
+    yakın ağ düğümüne bağlanır ve mesafe = bağlantı + en kısa yol +
+    bağlantı olur; elle girilmiş tablo bu durumda kullanılmaz. Ağ yoksa
+    iki uç da elle girilmiş tabloda olan çiftler (ilçeler ve Umuttepe)
+    için o tablo kullanılır. Ağa bağlanamayan (MAX_SNAP_KM'den uzak veya
+    ulaşılamayan) çiftler için haversine × ROAD_DETOUR_FACTOR (0.1 km'ye
+    yuvarlı) kullanılır. Depo dahil tam matris bellekte tutulur: tablo ilk
+    kullanımda tek sorguyla okunur, sonra istasyon eklenince / silinince
+    (signals.py) yalnızca o istasyonun satırı ve sütunu hesaplanır.
+    Başka bir süreçte eklenmiş ve burada henüz bilinmeyen istasyonlar
+    matrix() çağrısında veritabanından tamamlanır.
+
+    Args:
+        rows: (id, isim, enlem, boylam) listesi; verilirse veritabanı
+              okunmaz (komutlar ve kıyaslamalar için)
+        network: Ön işlenmiş yol ağı (RoadNetwork)
+        network_path: Yol ağı dosyası; ilk kullanımda okunur
+    """
+
+    INITIAL_CAPACITY = 64   # NumPy matrisi dolunca iki katına büyür
+
+    def __init__(self, rows: Optional[Iterable[Tuple]] = None, network=None,
+                 network_path: Optional[str] = None):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._network = network
+        self._network_path = network_path
+        self._reset()
+        if rows is not None:
+            self.load(rows)
+
+    # --------------------------------------------
+    # Yükleme
+    # --------------------------------------------
+
+    def _reset(self) -> None:
+        self._names: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._ids: Dict[int, str] = {}
+        self._lats: List[float] = []
+        self._lons: List[float] = []
+        self._snaps: List[Optional[Tuple[int, float]]] = []   # (ağ düğümü, bağlantı km)
+        self._dist = np.zeros((0, 0)) if np is not None else []
+
+    def road_network(self):
+        """Yol ağı (yoksa None); dosyadan ilk çağrıda okunur."""
+        if self._network is None and self._network_path:
+            from .road_network import RoadNetwork
+            self._network = RoadNetwork.load(self._network_path)
+        return self._network
+
+    def _snap(self, k: int) -> Optional[Tuple[int, float]]:
+        node, km = self.road_network().nearest(self._lats[k], self._lons[k])
+        if km > MAX_SNAP_KM:
+            return None
+        return node, km * ROAD_DETOUR_FACTOR
+
+    def _road_overlay(self, rows: Sequence[int], cols: Sequence[int]) -> None:
+        """rows × cols hücrelerini yol ağından yaz; ağa bağlanamayan uçlar haversine'de kalır."""
+        rows = [i for i in rows if self._snaps[i] is not None]
+        cols = [j for j in cols if self._snaps[j] is not None]
+        if not rows or not cols:
+            return
+        km, _ = self.road_network().many_to_many(
+            [self._snaps[i][0] for i in rows], [self._snaps[j][0] for j in cols]
+        )
+        if np is not None:
+            block = np.ix_(rows, cols)
+            total = (np.asarray(km) + np.array([self._snaps[i][1] for i in rows])[:, None]
+                     + np.array([self._snaps[j][1] for j in cols])[None, :])
+            self._dist[block] = np.where(np.isfinite(total), np.round(total, 1), self._dist[block])
+        else:
+            for a, i in enumerate(rows):
+                for b, j in enumerate(cols):
+                    if not math.isinf(km[a][b]):
+                        self._dist[i][j] = round(self._snaps[i][1] + km[a][b] + self._snaps[j][1], 1)
+        for i in set(rows).intersection(cols):
+            self._dist[i][i] = 0.0
+
+    def load(self, rows: Iterable[Tuple]) -> None:
+        """Matrisi baştan kur: ilçeler + verilen istasyonlar (aynı isimde istasyon koordinatı geçerli)."""
+        points: Dict[str, Tuple[float, float]] = {DEPOT_NAME: DEPOT_COORDS}
+        points.update(DISTRICT_COORDS)
+        ids: Dict[int, str] = {}
+        for station_id, name, lat, lon in rows:
+            if name == DEPOT_NAME:
+                continue
+            points[name] = (float(lat), float(lon))
+            if station_id is not None:
+                ids[station_id] = name
+
+        with self._lock:
+            self._reset()
+            self._ids = ids
+            self._names = list(points)
+            self._index = {name: k for k, name in enumerate(self._names)}
+            self._lats = [points[name][0] for name in self._names]
+            self._lons = [points[name][1] for name in self._names]
+            size = len(self._names)
+
+            if np is not None:
+                capacity = max(self.INITIAL_CAPACITY, size)
+                self._dist = np.zeros((capacity, capacity))
+                self._dist[:size, :size] = np.round(
+                    haversine_rows(self._lats, self._lons, self._lats, self._lons) * ROAD_DETOUR_FACTOR, 1
+                )
+                np.fill_diagonal(self._dist, 0.0)
+            else:
+                self._dist = [
+                    [round(haversine_km(a, b) * ROAD_DETOUR_FACTOR, 1) if i != j else 0.0
+                     for j, b in enumerate(zip(self._lats, self._lons))]
+                    for i, a in enumerate(zip(self._lats, self._lons))
+                ]
+
+            self._snaps = [None] * size
+            if self.road_network() is not None:
+                self._snaps = [self._snap(k) for k in range(size)]
+                self._road_overlay(range(size), range(size))
+            else:
+                known = [(name, self._index[name]) for name in KNOWN_NAMES if name in self._index]
+                for a, i in known:
+                    for b, j in known:
+                        value = known_distance(a, b)
+                        if value is not None:
+                            self._dist[i][j] = value
+            self._loaded = True
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            rows = station_rows()
+            if rows is None:
+                # Veritabanına ulaşılamadı (ör. komut satırı araçları):
+                # ilçelerle devam, sonraki çağrıda yeniden denenir
+                self.load([])
+                self._loaded = False
+            else:
+                self.load(rows)
+
+    def prepare(self) -> None:
+        self._ensure_loaded()
+
+    def snapshot(self) -> Dict:
+        """Yüklü matrisin kopyası (distance_artifact için): names, ids, lats, lons, matrix."""
+        self._ensure_loaded()
+        with self._lock:
+            size = len(self._names)
+            if np is not None:
+                matrix = self._dist[:size, :size].copy()
+            else:
+                matrix = [list(row) for row in self._dist]
+            return {
+                "names": list(self._names),
+                "ids": {name: station_id for station_id, name in self._ids.items()},
+                "lats": list(self._lats),
+                "lons": list(self._lons),
+                "matrix": matrix,
+            }
+
+    # --------------------------------------------
+    # Artımlı güncelleme
+    # --------------------------------------------
+
+    def _compute_row(self, k: int) -> None:
+        """k. düğümün satırını ve sütununu yeniden hesapla."""
+        point = (self._lats[k], self._lons[k])
+        size = len(self._names)
+        if np is not None:
+            row = np.round(
+                haversine_rows([point[0]], [point[1]], self._lats, self._lons)[0] * ROAD_DETOUR_FACTOR, 1
+            )
+            row[k] = 0.0
+            self._dist[k, :size] = row
+            self._dist[:size, k] = row
+        else:
+            row = [round(haversine_km(point, (lat, lon)) * ROAD_DETOUR_FACTOR, 1)
+                   for lat, lon in zip(self._lats, self._lons)]
+            row[k] = 0.0
+            self._dist[k] = row
+            for j in range(size):
+                self._dist[j][k] = row[j]
+
+        if self.road_network() is not None:
+            self._snaps[k] = self._snap(k)
+            self._road_overlay([k], range(size))
+            self._road_overlay(range(size), [k])
+            return
+
+        name = self._names[k]
+        for other in KNOWN_NAMES:
+            j = self._index.get(other)
+            if j is None:
+                continue
+            forward = known_distance(name, other)
+            if forward is not None:
+                self._dist[k][j] = forward
+            backward = known_distance(other, name)
+            if backward is not None:
+                self._dist[j][k] = backward
+
+    def _append(self, name: str, lat: float, lon: float) -> None:
+        k = len(self._names)
+        self._names.append(name)
+        self._index[name] = k
+        self._lats.append(lat)
+        self._lons.append(lon)
+        self._snaps.append(None)
+        if np is not None:
+            if k >= self._dist.shape[0]:
+                grown = np.zeros((2 * k, 2 * k))
+                grown[:k, :k] = self._dist[:k, :k]
+                self._dist = grown
+        else:
+            for row in self._dist:
+                row.append(0.0)
+            self._dist.append([0.0] * (k + 1))
+        self._compute_row(k)
+
+    def _remove(self, name: str) -> None:
+        """İsmi sil; son düğüm boşalan yere taşınır (yalnızca bir satır / sütun kopyalanır)."""
+        k = self._index.pop(name)
+        last = len(self._names) - 1
+        if k != last:
+            moved = self._names[last]
+            self._names[k] = moved
+            self._index[moved] = k
+            self._lats[k] = self._lats[last]
+            self._lons[k] = self._lons[last]
+            self._snaps[k] = self._snaps[last]
+            if np is not None:
+                self._dist[k, :last + 1] = self._dist[last, :last + 1]
+                self._dist[:last + 1, k] = self._dist[:last + 1, last]
+                self._dist[k, k] = 0.0
+            else:
+                self._dist[k] = self._dist[last]
+                for row in self._dist:
+                    row[k] = row[last]
+                self._dist[k][k] = 0.0
+        self._names.pop()
+        self._lats.pop()
+        self._lons.pop()
+        self._snaps.pop()
+        if np is None:
+            self._dist.pop()
+            for row in self._dist:
+                row.pop()
+
+    def add_station(self, name: str, latitude: float, longitude: float,
+                    station_id: Optional[int] = None) -> None:
+        """İstasyon eklendi / güncellendi: yalnızca onun satırı hesaplanır."""
+        if name == DEPOT_NAME:
+            return
+        with self._lock:
+            if not self._loaded:
+                return   # İlk yükleme zaten güncel tabloyu okuyacak
+            old = self._ids.get(station_id) if station_id is not None else None
+            if old is not None and old != name:
+                self._drop(old)
+            if station_id is not None:
+                self._ids[station_id] = name
+            k = self._index.get(name)
+            if k is None:
+                self._append(name, float(latitude), float(longitude))
+            else:
+                self._lats[k], self._lons[k] = float(latitude), float(longitude)
+                self._compute_row(k)
+
+    def remove_station(self, name: str, station_id: Optional[int] = None) -> None:
+        """İstasyon silindi: ilçeyse tablo koordinatına döner, değilse satırı kalkar."""
+        with self._lock:
+            if not self._loaded:
+                return
+            if station_id is not None:
+                name = self._ids.pop(station_id, name)
+            self._drop(name)
+
+    def _drop(self, name: str) -> None:
+        if name == DEPOT_NAME or name not in self._index:
+            return
+        if name in DISTRICT_COORDS:
+            k = self._index[name]
+            self._lats[k], self._lons[k] = DISTRICT_COORDS[name]
+            self._compute_row(k)
+        else:
+            self._remove(name)
+
+    # --------------------------------------------
+    # Sağlayıcı arayüzü
+    # --------------------------------------------
+
+    def matrix(self, names: Sequence[str]) -> List[List[float]]:
+        self._ensure_loaded()
+        with self._lock:
+            missing = [name for name in set(names) if name not in self._index]
+            if missing:
+                for station_id, name, lat, lon in station_rows(missing) or []:
+                    self._ids[station_id] = name
+                    if name not in self._index:
+                        self._append(name, float(lat), float(lon))
+                unknown = sorted(name for name in missing if name not in self._index)
+                if unknown:
+                    raise KeyError(f"Koordinatı bilinmeyen istasyon: {', '.join(unknown)}")
+
+            rows = [0] + [self._index[name] for name in names]
+            if np is not None:
+                return self._dist[np.ix_(rows, rows)].tolist()
+            return [[self._dist[a][b] for b in rows] for a in rows]
+
+    def locate(self, name: str) -> Optional[Tuple[float, float]]:
+        self._ensure_loaded()
+        k = self._index.get(name)
+        if k is None:
+            return None
+        return (self._lats[k], self._lons[k])
+
+
+def road_network_path() -> Optional[str]:
+    """Ayarlardaki ROAD_NETWORK_PATH; dosya yoksa None."""
+    from django.conf import settings
+
+    path = getattr(settings, "ROAD_NETWORK_PATH", None)
+    return str(path) if path and os.path.exists(path) else None
+
+
+_default_provider: DistanceProvider = DistrictDistanceProvider()
+
+
+def get_distance_provider() -> DistanceProvider:
+    """Süreç genelinde varsayılan sağlayıcı."""
+    return _default_provider
+
+
+def set_distance_provider(provider: DistanceProvider) -> None:
+    """Varsayılan sağlayıcıyı değiştir (None: ilçe matrisine dön)."""
+    global _default_provider
+    _default_provider = provider or DistrictDistanceProvider()
@@ -0,0 +1,339 @@
+"""
+Kesin Çözücü (Branch-and-Bound)
+
+Küçük örnekler (12 ziyarete kadar) için kapasiteli açık VRP'nin kesin
+optimumu. Sezgisel çözücülerin optimumdan ne kadar uzak olduğunu
+ölçmek için kullanılır.
+
+1. Rota kümesi DP'si: Held-Karp tablosundan her alt küme S için
+       c(S)  = S'yi gezip depoda biten en kısa açık yolun yakıtı (ilk sefer)
+       c'(S) = min_j d(depo, j) + yol(S, j'den başlayarak) (ek sefer)
+   Bir aracın seferlerinden biri boş gidişsizdir; diğerleri c'(S) öder,
+   bu yüzden her plan "ilk sefer / ek sefer" ayrımıyla tam fiyatlanır.
+2. Gevşetme: g(M) = M'yi filo kısıtı olmadan, sadece kapasiteye uygun
+   rotalarla bölmenin en küçük maliyeti (alt küme DP'si, O(3^n)).
+3. Dal ve sınır: en küçük indeksli atanmamış ziyareti içeren rota
+   seçilerek dallanılır; kısmi maliyet + g(kalan) en iyi çözümden
+   büyükse dal budanır.
+4. Yaprak: rotaların araçlara en ucuz ataması. Kullanılan araç kümesi
+   sayılır; ilk seferler iç içe kapasite yapısında açgözlü (matroid)
+   eşleştirme ile seçilir, kalan rotalar ek sefer olur.
+
+Başlangıç üst sınırı Clarke-Wright çözümüdür; süre dolarsa o ana kadar
+bulunan en iyi plan "kanıtlanmamış" olarak döner.
+"""
+
+import math
+import time
+from dataclasses import replace
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+from .bounds import gap_percent
+from .held_karp import held_karp_table
+from .local_search import deadline_from_budget, time_is_up
+from .routing_algorithm import ClarkeWrightVRP, RoutingResult
+
+EPSILON = 1e-6
+
+
+def _matchable(loads: List[float], capacities: List[float]) -> bool:
+    """Azalan sıralı yükler azalan sıralı kapasitelere tek tek sığıyor mu?"""
+    if len(loads) > len(capacities):
+        return False
+    return all(load <= capacity for load, capacity in zip(loads, capacities))
+
+
+class ExactVRP(ClarkeWrightVRP):
+    """Küçük örnekler için dal ve sınır ile kesin çözücü."""
+
+    MAX_EXACT_NODES = 12          # Bu ziyaret sayısının üstünde sezgisele düşülür
+    EXACT_TIME_LIMIT_MS = 30000   # Varsayılan arama süresi
+
+    def solve(self, allow_rental: bool = True, allow_multi_trip: bool = True,
+              time_budget_ms: Optional[float] = None,
+              time_limit_ms: Optional[float] = None,
+              max_vehicles: Optional[int] = None,
+              departure_time=None) -> RoutingResult:
+        """
+        Args:
+            time_budget_ms: Başlangıç (Clarke-Wright) çözümünün iyileştirme bütçesi
+            time_limit_ms: Dal ve sınır için süre (None: EXACT_TIME_LIMIT_MS)
+            max_vehicles: En fazla araç sayısı (kiralık dahil)
+            departure_time: Kalkış saati (saate bağlı sürelerde sezgisel sonuç döner)
+        """
+        if not self.cargos:
+            return RoutingResult(success=True, message="Taşınacak kargo bulunmuyor.")
+
+        self._set_departure(departure_time)
+        started = time.perf_counter()
+        allow_rental = self._limit_fleet(max_vehicles, allow_rental, allow_multi_trip)
+        self.allow_rental = allow_rental
+        self.allow_multi_trip = allow_multi_trip
+        template = self._prepare_result(allow_rental)
+
+        sequenced, unassigned = self._construct(allow_rental, allow_multi_trip, time_budget_ms)
+        heuristic = self._finish_result(
+            replace(template, warnings=list(template.warnings),
+                    unassigned_cargos=list(template.unassigned_cargos)),
+            sequenced, unassigned
+        )
+        stats = {"heuristic_cost": heuristic.total_cost, "proven_optimal": False}
+
+        if len(self.nodes) > self.MAX_EXACT_NODES:
+            heuristic.warnings.append(
+                f"Kesin çözüm yapılamadı ({len(self.nodes)} ziyaret, "
+                f"en fazla {self.MAX_EXACT_NODES}); sezgisel sonuç döndü"
+            )
+            heuristic.search_stats = stats
+            return heuristic
+        if self.time_constrained or self.travel_times is not None:
+            heuristic.warnings.append("Zaman pencereli / saate bağlı örneklerde kesin çözüm yok; sezgisel sonuç döndü")
+            heuristic.search_stats = stats
+            return heuristic
+        if unassigned:
+            heuristic.warnings.append("Filo tüm ziyaretleri taşıyamıyor; sezgisel sonuç döndü")
+            heuristic.search_stats = stats
+            return heuristic
+
+        if time_limit_ms is None:
+            time_limit_ms = self.EXACT_TIME_LIMIT_MS
+        self._deadline = deadline_from_budget(time_limit_ms)
+        self._build_tables()
+
+        self._best_cost = heuristic.total_cost + EPSILON
+        self._best_plan: Optional[List[Tuple[Dict, List[int]]]] = None
+        self._explored = 0
+        self._timed_out = False
+        full = (1 << len(self.nodes)) - 1
+        self._branch(full, [], 0.0)
+
+        stats.update({
+            "root_bound": self._relaxed[full],
+            "nodes_explored": self._explored,
+            "proven_optimal": not self._timed_out,
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+        })
+
+        if self._best_plan is None:
+            result = heuristic
+        else:
+            result = self._finish_result(template, self._sequence_trips(self._best_plan), [])
+
+        if not self._timed_out:
+            result.lower_bound = result.total_cost
+        else:
+            result.lower_bound = max(result.lower_bound, self._relaxed[full])
+        result.gap_percent = gap_percent(result.total_cost, result.lower_bound)
+        result.search_stats = stats
+        return result
+
+    # ============================================
+    # ROTA KÜMESİ DP'Sİ
+    # ============================================
+
+    def _build_tables(self) -> None:
+        """Tüm alt kümeler için yük, c(S), c'(S) ve gevşetme g(M) tabloları."""
+        nodes = self.nodes
+        n = len(nodes)
+        size = 1 << n
+        depot_row = self.dist[self.DEPOT]
+        capacity = self._max_capacity(self.allow_rental)
+        fuel = self.FUEL_COST_PER_KM
+
+        self._dp, self._parent = held_karp_table(nodes, self.dist, self.DEPOT)
+        self._load = [0.0] * size
+        self._first = [math.inf] * size
+        self._first_start = [-1] * size
+        self._extra = [math.inf] * size
+        self._extra_start = [-1] * size
+
+        for mask in range(1, size):
+            low = (mask & -mask).bit_length() - 1
+            self._load[mask] = self._load[mask & (mask - 1)] + self.demand[nodes[low]]
+            if self._load[mask] > capacity:
+                continue
+            row = self._dp[mask]
+            for j in range(n):
+                if not mask >> j & 1:
+                    continue
+                first = row[j] * fuel
+                if first < self._first[mask]:
+                    self._first[mask], self._first_start[mask] = first, j
+                extra = (depot_row[nodes[j]] + row[j]) * fuel
+                if extra < self._extra[mask]:
+                    self._extra[mask], self._extra_start[mask] = extra, j
+
+        # En küçük bitine göre gruplanmış, c(S)'ye göre sıralı uygun rotalar
+        self._blocks: List[List[int]] = [[] for _ in range(n)]
+        for mask in range(1, size):
+            if self._first[mask] < math.inf:
+                self._blocks[(mask & -mask).bit_length() - 1].append(mask)
+        for blocks in self._blocks:
+            blocks.sort(key=self._first.__getitem__)
+
+        # g(M): en küçük biti içeren rota + kalan (alt küme DP'si)
+        relaxed = [math.inf] * size
+        relaxed[0] = 0.0
+        for mask in range(1, size):
+            low = mask & -mask
+            rest = mask ^ low
+            best = math.inf
+            sub = rest
+            while True:
+                block = sub | low
+                cost = self._first[block] + relaxed[mask ^ block]
+                if cost < best:
+                    best = cost
+                if sub == 0:
+                    break
+                sub = (sub - 1) & rest
+            relaxed[mask] = best
+        self._relaxed = relaxed
+
+    def _route_order(self, mask: int, start: int) -> List[int]:
+        """DP tablosundan start'tan başlayan sırayı geri oku."""
+        order = []
+        j = start
+        while j != -1:
+            order.append(self.nodes[j])
+            next_j = self._parent[mask][j]
+            mask ^= 1 << j
+            j = next_j
+        return order
+
+    # ============================================
+    # DAL VE SINIR
+    # ============================================
+
+    def _branch(self, rest: int, chosen: List[int], partial: float) -> None:
+        """Kalan ziyaretleri rotalara bölerek dallan."""
+        self._explored += 1
+        if self._explored % 1024 == 0 and time_is_up(self._deadline):
+            self._timed_out = True
+        if self._timed_out:
+            return
+
+        if rest == 0:
+            cost, plan = self._assign(chosen)
+            if plan is not None and cost < self._best_cost - EPSILON:
+                self._best_cost, self._best_plan = cost, plan
+            return
+
+        low = (rest & -rest).bit_length() - 1
+        for block in self._blocks[low]:
+            if block & ~rest:
+                continue
+            remaining = rest ^ block
+            cost = partial + self._first[block]
+            if cost + self._relaxed[remaining] >= self._best_cost - EPSILON:
+                continue
+            chosen.append(block)
+            self._branch(remaining, chosen, cost)
+            chosen.pop()
+
+    def _assign(self, blocks: List[int]) -> Tuple[float, Optional[List[Tuple[Dict, List[int]]]]]:
+        """
+        Rotaların araçlara en ucuz ataması.
+
+        Kullanılan her araç tam bir ilk sefer yapar. Ek seferler c'(S)
+        öder; bu yüzden ilk sefer olarak c'(S) - c(S) tasarrufu en büyük
+        rotalar seçilir. İç içe kapasite yapısında "eşleştirilebilir
+        kümeler" bir matroid olduğu için açgözlü seçim optimaldir.
+
+        Returns:
+            (maliyet, [(araç, rota), ...]) - uygun atama yoksa (inf, None)
+        """
+        loads = [self._load[block] for block in blocks]
+        owned = self.vehicles
+        rental_max = len(blocks) if self.rental_limit is None else min(len(blocks), self.rental_limit)
+        rental_counts = range(rental_max + 1) if self.allow_rental else range(1)
+        candidates = []
+
+        for owned_count in range(len(owned) + 1):
+            for subset in combinations(range(len(owned)), owned_count):
+                for rentals in rental_counts:
+                    used = [owned[k] for k in subset] + [None] * rentals
+                    if not used:
+                        continue
+                    if not self.allow_multi_trip and len(used) != len(blocks):
+                        continue
+                    if len(used) > len(blocks):
+                        continue
+                    config = self._assign_to(blocks, loads, used)
+                    if config is not None:
+                        candidates.append(config)
+
+        for cost, first, extra, used in sorted(candidates, key=lambda c: c[0]):
+            plan = self._materialize(blocks, first, extra, used)
+            if self._daily_limits_ok(self._sequence_trips(plan)):
+                return cost, plan
+        return math.inf, None
+
+    def _assign_to(self, blocks: List[int], loads: List[float], used: List[Optional[Dict]]):
+        """Sabit araç kümesi için (maliyet, ilk_seferler, ek_seferler, araçlar)."""
+        capacities = sorted(
+            (self.RENTAL_CAPACITY if v is None else v["capacity"] for v in used), reverse=True
+        )
+        fees = sum(self.RENTAL_COST if v is None else v.get("rental_cost", 0) for v in used)
+
+        if not self.allow_multi_trip:
+            if not _matchable(sorted(loads, reverse=True), capacities):
+                return None
+            cost = sum(self._first[block] for block in blocks) + fees
+            return cost, list(range(len(blocks))), [], used
+
+        if max(loads) > capacities[0]:
+            return None
+
+        order = sorted(range(len(blocks)),
+                       key=lambda k: self._extra[blocks[k]] - self._first[blocks[k]], reverse=True)
+        first: List[int] = []
+        for k in order:
+            trial = sorted([loads[m] for m in first] + [loads[k]], reverse=True)
+            if _matchable(trial, capacities):
+                first.append(k)
+            if len(first) == len(used):
+                break
+        if len(first) < len(used):
+            return None
+
+        first_set = set(first)
+        extra = [k for k in range(len(blocks)) if k not in first_set]
+        cost = (sum(self._first[blocks[k]] for k in first)
+                + sum(self._extra[blocks[k]] for k in extra) + fees)
+        return cost, first, extra, used
+
+    def _materialize(self, blocks: List[int], first: List[int], extra: List[int],
+                     used: List[Optional[Dict]]) -> List[Tuple[Dict, List[int]]]:
+        """Atamayı (araç, rota) listesine çevir; kiralık araç sözlüklerini oluştur."""
+        vehicles = []
+        rental_idx = 0
+        for vehicle in used:
+            if vehicle is None:
+                rental_idx += 1
+                vehicle = {
+                    "id": 999 + rental_idx,
+                    "capacity": self.RENTAL_CAPACITY,
+                    "is_rented": True,
+                    "rental_cost": self.RENTAL_COST,
+                }
+            vehicles.append(vehicle)
+        vehicles.sort(key=lambda v: v["capacity"], reverse=True)
+
+        # İlk seferler: k. en ağır rota k. en büyük araca
+        plan = []
+        km = {id(v): 0.0 for v in vehicles}
+        for k, vehicle in zip(sorted(first, key=lambda k: self._load[blocks[k]], reverse=True), vehicles):
+            block = blocks[k]
+            plan.append((vehicle, self._route_order(block, self._first_start[block])))
+            km[id(vehicle)] += self._first[block]
+
+        # Ek seferler: sığan araçlardan günlük mesafesi en az olana
+        for k in sorted(extra, key=lambda k: self._extra[blocks[k]], reverse=True):
+            block = blocks[k]
+            vehicle = min((v for v in vehicles if v["capacity"] >= self._load[block]),
+                          key=lambda v: km[id(v)])
+            plan.append((vehicle, self._route_order(block, self._extra_start[block])))
+            km[id(vehicle)] += self._extra[block]
+        return plan
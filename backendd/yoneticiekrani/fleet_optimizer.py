@@ -0,0 +1,161 @@
+"""
+Filo Karması Optimizasyonu
+
+ClarkeWrightVRP.solve() önce özmal araçları kullanır, kalan rotalar
+için 500 kg kiralık araç ekler. Bu modül kiralama kararını toplam
+maliyete göre verir:
+
+1. Aday filolar: özmal araçlar + k adet kiralık araç (k = 0..gereken +
+   FLEET_EXTRA_RENTALS), her kiralık araç kiralama seçeneklerinden
+   (kapasite, ücret) biri. Ek kiralık araç Clarke-Wright birleştirmesine
+   daha fazla rota açar; uzun bir sapmayı kısaltan plan kira ücretinden
+   ucuz olabilir.
+2. Her aday kiralama kapalı (allow_rental=False) çözülür; kullanılmayan
+   kiralık araç ücret yazmaz. Mevcut davranış ("otomatik": sadece özmal
+   filo, gerektiğinde kiralama) da aday olarak eklenir, sonuç hiçbir
+   zaman ondan kötü olmaz.
+3. Adaylar süreç havuzunda eşzamanlı çözülür; en çok kargo taşıyan,
+   sonra en ucuz aday seçilir ve kiralık araç sayısına göre maliyet
+   eğrisi raporlanır.
+"""
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import combinations_with_replacement
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .distance_providers import get_distance_provider
+from .routing_algorithm import (
+    ClarkeWrightVRP,
+    Cargo,
+    _result_rank,
+    _solve_variant,
+    result_to_dict,
+)
+
+FLEET_EXTRA_RENTALS = 2     # Kapasite açığının üstünde denenecek ek kiralık araç
+FLEET_MAX_CANDIDATES = 64   # Aday filo üst sınırı
+RENTAL_ID_START = 1000      # Aday kiralık araç id'leri bu değerden başlar
+
+
+def default_rental_options() -> List[Tuple[float, float]]:
+    """Varsayılan kiralama seçeneği: (kapasite, ücret)."""
+    return [(ClarkeWrightVRP.RENTAL_CAPACITY, ClarkeWrightVRP.RENTAL_COST)]
+
+
+def candidate_fleets(vehicles: List[Dict], cargos: List[Cargo],
+                     rental_options: Sequence[Tuple[float, float]],
+                     extra_rentals: int = FLEET_EXTRA_RENTALS) -> List[Tuple[Tuple[float, ...], List[Dict]]]:
+    """
+    Denenecek filo karmaları.
+
+    Returns:
+        [(kiralık kapasiteler, araç listesi), ...] - kiralık sayısına göre artan
+    """
+    total_demand = sum(c.total_weight for c in cargos)
+    shortage = max(0.0, total_demand - sum(v["capacity"] for v in vehicles))
+    smallest = min(capacity for capacity, _ in rental_options)
+    needed = math.ceil(shortage / smallest) if shortage > 0 else 0
+
+    fees = dict(rental_options)
+    candidates = []
+    for count in range(needed + extra_rentals + 1):
+        for capacities in combinations_with_replacement(sorted(fees, reverse=True), count):
+            if len(candidates) >= FLEET_MAX_CANDIDATES:
+                return candidates
+            rentals = [
+                {
+                    "id": RENTAL_ID_START + i,
+                    "capacity": capacity,
+                    "is_rented": True,
+                    "rental_cost": fees[capacity],
+                }
+                for i, capacity in enumerate(capacities)
+            ]
+            candidates.append((capacities, list(vehicles) + rentals))
+    return candidates
+
+
+def optimize_fleet(vehicles: List[Dict], cargos: List[Cargo],
+                   rental_options: Optional[Sequence[Tuple[float, float]]] = None,
+                   allow_multi_trip: bool = True, mode: str = "cw",
+                   workers: Optional[int] = None, **solve_kwargs) -> Tuple[Dict, Dict]:
+    """
+    Aday filoları eşzamanlı çöz, toplam maliyeti en düşük olanı seç.
+
+    Args:
+        rental_options: [(kapasite, ücret), ...] (None: 500 kg / 200₺)
+        workers: Süreç sayısı (None: CPU sayısı)
+        solve_kwargs: solve() için ek argümanlar (time_budget_ms, ...)
+
+    Returns:
+        (en iyi sonuç dict, {"candidates": [...], "cost_curve": [...]})
+    """
+    options = list(rental_options or default_rental_options())
+    fleets = [(None, vehicles, True)] + [
+        (capacities, fleet, False)
+        for capacities, fleet in candidate_fleets(vehicles, cargos, options)
+    ]
+
+    def kwargs(allow_rental: bool) -> Dict:
+        return dict(solve_kwargs, allow_rental=allow_rental, allow_multi_trip=allow_multi_trip)
+
+    started = time.perf_counter()
+    get_distance_provider().prepare()   # İşçiler yüklü matrisi devralsın
+    try:
+        with ProcessPoolExecutor(max_workers=min(len(fleets), workers or os.cpu_count() or 1)) as pool:
+            futures = [
+                pool.submit(_solve_variant, fleet, cargos, index, None, 0.0, kwargs(auto), mode)
+                for index, (_, fleet, auto) in enumerate(fleets)
+            ]
+            outcomes = [future.result() for future in futures]
+    except (OSError, BrokenProcessPool):
+        outcomes = [
+            _solve_variant(fleet, cargos, index, None, 0.0, kwargs(auto), mode)
+            for index, (_, fleet, auto) in enumerate(fleets)
+        ]
+
+    best_index = min(range(len(outcomes)), key=lambda i: _result_rank(outcomes[i][0]))
+
+    candidates = []
+    for index, ((capacities, _, auto), (result, stats)) in enumerate(zip(fleets, outcomes)):
+        used_rentals = [r.vehicle_capacity for r in result.routes if r.is_rented and r.trip_number == 1]
+        candidates.append({
+            "fleet": "otomatik" if auto else "aday",
+            "rental_capacities": list(capacities) if capacities is not None else None,
+            "rentals_used": len(used_rentals),
+            "rental_capacities_used": sorted(used_rentals, reverse=True),
+            "carried": -_result_rank(result)[0],
+            "total_distance": result.total_distance,
+            "fuel_cost": result.total_fuel_cost,
+            "rental_cost": result.total_rental_cost,
+            "total_cost": result.total_cost,
+            "elapsed_ms": stats["elapsed_ms"],
+            "best": index == best_index,
+        })
+
+    # Maliyet eğrisi: kullanılan kiralık araç sayısı başına en iyi plan
+    full_load = max(c["carried"] for c in candidates)
+    curve: Dict[int, Dict] = {}
+    for candidate in candidates:
+        if candidate["carried"] < full_load:
+            continue
+        entry = curve.get(candidate["rentals_used"])
+        if entry is None or candidate["total_cost"] < entry["total_cost"]:
+            curve[candidate["rentals_used"]] = {
+                "rental_count": candidate["rentals_used"],
+                "rental_capacities": candidate["rental_capacities_used"],
+                "fuel_cost": candidate["fuel_cost"],
+                "rental_cost": candidate["rental_cost"],
+                "total_cost": candidate["total_cost"],
+            }
+
+    report = {
+        "candidates": candidates,
+        "cost_curve": [curve[k] for k in sorted(curve)],
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+    }
+    return result_to_dict(outcomes[best_index][0]), report
@@ -0,0 +1,166 @@
+"""
+Held-Karp Dinamik Programlama ile Kesin Rota Sırası
+
+Açık rota: araç herhangi bir duraktan başlar, tüm durakları bir kez
+ziyaret eder ve Umuttepe'de (depo) biter. Bitmask durumlu DP:
+
+    dp[mask][j] = mask kümesindeki durakları j'den başlayarak gezip
+                  depoda biten en kısa yolun uzunluğu
+
+    dp[{j}][j]  = d(j, depo)
+    dp[mask][j] = min_{k ∈ mask - {j}}  d(j, k) + dp[mask - {j}][k]
+
+Süre O(2^n · n²), bellek O(2^n · n). Aynı istasyon kümeleri günden
+güne tekrar ettiği için sonuçlar istasyon isimlerine göre önbelleğe
+alınır.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+DEPOT = 0
+INF = float("inf")
+
+
+def held_karp_table(nodes: Sequence[int], dist: Sequence[Sequence[float]],
+                    depot: int = DEPOT) -> Tuple[List[List[float]], List[List[int]]]:
+    """
+    Tüm alt kümeler için açık yol DP tablosunu hesapla.
+
+    Args:
+        nodes: Birleşik matristeki düğüm indeksleri (yerel bit sırası bu listedir)
+
+    Returns:
+        (dp, parent) - dp[mask][j] yukarıdaki tanım, parent[mask][j]
+        j'den sonra gidilen yerel düğüm (-1: doğrudan depo)
+    """
+    n = len(nodes)
+    size = 1 << n
+    dp = [[INF] * n for _ in range(size)]
+    parent = [[-1] * n for _ in range(size)]
+    local = [[dist[a][b] for b in nodes] for a in nodes]
+
+    for j in range(n):
+        dp[1 << j][j] = dist[nodes[j]][depot]
+
+    for mask in range(1, size):
+        row = dp[mask]
+        members = [j for j in range(n) if mask >> j & 1]
+        if len(members) < 2:
+            continue
+        for j in members:
+            rest = mask ^ (1 << j)
+            rest_row = dp[rest]
+            local_j = local[j]
+            best = INF
+            best_k = -1
+            for k in members:
+                if k == j:
+                    continue
+                cost = local_j[k] + rest_row[k]
+                if cost < best:
+                    best = cost
+                    best_k = k
+            row[j] = best
+            parent[mask][j] = best_k
+
+    return dp, parent
+
+
+def held_karp_order(route: Sequence[int], dist: Sequence[Sequence[float]],
+                    depot: int = DEPOT) -> Tuple[List[int], float]:
+    """
+    Rotadaki durakların en kısa açık yol sırasını bul.
+
+    Returns:
+        (sıralı düğümler, mesafe)
+    """
+    nodes = list(route)
+    n = len(nodes)
+    if n == 0:
+        return [], 0.0
+    if n == 1:
+        return nodes, dist[nodes[0]][depot]
+
+    dp, parent = held_karp_table(nodes, dist, depot)
+    full = (1 << n) - 1
+    start = min(range(n), key=lambda j: dp[full][j])
+
+    order = []
+    mask, j = full, start
+    while j != -1:
+        order.append(nodes[j])
+        next_j = parent[mask][j]
+        mask ^= 1 << j
+        j = next_j
+
+    return order, dp[full][start]
+
+
+class RouteOrderCache:
+    """
+    Durak kümesi -> optimal sıra için sınırlı LRU önbellek.
+
+    Anahtar istasyon isimlerinden oluşur; mesafe matrisi değişirse
+    yanlış sonuç dönmemesi için alt matrisin imzası da saklanır ve
+    okuma sırasında karşılaştırılır.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[tuple, Tuple[int, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, signature: tuple) -> Optional[Tuple[int, ...]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] != signature:
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, signature: tuple, order: Tuple[int, ...]) -> None:
+        with self._lock:
+            self._data[key] = (signature, order)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Süreç genelinde paylaşılan önbellek
+ROUTE_ORDER_CACHE = RouteOrderCache()
+
+
+def cached_held_karp_order(route: Sequence[int], labels: Sequence[str],
+                           dist: Sequence[Sequence[float]], depot: int = DEPOT,
+                           cache: RouteOrderCache = ROUTE_ORDER_CACHE) -> List[int]:
+    """
+    held_karp_order'ın önbellekli hali.
+
+    Args:
+        labels: labels[node] düğümün kalıcı adı (istasyon adı); önbellek
+                anahtarı bu isimlerin sıralı demetidir
+    """
+    canonical = sorted(route, key=lambda node: labels[node])
+    key = tuple(labels[node] for node in canonical)
+    signature = tuple(
+        tuple(dist[a][b] for b in canonical) + (dist[a][depot],)
+        for a in canonical
+    )
+
+    positions = cache.get(key, signature)
+    if positions is not None:
+        return [canonical[p] for p in positions]
+
+    order, _ = held_karp_order(canonical, dist, depot)
+    index = {node: pos for pos, node in enumerate(canonical)}
+    cache.put(key, signature, tuple(index[node] for node in order))
+    return order
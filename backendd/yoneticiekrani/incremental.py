@@ -0,0 +1,263 @@
+"""
+Artımlı Rota Güncelleme
+
+Gün planı hesaplandıktan sonra gelen (veya iptal edilen) kargoları planı
+baştan çözmeden işler:
+
+1. İptal edilen / artık bekleyen olmayan kargolar duraklardan çıkarılır,
+   boşalan duraklar ve rotalar silinir.
+2. Yeni kargo, aynı istasyona zaten uğrayan ve kapasitesi yeten bir
+   rotanın durağına mesafe maliyeti olmadan eklenir (kargonun alım
+   penceresi durağın planlanan servis anını kapsıyorsa).
+3. Kalan kargolar istasyon ziyaretlerine dönüştürülüp en ucuz uygun
+   konuma yerleştirilir (ALNS açgözlü onarımı); gerekirse yeni rota,
+   ek sefer veya kiralık araç açılır. Aracın günlük mesafe limitini
+   aşan seçenekler elenir; hiçbir araca sığmayan ağır ziyaret kiralık
+   kapasitesine bölünür.
+4. Değişen rotaların sırası yeniden optimize edilir; istenirse kısa
+   bir ALNS onarımı (repair_ms) uygulanır.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .alns import ALNSVRP, Plan
+from .routing_algorithm import Cargo, RoutingResult, cargos_from_dicts, result_to_dict
+from .time_windows import parse_clock
+
+
+class IncrementalPlanner(ALNSVRP):
+    """Mevcut planı (calculate_routes çıktısı) yeni kargo listesine göre güncelle."""
+
+    def _balance_visits(self, allow_rental: bool, allow_multi_trip: bool) -> None:
+        """Plan rotaları mevcut düğümleri gösterir; ziyaretler yeniden bölünmez."""
+
+    def update(self, plan: Dict, added_ids: Optional[Iterable[int]] = None,
+               removed_ids: Iterable[int] = (), allow_rental: bool = True,
+               allow_multi_trip: bool = True, reorder: bool = True,
+               repair_ms: float = 0.0) -> Tuple[RoutingResult, Dict]:
+        """
+        Args:
+            plan: Önceki calculate_routes çıktısı
+            added_ids: Eklenecek kargo id'leri (None: planda olmayan tüm kargolar)
+            removed_ids: Plandan çıkarılacak kargo id'leri; artık kargo
+                         listesinde olmayanlar da çıkarılır
+            reorder: Değişen rotaların sırasını yeniden optimize et
+            repair_ms: Eklemeden sonra uygulanacak ALNS onarım süresi (0: kapalı)
+
+        Returns:
+            (yeni RoutingResult, değişiklik özeti)
+        """
+        self.allow_rental = allow_rental
+        self.allow_multi_trip = allow_multi_trip
+        self._route_km = {}
+        # Plan saate bağlı sürelerle kurulduysa aynı kalkış korunur (_set_visits modeli kurar)
+        self.departure_time = parse_clock(plan.get("departure_time"))
+
+        by_id = {cargo.id: cargo for cargo in self.cargos}
+        removed = set(removed_ids)
+        visits: List[Tuple[str, List[Cargo]]] = []
+        routes: List[List[int]] = []
+        vehicles: List[Dict] = []
+        service_starts: Dict[int, Optional[float]] = {}
+        planned: Set[int] = set()
+        dropped: Set[int] = set()
+
+        owned = {vehicle["id"]: vehicle for vehicle in self.vehicles}
+        rentals: Dict[int, Dict] = {}
+        orphans: List[Cargo] = []
+
+        # 1) Önceki planı ziyaret düğümlerine çevir
+        original = {
+            tuple(tuple(stop.get("cargo_ids", [])) for stop in route_data.get("stops", []))
+            for route_data in plan.get("routes", [])
+        }
+        for route_data in plan.get("routes", []):
+            vehicle = owned.get(route_data.get("vehicle_id"))
+            if vehicle is None and route_data.get("is_rented"):
+                vehicle = rentals.setdefault(route_data["vehicle_id"], {
+                    "id": route_data["vehicle_id"],
+                    "capacity": route_data.get("vehicle_capacity", self.RENTAL_CAPACITY),
+                    "is_rented": True,
+                    "rental_cost": self.RENTAL_COST,
+                })
+
+            route = []
+            for stop in route_data.get("stops", []):
+                cargos = []
+                for cargo_id in stop.get("cargo_ids", []):
+                    planned.add(cargo_id)
+                    if cargo_id in removed or cargo_id not in by_id:
+                        dropped.add(cargo_id)
+                    else:
+                        cargos.append(by_id[cargo_id])
+                if vehicle is None:
+                    # Araç silinmiş: kargoları yeniden yerleştirilecek
+                    orphans.extend(cargos)
+                elif cargos:
+                    visits.append((stop["station_name"], cargos))
+                    route.append(len(visits))
+                    service_starts[len(visits)] = parse_clock(stop.get("service_start"))
+
+            if route:
+                routes.append(route)
+                vehicles.append(vehicle)
+
+        if added_ids is None:
+            added = [cargo for cargo in self.cargos if cargo.id not in planned]
+        else:
+            added = [by_id[cargo_id] for cargo_id in added_ids
+                     if cargo_id in by_id and cargo_id not in planned and cargo_id not in removed]
+        added.extend(orphans)
+
+        # 2) Aynı istasyona uğrayan rotaya mesafesiz ekle
+        loads = [sum(c.total_weight for node in route for c in visits[node - 1][1]) for route in routes]
+        stops_by_station: Dict[str, List[Tuple[int, int]]] = {}
+        for r, route in enumerate(routes):
+            for node in route:
+                stops_by_station.setdefault(visits[node - 1][0], []).append((r, node))
+
+        def in_window(cargo: Cargo, node: int) -> bool:
+            if cargo.window_start is None and cargo.window_end is None:
+                return True
+            served = service_starts.get(node)
+            return served is not None and (
+                (cargo.window_start is None or cargo.window_start <= served) and
+                (cargo.window_end is None or served <= cargo.window_end)
+            )
+
+        leftovers: Dict[str, List[Cargo]] = {}
+        for cargo in sorted(added, key=lambda c: c.total_weight, reverse=True):
+            target = next(
+                ((r, node) for r, node in stops_by_station.get(cargo.station_name, [])
+                 if loads[r] + cargo.total_weight <= vehicles[r]["capacity"] and in_window(cargo, node)),
+                None
+            )
+            if target is None:
+                leftovers.setdefault(cargo.station_name, []).append(cargo)
+                continue
+            r, node = target
+            visits[node - 1][1].append(cargo)
+            loads[r] += cargo.total_weight
+
+        # 3) Kalanları yeni ziyaret olarak en ucuz konuma yerleştir
+        self.split_capacity = self._max_capacity(allow_rental)
+        self.unplaced_cargos = []
+        new_nodes = []
+        for station, cargos in leftovers.items():
+            if sum(c.total_weight for c in cargos) > self.split_capacity:
+                station_visits, unplaced = self._split_station_cargos(cargos, self.split_capacity)
+                self.unplaced_cargos.extend(unplaced)
+            else:
+                station_visits = [cargos]
+            for visit in station_visits:
+                visits.append((station, visit))
+                new_nodes.append(len(visits))
+
+        self._set_visits(visits)
+        self._next_rental_id = max([v["id"] for v in vehicles] + [999]) + 1
+        template = self._prepare_result(allow_rental)
+
+        state = Plan(routes=routes, vehicles=vehicles, unassigned=new_nodes)
+        self._repair(state, regret=False)
+
+        # Özmal araçlar günlük limitteyken kiralık kapasitesini aşan ziyaret
+        # yerleşemez: kiralık araçlara bölünüp yeniden denenir
+        if allow_rental:
+            heavy = [node for node in state.unassigned if self.demand[node] > self.RENTAL_CAPACITY]
+            for node in heavy:
+                parts, unplaced = self._fill_visits(self.node_cargos[node], self.RENTAL_CAPACITY)
+                if not unplaced:
+                    state.unassigned.remove(node)
+                    state.unassigned.extend(self._add_visits(node, parts))
+            if heavy:
+                self._repair(state, regret=False)
+
+        def changed(route: List[int]) -> bool:
+            signature = tuple(tuple(c.id for c in self.node_cargos[node]) for node in route)
+            return signature not in original
+
+        if reorder:
+            for r, route in enumerate(state.routes):
+                if not changed(route):
+                    continue
+                state.routes[r] = self._optimize_route_order(route)
+                # Yeni sıra aracın vardiyasını / sonraki seferlerini bozuyorsa geri al
+                vehicle = state.vehicles[r]
+                trips = [trip for v, trip in zip(state.vehicles, state.routes) if v is vehicle]
+                if not self._vehicle_time_ok(vehicle, self._order_trips(vehicle, trips)):
+                    state.routes[r] = route
+
+        if repair_ms > 0:
+            cost = self._plan_cost(state)
+            self.best, self.best_cost = state.copy(), cost
+            self.stats = {"iterations": 0, "seed_cost": cost, "improvements": 0}
+            started = time.perf_counter()
+            self._search(state, cost, started, repair_ms, started + repair_ms / 1000.0)
+            state = self.best
+
+        changed_routes = {id(route) for route in state.routes if changed(route)}
+
+        # 4) Sonuç ve değişiklik özeti
+        sequenced = self._sequence_trips(list(zip(state.vehicles, state.routes)))
+        result = self._finish_result(template, sequenced, list(state.unassigned))
+
+        added_ids_set = {cargo.id for cargo in added}
+        delta = {
+            "added": [],
+            "removed": sorted(dropped),
+            "unassigned": sorted(c.id for c in result.unassigned_cargos if c.id in added_ids_set),
+            "changed_routes": [],
+            "cost_change": result.total_cost - plan.get("total_cost", 0.0),
+        }
+        for (_, route, _, _), vehicle_route in zip(sequenced, result.routes):
+            if id(route) in changed_routes:
+                delta["changed_routes"].append({
+                    "vehicle_id": vehicle_route.vehicle_id,
+                    "trip_number": vehicle_route.trip_number,
+                })
+            for stop in vehicle_route.stops:
+                for cargo_id in stop.cargo_ids:
+                    if cargo_id in added_ids_set:
+                        delta["added"].append({
+                            "cargo_id": cargo_id,
+                            "station_name": stop.station_name,
+                            "vehicle_id": vehicle_route.vehicle_id,
+                            "trip_number": vehicle_route.trip_number,
+                        })
+
+        return result, delta
+
+
+def update_routes(plan: Dict, vehicles: List[Dict], cargos: List[Dict],
+                  added_ids: Optional[Iterable[int]] = None, removed_ids: Iterable[int] = (),
+                  allow_rental: bool = True, allow_multi_trip: bool = True,
+                  reorder: bool = True, repair_ms: float = 0.0) -> Dict:
+    """
+    Önceki planı baştan çözmeden yeni / iptal edilen kargolarla güncelle.
+
+    Args:
+        plan: Önceki calculate_routes çıktısı
+        vehicles: calculate_routes ile aynı araç listesi
+        cargos: Günün güncel (bekleyen) kargo listesi
+        added_ids: Eklenecek kargo id'leri (None: planda olmayan tüm kargolar)
+        removed_ids: Çıkarılacak kargo id'leri
+        repair_ms: Eklemeden sonra kısa ALNS onarımı için süre (ms)
+
+    Returns:
+        calculate_routes çıktısı + "delta" (eklenen / çıkarılan kargolar,
+        değişen rotalar, maliyet farkı)
+    """
+    planner = IncrementalPlanner(vehicles, cargos_from_dicts(cargos))
+    result, delta = planner.update(
+        plan,
+        added_ids=added_ids,
+        removed_ids=removed_ids,
+        allow_rental=allow_rental,
+        allow_multi_trip=allow_multi_trip,
+        reorder=reorder,
+        repair_ms=repair_ms,
+    )
+    output = result_to_dict(result)
+    output["delta"] = delta
+    return output
@@ -0,0 +1,460 @@
+"""
+Rota İyileştirme (Local Search)
+
+Açık rotalar için (ilk duraktan başlayıp Umuttepe'de biten) komşuluk
+aramaları. Rotalar depo hariç düğüm indeks listeleridir; son duraktan
+sonra her zaman depo (0) gelir, başlangıç noktası ise serbesttir.
+
+Her hamle sadece değişen kenarlar üzerinden O(1) delta ile
+değerlendirilir ve sadece iyileştiren hamleler kabul edilir.
+Mesafe matrisinin simetrik olduğu varsayılır (2-opt ters çevirmesi).
+
+Zaman modeli verilirse iyileştiren her hamle ayrıca TimeModel'in
+gevşeklik dizileriyle (earliest / latest) kontrol edilir; pencereyi
+bozan hamle atlanır, çizelge yalnızca kabul edilen hamleden sonra
+yeniden kurulur. Başlangıçta zaten uygun olmayan rotada zaman kontrolü
+yapılmaz.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .time_windows import UNBOUNDED, RouteSchedule, TimeModel
+
+DEPOT = 0
+NO_SHIFT = (0.0, UNBOUNDED)
+EPSILON = 1e-9
+
+
+def route_distance(route: Sequence[int], dist: Sequence[Sequence[float]], depot: int = DEPOT) -> float:
+    """Açık rota mesafesi: duraklar arası + son duraktan depoya."""
+    if not route:
+        return 0.0
+    total = 0.0
+    for i in range(len(route) - 1):
+        total += dist[route[i]][route[i + 1]]
+    return total + dist[route[-1]][depot]
+
+
+def deadline_from_budget(budget_ms: Optional[float]) -> Optional[float]:
+    """Milisaniye bütçesinden perf_counter tabanlı bitiş zamanı üret."""
+    if budget_ms is None:
+        return None
+    return time.perf_counter() + max(0.0, budget_ms) / 1000.0
+
+
+def time_is_up(deadline: Optional[float]) -> bool:
+    """Zaman bütçesi doldu mu?"""
+    return deadline is not None and time.perf_counter() >= deadline
+
+
+def _timed_schedule(route: Sequence[int], time_model: Optional[TimeModel],
+                    shift: Tuple[float, float]) -> Optional[RouteSchedule]:
+    """Hamle kontrolü için çizelge; model yoksa veya rota zaten uygun değilse None."""
+    if time_model is None:
+        return None
+    schedule = time_model.schedule(route, *shift)
+    return schedule if schedule.feasible else None
+
+
+def two_opt(route: List[int], dist: Sequence[Sequence[float]],
+            deadline: Optional[float] = None, depot: int = DEPOT,
+            time_model: Optional[TimeModel] = None,
+            shift: Tuple[float, float] = NO_SHIFT) -> bool:
+    """
+    2-opt: route[i..j] segmentini ters çevir (yerinde).
+
+    Açık rotada başlangıç serbest olduğu için i == 0 durumunda sadece
+    segment sonundaki kenar değişir:
+        önce:  prev -> r[i] ... r[j] -> after
+        sonra: prev -> r[j] ... r[i] -> after
+
+    Args:
+        time_model: Verilirse pencereyi bozan ters çevirme atlanır
+        shift: Çizelgenin (başlangıç, en geç dönüş) anları
+
+    Returns:
+        En az bir iyileştirme yapıldıysa True
+    """
+    n = len(route)
+    improved = False
+    search = True
+    schedule = _timed_schedule(route, time_model, shift)
+
+    while search and not time_is_up(deadline):
+        search = False
+        for i in range(n - 1):
+            first = route[i]
+            prev = route[i - 1] if i > 0 else None
+            prev_edge = dist[prev][first] if prev is not None else 0.0
+            for j in range(i + 1, n):
+                last = route[j]
+                after = route[j + 1] if j + 1 < n else depot
+
+                delta = dist[first][after] - dist[last][after]
+                if prev is not None:
+                    delta += dist[prev][last] - prev_edge
+
+                if delta < -EPSILON:
+                    reversed_segment = route[i:j + 1][::-1]
+                    if schedule is not None and not time_model.can_replace(
+                            schedule, i, j + 1, reversed_segment):
+                        continue
+                    route[i:j + 1] = reversed_segment
+                    if schedule is not None:
+                        schedule = time_model.schedule(route, *shift)
+                    improved = search = True
+                    break
+            if search:
+                break
+
+    return improved
+
+
+def or_opt(route: List[int], dist: Sequence[Sequence[float]],
+           deadline: Optional[float] = None, max_segment: int = 3,
+           depot: int = DEPOT, time_model: Optional[TimeModel] = None,
+           shift: Tuple[float, float] = NO_SHIFT) -> bool:
+    """
+    Or-opt: 1..max_segment uzunluğundaki ardışık durakları rotada başka
+    bir konuma taşı (düz veya ters). Yerinde çalışır.
+
+    Segment çıkarıldığında prev -> after kenarı oluşur, u -> v arasına
+    eklendiğinde u -> seg ve seg -> v kenarları oluşur. u yoksa segment
+    rotanın yeni başlangıcıdır. Zaman kontrolünde değişen parça eski
+    konum ile yeni konum arasındaki duraklardır.
+
+    Returns:
+        En az bir iyileştirme yapıldıysa True
+    """
+    n = len(route)
+    improved = False
+    search = True
+    schedule = _timed_schedule(route, time_model, shift)
+
+    def fits(i: int, length: int, pos: int, segment: List[int]) -> bool:
+        # rest[pos] orijinal rotada pos (pos < i) veya pos + length indeksindedir
+        if schedule is None:
+            return True
+        if pos < i:
+            return time_model.can_replace(schedule, pos, i + length, segment + route[pos:i])
+        return time_model.can_replace(schedule, i, pos + length,
+                                      route[i + length:pos + length] + segment)
+
+    while search and not time_is_up(deadline):
+        search = False
+        for length in range(1, min(max_segment, n - 1) + 1):
+            for i in range(n - length + 1):
+                seg_first = route[i]
+                seg_last = route[i + length - 1]
+                prev = route[i - 1] if i > 0 else None
+                after = route[i + length] if i + length < n else depot
+
+                # Segmenti çıkarmanın kazancı
+                remove_gain = dist[seg_last][after]
+                if prev is not None:
+                    remove_gain += dist[prev][seg_first] - dist[prev][after]
+
+                rest = route[:i] + route[i + length:]
+                best_delta = -EPSILON
+                best_move = None
+
+                # pos: segmentin eklenmeden önce rest'te önünde duracak düğüm sayısı
+                for pos in range(len(rest) + 1):
+                    if pos == i:
+                        continue  # Aynı yer
+                    u = rest[pos - 1] if pos > 0 else None
+                    v = rest[pos] if pos < len(rest) else depot
+                    base = dist[u][v] if u is not None else 0.0
+
+                    add = dist[seg_last][v] - base
+                    add_rev = dist[seg_first][v] - base
+                    if u is not None:
+                        add += dist[u][seg_first]
+                        add_rev += dist[u][seg_last]
+
+                    if add - remove_gain < best_delta and fits(i, length, pos, route[i:i + length]):
+                        best_delta = add - remove_gain
+                        best_move = (pos, False)
+                    if (length > 1 and add_rev - remove_gain < best_delta
+                            and fits(i, length, pos, route[i:i + length][::-1])):
+                        best_delta = add_rev - remove_gain
+                        best_move = (pos, True)
+
+                if best_move is not None:
+                    pos, reverse = best_move
+                    segment = route[i:i + length]
+                    if reverse:
+                        segment.reverse()
+                    route[:] = rest[:pos] + segment + rest[pos:]
+                    if schedule is not None:
+                        schedule = time_model.schedule(route, *shift)
+                    improved = search = True
+                    break
+            if search:
+                break
+
+    return improved
+
+
+def improve_route(route: List[int], dist: Sequence[Sequence[float]],
+                  deadline: Optional[float] = None, depot: int = DEPOT,
+                  time_model: Optional[TimeModel] = None,
+                  shift: Tuple[float, float] = NO_SHIFT) -> List[int]:
+    """
+    2-opt ve Or-opt'u iyileştirme kalmayana (veya süre dolana) kadar
+    sırayla uygula. Yeni liste döndürür, girdiyi değiştirmez. Zaman
+    modeli verilirse uygun rota uygun kalır.
+    """
+    improved_route = list(route)
+    if len(improved_route) < 2:
+        return improved_route
+
+    while not time_is_up(deadline):
+        changed = two_opt(improved_route, dist, deadline, depot, time_model, shift)
+        changed = or_opt(improved_route, dist, deadline, depot=depot,
+                         time_model=time_model, shift=shift) or changed
+        if not changed:
+            break
+
+    return improved_route
+
+
+def _reordered_routes(route: List[int], max_segment: int):
+    """2-opt ters çevirmeleri, ardından Or-opt taşımaları (yeni listeler)."""
+    n = len(route)
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            yield route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+    for length in range(1, min(max_segment, n - 1) + 1):
+        for i in range(n - length + 1):
+            segment = route[i:i + length]
+            rest = route[:i] + route[i + length:]
+            for pos in range(len(rest) + 1):
+                if pos != i:
+                    yield rest[:pos] + segment + rest[pos:]
+
+
+def improve_route_by_cost(route: List[int], cost: Callable[[List[int]], float],
+                          deadline: Optional[float] = None, max_segment: int = 3) -> List[int]:
+    """
+    Delta'sı kenarlardan hesaplanamayan amaçlar (ör. saate bağlı süre)
+    için 2-opt ve Or-opt: her aday sıra cost ile baştan değerlendirilir,
+    ilk iyileştiren hamle kabul edilir. Hamle başına O(n) maliyet
+    çağrısıyla kısa rotalar için uygundur. Yeni liste döndürür.
+    """
+    best = list(route)
+    if len(best) < 2:
+        return best
+    best_cost = cost(best)
+
+    improved = True
+    while improved and not time_is_up(deadline):
+        improved = False
+        for candidate in _reordered_routes(best, max_segment):
+            if time_is_up(deadline):
+                break
+            value = cost(candidate)
+            if value < best_cost - EPSILON:
+                best, best_cost = candidate, value
+                improved = True
+                break
+
+    return best
+
+# ============================================
+# ROTALAR ARASI İYİLEŞTİRME
+# ============================================
+
+def nearest_neighbors(dist: Sequence[Sequence[float]], nodes: Sequence[int], k: int) -> Dict[int, List[int]]:
+    """
+    Her düğüm için en yakın k düğümü (granular aday listesi) döndür.
+
+    Rotalar arası hamleler sadece bu listelerdeki düğüm çiftleri için
+    denenir; böylece bir tarama O(n²) yerine O(n·k) olur.
+    """
+    neighbors = {}
+    for u in nodes:
+        row = dist[u]
+        others = [v for v in nodes if v != u]
+        others.sort(key=lambda v: row[v])
+        neighbors[u] = others[:k]
+    return neighbors
+
+
+class _InterRouteState:
+    """Rotalar arası aramada düğüm konumları ve yükler."""
+
+    def __init__(self, routes: List[List[int]], demand: Sequence[float]):
+        self.routes = routes
+        self.demand = demand
+        self.route_of: Dict[int, int] = {}
+        self.pos_of: Dict[int, int] = {}
+        self.loads: List[float] = [0.0] * len(routes)
+        self.prefix: List[List[float]] = [[] for _ in routes]
+        for r in range(len(routes)):
+            self.refresh(r)
+
+    def refresh(self, r: int) -> None:
+        """r rotasının konum, yük ve önek yük bilgilerini yeniden hesapla."""
+        prefix = []
+        load = 0.0
+        for pos, node in enumerate(self.routes[r]):
+            self.route_of[node] = r
+            self.pos_of[node] = pos
+            load += self.demand[node]
+            prefix.append(load)
+        self.loads[r] = load
+        self.prefix[r] = prefix
+
+
+def _neighbors_of(route: List[int], pos: int, depot: int):
+    """Düğümün öncülü (yoksa None) ve ardılı (yoksa depo)."""
+    prev = route[pos - 1] if pos > 0 else None
+    nxt = route[pos + 1] if pos + 1 < len(route) else depot
+    return prev, nxt
+
+
+def improve_inter_route(routes: List[List[int]], capacities: Sequence[float],
+                        demand: Sequence[float], dist: Sequence[Sequence[float]],
+                        neighbors: Dict[int, List[int]],
+                        fixed_costs: Optional[Sequence[float]] = None,
+                        deadline: Optional[float] = None,
+                        depot: int = DEPOT,
+                        time_models: Optional[Sequence[TimeModel]] = None,
+                        shifts: Optional[Sequence[Tuple[float, float]]] = None) -> List[List[int]]:
+    """
+    Farklı araçların rotaları arasında relocate, swap ve 2-opt* hamleleri.
+
+    routes[r] rotası capacities[r] kapasiteli araca aittir. Bir rota
+    tamamen boşalırsa fixed_costs[r] (ör. kiralama ücreti) kazanç sayılır
+    ve rota boş liste olarak döner, böylece indeksler araçlarla eşleşik kalır.
+
+    time_models[r] ve shifts[r] verilirse iyileştiren hamle iki rotanın
+    gevşeklik dizileriyle kontrol edilir; pencereyi bozan hamle seçilmez.
+
+    Hamleler:
+        relocate: u düğümünü v'nin önüne/arkasına taşı
+        swap:     u ve v düğümlerini yer değiştir
+        2-opt*:   u'dan sonrasını ve v'den sonrasını takas et (u -> v kenarı)
+    """
+    routes = [list(r) for r in routes]
+    fixed_costs = fixed_costs or [0.0] * len(routes)
+    state = _InterRouteState(routes, demand)
+    d = dist
+    schedules: List[Optional[RouteSchedule]] = [None] * len(routes)
+    if time_models is not None:
+        shifts = shifts or [NO_SHIFT] * len(routes)
+        schedules = [_timed_schedule(route, time_models[r], shifts[r]) for r, route in enumerate(routes)]
+
+    def fits(r: int, start: int, end: int, middle: List[int]) -> bool:
+        schedule = schedules[r]
+        return schedule is None or time_models[r].can_replace(schedule, start, end, middle)
+
+    def removal_delta(r: int, pos: int) -> float:
+        route = routes[r]
+        u = route[pos]
+        prev, nxt = _neighbors_of(route, pos, depot)
+        delta = -d[u][nxt]
+        if prev is not None:
+            delta += d[prev][nxt] - d[prev][u]
+        if len(route) == 1:
+            delta -= fixed_costs[r]
+        return delta
+
+    def insertion_delta(u: int, a: Optional[int], b: int) -> float:
+        delta = d[u][b]
+        if a is not None:
+            delta += d[a][u] - d[a][b]
+        return delta
+
+    improved = True
+    while improved and not time_is_up(deadline):
+        improved = False
+        for u in sorted(state.route_of):
+            if time_is_up(deadline):
+                break
+            r1 = state.route_of[u]
+            i = state.pos_of[u]
+            route1 = routes[r1]
+            prev_u, next_u = _neighbors_of(route1, i, depot)
+            du = demand[u]
+            best = (-EPSILON, None)
+
+            for v in neighbors.get(u, ()):
+                r2 = state.route_of.get(v)
+                if r2 is None or r2 == r1:
+                    continue
+                j = state.pos_of[v]
+                route2 = routes[r2]
+                prev_v, next_v = _neighbors_of(route2, j, depot)
+                dv = demand[v]
+
+                # Relocate: u'yu v'nin önüne veya arkasına koy
+                if state.loads[r2] + du <= capacities[r2]:
+                    base = removal_delta(r1, i)
+                    before = base + insertion_delta(u, prev_v, v)
+                    if before < best[0] and fits(r1, i, i + 1, []) and fits(r2, j, j, [u]):
+                        best = (before, ("relocate", u, r1, r2, j))
+                    after = base + insertion_delta(u, v, next_v)
+                    if after < best[0] and fits(r1, i, i + 1, []) and fits(r2, j + 1, j + 1, [u]):
+                        best = (after, ("relocate", u, r1, r2, j + 1))
+
+                # Swap: u <-> v
+                if (state.loads[r1] - du + dv <= capacities[r1] and
+                        state.loads[r2] - dv + du <= capacities[r2]):
+                    delta = d[v][next_u] - d[u][next_u] + d[u][next_v] - d[v][next_v]
+                    if prev_u is not None:
+                        delta += d[prev_u][v] - d[prev_u][u]
+                    if prev_v is not None:
+                        delta += d[prev_v][u] - d[prev_v][v]
+                    if delta < best[0] and fits(r1, i, i + 1, [v]) and fits(r2, j, j + 1, [u]):
+                        best = (delta, ("swap", u, v))
+
+                # 2-opt*: r1[:i+1] + r2[j:]  ve  r2[:j] + r1[i+1:]
+                head1 = state.prefix[r1][i]
+                head2 = state.prefix[r2][j - 1] if j > 0 else 0.0
+                new_load1 = head1 + state.loads[r2] - head2
+                new_load2 = head2 + state.loads[r1] - head1
+                if new_load1 <= capacities[r1] and new_load2 <= capacities[r2]:
+                    delta = d[u][v] - d[u][next_u]
+                    if prev_v is not None:
+                        # r2[:j] artık r1'in kalanına (veya depoya) bağlanır
+                        delta += d[prev_v][next_u] - d[prev_v][v]
+                    if j == 0 and i + 1 == len(route1):
+                        delta -= fixed_costs[r2]
+                    if (delta < best[0] and fits(r1, i + 1, len(route1), route2[j:])
+                            and fits(r2, j, len(route2), route1[i + 1:])):
+                        best = (delta, ("2opt*", r1, i, r2, j))
+
+            move = best[1]
+            if move is None:
+                continue
+
+            kind = move[0]
+            if kind == "relocate":
+                _, node, src, dst, pos = move
+                routes[src].pop(state.pos_of[node])
+                routes[dst].insert(pos, node)
+                touched = (src, dst)
+            elif kind == "swap":
+                _, a, b = move
+                ra, rb = state.route_of[a], state.route_of[b]
+                routes[ra][state.pos_of[a]] = b
+                routes[rb][state.pos_of[b]] = a
+                touched = (ra, rb)
+            else:
+                _, ra, pa, rb, pb = move
+                tail1 = routes[ra][pa + 1:]
+                tail2 = routes[rb][pb:]
+                routes[ra] = routes[ra][:pa + 1] + tail2
+                routes[rb] = routes[rb][:pb] + tail1
+                touched = (ra, rb)
+
+            for r in touched:
+                state.refresh(r)
+                if schedules[r] is not None:
+                    schedules[r] = _timed_schedule(routes[r], time_models[r], shifts[r])
+            improved = True
+
+    return routes
@@ -0,0 +1,39 @@
+"""
+Station tablosundan bellek eşlemeli mesafe matrisi dosyasını derler.
+Kullanım: python manage.py build_distance_artifact [--output yol]
+
+Çalışan işçiler dosyanın yeni sürümünü bir sonraki rota hesabında
+kendiliğinden yükler; yeniden başlatma gerekmez.
+"""
+
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from yoneticiekrani.distance_artifact import write_artifact
+from yoneticiekrani.distance_providers import StationDistanceProvider, road_network_path, station_rows
+
+
+class Command(BaseCommand):
+    help = "Mesafe matrisini (depo dahil) sürümlü float32 dosyaya yazar"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Dosya yolu (varsayılan: DISTANCE_ARTIFACT_PATH)')
+
+    def handle(self, *args, **options):
+        path = options['output'] or getattr(settings, 'DISTANCE_ARTIFACT_PATH', None)
+        if not path:
+            raise CommandError("Dosya yolu yok: --output verin veya DISTANCE_ARTIFACT_PATH ayarlayın.")
+
+        rows = station_rows()
+        if rows is None:
+            raise CommandError("Station tablosu okunamadı (veritabanı bağlantısını kontrol edin).")
+
+        provider = StationDistanceProvider(rows, network_path=road_network_path())
+        header = write_artifact(str(path), provider.snapshot())
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        self.stdout.write(self.style.SUCCESS(
+            f"Sürüm {header['version']}: {header['size']} düğüm (depo dahil), "
+            f"{size_mb:.1f} MB -> {path}"
+        ))
@@ -0,0 +1,55 @@
+"""
+Yol ağını okuyup contraction hierarchies ile ön işler ve kaydeder.
+Kullanım: python manage.py build_road_network --osm kocaeli.osm
+          python manage.py build_road_network --nodes nodes.csv --edges edges.csv
+
+Çıktı ROAD_NETWORK_PATH'e yazılır; sunucu yeniden başlayınca istasyon
+mesafeleri bu ağdan hesaplanır. Derlenmiş matris dosyası kullanılıyorsa
+ardından build_distance_artifact çalıştırın.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from yoneticiekrani.road_network import contract, read_edge_list, read_osm
+
+
+class Command(BaseCommand):
+    help = "Yol ağını (OSM XML veya CSV kenar listesi) ön işleyip kaydeder"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--osm', help='OSM XML özütü (.osm)')
+        parser.add_argument('--nodes', help='Düğüm CSV dosyası (id,lat,lon)')
+        parser.add_argument('--edges', help='Kenar CSV dosyası (source,target[,length_km][,speed_kmh][,oneway])')
+        parser.add_argument('--output', help='Çıktı (.npz, varsayılan: ROAD_NETWORK_PATH)')
+
+    def handle(self, *args, **options):
+        output = options['output'] or getattr(settings, 'ROAD_NETWORK_PATH', None)
+        if not output:
+            raise CommandError("Çıktı yolu yok: --output verin veya ROAD_NETWORK_PATH ayarlayın.")
+
+        started = time.perf_counter()
+        try:
+            if options['osm']:
+                lats, lons, edges = read_osm(options['osm'])
+            elif options['nodes'] and options['edges']:
+                lats, lons, edges = read_edge_list(options['nodes'], options['edges'])
+            else:
+                raise CommandError("--osm veya --nodes ile --edges verin.")
+        except (OSError, KeyError, ValueError) as exc:
+            raise CommandError(f"Yol ağı okunamadı: {exc}")
+        if not lats:
+            raise CommandError("Yol ağında düğüm yok.")
+        self.stdout.write(f"{len(lats)} düğüm, {len(edges)} yönlü kenar okundu; ön işleniyor...")
+
+        network = contract(lats, lons, edges)
+        try:
+            network.save(str(output))
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(network.up_out[1]) + len(network.up_in[1])} yukarı kenar, "
+            f"{time.perf_counter() - started:.1f} sn -> {output}"
+        ))
@@ -0,0 +1,71 @@
+"""
+İki run_benchmark raporunu karşılaştırır.
+Kullanım: python manage.py compare_benchmarks eski.json yeni.json [--threshold 1.0] [--fail-on-regression]
+
+Maliyeti eşikten fazla artan ölçümler gerileme olarak işaretlenir;
+--fail-on-regression ile komut bu durumda hata kodu döner (CI için).
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from yoneticiekrani.benchmarks import compare_reports, load_report
+
+
+def _percent(value):
+    return "-" if value is None else f"%{value:+.2f}"
+
+
+def _times(value):
+    return "-" if value is None else f"×{value:.2f}"
+
+
+class Command(BaseCommand):
+    help = "İki kıyaslama raporunu maliyet, süre ve bellek açısından karşılaştırır"
+
+    def add_arguments(self, parser):
+        parser.add_argument('base', help='Temel rapor (.json veya .csv)')
+        parser.add_argument('new', help='Yeni rapor (.json veya .csv)')
+        parser.add_argument('--threshold', type=float, default=1.0,
+                            help='Gerileme sayılacak maliyet artışı (%%)')
+        parser.add_argument('--fail-on-regression', action='store_true',
+                            help='Gerileme varsa hata koduyla çık')
+
+    def handle(self, *args, **options):
+        try:
+            comparison = compare_reports(load_report(options['base']), load_report(options['new']))
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f"Rapor okunamadı: {exc}")
+
+        threshold = options['threshold']
+        regressions = []
+        for row in comparison['rows']:
+            delta = row['cost_delta_percent']
+            flag = ""
+            if (delta is not None and delta > threshold) or row['unassigned_delta'] > 0:
+                regressions.append(row)
+                flag = "  <- gerileme"
+            self.stdout.write(
+                f"  {row['instance']:20} {row['mode']:5} s{row['seed']}  "
+                f"{row['base_cost']:10.1f} -> {row['new_cost']:10.1f}  "
+                f"{_percent(delta)}  süre {_times(row['time_ratio'])}  "
+                f"bellek {_times(row['memory_ratio'])}{flag}"
+            )
+
+        for mode, summary in comparison['summary'].items():
+            self.stdout.write(self.style.SUCCESS(
+                f"{mode}: {summary['count']} ölçüm, ortalama maliyet farkı "
+                f"{_percent(summary['mean_cost_delta_percent'])} "
+                f"(en kötü {_percent(summary['worst_cost_delta_percent'])}), "
+                f"süre {_times(summary['mean_time_ratio'])}, "
+                f"bellek {_times(summary['mean_memory_ratio'])}"
+            ))
+        if comparison['missing']:
+            self.stdout.write(self.style.WARNING(
+                f"Temel raporda karşılığı olmayan {len(comparison['missing'])} ölçüm atlandı."
+            ))
+
+        if regressions:
+            message = f"{len(regressions)} ölçümde maliyet %{threshold} eşiğini aştı veya atanamayan arttı."
+            if options['fail_on_regression']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
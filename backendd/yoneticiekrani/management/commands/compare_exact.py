@@ -0,0 +1,113 @@
+"""
+Sezgisel çözücüleri küçük senaryolarda kesin optimumla karşılaştırır.
+Kullanım: python manage.py compare_exact [--scenario 1] [--time-limit 30000]
+
+Senaryo kargoları seed_scenarios, araçlar seed_vehicles verisinden
+bellekte oluşturulur; veritabanı gerekmez.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from yoneticiekrani.routing_algorithm import calculate_routes
+from .seed_scenarios import SENARYO_1, SENARYO_2, SENARYO_3, SENARYO_4
+from .seed_vehicles import INITIAL_VEHICLES
+
+SCENARIOS = {1: SENARYO_1, 2: SENARYO_2, 3: SENARYO_3, 4: SENARYO_4}
+
+
+def scenario_cargos(data):
+    """Senaryo verisini calculate_routes kargo sözlüklerine çevir."""
+    cargos = []
+    for station_name, (cargo_count, total_weight) in data.items():
+        for _ in range(cargo_count):
+            cargos.append({
+                "id": len(cargos) + 1,
+                "station_name": station_name,
+                "weight": round(total_weight / cargo_count, 2),
+                "quantity": 1,
+                "sender_id": 0,
+            })
+    return cargos
+
+
+class Command(BaseCommand):
+    help = "Clarke-Wright / ALNS sonuçlarını kesin (dal ve sınır) optimumla karşılaştırır"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenario',
+            type=int,
+            choices=[1, 2, 3, 4],
+            help='Sadece belirli bir senaryoyu karşılaştır',
+        )
+        parser.add_argument(
+            '--capacities',
+            type=str,
+            help='Araç kapasiteleri, virgülle (örn. 500,750,1000)',
+        )
+        parser.add_argument(
+            '--time-limit',
+            type=float,
+            default=30000,
+            help='Kesin çözücü süre limiti (ms)',
+        )
+        parser.add_argument(
+            '--alns-ms',
+            type=float,
+            default=1000,
+            help='ALNS arama süresi (ms, 0: ALNS çalıştırılmaz)',
+        )
+        parser.add_argument(
+            '--no-multi-trip',
+            action='store_true',
+            help='Çoklu seferi kapat',
+        )
+
+    def handle(self, *args, **options):
+        if options['capacities']:
+            vehicles = [
+                {"id": i, "capacity": float(capacity), "is_rented": False, "rental_cost": 0}
+                for i, capacity in enumerate(options['capacities'].split(','), start=1)
+            ]
+        else:
+            vehicles = [dict(vehicle, id=i) for i, vehicle in enumerate(INITIAL_VEHICLES, start=1)]
+
+        common = {"allow_multi_trip": not options['no_multi_trip']}
+        modes = [("cw", {})]
+        if options['alns_ms'] > 0:
+            modes.append(("alns", {"time_limit_ms": options['alns_ms']}))
+
+        scenarios = [options['scenario']] if options['scenario'] else [1, 2, 3, 4]
+        for scenario_num in scenarios:
+            cargos = scenario_cargos(SCENARIOS[scenario_num])
+
+            started = time.perf_counter()
+            exact = calculate_routes(
+                vehicles, cargos, mode="exact", time_limit_ms=options['time_limit'], **common
+            )
+            exact_ms = (time.perf_counter() - started) * 1000
+            stats = exact.get("search_stats", {})
+            proven = "kanıtlandı" if stats.get("proven_optimal") else "kanıtlanmadı"
+
+            self.stdout.write(self.style.SUCCESS(
+                f"\nSenaryo {scenario_num}: {len(cargos)} kargo, "
+                f"kesin {exact['total_cost']:.1f}₺ ({proven}, {exact_ms:.0f} ms)"
+            ))
+            for warning in exact["warnings"]:
+                if warning.startswith("Kesin çözüm") or warning.startswith("Filo tüm"):
+                    self.stdout.write(self.style.WARNING(f"  {warning}"))
+
+            for mode, extra in modes:
+                started = time.perf_counter()
+                result = calculate_routes(vehicles, cargos, mode=mode, **common, **extra)
+                elapsed = (time.perf_counter() - started) * 1000
+                gap = (
+                    (result["total_cost"] - exact["total_cost"]) / exact["total_cost"] * 100
+                    if exact["total_cost"] > 0 else 0.0
+                )
+                self.stdout.write(
+                    f"  {mode:5} {result['total_cost']:8.1f}₺  "
+                    f"optimumdan fark: %{gap:.2f}  ({elapsed:.0f} ms)"
+                )
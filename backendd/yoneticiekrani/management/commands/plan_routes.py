@@ -0,0 +1,98 @@
+"""
+Tarih aralığının her günü için rota hesaplar (haftalık planlama).
+Kullanım: python manage.py plan_routes --start 2025-12-21 [--end 2025-12-27]
+
+Kargolar tek sorguda çekilir, günler süreç havuzunda eşzamanlı çözülür
+ve her gün bittikçe yazdırılır. --output ile sonuçlar NDJSON olarak
+dosyaya da yazılır.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from yoneticiekrani.batch_routing import MAX_BATCH_DAYS, iter_batch_routes
+from yoneticiekrani.routing_algorithm import SOLVER_MODES
+from yoneticiekrani.routing_inputs import pending_cargos_by_date, routing_vehicles
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise CommandError(f"Geçersiz tarih: {value} (YYYY-MM-DD kullanın)")
+
+
+class Command(BaseCommand):
+    help = "Tarih aralığındaki bekleyen kargolar için günlük rotaları eşzamanlı hesaplar"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', required=True, help='Başlangıç tarihi (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Bitiş tarihi (varsayılan: başlangıç + 6 gün)')
+        parser.add_argument('--mode', choices=SOLVER_MODES, default='cw', help='Çözüm modu')
+        parser.add_argument('--no-rental', action='store_true', help='Araç kiralamayı kapat')
+        parser.add_argument('--no-multi-trip', action='store_true', help='Çoklu seferi kapat')
+        parser.add_argument('--workers', type=int, help='Süreç sayısı (varsayılan: CPU sayısı)')
+        parser.add_argument('--no-cache', action='store_true', help='Rota önbelleğini kullanma')
+        parser.add_argument('--output', help='Sonuçların yazılacağı NDJSON dosyası')
+
+    def handle(self, *args, **options):
+        start_date = _parse_date(options['start'])
+        end_date = _parse_date(options['end']) if options['end'] else start_date + timedelta(days=6)
+        if end_date < start_date:
+            raise CommandError("Bitiş tarihi başlangıçtan önce olamaz.")
+        if (end_date - start_date).days + 1 > MAX_BATCH_DAYS:
+            raise CommandError(f"En fazla {MAX_BATCH_DAYS} günlük aralık hesaplanabilir.")
+
+        vehicles = routing_vehicles()
+        if not vehicles:
+            raise CommandError("Sistemde araç bulunmuyor. Önce 'python manage.py seed_vehicles' çalıştırın.")
+
+        cargos_by_date = pending_cargos_by_date(start_date, end_date)
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        stream = iter_batch_routes(
+            vehicles,
+            {day: cargos_by_date.get(day, []) for day in days},
+            workers=options['workers'],
+            use_cache=not options['no_cache'],
+            allow_rental=not options['no_rental'],
+            allow_multi_trip=not options['no_multi_trip'],
+            mode=options['mode'],
+        )
+
+        output = open(options['output'], 'w', encoding='utf-8') if options['output'] else None
+        try:
+            for line in stream:
+                if output is not None:
+                    output.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+                if line["type"] == "summary":
+                    self.stdout.write(self.style.SUCCESS(
+                        f"\n🗓️  {line['solved_days']}/{line['days']} gün çözüldü "
+                        f"({line['cache_hits']} önbellekten), toplam {line['total_cost']:.1f}₺, "
+                        f"{line['total_distance']:.1f} km, {line['elapsed_ms']:.0f} ms"
+                    ))
+                    if not line["complete"]:
+                        self.stdout.write(self.style.WARNING(
+                            f"⚠️  {len(line['partial_days'])} gün kısmi: {line['unassigned_count']} kargo "
+                            f"({line['unassigned_weight']:.0f} kg) taşınmadı; toplam maliyet bu kargoları içermez"
+                        ))
+                    continue
+
+                result = line["result"]
+                if not line["cargo_count"]:
+                    self.stdout.write(f"  {line['target_date']}: kargo yok")
+                    continue
+                partial = ""
+                if not result.get("complete", True):
+                    partial = f" ⚠️ kısmi: {len(result['unassigned_cargos'])} kargo taşınmadı"
+                self.stdout.write(
+                    f"  {line['target_date']}: {line['cargo_count']} kargo, "
+                    f"{len(result['routes'])} sefer, {result['total_distance']:.1f} km, "
+                    f"{result['total_cost']:.1f}₺ ({result.get('elapsed_ms', 0):.0f} ms"
+                    f"{', önbellek' if result.get('cache_hit') else ''}){partial}"
+                )
+        finally:
+            if output is not None:
+                output.close()
@@ -0,0 +1,79 @@
+"""
+Rota çözücülerini sabit tohumlu örneklerde kıyaslar.
+Kullanım: python manage.py run_benchmark [--sizes 50,200,1000] [--modes cw,alns]
+          [--cvrplib A-n32-k5.vrp ...] [--output rapor.json]
+
+Örnekler bellekte üretilir veya CVRPLIB dosyasından okunur; veritabanı
+gerekmez. Rapor compare_benchmarks ile başka bir raporla karşılaştırılır.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from yoneticiekrani.benchmarks import generate_instance, load_cvrplib, run_benchmark, write_report
+from yoneticiekrani.benchmarks.runner import DEFAULT_TIME_LIMIT_MS
+from yoneticiekrani.routing_algorithm import SOLVER_MODES
+
+
+def _int_list(value):
+    try:
+        return [int(part) for part in value.split(',') if part.strip()]
+    except ValueError:
+        raise CommandError(f"Geçersiz sayı listesi: {value}")
+
+
+class Command(BaseCommand):
+    help = "Çözüm modlarını üretilmiş / CVRPLIB örneklerinde süre, bellek ve maliyet açısından kıyaslar"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='50,200', help='Üretilecek örneklerin istasyon sayıları, virgülle')
+        parser.add_argument('--per-size', type=int, default=1, help='Her boyuttan örnek sayısı')
+        parser.add_argument('--clustered', action='store_true', help='Kümeli örnekler üret')
+        parser.add_argument('--cvrplib', nargs='*', default=[], help='CVRPLIB .vrp dosyaları')
+        parser.add_argument('--modes', default='cw,alns', help=f"Çözüm modları, virgülle ({', '.join(SOLVER_MODES)})")
+        parser.add_argument('--seeds', default='0,1,2', help='Çözücü tohumları, virgülle')
+        parser.add_argument('--time-limit', type=float, default=DEFAULT_TIME_LIMIT_MS,
+                            help='alns / exact arama süresi (ms)')
+        parser.add_argument('--no-memory', action='store_true', help='Tepe bellek ölçümünü atla')
+        parser.add_argument('--output', help='Rapor dosyası (.json veya .csv)')
+
+    def handle(self, *args, **options):
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        unknown = [mode for mode in modes if mode not in SOLVER_MODES]
+        if unknown:
+            raise CommandError(f"Bilinmeyen mod: {', '.join(unknown)}")
+
+        instances = []
+        for size in _int_list(options['sizes']):
+            for k in range(options['per_size']):
+                try:
+                    instances.append(generate_instance(size, seed=k, clustered=options['clustered']))
+                except ValueError as exc:
+                    raise CommandError(str(exc))
+        for path in options['cvrplib']:
+            try:
+                instances.append(load_cvrplib(path))
+            except (OSError, KeyError, ValueError) as exc:
+                raise CommandError(f"{path} okunamadı: {exc}")
+        if not instances:
+            raise CommandError("Kıyaslanacak örnek yok (--sizes veya --cvrplib verin).")
+
+        def progress(row):
+            memory = f"{row['peak_memory_kb']:.0f} KB" if row['peak_memory_kb'] is not None else "-"
+            gap = f"%{row['gap_percent']:.1f}" if row['gap_percent'] is not None else "-"
+            self.stdout.write(
+                f"  {row['instance']:20} {row['mode']:5} s{row['seed']}  "
+                f"{row['total_cost']:10.1f}  açık {gap:>7}  {row['elapsed_ms']:8.0f} ms  {memory:>10}  "
+                f"araç {row['vehicles_used']}  atanamayan {row['unassigned']}"
+            )
+
+        report = run_benchmark(
+            instances, modes, seeds=_int_list(options['seeds']),
+            time_limit_ms=options['time_limit'],
+            measure_memory=not options['no_memory'],
+            progress=progress,
+        )
+        if options['output']:
+            write_report(report, options['output'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{len(report['results'])} ölçüm {options['output']} dosyasına yazıldı."
+            ))
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.4 on 2026-10-17 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("yoneticiekrani", "0002_cargo_target_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="station",
+            name="window_start",
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="station",
+            name="window_end",
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="cargo",
+            name="window_start",
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="cargo",
+            name="window_end",
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="vehicle",
+            name="shift_start",
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="vehicle",
+            name="max_shift_minutes",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="vehicle",
+            name="speed_kmh",
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
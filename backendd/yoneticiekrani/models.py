@@ -48,6 +48,8 @@ class Station(models.Model):
     name = models.CharField(max_length=100) # Başiskele, Gebze vb. [cite: 26]
     latitude = models.FloatField() # Enlem [cite: 23]
     longitude = models.FloatField() # Boylam [cite: 23]
+    window_start = models.TimeField(null=True, blank=True) # Alım penceresi başlangıcı
+    window_end = models.TimeField(null=True, blank=True) # Alım penceresi bitişi
 
     def __str__(self):
         return self.name
@@ -58,6 +60,9 @@ class Vehicle(models.Model):
     capacity = models.PositiveIntegerField() 
     is_rented = models.BooleanField(default=False) # Kiralık mı? [cite: 31]
     rental_cost = models.FloatField(default=0.0) # Kiralama maliyeti (200 birim) [cite: 40]
+    shift_start = models.TimeField(null=True, blank=True) # Vardiya başlangıcı (boş: 08:00)
+    max_shift_minutes = models.PositiveIntegerField(null=True, blank=True) # Azami vardiya süresi
+    speed_kmh = models.FloatField(null=True, blank=True) # Ortalama hız (boş: 50 km/s)
 
     def __str__(self):
         return f"{self.capacity}kg {'Kiralık' if self.is_rented else 'Özmal'}"
@@ -70,6 +75,8 @@ class Cargo(models.Model):
     quantity = models.PositiveIntegerField() # [cite: 15]
     status = models.CharField(max_length=20, default='pending')
     target_date = models.DateField(null=True, blank=True) # Hangi gün taşınacak?
+    window_start = models.TimeField(null=True, blank=True) # Alım penceresi başlangıcı
+    window_end = models.TimeField(null=True, blank=True) # Alım penceresi bitişi
     created_at = models.DateTimeField(auto_now_add=True)
 
 # 5. SEFER / ROTA TABLOSU
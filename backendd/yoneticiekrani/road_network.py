@@ -0,0 +1,408 @@
+"""
+Çevrimdışı Yol Ağı (Contraction Hierarchies)
+
+Elle girilmiş ilçe matrisi simetrik, üçgen eşitsizliğini garanti etmiyor
+ve yeni istasyonları kapsamıyor. Bu modül yol ağını diskten (kenar
+listesi CSV veya OSM XML özütü) okur, contraction hierarchies ile bir
+kez ön işler ve çoktan-çoğa mesafe / süre sorgularını dış servis
+olmadan yanıtlar.
+
+Ön işleme: Düğümler kenar farkı (eklenen kısayol - silinen kenar) +
+silinmiş komşu sayısı önceliğiyle, tembel güncellemeyle sırayla
+daraltılır. u -> v -> w yolu için, v'yi kullanmayan ve daha kısa olmayan
+bir tanık yol (sınırlı Dijkstra) yoksa u -> w kısayolu eklenir. Sonuçta
+her düğümün yalnızca kendinden sonra daraltılan komşularına giden
+"yukarı" kenarları saklanır.
+
+Sorgu: Her hedeften geriye doğru yukarı arama yapılır, ulaşılan her
+düğüme (hedef, mesafe) kovası bırakılır; her kaynaktan ileri yukarı
+arama ulaştığı düğümlerin kovalarını tarar (Knopp vd.). Yukarı arama
+uzayları birkaç yüz düğümdür; n × m matris n + m küçük aramayla çıkar.
+
+Ağırlık km'dir (çözücü maliyeti mesafeye bağlı); süre (dakika) aynı
+yol boyunca ikinci değer olarak taşınır. Tek yönlü yollar desteklenir,
+bu yüzden matris asimetrik olabilir.
+"""
+
+import csv
+import heapq
+import math
+import xml.etree.ElementTree as ElementTree
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy yoksa en yakın düğüm saf Python ile bulunur, kayıt desteklenmez
+    np = None
+
+from .distance_matrix import haversine_km
+
+NETWORK_FORMAT = 1
+DEFAULT_SPEED_KMH = 50.0        # Hızı verilmeyen kenarlar
+WITNESS_SETTLE_LIMIT = 60       # Tanık aramasında en fazla yerleşen düğüm
+ROAD_SPEEDS_KMH = {             # OSM highway etiketi -> varsayılan hız (maxspeed yoksa)
+    "motorway": 110, "motorway_link": 60, "trunk": 90, "trunk_link": 50,
+    "primary": 70, "primary_link": 40, "secondary": 60, "secondary_link": 40,
+    "tertiary": 50, "tertiary_link": 30, "unclassified": 40, "residential": 30,
+    "living_street": 10, "service": 20, "road": 40,
+}
+
+Edge = Tuple[int, int, float, float]   # (kaynak, hedef, km, dakika)
+
+
+# ============================================
+# OKUMA
+# ============================================
+
+def read_edge_list(nodes_path: str, edges_path: str) -> Tuple[List[float], List[float], List[Edge]]:
+    """
+    CSV kenar listesi.
+
+    nodes: id,lat,lon
+    edges: source,target[,length_km][,speed_kmh][,oneway]
+           (length_km boşsa koordinatlardan, speed_kmh boşsa
+           DEFAULT_SPEED_KMH; oneway 1/true ise yalnız source -> target)
+
+    Returns:
+        (enlemler, boylamlar, kenarlar) - düğümler 0..n-1 indeksli
+    """
+    index: Dict[str, int] = {}
+    lats: List[float] = []
+    lons: List[float] = []
+    with open(nodes_path, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            index[row["id"].strip()] = len(lats)
+            lats.append(float(row["lat"]))
+            lons.append(float(row["lon"]))
+
+    edges: List[Edge] = []
+    with open(edges_path, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            u = index[row["source"].strip()]
+            v = index[row["target"].strip()]
+            km = float(row["length_km"]) if row.get("length_km") else \
+                haversine_km((lats[u], lons[u]), (lats[v], lons[v]))
+            speed = float(row["speed_kmh"]) if row.get("speed_kmh") else DEFAULT_SPEED_KMH
+            minutes = km / speed * 60
+            edges.append((u, v, km, minutes))
+            if (row.get("oneway") or "").strip().lower() not in ("1", "true", "yes"):
+                edges.append((v, u, km, minutes))
+    return lats, lons, edges
+
+
+def _osm_speed(tags: Dict[str, str]) -> float:
+    value = tags.get("maxspeed", "").split(";")[0].strip()
+    try:
+        if value.endswith("mph"):
+            return float(value[:-3]) * 1.609
+        return float(value)
+    except ValueError:
+        return float(ROAD_SPEEDS_KMH.get(tags["highway"], DEFAULT_SPEED_KMH))
+
+
+def read_osm(path: str) -> Tuple[List[float], List[float], List[Edge]]:
+    """
+    OSM XML özütü (.osm). Yalnızca ROAD_SPEEDS_KMH'deki highway türleri
+    alınır; oneway=yes/1/-1 ve sayısal maxspeed etiketleri uygulanır.
+    (PBF okumak ek bağımlılık gerektirir; önce osmium ile XML'e çevirin.)
+    """
+    coords: Dict[str, Tuple[float, float]] = {}
+    ways: List[Tuple[List[str], Dict[str, str]]] = []
+    for _, element in ElementTree.iterparse(path, events=("end",)):
+        if element.tag == "node":
+            coords[element.get("id")] = (float(element.get("lat")), float(element.get("lon")))
+        elif element.tag == "way":
+            tags = {tag.get("k"): tag.get("v") for tag in element.iter("tag")}
+            if tags.get("highway") in ROAD_SPEEDS_KMH:
+                ways.append(([nd.get("ref") for nd in element.iter("nd")], tags))
+            element.clear()
+        elif element.tag == "relation":
+            element.clear()
+
+    index: Dict[str, int] = {}
+    lats: List[float] = []
+    lons: List[float] = []
+    edges: List[Edge] = []
+    for refs, tags in ways:
+        refs = [ref for ref in refs if ref in coords]
+        oneway = tags.get("oneway", "no").lower()
+        if oneway == "-1":
+            refs.reverse()
+        speed = _osm_speed(tags)
+        for ref in refs:
+            if ref not in index:
+                index[ref] = len(lats)
+                lats.append(coords[ref][0])
+                lons.append(coords[ref][1])
+        for a, b in zip(refs, refs[1:]):
+            u, v = index[a], index[b]
+            km = haversine_km(coords[a], coords[b])
+            minutes = km / speed * 60
+            edges.append((u, v, km, minutes))
+            if oneway not in ("yes", "1", "true", "-1"):
+                edges.append((v, u, km, minutes))
+    return lats, lons, edges
+
+
+# ============================================
+# ÖN İŞLEME
+# ============================================
+
+def contract(lats: List[float], lons: List[float], edges: Sequence[Edge],
+             witness_limit: int = WITNESS_SETTLE_LIMIT) -> "RoadNetwork":
+    """Yol ağını contraction hierarchies ile ön işle."""
+    n = len(lats)
+    out: List[Dict[int, Tuple[float, float]]] = [{} for _ in range(n)]
+    inc: List[Dict[int, Tuple[float, float]]] = [{} for _ in range(n)]
+    for u, v, km, minutes in edges:
+        if u != v and (v not in out[u] or km < out[u][v][0]):
+            out[u][v] = (km, minutes)
+            inc[v][u] = (km, minutes)
+
+    def witness(source: int, targets: List[int], skip: int, limit: float) -> Dict[int, float]:
+        """skip'i kullanmadan source'tan sınırlı Dijkstra (geçici mesafeler de geçerli yol)."""
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        remaining = set(targets)
+        settled = 0
+        while heap and remaining and settled < witness_limit:
+            d, x = heapq.heappop(heap)
+            if d > dist[x]:
+                continue
+            if d > limit:
+                break
+            remaining.discard(x)
+            settled += 1
+            for y, (w, _) in out[x].items():
+                nd = d + w
+                if y != skip and nd < dist.get(y, math.inf):
+                    dist[y] = nd
+                    heapq.heappush(heap, (nd, y))
+        return dist
+
+    def shortcuts(v: int) -> List[Edge]:
+        found = []
+        outs = out[v]
+        if not outs:
+            return found
+        longest = max(w for w, _ in outs.values())
+        for u, (wu, mu) in inc[v].items():
+            targets = [w for w in outs if w != u]
+            if not targets:
+                continue
+            dist = witness(u, targets, v, wu + longest)
+            for w in targets:
+                ww, mw = outs[w]
+                if dist.get(w, math.inf) > wu + ww:
+                    found.append((u, w, wu + ww, mu + mw))
+        return found
+
+    deleted = [0] * n
+
+    def priority(v: int, found: List[Edge]) -> int:
+        return len(found) - len(out[v]) - len(inc[v]) + deleted[v]
+
+    heap = [(priority(v, shortcuts(v)), v) for v in range(n)]
+    heapq.heapify(heap)
+    up_out: List[List[Tuple[int, float, float]]] = [[] for _ in range(n)]
+    up_in: List[List[Tuple[int, float, float]]] = [[] for _ in range(n)]
+
+    while heap:
+        _, v = heapq.heappop(heap)
+        found = shortcuts(v)
+        current = priority(v, found)
+        if heap and current > heap[0][0]:
+            heapq.heappush(heap, (current, v))   # Tembel güncelleme
+            continue
+
+        up_out[v] = [(w, km, minutes) for w, (km, minutes) in out[v].items()]
+        up_in[v] = [(u, km, minutes) for u, (km, minutes) in inc[v].items()]
+        for u in inc[v]:
+            del out[u][v]
+            deleted[u] += 1
+        for w in out[v]:
+            del inc[w][v]
+            deleted[w] += 1
+        out[v] = {}
+        inc[v] = {}
+        for u, w, km, minutes in found:
+            if w not in out[u] or km < out[u][w][0]:
+                out[u][w] = (km, minutes)
+                inc[w][u] = (km, minutes)
+
+    return RoadNetwork(lats, lons, _csr(up_out), _csr(up_in))
+
+
+def _csr(adjacency: List[List[Tuple[int, float, float]]]) -> Tuple[List[int], List[int], List[float], List[float]]:
+    """Komşuluk listelerini (başlangıç, hedef, km, dakika) dizilerine sıkıştır."""
+    start = [0]
+    heads: List[int] = []
+    kms: List[float] = []
+    minutes: List[float] = []
+    for edges in adjacency:
+        for head, km, minute in edges:
+            heads.append(head)
+            kms.append(km)
+            minutes.append(minute)
+        start.append(len(heads))
+    return start, heads, kms, minutes
+
+
+# ============================================
+# SORGU
+# ============================================
+
+class RoadNetwork:
+    """
+    Ön işlenmiş yol ağı.
+
+    up_out: v'den daha sonra daraltılan düğümlere kenarlar (ileri arama)
+    up_in:  daha sonra daraltılan düğümlerden v'ye kenarlar (geri arama)
+    Her ikisi de (başlangıç, hedef, km, dakika) CSR dizileridir.
+    """
+
+    def __init__(self, lats: Sequence[float], lons: Sequence[float], up_out, up_in):
+        self.lats = list(lats)
+        self.lons = list(lons)
+        self.up_out = tuple(list(part) for part in up_out)
+        self.up_in = tuple(list(part) for part in up_in)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.lats)
+
+    @classmethod
+    def from_edge_list(cls, nodes_path: str, edges_path: str) -> "RoadNetwork":
+        return contract(*read_edge_list(nodes_path, edges_path))
+
+    @classmethod
+    def from_osm(cls, path: str) -> "RoadNetwork":
+        return contract(*read_osm(path))
+
+    def save(self, path: str) -> None:
+        """Ön işlenmiş ağı .npz olarak kaydet (NumPy gerekir)."""
+        if np is None:
+            raise RuntimeError("Yol ağını kaydetmek için NumPy gerekli.")
+        arrays = {"format": np.array([NETWORK_FORMAT]), "lats": np.asarray(self.lats),
+                  "lons": np.asarray(self.lons)}
+        for prefix, (start, heads, kms, minutes) in (("out", self.up_out), ("in", self.up_in)):
+            arrays[f"{prefix}_start"] = np.asarray(start, dtype=np.int64)
+            arrays[f"{prefix}_head"] = np.asarray(heads, dtype=np.int64)
+            arrays[f"{prefix}_km"] = np.asarray(kms)
+            arrays[f"{prefix}_minutes"] = np.asarray(minutes)
+        with open(path, "wb") as handle:
+            np.savez(handle, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "RoadNetwork":
+        if np is None:
+            raise RuntimeError("Yol ağını okumak için NumPy gerekli.")
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format"][0]) != NETWORK_FORMAT:
+                raise ValueError(f"{path}: desteklenmeyen yol ağı biçimi")
+            parts = {
+                prefix: tuple(data[f"{prefix}_{name}"].tolist() for name in ("start", "head", "km", "minutes"))
+                for prefix in ("out", "in")
+            }
+            return cls(data["lats"].tolist(), data["lons"].tolist(), parts["out"], parts["in"])
+
+    # --------------------------------------------
+
+    def nearest(self, lat: float, lon: float) -> Tuple[int, float]:
+        """En yakın ağ düğümü ve ona kuş uçuşu mesafe (km)."""
+        if np is not None:
+            from .distance_providers import haversine_rows
+            row = haversine_rows([lat], [lon], self.lats, self.lons)[0]
+            node = int(np.argmin(row))
+            return node, float(row[node])
+        point = (lat, lon)
+        return min(
+            ((k, haversine_km(point, (a, b))) for k, (a, b) in enumerate(zip(self.lats, self.lons))),
+            key=lambda item: item[1]
+        )
+
+    @staticmethod
+    def _upward(source: int, graph) -> Dict[int, Tuple[float, float]]:
+        """Yukarı grafta tam Dijkstra: {düğüm: (km, dakika)}."""
+        start, heads, kms, minutes = graph
+        best = {source: (0.0, 0.0)}
+        heap = [(0.0, 0.0, source)]
+        while heap:
+            d, t, x = heapq.heappop(heap)
+            if d > best[x][0]:
+                continue
+            for e in range(start[x], start[x + 1]):
+                y = heads[e]
+                nd = d + kms[e]
+                if y not in best or nd < best[y][0]:
+                    best[y] = (nd, t + minutes[e])
+                    heapq.heappush(heap, (nd, t + minutes[e], y))
+        return best
+
+    def many_to_many(self, sources: Sequence[int], targets: Sequence[int]
+                     ) -> Tuple[List[List[float]], List[List[float]]]:
+        """
+        Kaynak × hedef en kısa yol mesafeleri (km) ve o yolların süreleri
+        (dakika). Ulaşılamayan çiftler math.inf.
+        """
+        if np is not None:
+            return self._many_to_many_numpy(sources, targets)
+
+        buckets: Dict[int, List[Tuple[int, float, float]]] = {}
+        for j, target in enumerate(targets):
+            for x, (d, t) in self._upward(target, self.up_in).items():
+                buckets.setdefault(x, []).append((j, d, t))
+
+        km = [[math.inf] * len(targets) for _ in sources]
+        minutes = [[math.inf] * len(targets) for _ in sources]
+        for i, source in enumerate(sources):
+            row_km, row_min = km[i], minutes[i]
+            for x, (d, t) in self._upward(source, self.up_out).items():
+                for j, bd, bt in buckets.get(x, ()):
+                    total = d + bd
+                    if total < row_km[j]:
+                        row_km[j] = total
+                        row_min[j] = t + bt
+        return km, minutes
+
+    def _many_to_many_numpy(self, sources: Sequence[int], targets: Sequence[int]
+                            ) -> Tuple[List[List[float]], List[List[float]]]:
+        """
+        Aynı sorgu; ileri aramalar da kovalanır ve her ortak düğümde
+        kaynak × hedef bloğu tek vektör işlemiyle birleştirilir (saf
+        Python'da baskın maliyet kova taramasıdır).
+        """
+        def collect(nodes, graph):
+            spaces: Dict[int, Tuple[List[int], List[float], List[float]]] = {}
+            for k, node in enumerate(nodes):
+                for x, (d, t) in self._upward(node, graph).items():
+                    bucket = spaces.get(x)
+                    if bucket is None:
+                        bucket = spaces[x] = ([], [], [])
+                    bucket[0].append(k)
+                    bucket[1].append(d)
+                    bucket[2].append(t)
+            return spaces
+
+        backward = collect(targets, self.up_in)
+        forward = collect(sources, self.up_out)
+        km = np.full((len(sources), len(targets)), math.inf)
+        minutes = np.full((len(sources), len(targets)), math.inf)
+        for x, (rows, fd, ft) in forward.items():
+            bucket = backward.get(x)
+            if bucket is None:
+                continue
+            cols, bd, bt = bucket
+            block = np.ix_(rows, cols)
+            candidate = np.add.outer(fd, bd)
+            current = km[block]
+            better = candidate < current
+            if better.any():
+                km[block] = np.where(better, candidate, current)
+                minutes[block] = np.where(better, np.add.outer(ft, bt), minutes[block])
+        return km.tolist(), minutes.tolist()
+
+    def distance(self, source: int, target: int) -> Tuple[float, float]:
+        """Tek çift (km, dakika)."""
+        km, minutes = self.many_to_many([source], [target])
+        return km[0][0], minutes[0][0]
@@ -0,0 +1,202 @@
+"""
+Rota Sonucu Önbelleği
+
+calculate_routes çıktısını girdilerin parmak iziyle saklar. Aynı tarih
+için kargo, filo ve seçenekler değişmediyse sonuç yeniden çözülmeden
+döner. Anahtar içerikten üretildiği için değişen veri zaten yeni bir
+anahtar verir; Cargo / Vehicle / Station kayıt ve silme sinyalleri (signals.py)
+eski kayıtları bellekten temizler. Mesafe sağlayıcısının sürümü (ör. yeniden
+derlenen matris dosyası) da anahtara girer; başka süreçte derlenen dosya
+da eski sonuçları geçersiz kılar.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .distance_providers import get_distance_provider
+from .routing_algorithm import calculate_routes
+
+
+def fingerprint(vehicles: List[Dict], cargos: List[Dict], **options) -> str:
+    """
+    Girdilerin sıradan bağımsız sha256 parmak izi.
+
+    İçerik: istasyon talepleri, kargo id / ağırlık / adet / alım
+    pencereleri / öncelik, araç kapasite, ücret, vardiya ve hızları ve çözüm
+    seçenekleri (allow_rental, allow_multi_trip, mode, ...) ve mesafe
+    sağlayıcısının sürümü (cache_token).
+    """
+    demands: Dict[str, float] = {}
+    for c in cargos:
+        demands[c["station_name"]] = demands.get(c["station_name"], 0) + c["weight"] * c["quantity"]
+
+    canonical = {
+        "demands": sorted(demands.items()),
+        "cargos": sorted(
+            (c["id"], c["station_name"], c["weight"], c["quantity"],
+             str(c.get("window_start")), str(c.get("window_end")), c.get("priority"))
+            for c in cargos
+        ),
+        "vehicles": sorted(
+            (v["id"], v["capacity"], bool(v.get("is_rented", False)), v.get("rental_cost", 0),
+             str(v.get("shift_start")), v.get("max_shift_minutes") or 0, v.get("speed_kmh") or 0)
+            for v in vehicles
+        ),
+        "options": sorted(options.items()),
+        "distances": get_distance_provider().cache_token(),
+    }
+    payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RouteResultCache:
+    """
+    Süre sınırlı (TTL) ve boyut sınırlı LRU önbellek.
+
+    Sonuçlar derin kopya olarak saklanır ve döner; çağıran tarafın
+    sözlüğü değiştirmesi önbelleği bozmaz.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl_seconds: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, key: str, value: Dict) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(value))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Süreç genelinde paylaşılan önbellek
+ROUTE_RESULT_CACHE = RouteResultCache()
+
+
+def cached_calculate_routes(vehicles: List[Dict], cargos: List[Dict],
+                            cache: RouteResultCache = ROUTE_RESULT_CACHE, **options) -> Dict:
+    """
+    calculate_routes'un önbellekli hali.
+
+    Dönen sözlükte "cache_hit" sonucun önbellekten gelip gelmediğini
+    belirtir.
+    """
+    key = fingerprint(vehicles, cargos, **options)
+    result = cache.get(key)
+    if result is not None:
+        result["cache_hit"] = True
+        return result
+
+    result = calculate_routes(vehicles, cargos, **options)
+    cache.put(key, result)
+    result["cache_hit"] = False
+    return result
+
+
+def _timed_calculate(vehicles: List[Dict], cargos: List[Dict], options: Dict) -> Tuple[Dict, float]:
+    """Tek çözüm ve süresi (ProcessPoolExecutor işçisi, üst seviyede olmalı)."""
+    started = time.perf_counter()
+    result = calculate_routes(vehicles, cargos, **options)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def iter_cached_calculate(jobs: List[Tuple[List[Dict], List[Dict], Dict]],
+                          workers: Optional[int] = None,
+                          cache: RouteResultCache = ROUTE_RESULT_CACHE) -> Iterator[Tuple[int, Dict]]:
+    """
+    Birden fazla bağımsız rota hesabını önbellekli ve eşzamanlı çöz;
+    sonuçları bittikçe (iş_indeksi, sonuç) olarak üret.
+
+    Önbellekte olanlar hemen döner; kalanlar süreç havuzunda çözülüp
+    önbelleğe yazılır (havuz açılamazsa sırayla). Her sonuçta
+    "cache_hit" ve "elapsed_ms" bulunur.
+
+    Args:
+        jobs: [(araçlar, kargolar, calculate_routes seçenekleri), ...]
+        workers: Süreç sayısı (None: CPU sayısı)
+    """
+    keys = []
+    missing = []
+    for index, (vehicles, cargos, options) in enumerate(jobs):
+        started = time.perf_counter()
+        key = fingerprint(vehicles, cargos, **options)
+        keys.append(key)
+        result = cache.get(key)
+        if result is None:
+            missing.append(index)
+            continue
+        result["cache_hit"] = True
+        result["elapsed_ms"] = (time.perf_counter() - started) * 1000
+        yield index, result
+
+    if not missing:
+        return
+
+    def finished(index: int, result: Dict, elapsed_ms: float) -> Tuple[int, Dict]:
+        cache.put(keys[index], result)
+        result["cache_hit"] = False
+        result["elapsed_ms"] = elapsed_ms
+        return index, result
+
+    get_distance_provider().prepare()   # İşçiler yüklü matrisi devralsın
+    try:
+        pool = ProcessPoolExecutor(max_workers=min(len(missing), workers or os.cpu_count() or 1))
+    except OSError:
+        pool = None
+
+    if pool is not None:
+        with pool:
+            futures = {pool.submit(_timed_calculate, *jobs[index]): index for index in missing}
+            served = set()
+            try:
+                for future in as_completed(futures):
+                    index = futures[future]
+                    yield finished(index, *future.result())
+                    served.add(index)
+                return
+            except BrokenProcessPool:
+                missing = [index for index in missing if index not in served]
+
+    for index in missing:
+        yield finished(index, *_timed_calculate(*jobs[index]))
+
+
+def cached_calculate_many(jobs: List[Tuple[List[Dict], List[Dict], Dict]],
+                          workers: Optional[int] = None,
+                          cache: RouteResultCache = ROUTE_RESULT_CACHE) -> List[Dict]:
+    """iter_cached_calculate sonuçlarını iş sırasıyla liste olarak döndür."""
+    results: List[Optional[Dict]] = [None] * len(jobs)
+    for index, result in iter_cached_calculate(jobs, workers=workers, cache=cache):
+        results[index] = result
+    return results
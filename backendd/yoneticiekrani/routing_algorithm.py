@@ -8,17 +8,50 @@ Bu modül:
 4. Araç başlangıç noktalarını optimize eder
 """
 
-from typing import List, Dict, Tuple, Optional
+import heapq
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Tuple, Optional, Iterator
 from dataclasses import dataclass, field
-from .distance_matrix import (
-    DISTRICTS, 
-    DISTANCE_MATRIX,
-    DEPOT_DISTANCES, 
-    DEPOT_NAME,
-    DEPOT_COORDS,
-    DISTRICT_COORDS,
-    get_distance,
-    get_district_index
+
+try:
+    import numpy as np
+except ImportError:  # NumPy yoksa saf Python yolu kullanılır
+    np = None
+
+from .distance_matrix import DEPOT_NAME, DEPOT_COORDS
+from .bounds import (
+    distance_lower_bound,
+    extra_route_lower_bound,
+    gap_percent,
+    rental_lower_bound,
+)
+from .cargo_selection import select_cargos
+from .distance_providers import DistanceProvider, get_distance_provider
+from .held_karp import cached_held_karp_order
+from .spatial_index import candidate_lists
+from .time_windows import (
+    AVERAGE_SPEED_KMH,
+    DAY_START_MINUTES,
+    SERVICE_MINUTES,
+    UNBOUNDED,
+    RouteSchedule,
+    TimeModel,
+    format_clock,
+    intersect_windows,
+    parse_clock,
+)
+from .travel_times import TRAVEL_TIME_HORIZON_MINUTES, TravelTimeTable, corridor_exposure
+from .local_search import (
+    deadline_from_budget,
+    improve_inter_route,
+    improve_route,
+    improve_route_by_cost,
+    nearest_neighbors,
 )
 @dataclass
 class Cargo:
@@ -29,6 +62,14 @@ class Cargo:
     quantity: int
     sender_id: int
     sender_name: str = ""
+    window_start: Optional[float] = None  # Alım penceresi (dakika, istasyon ile kesişmiş)
+    window_end: Optional[float] = None
+    priority: Optional[float] = None      # Araç limitinde seçim önceliği (yoksa ağırlık)
+
+    @property
+    def total_weight(self) -> float:
+        """Araçta kapladığı yük (birim ağırlık × adet)"""
+        return self.weight * self.quantity
 @dataclass
 class RouteStop:
     """Rota durağı"""
@@ -36,6 +77,10 @@ class RouteStop:
     cargo_ids: List[int] = field(default_factory=list)
     total_weight: float = 0.0
     coords: Tuple[float, float] = (0.0, 0.0)
+    arrival_time: float = 0.0        # Varış (dakika)
+    service_start: float = 0.0       # Servis başlangıcı (pencere açılışına kadar bekleme dahil)
+    window: Tuple[float, float] = (0.0, UNBOUNDED)
+    slack: float = UNBOUNDED         # Durağın geri kalan rotayı bozmadan kayabileceği süre
 
 
 @dataclass
@@ -49,8 +94,14 @@ class VehicleRoute:
     stops: List[RouteStop] = field(default_factory=list)
     total_distance: float = 0.0
     fuel_cost: float = 0.0
+    time_cost: float = 0.0  # Sürücü süresi maliyeti (yalnız kalkış saati verildiğinde)
     total_cost: float = 0.0
     trip_number: int = 1  # Kaçıncı sefer
+    deadhead_distance: float = 0.0  # 2. ve sonraki seferlerde Umuttepe -> ilk durak
+    start_time: float = 0.0         # Sefer başlangıcı (ilk sefer: ilk durak, sonrakiler: Umuttepe çıkışı)
+    end_time: float = 0.0           # Umuttepe'ye varış
+    duration_minutes: float = 0.0
+    time_feasible: bool = True      # Pencere ve vardiya kısıtları sağlanıyor mu
 
 
 @dataclass 
@@ -61,6 +112,7 @@ class RoutingResult:
     total_distance: float = 0.0
     total_fuel_cost: float = 0.0
     total_rental_cost: float = 0.0
+    total_time_cost: float = 0.0
     total_cost: float = 0.0
     unassigned_cargos: List[Cargo] = field(default_factory=list)
     needs_rental: bool = False
@@ -68,24 +120,431 @@ class RoutingResult:
     needs_multi_trip: bool = False
     message: str = ""
     warnings: List[str] = field(default_factory=list)
+    search_stats: Dict = field(default_factory=dict)  # ALNS iterasyon / maliyet özeti
+    lower_bound: float = 0.0               # Taşınan ziyaretler için maliyet alt sınırı
+    gap_percent: Optional[float] = None    # (maliyet - alt sınır) / maliyet · 100
+    cargo_selection: Dict = field(default_factory=dict)  # Araç limitinde taşınan / ertelenen kargo özeti
+    departure_time: Optional[float] = None  # Saate bağlı sürelerle planlandıysa kalkış (dakika)
+    complete: bool = True                  # Tüm kargolar taşındı mı (ertelenen / atanamayan yok)
+    carried_weight: float = 0.0            # Rotalardaki toplam yük (kg)
+    unassigned_weight: float = 0.0         # Ertelenen + atanamayan yük (kg)
 
 class ClarkeWrightVRP:
-    """Clarke-Wright Savings algoritması ile VRP çözücü"""
+    """
+    Clarke-Wright Savings algoritması ile VRP çözücü.
+
+    Çözücü içeride istasyon isimleriyle değil yoğun tamsayı indekslerle
+    çalışır: 0 = Umuttepe (depo), 1..n = ziyaretler. Talebi en büyük araç
+    kapasitesini aşan istasyon kargo bazında birden fazla ziyarete
+    bölünür; bu yüzden aynı istasyon birden fazla düğümde görünebilir.
+    İsimler sadece sonuç (VehicleRoute) oluşturulurken geri çevrilir.
+    """
     
     FUEL_COST_PER_KM = 1.0  # Yakıt maliyeti (birim/km)
     RENTAL_COST = 200.0     # Kiralık araç maliyeti
     RENTAL_CAPACITY = 500   # Kiralık araç kapasitesi
+    DEPOT = 0               # Birleşik matristeki depo indeksi
+    NUMPY_MIN_NODES = 16    # Bu düğüm sayısından itibaren NumPy yolu kullanılır
+    LOCAL_SEARCH_BUDGET_MS = 500  # Varsayılan 2-opt / Or-opt süre bütçesi
+    GRANULAR_NEIGHBORS = 10       # Rotalar arası hamlelerde aday komşu sayısı
+    SPATIAL_CANDIDATE_MIN_NODES = 300  # Bu ziyaret sayısından itibaren adaylar ızgaradan seçilir
+    EXACT_ORDER_MAX_STOPS = 12    # Bu durak sayısına kadar Held-Karp ile kesin sıra
+    MAX_DAILY_DISTANCE_KM = 300.0 # Araç başı günlük mesafe limiti (multi-trip)
+    MAX_SPLIT_VISITS = 4          # Bir istasyonun bölünebileceği en fazla ziyaret
+    AVERAGE_SPEED_KMH = AVERAGE_SPEED_KMH  # Aracı "speed_kmh" vermezse kullanılan hız
+    SERVICE_MINUTES = SERVICE_MINUTES      # Durak başına servis süresi
+    DAY_START_MINUTES = DAY_START_MINUTES  # Aracı "shift_start" vermezse vardiya başlangıcı
+    DRIVER_COST_PER_MINUTE = 0.25          # Sefer süresi maliyeti (birim/dk; yalnız departure_time ile)
     
-    def __init__(self, vehicles: List[Dict], cargos: List[Cargo]):
+    def __init__(self, vehicles: List[Dict], cargos: List[Cargo],
+                 seed: Optional[int] = None, savings_noise: float = 0.0,
+                 distance_provider: Optional[DistanceProvider] = None):
         """
         Args:
             vehicles: Araç listesi [{"id": 1, "capacity": 500, "is_rented": False}, ...]
             cargos: Kargo listesi
+            seed: Rastgele varyant tohumu (çoklu başlangıç için)
+            savings_noise: Kazanç sırasına uygulanacak göreli bozulma
+                           (0.1: her kazanç ±%10 içinde karıştırılır)
+            distance_provider: Mesafe / koordinat kaynağı (None: süreç varsayılanı)
         """
+        self.distance_provider = distance_provider or get_distance_provider()
         self.vehicles = sorted(vehicles, key=lambda v: v["capacity"], reverse=True)
         self.cargos = cargos
+        self.rng = random.Random(seed)
+        self.allow_rental = True
+        self.allow_multi_trip = True
+        self.savings_noise = savings_noise
+        self.max_vehicles: Optional[int] = None
+        self.rental_limit: Optional[int] = None   # None: sınırsız kiralık araç
+        self.deferred_cargos: List[Cargo] = []
+        self.selection_stats: Dict = {}
+        self.selection_bins: List[Dict] = []
+        self.departure_time: Optional[float] = None
+        self.travel_times: Optional[TravelTimeTable] = None
         self.stations_with_cargo = self._group_cargos_by_station()
+        self._build_nodes(self._max_capacity(allow_rental=True))
+
+    def _build_nodes(self, split_capacity: float) -> None:
+        """
+        Ziyaret düğümlerini, mesafe matrisini ve talepleri oluştur.
+
+        Talebi split_capacity'yi aşan istasyonun kargoları
+        _split_station_cargos ile birden fazla ziyarete dağıtılır; hiçbir
+        ziyarete sığmayan kargolar unplaced_cargos'ta kalır. Araç limiti
+        için kargo seçimi yapıldıysa ziyaretler seçimin araç kutularına
+        göre bölünür (kutu başına istasyon başına bir ziyaret).
+        """
+        self.split_capacity = split_capacity
+        self.unplaced_cargos: List[Cargo] = []
+        self.route_split_visits = 0
+        self.node_bins: List[Optional[int]] = []
+
+        visits: List[Tuple[str, List[Cargo]]] = []
+        if self.selection_bins:
+            by_id = {cargo.id: cargo for cargo in self.cargos}
+            bins = []
+            for b, packed in enumerate(self.selection_bins):
+                by_station: Dict[str, List[Cargo]] = {}
+                for cargo_id in packed["cargo_ids"]:
+                    cargo = by_id[cargo_id]
+                    by_station.setdefault(cargo.station_name, []).append(cargo)
+                visits.extend(by_station.items())
+                bins.extend([b] * len(by_station))
+            self._set_visits(visits)
+            self.node_bins = [None] + bins
+            return
+
+        for station, cargos in self.stations_with_cargo.items():
+            if self._get_station_demand(station) > split_capacity:
+                station_visits, unplaced = self._split_station_cargos(cargos, split_capacity)
+                self.unplaced_cargos.extend(unplaced)
+            else:
+                station_visits = [cargos]
+            visits.extend((station, visit) for visit in station_visits)
+        self._set_visits(visits)
+
+    def _set_visits(self, visits: List[Tuple[str, List[Cargo]]]) -> None:
+        """Ziyaret listesinden [(istasyon, kargolar), ...] düğüm tablolarını kur."""
+        # İsim <-> indeks tabloları (sınırda bir kez çevrilir)
+        self.node_names: List[str] = [DEPOT_NAME] + [station for station, _ in visits]
+        self.node_cargos: List[List[Cargo]] = [[]] + [cargos for _, cargos in visits]
+        self.nodes: List[int] = list(range(1, len(self.node_names)))
+
+        # Depo 0. satır/sütun olacak şekilde birleşik mesafe matrisi
+        self.dist: List[List[float]] = self.distance_provider.matrix(self.node_names[1:])
+        self.dist_array = np.asarray(self.dist, dtype=float) if np is not None else None
+        self.demand: List[float] = [
+            sum(c.total_weight for c in cargos) for cargos in self.node_cargos
+        ]
+        self._build_time_model()
+
+    def _build_time_model(self) -> None:
+        """
+        Zaman modeli: ziyaret penceresi = kargo pencerelerinin kesişimi.
+        Kalkış saati verildiyse sürüş süreleri saate bağlı tablodan gelir.
+        """
+        windows = [(0.0, UNBOUNDED)] + [
+            intersect_windows([(c.window_start, c.window_end) for c in cargos])
+            for cargos in self.node_cargos[1:]
+        ]
+        service = [0.0] + [self.SERVICE_MINUTES] * (len(self.node_names) - 1)
+        speeds = [v.get("speed_kmh") or self.AVERAGE_SPEED_KMH for v in self.vehicles] + [self.AVERAGE_SPEED_KMH]
+        speed = max(speeds)
+        self.travel_times = (self._build_travel_times(speed, speed / min(speeds))
+                             if self.departure_time is not None else None)
+        self.time_model = TimeModel(self.dist, windows, service, speed, self.DEPOT, self.travel_times)
+        self._vehicle_time_models: Dict[float, TimeModel] = {speed: self.time_model}
+        self.time_constrained = self.time_model.active or any(
+            v.get("max_shift_minutes") for v in self.vehicles
+        )
+
+    def _build_travel_times(self, speed: float, max_scale: float = 1.0) -> TravelTimeTable:
+        """
+        Ziyaret istasyonları için saate bağlı süre tablosu. Bölünmüş
+        ziyaretler aynı satırı paylaşır; tablo en erken vardiya
+        başlangıcından TRAVEL_TIME_HORIZON_MINUTES boyunca kurulur.
+        max_scale (tablo hızı / en yavaş araç hızı) FIFO düzeltmesine girer.
+        """
+        stations = list(dict.fromkeys(self.node_names))
+        row = {name: k for k, name in enumerate(stations)}
+        first = {}
+        for node, name in enumerate(self.node_names):
+            first.setdefault(name, node)
+        dist = [[self.dist[first[a]][first[b]] for b in stations] for a in stations]
+
+        provider = self.distance_provider
+        exposure = None
+        if provider.geographic:
+            exposure = corridor_exposure([provider.locate(name) for name in stations])
+
+        start = self._fleet_shift()[0]
+        return TravelTimeTable.build(
+            dist, speed, start, start + TRAVEL_TIME_HORIZON_MINUTES, exposure,
+            node_index=[row[name] for name in self.node_names], max_scale=max_scale,
+        )
+
+    def _set_departure(self, departure_time) -> None:
+        """Kalkış saatini ("HH:MM" veya dakika) ayarla ve zaman modelini yeniden kur."""
+        departure = parse_clock(departure_time)
+        if departure == self.departure_time:
+            return
+        self.departure_time = departure
+        self._build_time_model()
+
+    # ============================================
+    # ZAMAN PENCERELERİ VE VARDİYA
+    # ============================================
+
+    def _shift(self, vehicle: Dict) -> Tuple[float, float]:
+        """
+        Aracın vardiyası (başlangıç, en geç dönüş) - dakika. Kalkış saati
+        verildiyse vardiyası belirtilmeyen araçlar o saatte, diğerleri
+        vardiyaları başlamışsa kalkış saatinde yola çıkar.
+        """
+        start = parse_clock(vehicle.get("shift_start"))
+        if start is None:
+            start = self.DAY_START_MINUTES if self.departure_time is None else self.departure_time
+        limit = vehicle.get("max_shift_minutes")
+        end = start + limit if limit else UNBOUNDED
+        if self.departure_time is not None:
+            start = max(start, self.departure_time)   # Vardiya bitişi değişmez
+        return start, end
+
+    def _fleet_shift(self) -> Tuple[float, float]:
+        """
+        Herhangi bir aracın (kiralık dahil) sağlayabileceği en geniş vardiya.
+        Birleştirme ve eklemede gerekli koşul olarak kullanılır; kesin
+        kontrol araç atandıktan sonra yapılır.
+        """
+        shifts = [self._shift(v) for v in self.vehicles]
+        if self.allow_rental or not shifts:
+            shifts.append(self._shift({}))
+        return min(start for start, _ in shifts), max(end for _, end in shifts)
+
+    def _time_model_for(self, vehicle: Dict) -> TimeModel:
+        """Aracın hızına göre zaman modeli (hız başına bir kez kurulur)."""
+        speed = vehicle.get("speed_kmh") or self.AVERAGE_SPEED_KMH
+        model = self._vehicle_time_models.get(speed)
+        if model is None:
+            base = self.time_model
+            model = TimeModel(self.dist, base.windows, base.service, speed, self.DEPOT,
+                              base.travel_times)
+            self._vehicle_time_models[speed] = model
+        return model
+
+    def _route_schedule(self, route: List[int]) -> RouteSchedule:
+        """Rotanın filo genelindeki en geniş vardiyaya göre çizelgesi."""
+        start, end = self._fleet_shift()
+        return self.time_model.schedule(route, start, end)
+
+    def _trip_schedules(self, vehicle: Dict, routes: List[List[int]]) -> List[RouteSchedule]:
+        """
+        Aracın sıralı seferlerinin çizelgeleri.
+
+        İlk sefer vardiya başında ilk durakta başlar; sonraki seferler
+        önceki seferin Umuttepe'ye varışında boş gidişle başlar.
+        """
+        model = self._time_model_for(vehicle)
+        clock, deadline = self._shift(vehicle)
+        schedules = []
+        for number, route in enumerate(routes, start=1):
+            if number > 1:
+                clock += model.travel(self.DEPOT, route[0], clock)
+            schedule = model.schedule(route, clock, deadline)
+            schedules.append(schedule)
+            clock = schedule.end_time
+        return schedules
+
+    def _vehicle_time_ok(self, vehicle: Dict, routes: List[List[int]]) -> bool:
+        """Seferler pencerelere ve vardiyaya uyuyor mu? (kısıt yoksa her zaman True)"""
+        if not self.time_constrained:
+            return True
+        return all(schedule.feasible for schedule in self._trip_schedules(vehicle, routes))
+
+    def _time_cost(self, minutes: float) -> float:
+        """Sefer süresinin maliyeti; saate bağlı süreler kapalıyken 0."""
+        if self.travel_times is None:
+            return 0.0
+        return minutes * self.DRIVER_COST_PER_MINUTE
+
+    def _plan_time_cost(self, sequenced: List[Tuple[Dict, List[int], int, float]]) -> float:
+        """
+        Planın süre maliyeti: araç başına ilk seferin başlangıcından son
+        seferin Umuttepe'ye varışına kadar (ek seferler önceki seferin
+        bitişinde başlar).
+        """
+        if self.travel_times is None:
+            return 0.0
+        trips: Dict[int, Tuple[Dict, List[Tuple[int, List[int]]]]] = {}
+        for vehicle, route, trip_number, _ in sequenced:
+            trips.setdefault(id(vehicle), (vehicle, []))[1].append((trip_number, route))
+        minutes = 0.0
+        for vehicle, numbered in trips.values():
+            numbered.sort(key=lambda trip: trip[0])
+            chain = self._trip_schedules(vehicle, [route for _, route in numbered])
+            minutes += chain[-1].end_time - chain[0].start_time
+        return self._time_cost(minutes)
+
+    def _timed_route_cost(self, route: List[int]) -> float:
+        """Yakıt + süre maliyeti (filo vardiyasıyla); pencereyi bozan sıra sonsuz."""
+        schedule = self._route_schedule(route)
+        if self.time_constrained and not schedule.feasible:
+            return math.inf
+        return (self._calculate_route_distance(route) * self.FUEL_COST_PER_KM
+                + self._time_cost(schedule.end_time - schedule.start_time))
+
+    # ============================================
+    # ARAÇ SAYISI SINIRI
+    # ============================================
+
+    def _limit_fleet(self, max_vehicles: Optional[int], allow_rental: bool,
+                     allow_multi_trip: bool) -> bool:
+        """
+        En fazla max_vehicles araç kullan.
+
+        En büyük kapasiteli özmal araçlar tutulur; sınırın kalanı kadar
+        kiralık araç açılabilir. Çoklu sefer kapalıysa filo günde araç
+        başına bir sefer taşır: talep bu kapasiteyi aşıyorsa taşınacak
+        kargolar çoklu sırt çantası ile seçilir, kalanlar ertelenir; seçimin
+        araç kutuları, birleştirme taşıyamazsa yedek plan olur.
+        Çoklu seferde sınırı günlük mesafe ve vardiya belirler; taşınamayan
+        ziyaretler atama sonunda ertelenir.
+
+        Returns:
+            Kiralamaya hâlâ izin var mı
+        """
+        self.max_vehicles = max_vehicles
+        if max_vehicles is None:
+            return allow_rental
+
+        kept = sorted(self.vehicles, key=lambda v: (-v["capacity"], v.get("rental_cost", 0)))
+        self.vehicles = kept[:max_vehicles]
+        self.rental_limit = max(0, max_vehicles - len(self.vehicles)) if allow_rental else 0
+        allow_rental = self.rental_limit > 0
+
+        if not allow_multi_trip:
+            capacities = [v["capacity"] for v in self.vehicles] + [self.RENTAL_CAPACITY] * self.rental_limit
+            if sum(c.total_weight for c in self.cargos) > sum(capacities):
+                self.cargos, self.deferred_cargos, self.selection_stats = select_cargos(self.cargos, capacities)
+                self.selection_bins = self.selection_stats.pop("bins")
+                self.stations_with_cargo = self._group_cargos_by_station()
+        self._build_nodes(self._max_capacity(allow_rental))
+        return allow_rental
+
+    def _max_capacity(self, allow_rental: bool) -> float:
+        """Tek bir aracın taşıyabileceği en büyük yük."""
+        return max(
+            [v["capacity"] for v in self.vehicles] +
+            ([self.RENTAL_CAPACITY] if allow_rental else [0])
+        )
+
+    def _split_station_cargos(self, cargos: List[Cargo],
+                              capacity: float) -> Tuple[List[List[Cargo]], List[Cargo]]:
+        """
+        İstasyonun kargolarını kapasiteyi aşmayan ziyaretlere böl.
+
+        Ağırdan hafife sıralı kargolar, heap'ten alınan en az yüklü
+        ziyarete (worst-fit) eklenir: kargo başına O(log k). En az yüklü
+        ziyarete sığmayan kargo hiçbirine sığmaz; bu durumda
+        MAX_SPLIT_VISITS'e kadar yeni ziyaret açılır.
+
+        Returns:
+            ([ziyaret_kargoları, ...], yerleştirilemeyen_kargolar)
+        """
+        fitting = sorted((c for c in cargos if c.total_weight <= capacity),
+                         key=lambda c: c.total_weight, reverse=True)
+        unplaced = [c for c in cargos if c.total_weight > capacity]
+
+        total = sum(c.total_weight for c in fitting)
+        visit_count = min(max(1, math.ceil(total / capacity)), self.MAX_SPLIT_VISITS)
+        visits: List[List[Cargo]] = [[] for _ in range(visit_count)]
+        heap = [(0.0, idx) for idx in range(visit_count)]
+
+        for cargo in fitting:
+            load, idx = heap[0]
+            if load + cargo.total_weight <= capacity:
+                heapq.heapreplace(heap, (load + cargo.total_weight, idx))
+            elif len(visits) < self.MAX_SPLIT_VISITS:
+                idx = len(visits)
+                visits.append([])
+                heapq.heappush(heap, (cargo.total_weight, idx))
+            else:
+                unplaced.append(cargo)
+                continue
+            visits[idx].append(cargo)
+
+        return [visit for visit in visits if visit], unplaced
         
+    def _balance_visits(self, allow_rental: bool, allow_multi_trip: bool) -> None:
+        """
+        Ziyaretleri filonun her kapasite seviyesine göre böl.
+
+        _build_nodes yalnızca en büyük aracı aşan istasyonları böler; ama
+        c seviyesinin üstünde kalan ziyaret sayısı, kapasitesi c'yi aşan
+        araç sayısından fazlaysa (Hall koşulu, bkz. _fleet_levels) bu
+        ziyaretler birleştirmeyle düzelmez. Seviyeler yukarıdan aşağı
+        gezilir; fazlalık kadar ağır ziyaret c kapasiteli parçalara
+        bölünür. Her ek parça istasyondan Umuttepe'ye bir sefer daha
+        demektir; bu yüzden Umuttepe'ye en yakın istasyonlar önce bölünür.
+        Bölmeyle kargo yerleştirilemeyecekse ziyaret olduğu gibi kalır
+        (atamada _split_route devreye girer).
+        """
+        if self.selection_bins:
+            return   # Seçim kutuları zaten araçlara sığar
+        visits = list(zip(self.node_names[1:], self.node_cargos[1:]))
+        loads = self.demand[1:]
+        depot_km = {name: self.dist[node][self.DEPOT] for node, name in enumerate(self.node_names)}
+        changed = False
+        for level, vehicle_count, _ in reversed(self._fleet_levels(allow_rental, allow_multi_trip)):
+            heavy = sorted((k for k, load in enumerate(loads) if load > level),
+                           key=lambda k: (depot_km[visits[k][0]], loads[k]))
+            excess = len(heavy) - vehicle_count
+            if level <= 0 or excess <= 0:
+                continue
+            for k in heavy[:int(excess)]:
+                station, cargos = visits[k]
+                parts, unplaced = self._fill_visits(cargos, level)
+                if unplaced:
+                    continue
+                visits[k] = (station, parts[0])
+                loads[k] = sum(c.total_weight for c in parts[0])
+                for part in parts[1:]:
+                    visits.append((station, part))
+                    loads.append(sum(c.total_weight for c in part))
+                changed = True
+        if changed:
+            self._set_visits(visits)
+
+    @staticmethod
+    def _fill_visits(cargos: List[Cargo], capacity: float) -> Tuple[List[List[Cargo]], List[Cargo]]:
+        """
+        Kargoları ilk uyan azalan (FFD) sırayla capacity'lik ziyaretlere doldur.
+
+        _split_station_cargos'un dengeli parçalarının aksine dolu
+        ziyaretler ve küçük bir artık çıkar; artık birleştirmede kolay
+        yer bulur, dolu parça tek başına bir araca gider.
+
+        Returns:
+            ([ziyaret_kargoları, ...], capacity'yi tek başına aşan kargolar)
+        """
+        parts: List[List[Cargo]] = []
+        loads: List[float] = []
+        unplaced: List[Cargo] = []
+        for cargo in sorted(cargos, key=lambda c: c.total_weight, reverse=True):
+            if cargo.total_weight > capacity:
+                unplaced.append(cargo)
+                continue
+            for k, load in enumerate(loads):
+                if load + cargo.total_weight <= capacity:
+                    parts[k].append(cargo)
+                    loads[k] += cargo.total_weight
+                    break
+            else:
+                parts.append([cargo])
+                loads.append(cargo.total_weight)
+        return parts, unplaced
+
     def _group_cargos_by_station(self) -> Dict[str, List[Cargo]]:
         """Kargoları istasyonlara göre grupla"""
         grouped = {}
@@ -95,39 +554,105 @@ class ClarkeWrightVRP:
             grouped[cargo.station_name].append(cargo)
         return grouped
     
-    def _calculate_savings(self) -> List[Tuple[str, str, float]]:
+    def _calculate_savings(self, positive: bool = True) -> List[Tuple[int, int, float]]:
         """
-        Clarke-Wright Savings hesapla.
-        Savings(i,j) = d(depot,i) + d(depot,j) - d(i,j)
-        
-        İki müşteriyi aynı rotada birleştirmenin kazancı.
+        Clarke-Wright Savings hesapla (açık rota versiyonu).
+
+        Rotalar depodan BAŞLAMAZ, sadece Umuttepe'de biter. Bu yüzden
+        i ile biten bir rotanın arkasına j ile başlayan rotayı eklemek
+        i -> Umuttepe kenarını i -> j kenarı ile değiştirir:
+
+            Savings(i,j) = d(i,depot) - d(i,j)
+
+        Kazanç yönlüdür: (i, j) "i'den sonra j" demektir.
+
+        Args:
+            positive: True ise sadece pozitif kazançlar, False ise
+                      pozitif olmayan kazançlar döner (araç sayısını
+                      düşürmek için gereken ikinci faz).
         """
-        stations = list(self.stations_with_cargo.keys())
+        if self._use_numpy(len(self.nodes)):
+            return self._calculate_savings_numpy(positive)
+
+        dist = self.dist
         savings = []
-        
-        for i, station_i in enumerate(stations):
-            for j, station_j in enumerate(stations):
-                if i >= j:
+
+        for i in self.nodes:
+            row = dist[i]
+            d_depot_i = row[self.DEPOT]
+            for j in self.nodes:
+                if i == j:
                     continue
-                    
-                d_depot_i = DEPOT_DISTANCES.get(station_i, 0)
-                d_depot_j = DEPOT_DISTANCES.get(station_j, 0)
-                d_i_j = get_distance(station_i, station_j)
-                
-                saving = d_depot_i + d_depot_j - d_i_j
-                if saving > 0:
-                    savings.append((station_i, station_j, saving))
-        
-        # Savings'i büyükten küçüğe sırala
-        savings.sort(key=lambda x: x[2], reverse=True)
+
+                saving = d_depot_i - row[j]
+                if (saving > 0) == positive:
+                    savings.append((i, j, saving))
+
         return savings
+
+    def _use_numpy(self, size: int) -> bool:
+        """NumPy yolu bu boyut için kullanılmalı mı?"""
+        return self.dist_array is not None and size >= self.NUMPY_MIN_NODES
+
+    def _calculate_savings_numpy(self, positive: bool = True) -> List[Tuple[int, int, float]]:
+        """
+        Tüm çiftler için kazancı tek bir broadcast ifadesiyle hesapla.
+
+        S[i, j] = D[i, 0] - D[i, j]; depo satır/sütunu ve köşegen hariç
+        tutulur, seçilen değerler argsort ile büyükten küçüğe sıralanır.
+        """
+        dist = self.dist_array
+        savings = dist[:, self.DEPOT:self.DEPOT + 1] - dist
+
+        valid = np.ones(savings.shape, dtype=bool)
+        valid[self.DEPOT, :] = False
+        valid[:, self.DEPOT] = False
+        np.fill_diagonal(valid, False)
+        valid &= (savings > 0) if positive else (savings <= 0)
+
+        rows, cols = np.nonzero(valid)
+        values = savings[rows, cols]
+        order = np.argsort(-values, kind="stable")
+        return list(zip(rows[order].tolist(), cols[order].tolist(), values[order].tolist()))
+
+    def _savings_queue(self, positive: bool = True) -> Iterator[Tuple[int, int, float]]:
+        """
+        Kazançları büyükten küçüğe üret.
+
+        NumPy yolunda liste zaten sıralı gelir; saf Python yolunda
+        max-heap'ten tembel olarak çekilir (erken durulursa tam sıralama
+        maliyeti ödenmez).
+
+        savings_noise > 0 ise sıra bozulmuş kazançlara göre belirlenir,
+        birleştirme kararı yine gerçek kazançla verilir.
+        """
+        savings = self._calculate_savings(positive)
+        noise = self.savings_noise
+        if noise <= 0 and self._use_numpy(len(self.nodes)):
+            yield from savings
+            return
+
+        if noise > 0:
+            uniform = self.rng.uniform
+            heap = [(-saving * (1 + uniform(-noise, noise)), i, j, saving) for i, j, saving in savings]
+        else:
+            heap = [(-saving, i, j, saving) for i, j, saving in savings]
+        heapq.heapify(heap)
+        while heap:
+            _, i, j, saving = heapq.heappop(heap)
+            yield i, j, saving
     
     def _get_station_demand(self, station_name: str) -> float:
         """İstasyondaki toplam kargo ağırlığı"""
         cargos = self.stations_with_cargo.get(station_name, [])
-        return sum(c.weight * c.quantity for c in cargos)
+        return sum(c.total_weight for c in cargos)
+
+    def _route_load(self, route: List[int]) -> float:
+        """Rotadaki toplam yük"""
+        demand = self.demand
+        return sum(demand[i] for i in route)
     
-    def _calculate_route_distance(self, route_stations: List[str]) -> float:
+    def _calculate_route_distance(self, route: List[int]) -> float:
         """
         Rota mesafesini hesapla.
         YENİ MANTIK: Araç ilk istasyondan başlar, diğer istasyonları ziyaret eder,
@@ -136,21 +661,27 @@ class ClarkeWrightVRP:
         Örnek: Darıca(başlangıç) -> Gölcük -> Umuttepe
         Mesafe = Darıca-Gölcük + Gölcük-Umuttepe
         """
-        if not route_stations:
+        if not route:
             return 0.0
+
+        if self._use_numpy(len(route)):
+            # Ardışık durak çiftleri üzerinden fancy-index toplamı
+            idx = np.asarray(route)
+            return float(self.dist_array[idx[:-1], idx[1:]].sum() + self.dist_array[idx[-1], self.DEPOT])
             
+        dist = self.dist
         total = 0.0
         
         # Duraklar arası mesafe
-        for i in range(len(route_stations) - 1):
-            total += get_distance(route_stations[i], route_stations[i + 1])
+        for i in range(len(route) - 1):
+            total += dist[route[i]][route[i + 1]]
         
         # Son duraktan Umuttepe'ye (depoya) mesafe
-        total += DEPOT_DISTANCES.get(route_stations[-1], 0)
+        total += dist[route[-1]][self.DEPOT]
         
         return total
     
-    def _find_optimal_start_station(self, stations: List[str]) -> str:
+    def _find_optimal_start_station(self, route: List[int]) -> int:
         """
         Rota için optimal başlangıç istasyonunu bul.
         
@@ -161,93 +692,34 @@ class ClarkeWrightVRP:
         Örnek: Gebze(48km), İzmit(5km), Derince(14km) varsa
         -> Gebze'den başla, İzmit'e uğra, Umuttepe'ye gel
         """
-        if not stations:
-            return DEPOT_NAME
+        if not route:
+            return self.DEPOT
         
-        if len(stations) == 1:
-            return stations[0]
+        if len(route) == 1:
+            return route[0]
         
         # Umuttepe'ye en uzak istasyonu bul
+        dist = self.dist
         max_distance = 0
-        best_start = stations[0]
+        best_start = route[0]
         
-        for station in stations:
-            dist = DEPOT_DISTANCES.get(station, 0)
-            if dist > max_distance:
-                max_distance = dist
-                best_start = station
+        for node in route:
+            d = dist[node][self.DEPOT]
+            if d > max_distance:
+                max_distance = d
+                best_start = node
         
         return best_start
     
-    def _find_optimal_start_positions(self, routes: List[List[str]]) -> List[str]:
+    def _find_optimal_start_positions(self, routes: List[List[int]]) -> List[int]:
         """
         Her rota için optimal başlangıç noktasını bul.
         Araçların hangi istasyondan başlaması toplam mesafeyi minimize eder?
-        """
-        optimal_starts = []
-        
-        for route in routes:
-            if not route:
-                optimal_starts.append(DEPOT_NAME)
-                continue
-            
-            # En uzak noktadan başlamak genelde daha iyi
-            # Çünkü araç dolu giderken uzağa, boşalırken depoya yaklaşır
-            max_distance = 0
-            best_start = route[0]
-            
-            for station in route:
-                dist = DEPOT_DISTANCES.get(station, 0)
-                if dist > max_distance:
-                    max_distance = dist
-                    best_start = station
-            
-            optimal_starts.append(best_start)
         
-        return optimal_starts
-    
-    def _split_route_by_capacity(self, route_stations: List[str], max_capacity: float) -> List[List[str]]:
-        """
-        Rotayı kapasite kısıtına göre böl.
-        Önce en ağır istasyonları ayır, sonra yakın istasyonları grupla.
+        En uzak noktadan başlamak genelde daha iyi
+        Çünkü araç dolu giderken uzağa, boşalırken depoya yaklaşır
         """
-        if not route_stations:
-            return []
-            
-        # İstasyon talepleri
-        station_demands = [(station, self._get_station_demand(station)) for station in route_stations]
-        station_demands.sort(key=lambda x: x[1], reverse=True)  # Ağır istasyonları öne al
-        
-        sub_routes = []
-        current_route = []
-        current_load = 0.0
-        
-        for station, demand in station_demands:
-            # Bu istasyon tek başına kapasite aşıyorsa, ayrı rota yap
-            if demand > max_capacity:
-                if current_route:
-                    sub_routes.append(current_route)
-                    current_route = []
-                    current_load = 0.0
-                sub_routes.append([station])  # Tek istasyonlu rota
-                continue
-                
-            # Mevcut rotaya sığar mı?
-            if current_load + demand <= max_capacity:
-                current_route.append(station)
-                current_load += demand
-            else:
-                # Yeni rota başlat
-                if current_route:
-                    sub_routes.append(current_route)
-                current_route = [station]
-                current_load = demand
-        
-        # Son rotayı ekle
-        if current_route:
-            sub_routes.append(current_route)
-            
-        return sub_routes
+        return [self._find_optimal_start_station(route) for route in routes]
     
     def _get_region_for_station(self, station: str) -> str:
         """
@@ -267,17 +739,18 @@ class ClarkeWrightVRP:
                 return region
         return "merkez"  # Default
     
-    def _calculate_route_compatibility(self, existing_stations: List[str], new_station: str) -> float:
+    def _calculate_route_compatibility(self, existing: List[int], new_node: int) -> float:
         """
         Yeni istasyonun mevcut rotayla ne kadar uyumlu olduğunu hesapla.
         Düşük skor = daha uyumlu
         """
-        if not existing_stations:
+        if not existing:
             return 0.0
         
         # 1. Bölge uyumu kontrolü
-        new_region = self._get_region_for_station(new_station)
-        existing_regions = [self._get_region_for_station(s) for s in existing_stations]
+        names = self.node_names
+        new_region = self._get_region_for_station(names[new_node])
+        existing_regions = [self._get_region_for_station(names[s]) for s in existing]
         
         # Farklı bölgeden ise ceza ver
         region_penalty = 0
@@ -299,19 +772,66 @@ class ClarkeWrightVRP:
         
         # 2. Mesafe uyumu - mevcut rotaya ne kadar uzaklık ekler?
         # En yakın istasyona mesafe
-        min_distance = min(get_distance(new_station, s) for s in existing_stations)
+        dist = self.dist
+        min_distance = min(dist[new_node][s] for s in existing)
         
         # 3. Umuttepe'ye göre yön uyumu
-        new_depot_dist = DEPOT_DISTANCES.get(new_station, 0)
-        avg_depot_dist = sum(DEPOT_DISTANCES.get(s, 0) for s in existing_stations) / len(existing_stations)
+        new_depot_dist = dist[new_node][self.DEPOT]
+        avg_depot_dist = sum(dist[s][self.DEPOT] for s in existing) / len(existing)
         direction_diff = abs(new_depot_dist - avg_depot_dist)
         
         # Toplam uyumsuzluk skoru
         return region_penalty + min_distance * 0.5 + direction_diff * 0.3
     
-    def _optimize_route_order(self, stations: List[str], start_station: str) -> List[str]:
+    def _optimize_route_order(self, route: List[int], deadline: Optional[float] = None,
+                              local_search: bool = True) -> List[int]:
         """
         Rota sırasını optimize et.
+
+        EXACT_ORDER_MAX_STOPS ve altındaki rotalar için Held-Karp DP ile
+        kesin en kısa açık yol (önbellekli). Daha uzun rotalarda açgözlü
+        sıralama ile birleştirme sırasının kısası alınır ve süre bütçesi
+        içinde 2-opt / Or-opt ile iyileştirilir. Saate bağlı sürelerde
+        mesafe sırası yakıt + süre maliyetiyle ayrıca iyileştirilir (zirve
+        saatte koridordan kaçan sıra kilometrece uzun olabilir). Zaman
+        kısıtı varsa başlangıç sırası pencereleri bozuyorsa uygun mevcut
+        sıradan başlanır ve 2-opt / Or-opt hamleleri gevşeklik dizileriyle
+        tek tek elenir; son sıra yine bir kez O(n) doğrulanır.
+        """
+        if len(route) <= 1:
+            return list(route)
+
+        exact = len(route) <= self.EXACT_ORDER_MAX_STOPS
+        if exact:
+            ordered = cached_held_karp_order(route, self.node_names, self.dist, self.DEPOT)
+        else:
+            start = self._find_optimal_start_station(route)
+            ordered = self._greedy_route_order(route, start)
+            if self._calculate_route_distance(route) < self._calculate_route_distance(ordered):
+                ordered = list(route)
+
+        time_model = self.time_model if self.time_constrained else None
+        if (time_model is not None and not self._route_schedule(ordered).feasible
+                and self._route_schedule(route).feasible):
+            ordered, exact = list(route), False
+        if local_search and not exact:
+            ordered = improve_route(ordered, self.dist, deadline, self.DEPOT,
+                                    time_model, self._fleet_shift())
+
+        if self.travel_times is not None and local_search:
+            if deadline is None:
+                deadline = deadline_from_budget(self.LOCAL_SEARCH_BUDGET_MS)
+            ordered = improve_route_by_cost(ordered, self._timed_route_cost, deadline)
+
+        # Mesafe sırası pencereleri bozuyorsa uygun olan mevcut sıra korunur
+        if (self.time_constrained and not self._route_schedule(ordered).feasible
+                and self._route_schedule(route).feasible):
+            return list(route)
+        return ordered
+
+    def _greedy_route_order(self, route: List[int], start: int) -> List[int]:
+        """
+        Açgözlü rota sırası (uzun rotalar için başlangıç çözümü).
         
         YENİ MANTIK: Başlangıç istasyonundan başla, 
         Umuttepe'ye doğru ilerleyecek şekilde sırala.
@@ -319,27 +839,28 @@ class ClarkeWrightVRP:
         Örnek: Gebze'den başla -> Dilovası -> Körfez -> Umuttepe
         (Umuttepe'ye giderek yaklaşan bir rota)
         """
-        if len(stations) <= 1:
-            return stations
+        if len(route) <= 1:
+            return route
         
-        if len(stations) == 2:
+        dist = self.dist
+        depot = self.DEPOT
+
+        if len(route) == 2:
             # 2 istasyon varsa, Umuttepe'ye uzak olanı öne al
-            dist0 = DEPOT_DISTANCES.get(stations[0], 0)
-            dist1 = DEPOT_DISTANCES.get(stations[1], 0)
-            if dist0 >= dist1:
-                return stations
+            if dist[route[0]][depot] >= dist[route[1]][depot]:
+                return route
             else:
-                return [stations[1], stations[0]]
+                return [route[1], route[0]]
         
         # Başlangıç istasyonunu öne al
-        remaining = [s for s in stations if s != start_station]
-        route = [start_station]
+        remaining = [s for s in route if s != start]
+        ordered = [start]
         
         # Nearest Neighbor - ama Umuttepe'ye yaklaşacak şekilde
         # Her adımda: ya en yakın istasyona git, ya da Umuttepe'ye yaklaş
         while remaining:
-            current = route[-1]
-            current_depot_dist = DEPOT_DISTANCES.get(current, 0)
+            current = ordered[-1]
+            current_depot_dist = dist[current][depot]
             
             # En iyi sonraki durağı bul
             best_next = None
@@ -347,8 +868,8 @@ class ClarkeWrightVRP:
             
             for candidate in remaining:
                 # Mesafe skoru: mevcut noktadan candidate'a mesafe
-                dist_to_candidate = get_distance(current, candidate)
-                candidate_depot_dist = DEPOT_DISTANCES.get(candidate, 0)
+                dist_to_candidate = dist[current][candidate]
+                candidate_depot_dist = dist[candidate][depot]
                 
                 # Skor: kısa mesafe + Umuttepe'ye yaklaşma bonusu
                 # Umuttepe'ye yaklaşıyorsa bonus ver
@@ -359,266 +880,907 @@ class ClarkeWrightVRP:
                     best_score = score
                     best_next = candidate
             
-            if best_next:
-                route.append(best_next)
+            if best_next is not None:
+                ordered.append(best_next)
                 remaining.remove(best_next)
         
         # Son kontrol: Rota Umuttepe'ye doğru mu gidiyor?
         # Son durak Umuttepe'ye en yakın olmalı
-        if len(route) > 2:
+        if len(ordered) > 2:
             # Son iki durağı kontrol et
-            last_dist = DEPOT_DISTANCES.get(route[-1], 0)
-            second_last_dist = DEPOT_DISTANCES.get(route[-2], 0)
+            last_dist = dist[ordered[-1]][depot]
+            second_last_dist = dist[ordered[-2]][depot]
             
             # Eğer son durak daha uzaksa, ters çevir
             if last_dist > second_last_dist:
                 # Sadece son kısmı değil, tamamını yeniden değerlendir
                 # Umuttepe mesafesine göre sırala (uzaktan yakına)
-                route_sorted = sorted(route, key=lambda s: DEPOT_DISTANCES.get(s, 0), reverse=True)
+                route_sorted = sorted(ordered, key=lambda s: dist[s][depot], reverse=True)
                 
                 # Eğer bu sıralama daha kısa mesafe veriyorsa kullan
-                old_dist = self._calculate_route_distance(route)
+                old_dist = self._calculate_route_distance(ordered)
                 new_dist = self._calculate_route_distance(route_sorted)
                 
                 if new_dist < old_dist:
-                    route = route_sorted
+                    ordered = route_sorted
         
-        return route
+        return ordered
     
-    def solve(self, allow_rental: bool = True, allow_multi_trip: bool = True) -> RoutingResult:
+    # ============================================
+    # FİLO FİZİBİLİTESİ (Hall koşulu)
+    # ============================================
+
+    def _fleet_levels(self, allow_rental: bool, allow_multi_trip: bool = False) -> List[Tuple[float, float, int]]:
         """
-        ÖNCE KAPASİTE, SONRA COĞRAFİ OPTİMİZASYON:
-        1. Tüm mevcut araçları maksimum doldur (First Fit Decreasing)
-        2. Coğrafi uyum sadece sıralama için kullanılsın
-        3. Sadece gerçekten taşamayan kargo için kiralık araç
+        Kapasite seviyeleri ve her seviyenin üstünde kapasitesi olan araç sayısı.
+
+        Her rota tek bir araca gider ve bir rota ancak yükünden büyük/eşit
+        kapasiteli araca sığar. Uygun araç kümeleri iç içe olduğu için
+        atamanın yapılabilmesi şu koşula denktir:
+
+            her c seviyesi için: #(yük > c olan rota) <= #(kapasite > c olan araç)
+
+        Multi-trip açıksa bir araç birden fazla sefer yapabildiği için
+        kapasitesinin altındaki seviyelerde araç sayısı sonsuz sayılır.
+        Günlük mesafe limiti burada sayılmaz; limite sığmayan sefer
+        _assign_vehicles'ta boş kalan / limiti dolmamış araçlara veya
+        kiralık araçlara bölünür.
+
+        Returns:
+            [(seviye, araç_sayısı, özmal_araç_sayısı), ...] - kiralık araçlar
+            (araç sayısı sınırı yoksa) sonsuz sayılır
+        """
+        capacities = [v["capacity"] for v in self.vehicles]
+        levels = set(capacities) | {0}
+        if allow_rental:
+            levels.add(self.RENTAL_CAPACITY)
+        reusable_capacity = max(capacities, default=0) if allow_multi_trip else 0
+        rental_slots = float("inf") if self.rental_limit is None else self.rental_limit
+
+        fleet_levels = []
+        for level in sorted(levels):
+            owned = sum(1 for c in capacities if c > level)
+            if reusable_capacity > level:
+                fleet_levels.append((level, float("inf"), owned))
+            elif allow_rental and self.RENTAL_CAPACITY > level:
+                fleet_levels.append((level, owned + rental_slots, owned))
+            else:
+                fleet_levels.append((level, owned, owned))
+        return fleet_levels
+
+    def _fleet_state(self, routes_above: List[int], fleet_levels: List[Tuple[float, float, int]]) -> Tuple[int, int]:
+        """
+        Mevcut rota yükleri için (ihlal, gereken kiralık araç) çifti.
+
+        ihlal: hiçbir araca atanamayacak rota sayısı (seviyelerdeki en büyük
+               Hall açığı; iç içe araç kümelerinde eşleşme açığı budur)
+        kiralık: özmal araçlara ilk sefer olarak sığmayıp kiralık araca veya
+                 ek sefere kalan rota sayısı
+        """
+        violation = 0
+        rentals = 0
+        for count, (_, vehicle_count, owned_count) in zip(routes_above, fleet_levels):
+            violation = max(violation, count - vehicle_count)
+            if vehicle_count > owned_count:
+                rentals = max(rentals, count - owned_count)
+        return violation, rentals
+
+    def _merge_routes(self, allow_rental: bool, allow_multi_trip: bool = False) -> List[List[int]]:
+        """
+        Clarke-Wright birleştirme fazı (heap tabanlı).
+
+        Başlangıçta her istasyon tek duraklı bir açık rotadır. Kazançlar
+        max-heap'ten sırayla çekilir; i bir rotanın SON durağı, j başka bir
+        rotanın İLK durağı ise ve birleşik yük filoya atanabiliyorsa
+        rotalar birleştirilir. Rota uçları indeks dizileriyle takip edildiği
+        için her kontrol O(1), toplam süre O(n² log n).
+
+        Kapasitesi her araçtan büyük istasyonlar birleştirmeye katılmaz.
+
+        Özmal filoyu aşan her ek rota bir kiralama ücretine (multi-trip
+        açıksa tahmini boş dönüş mesafesine) mal olur; birleştirme kazancı
+        bu ceza ile birlikte değerlendirilir.
+
+        Zaman kısıtı varsa her rotanın çizelgesi tutulur; j'nin rotasını
+        i'nin arkasına eklemenin pencere / vardiya uygunluğu O(1) kontrol
+        edilir.
+        """
+        fleet_levels = self._fleet_levels(allow_rental, allow_multi_trip)
+        extra_route_cost = self._extra_route_cost(allow_rental, allow_multi_trip)
+        max_capacity = self._max_capacity(allow_rental)
+
+        # Rota yapıları: rota_id -> duraklar / yük, düğüm -> rota_id
+        # (rota_id, rotanın ilk düğümünün indeksidir)
+        routes: Dict[int, List[int]] = {}
+        loads: Dict[int, float] = {}
+        route_of: List[Optional[int]] = [None] * len(self.node_names)
+
+        for node in self.nodes:
+            routes[node] = [node]
+            loads[node] = self.demand[node]
+            route_of[node] = node
+
+        schedules: Optional[Dict[int, RouteSchedule]] = None
+        if self.time_constrained:
+            schedules = {node: self._route_schedule([node]) for node in self.nodes}
+
+        routes_above = [
+            sum(1 for load in loads.values() if load > level)
+            for level, _, _ in fleet_levels
+        ]
+        violation, rentals = self._fleet_state(routes_above, fleet_levels)
+
+        def try_merge(i: int, j: int, saving: float) -> bool:
+            nonlocal violation, rentals
+            ri = route_of[i]
+            rj = route_of[j]
+            if ri is None or rj is None or ri == rj:
+                return False
+            # i rotanın sonu, j rotanın başı olmalı
+            if routes[ri][-1] != i or routes[rj][0] != j:
+                return False
+
+            load_i, load_j = loads[ri], loads[rj]
+            merged_load = load_i + load_j
+            if merged_load > max_capacity:
+                return False
+            if schedules is not None and not self.time_model.can_append(schedules[ri], schedules[rj]):
+                return False
+
+            new_above = [
+                count + (merged_load > level) - (load_i > level) - (load_j > level)
+                for count, (level, _, _) in zip(routes_above, fleet_levels)
+            ]
+            new_violation, new_rentals = self._fleet_state(new_above, fleet_levels)
+            if new_violation > violation:
+                return False
+            if new_violation == violation:
+                gain = saving + (rentals - new_rentals) * extra_route_cost
+                if gain <= 0:
+                    return False
+
+            # Birleştir: j'nin rotası i'nin rotasının arkasına eklenir
+            for node in routes[rj]:
+                route_of[node] = ri
+            routes[ri].extend(routes.pop(rj))
+            loads[ri] = merged_load
+            del loads[rj]
+            if schedules is not None:
+                del schedules[rj]
+                schedules[ri] = self._route_schedule(routes[ri])
+            routes_above[:] = new_above
+            violation, rentals = new_violation, new_rentals
+            return True
+
+        # Faz 1: pozitif kazançlar
+        for i, j, saving in self._savings_queue():
+            try_merge(i, j, saving)
+
+        # Faz 2: araç yetmiyorsa veya kiralık gerekiyorsa, negatif kazançlı
+        # birleştirmelerle rota sayısını düşür
+        if violation > 0 or rentals > 0:
+            for i, j, saving in self._savings_queue(positive=False):
+                try_merge(i, j, saving)
+                if violation == 0 and rentals == 0:
+                    break
+
+        return list(routes.values())
+
+    def _extra_route_cost(self, allow_rental: bool, allow_multi_trip: bool) -> float:
+        """Özmal filoya sığmayan bir rotanın tahmini ek maliyeti."""
+        if allow_multi_trip and self.vehicles and self.nodes:
+            # Ek sefer: Umuttepe'den rotanın başına boş gidiş (ortalama)
+            average_deadhead = sum(self.dist[self.DEPOT][i] for i in self.nodes) / len(self.nodes)
+            cost = average_deadhead * self.FUEL_COST_PER_KM
+            return min(cost, self.RENTAL_COST) if allow_rental else cost
+        return self.RENTAL_COST
+
+    def _assign_vehicles(self, routes: List[List[int]], allow_rental: bool,
+                         allow_multi_trip: bool = False) -> Tuple[List[Tuple[Dict, List[int]]], List[List[int]]]:
+        """
+        Rotaları araçlara (ve multi-trip açıksa seferlere) ata.
+
+        1. En ağır rota önce; her rota kendisine sığan en küçük boş araca
+           ilk sefer olarak gider.
+        2. Kalan rotalar için en ucuz seçenek: kullanılan bir aracın ek
+           seferi (Umuttepe'den rota başına boş gidiş, günlük limit dahilinde)
+           veya yeni kiralık araç. Kiralık araç da sonraki seferlerde
+           yeniden kullanılabilir.
+        3. Hiçbirine sığmayan rota, hâlâ sefer alabilecek daha küçük bir
+           araç (boş araç, günlük limiti dolmamış araç veya kiralık) varsa
+           onun kapasitesine bölünür (_split_route) ve parçalar 2. adımdan
+           geçer; rota bütünüyle düşürülmez.
+
+        Aynı araca düşen rotalar aynı araç sözlüğünü paylaşır; sefer
+        sırası _sequence_trips ile belirlenir. Zaman kısıtı varsa araç
+        ancak seferleri penceresine ve vardiyasına uyuyorsa seçilir.
+
+        Returns:
+            ([(araç, rota), ...], [atanamayan_rota, ...])
+        """
+        depot_row = self.dist[self.DEPOT]
+        slots = [
+            self._new_trip_slot(v)
+            for v in sorted(self.vehicles, key=lambda v: (v["capacity"], v.get("rental_cost", 0)))
+        ]
+        assignments = []
+        unassigned = []
+        pending = []
+
+        loaded_routes = sorted(((self._route_load(r), r) for r in routes), key=lambda x: -x[0])
+
+        # 1) İlk seferler
+        for load, route in loaded_routes:
+            km = self._calculate_route_distance(route)
+            slot = next(
+                (s for s in slots
+                 if not s["trips"] and s["vehicle"]["capacity"] >= load
+                 and self._vehicle_time_ok(s["vehicle"], [route])),
+                None
+            )
+            if slot is None:
+                pending.append((load, route, km))
+                continue
+            self._add_trip(slot, km, depot_row[route[0]])
+            slot["routes"].append(route)
+            assignments.append((slot["vehicle"], route))
+
+        # 2) Ek seferler / kiralık araçlar (3: sığmayan rota bölünüp sona eklenir)
+        rental_idx = 0
+        for load, route, km in pending:
+            deadhead = self.dist[self.DEPOT][route[0]]   # Bölme tabloları yeniler
+            best_cost = float("inf")
+            best_slot = None
+
+            for slot in slots:
+                if slot["vehicle"]["capacity"] < load:
+                    continue
+                if not slot["trips"]:
+                    # Bölünmüş rotanın parçası boş kalan araca ilk sefer olabilir
+                    if self._vehicle_time_ok(slot["vehicle"], [route]):
+                        best_cost, best_slot = 0.0, slot
+                        break
+                    continue
+                if not allow_multi_trip:
+                    continue
+                extra = self._extra_deadhead(slot, deadhead)
+                if slot["km"] + km + extra > slot["limit"]:
+                    continue
+                if self.time_constrained and not self._vehicle_time_ok(
+                        slot["vehicle"], self._order_trips(slot["vehicle"], slot["routes"] + [route])):
+                    continue
+                if extra * self.FUEL_COST_PER_KM < best_cost:
+                    best_cost = extra * self.FUEL_COST_PER_KM
+                    best_slot = slot
+
+            rental_open = allow_rental and (self.rental_limit is None or rental_idx < self.rental_limit)
+            if rental_open and load <= self.RENTAL_CAPACITY and self.RENTAL_COST < best_cost:
+                rental = {
+                    "id": 999 + rental_idx + 1,
+                    "capacity": self.RENTAL_CAPACITY,
+                    "is_rented": True,
+                    "rental_cost": self.RENTAL_COST,
+                }
+                if self._vehicle_time_ok(rental, [route]):
+                    rental_idx += 1
+                    best_slot = self._new_trip_slot(rental)
+                    slots.append(best_slot)
+
+            if best_slot is None:
+                capacity = self._piece_capacity(slots, load, rental_open, allow_multi_trip)
+                if capacity is None:
+                    unassigned.append(route)
+                    continue
+                pieces, leftover = self._split_route(route, capacity)
+                if leftover:
+                    unassigned.append(leftover)
+                pending.extend(
+                    (self._route_load(piece), piece, self._calculate_route_distance(piece))
+                    for piece in pieces
+                )
+                continue
+            self._add_trip(best_slot, km, deadhead)
+            best_slot["routes"].append(route)
+            assignments.append((best_slot["vehicle"], route))
+
+        return assignments, unassigned
+
+    def _piece_capacity(self, slots: List[Dict], load: float, rental_open: bool,
+                        allow_multi_trip: bool) -> Optional[float]:
+        """
+        Atanamayan rota bölünecekse parça kapasitesi: yükten küçük ve hâlâ
+        sefer alabilecek (boş, multi-trip'te günlük limiti dolmamış veya
+        kiralanabilir) en büyük araç kapasitesi. Parçalar her bölmede
+        küçüldüğü için bölme sonlanır.
+
+        Returns:
+            Kapasite (None: bölmek işe yaramaz)
+        """
+        capacities = [
+            slot["vehicle"]["capacity"] for slot in slots
+            if not slot["trips"] or (allow_multi_trip and slot["km"] < slot["limit"])
+        ]
+        if rental_open:
+            capacities.append(self.RENTAL_CAPACITY)
+        capacities = [capacity for capacity in capacities if 0 < capacity < load]
+        return max(capacities, default=None)
+
+    def _split_route(self, route: List[int], capacity: float) -> Tuple[List[List[int]], List[int]]:
+        """
+        Araca atanamayan rotayı capacity'ye sığan rotalara böl.
+
+        Kapasiteyi aşan ziyaretler kargo düzeyinde yeni ziyaretlere
+        bölünür (_add_visits); ziyaretler ağırdan hafife ilk uyan kutuya
+        yerleştirilir ve her kutunun sırası yeniden kurulur. Tek başına
+        capacity'yi aşan kargolar ayrı bir ziyarette kalır.
+
+        Returns:
+            ([rota, ...], sığmayan_kargoların_düğümleri)
+        """
+        nodes: List[int] = []
+        leftover: List[int] = []
+        for node in route:
+            if self.demand[node] <= capacity:
+                nodes.append(node)
+                continue
+            cargos = self.node_cargos[node]
+            visits, unplaced = self._fill_visits(cargos, capacity)
+            parts = visits + ([unplaced] if unplaced else [])
+            added = self._add_visits(node, parts)
+            nodes.extend(added[:len(visits)])
+            leftover.extend(added[len(visits):])
+
+        bins: List[Tuple[float, List[int]]] = []
+        for node in sorted(nodes, key=lambda n: -self.demand[n]):
+            for k, (load, members) in enumerate(bins):
+                if load + self.demand[node] <= capacity:
+                    members.append(node)
+                    bins[k] = (load + self.demand[node], members)
+                    break
+            else:
+                bins.append((self.demand[node], [node]))
+
+        pieces = [self._optimize_route_order(members, local_search=False) for _, members in bins]
+        return pieces, leftover
+
+    def _add_visits(self, node: int, parts: List[List[Cargo]]) -> List[int]:
+        """
+        Düğümün kargolarını parçalara ayır: ilk parça düğümde kalır,
+        diğerleri aynı istasyonun yeni ziyaretleri olarak sona eklenir.
+        Mevcut düğüm indeksleri değişmez; tablolar _set_visits ile yeniden
+        kurulur.
+
+        Returns:
+            Parçaların düğümleri (parts sırasıyla)
+        """
+        if len(parts) == 1:
+            return [node]
+        station = self.node_names[node]
+        visits = list(zip(self.node_names[1:], self.node_cargos[1:]))
+        visits[node - 1] = (station, parts[0])
+        visits.extend((station, part) for part in parts[1:])
+        first_new = len(self.node_names)
+        bins = self.node_bins
+        self._set_visits(visits)
+        if bins:
+            self.node_bins = bins + [bins[node]] * (len(parts) - 1)
+        self.route_split_visits += len(parts) - 1
+        return [node] + list(range(first_new, first_new + len(parts) - 1))
+
+    def _new_trip_slot(self, vehicle: Dict) -> Dict:
+        """Bir aracın günlük sefer durumu (hızlı fizibilite için)."""
+        return {
+            "vehicle": vehicle,
+            "limit": vehicle.get("max_daily_distance") or self.MAX_DAILY_DISTANCE_KM,
+            "trips": 0,
+            "km": 0.0,
+            "deadhead_sum": 0.0,
+            "deadhead_max": 0.0,
+            "routes": [],
+        }
+
+    @staticmethod
+    def _extra_deadhead(slot: Dict, deadhead: float) -> float:
+        """
+        Araca yeni sefer eklemenin ek boş gidiş mesafesi - O(1).
+
+        İlk sefer boş gidişsizdir ve en uzak başlangıçlı rota ilk sefer
+        yapılır; toplam boş gidiş = toplam - en büyük.
+        """
+        if not slot["trips"]:
+            return 0.0
+        new_total = slot["deadhead_sum"] + deadhead - max(slot["deadhead_max"], deadhead)
+        return new_total - (slot["deadhead_sum"] - slot["deadhead_max"])
+
+    def _add_trip(self, slot: Dict, km: float, deadhead: float) -> None:
+        """Sefer durumunu güncelle."""
+        slot["km"] += km + self._extra_deadhead(slot, deadhead)
+        slot["trips"] += 1
+        slot["deadhead_sum"] += deadhead
+        slot["deadhead_max"] = max(slot["deadhead_max"], deadhead)
+
+    def _sequence_trips(self, assignments: List[Tuple[Dict, List[int]]]) -> List[Tuple[Dict, List[int], int, float]]:
+        """
+        Her aracın seferlerini sırala ve boş gidişleri hesapla.
+
+        Umuttepe'ye en uzak başlayan rota ilk sefer olur (araç zaten
+        oradadır); sonraki seferler Umuttepe'den rota başına boş gider.
+
+        Returns:
+            [(araç, rota, sefer_no, boş_gidiş_km), ...]
+        """
+        depot_row = self.dist[self.DEPOT]
+        by_vehicle: Dict[int, Tuple[Dict, List[List[int]]]] = {}
+        for vehicle, route in assignments:
+            by_vehicle.setdefault(id(vehicle), (vehicle, []))[1].append(route)
+
+        sequenced = []
+        for vehicle, routes in by_vehicle.values():
+            for number, route in enumerate(self._order_trips(vehicle, routes), start=1):
+                deadhead = depot_row[route[0]] if number > 1 else 0.0
+                sequenced.append((vehicle, route, number, deadhead))
+        return sequenced
+
+    def _order_trips(self, vehicle: Dict, routes: List[List[int]]) -> List[List[int]]:
+        """
+        Aracın seferlerinin sırası: en uzak başlangıç önce. Bu sıra
+        pencereleri bozuyorsa en geç başlama anı en erken olan sefer önce
+        (EDD) denenir.
+        """
+        depot_row = self.dist[self.DEPOT]
+        ordered = sorted(routes, key=lambda route: -depot_row[route[0]])
+        if len(ordered) < 2 or self._vehicle_time_ok(vehicle, ordered):
+            return ordered
+        by_deadline = sorted(routes, key=lambda route: self._route_schedule(route).latest[0])
+        return by_deadline if self._vehicle_time_ok(vehicle, by_deadline) else ordered
+
+    def _daily_limits_ok(self, sequenced: List[Tuple[Dict, List[int], int, float]]) -> bool:
+        """
+        Birden fazla sefer yapan her aracın günlük toplam mesafesi limit
+        içinde mi? Zaman kısıtı varsa her aracın seferleri pencerelere ve
+        vardiyaya da uymalı.
+        """
+        totals: Dict[int, List] = {}
+        for vehicle, route, number, deadhead in sequenced:
+            entry = totals.setdefault(id(vehicle), [vehicle, 0.0, 0, []])
+            entry[1] += self._calculate_route_distance(route) + deadhead
+            entry[2] = max(entry[2], number)
+            entry[3].append((number, route))
+        for vehicle, km, trips, routes in totals.values():
+            if trips > 1 and km > (vehicle.get("max_daily_distance") or self.MAX_DAILY_DISTANCE_KM) + 1e-9:
+                return False
+            if self.time_constrained and not self._vehicle_time_ok(
+                    vehicle, [route for _, route in sorted(routes, key=lambda trip: trip[0])]):
+                return False
+        return True
+
+    def _candidate_neighbors(self) -> Dict[int, List[int]]:
+        """
+        Rotalar arası hamlelerin aday listeleri. Büyük örneklerde tüm
+        satırları sıralamak yerine mekânsal ızgaradan aday alınır;
+        koordinatı bilinmeyen ziyaret varsa matris taranır.
+        """
+        if len(self.nodes) >= self.SPATIAL_CANDIDATE_MIN_NODES:
+            points = self.distance_provider.planar_points(self.node_names)
+            if points is not None:
+                return candidate_lists(points, self.nodes, self.dist, self.GRANULAR_NEIGHBORS)
+        return nearest_neighbors(self.dist, self.nodes, self.GRANULAR_NEIGHBORS)
+
+    def _improve_between_vehicles(self, assignments: List[Tuple[Dict, List[int]]],
+                                  deadline: Optional[float]) -> List[Tuple[Dict, List[int]]]:
+        """
+        Atanmış rotalar arasında istasyon taşı/değiştir.
+
+        Kapasite her rotanın atandığı aracın kapasitesine göre kontrol
+        edilir; tamamen boşalan rotanın aracı (kiralıksa ücretiyle
+        birlikte) plandan çıkar. Kiralama ücreti yalnızca tek seferli
+        kiralık aracın rotasında kazanç sayılır: çok seferli araçta bir
+        seferin boşalması ücreti düşürmez. Zaman kısıtı varsa her hamle
+        iki seferin gevşeklik dizileriyle kontrol edilir (bkz.
+        _trip_windows). Değişen rotalar tekrar 2-opt / Or-opt'tan geçirilir.
+        """
+        vehicles = [vehicle for vehicle, _ in assignments]
+        routes = [route for _, route in assignments]
+        neighbors = self._candidate_neighbors()
+
+        trips: Dict[int, int] = {}
+        for vehicle in vehicles:
+            trips[id(vehicle)] = trips.get(id(vehicle), 0) + 1
+        fixed_costs = [
+            vehicle.get("rental_cost", 0) if trips[id(vehicle)] == 1 else 0.0
+            for vehicle in vehicles
+        ]
+
+        new_routes = improve_inter_route(
+            routes,
+            capacities=[v["capacity"] for v in vehicles],
+            demand=self.demand,
+            dist=self.dist,
+            neighbors=neighbors,
+            fixed_costs=fixed_costs,
+            deadline=deadline,
+            depot=self.DEPOT,
+            time_models=[self._time_model_for(v) for v in vehicles] if self.time_constrained else None,
+            shifts=self._trip_windows(vehicles, routes) if self.time_constrained else None,
+        )
+
+        improved = []
+        for vehicle, old_route, route in zip(vehicles, routes, new_routes):
+            if not route:
+                continue
+            if route != old_route:
+                route = self._optimize_route_order(route, deadline)
+            improved.append((vehicle, route))
+        return improved
+
+    def _trip_windows(self, vehicles: List[Dict], routes: List[List[int]]) -> List[Tuple[float, float]]:
+        """
+        Her seferin (başlangıç, en geç dönüş) anları.
+
+        Sefer, aracın sıralı seferlerindeki başlangıcında başlar; ardından
+        sefer varsa onun ilk durağına latest[0]'da yetişecek kadar erken
+        Umuttepe'de olmalıdır, son sefer vardiya bitişine kadar sürebilir.
+        Hamleler diğer seferleri de kaydırabildiği için araç seferlerinin
+        kesin kontrolü yine iyileştirmenin sonunda yapılır.
+        """
+        indices: Dict[int, List[int]] = {}
+        for index, vehicle in enumerate(vehicles):
+            indices.setdefault(id(vehicle), []).append(index)
+
+        windows: List[Tuple[float, float]] = [(0.0, 0.0)] * len(routes)
+        for members in indices.values():
+            vehicle = vehicles[members[0]]
+            model = self._time_model_for(vehicle)
+            _, end = self._shift(vehicle)
+            index_of = {id(routes[k]): k for k in members}
+            ordered = self._order_trips(vehicle, [routes[k] for k in members])
+            schedules = self._trip_schedules(vehicle, ordered)
+            for number, (route, schedule) in enumerate(zip(ordered, schedules)):
+                back_by = end
+                if number + 1 < len(schedules):
+                    following = schedules[number + 1]
+                    back_by = model.depart_by(self.DEPOT, following.route[0], following.latest[0])
+                windows[index_of[id(route)]] = (schedule.start_time, back_by)
+        return windows
+
+    def _build_vehicle_route(self, vehicle: Dict, route: List[int], trip_number: int = 1,
+                             deadhead: float = 0.0,
+                             schedule: Optional[RouteSchedule] = None) -> VehicleRoute:
+        """
+        Araç ve düğüm sırasından VehicleRoute oluştur (isimler burada geri çevrilir).
+
+        Boş gidiş mesafesi toplam mesafeye ve yakıta eklenir; kiralama
+        ücreti yalnızca aracın ilk seferine yazılır.
+
+        Args:
+            schedule: Seferin çizelgesi (None: vardiya başında tek sefer)
+        """
+        if schedule is None:
+            schedule = self._trip_schedules(vehicle, [route])[0]
+        model = self._time_model_for(vehicle)
+        names = self.node_names
+        start_station = names[route[0]]
+        distance = self._calculate_route_distance(route) + deadhead
+        fuel_cost = distance * self.FUEL_COST_PER_KM
+        rental_cost = vehicle.get("rental_cost", 0) if trip_number == 1 else 0
+
+        stops = []
+        for k, node in enumerate(route):
+            station = names[node]
+            stops.append(RouteStop(
+                station_name=station,
+                cargo_ids=[c.id for c in self.node_cargos[node]],
+                total_weight=self.demand[node],
+                coords=self.distance_provider.coords(station),
+                arrival_time=schedule.arrival[k],
+                service_start=schedule.earliest[k],
+                window=model.windows[node],
+                slack=schedule.latest[k] - schedule.earliest[k],
+            ))
+
+        start_time = schedule.start_time
+        if trip_number > 1:
+            start_time = model.depart_by(self.DEPOT, route[0], start_time)
+        duration = schedule.end_time - start_time
+        time_cost = self._time_cost(duration)
+
+        return VehicleRoute(
+            vehicle_id=vehicle["id"],
+            vehicle_capacity=vehicle["capacity"],
+            is_rented=vehicle.get("is_rented", False),
+            rental_cost=rental_cost,
+            start_station=start_station,
+            stops=stops,
+            total_distance=distance,
+            fuel_cost=fuel_cost,
+            time_cost=time_cost,
+            total_cost=fuel_cost + rental_cost + time_cost,
+            trip_number=trip_number,
+            deadhead_distance=deadhead,
+            start_time=start_time,
+            end_time=schedule.end_time,
+            duration_minutes=duration,
+            time_feasible=schedule.feasible
+        )
+
+    def solve(self, allow_rental: bool = True, allow_multi_trip: bool = True,
+              time_budget_ms: Optional[float] = None,
+              max_vehicles: Optional[int] = None,
+              departure_time=None) -> RoutingResult:
+        """
+        Clarke-Wright Savings ile açık rota (Umuttepe'de biten) VRP çözümü:
+        1. Kazanç heap'inden kapasite ve filo uygun birleştirmeler
+        2. Rota sırası: kısa rotalarda Held-Karp ile kesin sıra, uzun
+           rotalarda süre bütçesi içinde 2-opt / Or-opt iyileştirmesi
+        3. Rotaları en küçük uygun araca ata; kalanlar için ek sefer
+           (allow_multi_trip) veya kiralık araç
+
+        Args:
+            time_budget_ms: İyileştirme fazı için süre bütçesi
+                            (None: LOCAL_SEARCH_BUDGET_MS, 0: kapalı)
+            max_vehicles: Kullanılabilecek en fazla araç (kiralık dahil);
+                          sığmayan kargolar unassigned_cargos'a ertelenir
+            departure_time: Kalkış saati ("HH:MM"); verilirse sürüş süreleri
+                            saate bağlı tablodan gelir ve sefer süresi
+                            DRIVER_COST_PER_MINUTE ile maliyete eklenir
         """
-        result = RoutingResult(success=False)
-        
         if not self.cargos:
-            result.success = True
-            result.message = "Taşınacak kargo bulunmuyor."
-            return result
+            return RoutingResult(success=True, message="Taşınacak kargo bulunmuyor.")
+
+        self._set_departure(departure_time)
+        allow_rental = self._limit_fleet(max_vehicles, allow_rental, allow_multi_trip)
+        self.allow_rental = allow_rental
+        self.allow_multi_trip = allow_multi_trip
+        result = self._prepare_result(allow_rental)
+        sequenced, unassigned = self._construct(allow_rental, allow_multi_trip, time_budget_ms)
+        return self._finish_result(result, sequenced, unassigned)
+
+    def _lower_bound(self, nodes: List[int]) -> float:
+        """
+        Verilen ziyaretleri taşıyan her planın maliyeti için alt sınır:
+        MST / ardıl mesafe sınırı + kaçınılmaz kiralama ücreti (çoklu
+        seferde: kiralama veya en kısa boş gidiş).
+        """
+        demands = [self.demand[node] for node in nodes]
+        max_capacity = self._max_capacity(self.allow_rental)
+        rentals = rental_lower_bound(
+            demands,
+            owned_capacities=[v["capacity"] for v in self.vehicles],
+            max_capacity=max_capacity,
+            rental_capacity=self.RENTAL_CAPACITY,
+            allow_rental=self.allow_rental,
+            allow_multi_trip=self.allow_multi_trip,
+        )
+        fixed = rentals * self.RENTAL_COST
+
+        if self.allow_multi_trip and nodes:
+            extra_routes = extra_route_lower_bound(demands, len(self.vehicles), max_capacity)
+            per_route = min(self.dist[self.DEPOT][node] for node in nodes) * self.FUEL_COST_PER_KM
+            if self.allow_rental:
+                per_route = min(per_route, self.RENTAL_COST)
+            fixed += extra_routes * per_route
+
+        distance = distance_lower_bound(nodes, self.dist, self.DEPOT)
+        bound = distance * self.FUEL_COST_PER_KM + fixed
+        if self.travel_times is not None:
+            # Tablo serbest akıştan (en hızlı araç) kısa süre vermez
+            model = self.time_model
+            bound += self._time_cost(distance * model.minutes_per_km
+                                     + sum(model.service[node] for node in nodes))
+        return bound
+
+    def _prepare_result(self, allow_rental: bool) -> RoutingResult:
+        """Ziyaretleri hazırla; bölme ve kapasite eksikliği uyarılarını yaz."""
+        result = RoutingResult(success=False)
+
+        # Kiralama kapalıysa en büyük araç küçülebilir: ziyaretleri yeniden böl
+        max_capacity = self._max_capacity(allow_rental)
+        if max_capacity != self.split_capacity:
+            self._build_nodes(max_capacity)
+        self._balance_visits(allow_rental, self.allow_multi_trip)
+
+        extra_visits = len(self.nodes) - len(set(self.node_names[1:]))
+        if extra_visits > 0:
+            result.warnings.append(f"{extra_visits} ek ziyaret: kapasiteyi aşan istasyonlar bölündü")
+
+        result.unassigned_cargos = list(self.unplaced_cargos)
+        for cargo in self.unplaced_cargos:
+            result.warnings.append(
+                f"UYARI: {cargo.station_name} kargosu #{cargo.id} yerleştirilemedi ({cargo.total_weight:.0f} kg)"
+            )
+
+        if self.deferred_cargos:
+            result.unassigned_cargos.extend(self.deferred_cargos)
+            result.cargo_selection = {
+                "max_vehicles": self.max_vehicles,
+                "deferred_count": len(self.deferred_cargos),
+                **self.selection_stats,
+            }
+            result.warnings.append(
+                f"Araç limiti ({self.max_vehicles}): {len(self.deferred_cargos)} kargo "
+                f"({self.selection_stats['deferred_weight']:.0f} kg) ertelendi"
+            )
         
         # Toplam talep ve kapasite hesapla
-        total_demand = sum(self._get_station_demand(s) for s in self.stations_with_cargo)
+        total_demand = sum(self.demand)
         total_capacity = sum(v["capacity"] for v in self.vehicles)
         
         # Kapasite eksikliği varsa kaç kiralık araç gerektiğini hesapla
         shortage = max(0, total_demand - total_capacity)
         if shortage > 0:
-            rental_needed = int(shortage // self.RENTAL_CAPACITY) + (1 if shortage % self.RENTAL_CAPACITY > 0 else 1)
+            rental_needed = math.ceil(shortage / self.RENTAL_CAPACITY)
             result.needs_rental = True
             result.rental_count_needed = rental_needed
             result.warnings.append(f"Kapasite eksik: {shortage:.0f} kg, {rental_needed} kiralık araç gerekli")
-        
+
+        return result
+
+    def _construct(self, allow_rental: bool, allow_multi_trip: bool,
+                   time_budget_ms: Optional[float]) -> Tuple[List[Tuple[Dict, List[int], int, float]], List[int]]:
+        """
+        Adım 1-3: birleştirme, rota sırası ve araç ataması.
+
+        Returns:
+            ([(araç, rota, sefer_no, boş_gidiş_km), ...], atanamayan_düğümler)
+        """
         # ============================================
-        # ADIM 1: İstasyonları ağırlığa göre sırala (FFD - First Fit Decreasing)
+        # ADIM 1: Clarke-Wright birleştirme
         # ============================================
-        station_list = []
-        for station_name, cargos in self.stations_with_cargo.items():
-            demand = self._get_station_demand(station_name)
-            cargo_ids = [c.id for c in cargos]
-            station_list.append({
-                "station": station_name,
-                "demand": demand,
-                "cargo_ids": cargo_ids,
-                "assigned": False,
-                "region": self._get_region_for_station(station_name),
-                "depot_distance": DEPOT_DISTANCES.get(station_name, 0)
-            })
-        
-        # AĞIRLIĞA GÖRE SIRALA (en ağır önce) - First Fit Decreasing
-        station_list.sort(key=lambda x: -x["demand"])
-        
+        merged_routes = self._merge_routes(allow_rental, allow_multi_trip)
+
         # ============================================
-        # ADIM 2: FIRST FIT DECREASING - Mevcut araçlara at
+        # ADIM 2: Rota sırasını iyileştir
         # ============================================
-        assigned_routes: List[VehicleRoute] = []
-        
-        # Araçları kapasiteye göre sırala (büyükten küçüğe)
-        available_vehicles = sorted(self.vehicles, key=lambda v: v["capacity"], reverse=True)
-        
-        # Her araç için bir "kutu" oluştur
-        vehicle_bins = []
-        for v in available_vehicles:
-            vehicle_bins.append({
-                "vehicle": v,
-                "stations": [],
-                "current_load": 0.0,
-            })
-        
-        # HER İSTASYONU SIRAYLA ATA (FIRST FIT)
-        for station_info in station_list:
-            station_demand = station_info["demand"]
-            placed = False
-            
-            # İlk sığan araca at (First Fit)
-            for vbin in vehicle_bins:
-                remaining_capacity = vbin["vehicle"]["capacity"] - vbin["current_load"]
-                
-                if station_demand <= remaining_capacity:
-                    vbin["stations"].append(station_info)
-                    vbin["current_load"] += station_demand
-                    station_info["assigned"] = True
-                    placed = True
-                    break
-            
-            # Hiçbir mevcut araca sığmadı - daha sonra kiralık araçla halledelim
-            if not placed:
-                pass  # Atanamayan olarak bırak
-        
+        if time_budget_ms is None:
+            time_budget_ms = self.LOCAL_SEARCH_BUDGET_MS
+        deadline = deadline_from_budget(time_budget_ms)
+
+        ordered_routes = [
+            self._optimize_route_order(route, deadline, local_search=time_budget_ms > 0)
+            for route in merged_routes
+        ]
+
         # ============================================
-        # ADIM 3: Atanan araçlardan rota oluştur
+        # ADIM 3: Araç ataması
         # ============================================
-        for vbin in vehicle_bins:
-            if not vbin["stations"]:
-                continue  # Bu araç boş, atla
-            
-            vehicle = vbin["vehicle"]
-            route_stations = [s["station"] for s in vbin["stations"]]
-            
-            # Rota sırasını optimize et (coğrafi optimizasyon burada)
-            if len(route_stations) > 1:
-                optimal_starts = self._find_optimal_start_positions([route_stations])
-                start_station = optimal_starts[0]
-                optimized_route = self._optimize_route_order(route_stations, start_station)
-            else:
-                start_station = route_stations[0]
-                optimized_route = route_stations
-            
-            # Mesafe hesapla
-            distance = self._calculate_route_distance(optimized_route)
-            fuel_cost = distance * self.FUEL_COST_PER_KM
-            
-            # Durakları oluştur
-            stops = []
-            for station in optimized_route:
-                station_cargos = self.stations_with_cargo.get(station, [])
-                stop = RouteStop(
-                    station_name=station,
-                    cargo_ids=[c.id for c in station_cargos],
-                    total_weight=self._get_station_demand(station),
-                    coords=DISTRICT_COORDS.get(station, (0, 0))
-                )
-                stops.append(stop)
-            
-            vehicle_route = VehicleRoute(
-                vehicle_id=vehicle["id"],
-                vehicle_capacity=vehicle["capacity"],
-                is_rented=vehicle.get("is_rented", False),
-                rental_cost=vehicle.get("rental_cost", 0),
-                start_station=start_station,
-                stops=stops,
-                total_distance=distance,
-                fuel_cost=fuel_cost,
-                total_cost=fuel_cost + vehicle.get("rental_cost", 0)
+        assignments, unassigned_routes = self._assign_vehicles(
+            ordered_routes, allow_rental, allow_multi_trip
+        )
+        if unassigned_routes and self.selection_bins:
+            assignments, unassigned_routes = self._packed_assignment(
+                assignments, unassigned_routes, allow_rental, allow_multi_trip,
+                deadline, time_budget_ms > 0
             )
-            assigned_routes.append(vehicle_route)
-        
-        # ============================================
-        # ADIM 4: Atanamayan istasyonlar için kiralık araç
-        # ============================================
-        unassigned_stations = [s for s in station_list if not s["assigned"]]
-        
-        if unassigned_stations and allow_rental:
-            # Kiralık araç için bin packing
-            rental_bins = []
-            
-            for station_info in unassigned_stations:
-                station_demand = station_info["demand"]
-                placed = False
-                
-                # Mevcut kiralık araçlara sığıyor mu?
-                for rbin in rental_bins:
-                    remaining = self.RENTAL_CAPACITY - rbin["current_load"]
-                    if station_demand <= remaining:
-                        rbin["stations"].append(station_info)
-                        rbin["current_load"] += station_demand
-                        station_info["assigned"] = True
-                        placed = True
-                        break
-                
-                # Sığmadıysa yeni kiralık araç ekle
-                if not placed:
-                    rental_bins.append({
-                        "stations": [station_info],
-                        "current_load": station_demand
-                    })
-                    station_info["assigned"] = True
-            
-            # Kiralık araçlardan rota oluştur
-            rental_id_start = 1000
-            for idx, rbin in enumerate(rental_bins):
-                route_stations = [s["station"] for s in rbin["stations"]]
-                
-                if len(route_stations) > 1:
-                    optimal_starts = self._find_optimal_start_positions([route_stations])
-                    start_station = optimal_starts[0]
-                    optimized_route = self._optimize_route_order(route_stations, start_station)
-                else:
-                    start_station = route_stations[0]
-                    optimized_route = route_stations
-                
-                distance = self._calculate_route_distance(optimized_route)
-                fuel_cost = distance * self.FUEL_COST_PER_KM
-                
-                stops = []
-                for station in optimized_route:
-                    station_cargos = self.stations_with_cargo.get(station, [])
-                    stop = RouteStop(
-                        station_name=station,
-                        cargo_ids=[c.id for c in station_cargos],
-                        total_weight=self._get_station_demand(station),
-                        coords=DISTRICT_COORDS.get(station, (0, 0))
-                    )
-                    stops.append(stop)
-                
-                vehicle_route = VehicleRoute(
-                    vehicle_id=rental_id_start + idx,
-                    vehicle_capacity=self.RENTAL_CAPACITY,
-                    is_rented=True,
-                    rental_cost=self.RENTAL_COST,
-                    start_station=start_station,
-                    stops=stops,
-                    total_distance=distance,
-                    fuel_cost=fuel_cost,
-                    total_cost=fuel_cost + self.RENTAL_COST,
-                    trip_number=idx + 1
-                )
-                assigned_routes.append(vehicle_route)
-            
-            if rental_bins:
-                result.warnings.append(f"{len(rental_bins)} kiralık araç eklendi")
-        
-        # Hala atanamayan var mı kontrol et
-        still_unassigned = [s for s in station_list if not s["assigned"]]
-        if still_unassigned:
-            for s in still_unassigned:
-                result.warnings.append(f"UYARI: {s['station']} istasyonu atanamadı ({s['demand']:.0f} kg)")
-        
+        sequenced = self._sequence_trips(assignments)
+
+        # Araçlar arası iyileştirme (relocate / swap / 2-opt*); günlük
+        # mesafe limitini aşan sonuç geri alınır
+        if time_budget_ms > 0 and len(assignments) > 1:
+            improved = self._sequence_trips(self._improve_between_vehicles(assignments, deadline))
+            if self._daily_limits_ok(improved):
+                sequenced = improved
+
+        return sequenced, [node for route in unassigned_routes for node in route]
+
+    def _packed_assignment(self, assignments: List[Tuple[Dict, List[int]]], unassigned: List[List[int]],
+                           allow_rental: bool, allow_multi_trip: bool,
+                           deadline: Optional[float], local_search: bool) -> Tuple[List[Tuple[Dict, List[int]]], List[List[int]]]:
+        """
+        Birleştirme seçilen kargoların hepsini taşıyamadıysa sırt çantası
+        kutularını rota olarak kullan (her kutu kendi aracına sığar); daha
+        fazla yük taşıyan plan seçilir.
+        """
+        packed: Dict[int, List[int]] = {}
+        for node in self.nodes:
+            packed.setdefault(self.node_bins[node], []).append(node)
+        routes = [
+            self._optimize_route_order(route, deadline, local_search=local_search)
+            for route in packed.values()
+        ]
+        packed_assignments, packed_unassigned = self._assign_vehicles(routes, allow_rental, allow_multi_trip)
+
+        def carried(plan: List[Tuple[Dict, List[int]]]) -> float:
+            return sum(self._route_load(route) for _, route in plan)
+
+        if carried(packed_assignments) > carried(assignments) + 1e-9:
+            return packed_assignments, packed_unassigned
+        return assignments, unassigned
+
+    def _finish_result(self, result: RoutingResult, sequenced: List[Tuple[Dict, List[int], int, float]],
+                       unassigned: List[int]) -> RoutingResult:
+        """Sefer listesinden VehicleRoute'ları, toplamları ve mesajı oluştur."""
+        trips: Dict[int, Tuple[Dict, List[Tuple[int, List[int]]]]] = {}
+        for vehicle, route, trip_number, _ in sequenced:
+            trips.setdefault(id(vehicle), (vehicle, []))[1].append((trip_number, route))
+        schedules: Dict[Tuple[int, int], RouteSchedule] = {}
+        for key, (vehicle, numbered) in trips.items():
+            numbered.sort(key=lambda trip: trip[0])
+            chain = self._trip_schedules(vehicle, [route for _, route in numbered])
+            for (trip_number, _), schedule in zip(numbered, chain):
+                schedules[(key, trip_number)] = schedule
+
+        assigned_routes: List[VehicleRoute] = [
+            self._build_vehicle_route(vehicle, route, trip_number, deadhead,
+                                      schedules[(id(vehicle), trip_number)])
+            for vehicle, route, trip_number, deadhead in sequenced
+        ]
+
+        late = [r for r in assigned_routes if not r.time_feasible]
+        if late:
+            result.warnings.append(
+                f"UYARI: {len(late)} sefer zaman penceresi / vardiya sınırını aşıyor"
+            )
+
+        rental_count = sum(1 for r in assigned_routes if r.is_rented and r.trip_number == 1)
+        if rental_count:
+            result.warnings.append(f"{rental_count} kiralık araç eklendi")
+
+        result.needs_multi_trip = any(r.trip_number > 1 for r in assigned_routes)
+        if result.needs_multi_trip:
+            extra_trips = sum(1 for r in assigned_routes if r.trip_number > 1)
+            result.warnings.append(f"{extra_trips} ek sefer planlandı")
+
+        if self.route_split_visits:
+            result.warnings.append(
+                f"{self.route_split_visits} ek ziyaret: araca sığmayan rotalar bölündü"
+            )
+
+        for node in unassigned:
+            result.unassigned_cargos.extend(self.node_cargos[node])
+            result.warnings.append(
+                f"UYARI: {self.node_names[node]} istasyonu atanamadı ({self.demand[node]:.0f} kg)"
+            )
+
+        # Araç limitiyle bilerek ertelenenler dışında taşınamayan kargo
+        # kaldıysa plan başarısızdır; ertelenen varsa plan kısmidir
+        deferred_ids = {cargo.id for cargo in self.deferred_cargos}
+        dropped = [c for c in result.unassigned_cargos if c.id not in deferred_ids]
+        deferred = [c for c in result.unassigned_cargos if c.id in deferred_ids]
         
         # ============================================
-        # ADIM 5: Sonuçları hesapla
+        # ADIM 4: Sonuçları hesapla
         # ============================================
-        result.success = True
+        result.success = not dropped
+        result.complete = not result.unassigned_cargos
+        result.carried_weight = sum(stop.total_weight for r in assigned_routes for stop in r.stops)
+        result.unassigned_weight = sum(c.total_weight for c in result.unassigned_cargos)
         result.routes = assigned_routes
         result.total_distance = sum(r.total_distance for r in assigned_routes)
         result.total_fuel_cost = sum(r.fuel_cost for r in assigned_routes)
         result.total_rental_cost = sum(r.rental_cost for r in assigned_routes)
-        result.total_cost = result.total_fuel_cost + result.total_rental_cost
+        result.total_time_cost = sum(r.time_cost for r in assigned_routes)
+        result.total_cost = result.total_fuel_cost + result.total_rental_cost + result.total_time_cost
+        result.departure_time = self.departure_time
+
+        served = [node for _, route, _, _ in sequenced for node in route]
+        result.lower_bound = self._lower_bound(served)
+        result.gap_percent = gap_percent(result.total_cost, result.lower_bound)
         
         # Araç özeti çıkar
-        owned_vehicles = [r for r in assigned_routes if not r.is_rented]
-        rented_vehicles = [r for r in assigned_routes if r.is_rented]
+        owned_vehicles = [r for r in assigned_routes if not r.is_rented and r.trip_number == 1]
+        rented_vehicles = [r for r in assigned_routes if r.is_rented and r.trip_number == 1]
         
         # Mesaj oluştur
-        message_parts = ["✅ Rota hesaplandı!"]
+        if dropped:
+            message_parts = [
+                "⚠️ Rota eksik hesaplandı!",
+                f"{len(dropped)} kargo ({sum(c.total_weight for c in dropped):.0f} kg) atanamadı",
+            ]
+        elif deferred:
+            message_parts = ["⚠️ Kısmi rota hesaplandı!"]
+        else:
+            message_parts = ["✅ Rota hesaplandı!"]
+        if deferred:
+            message_parts.append(f"{len(deferred)} kargo ({sum(c.total_weight for c in deferred):.0f} kg) ertelendi")
         
         if owned_vehicles:
             message_parts.append(f"{len(owned_vehicles)} mevcut araç")
         
         if rented_vehicles:
             message_parts.append(f"{len(rented_vehicles)} kiralık araç")
+
+        if result.needs_multi_trip:
+            message_parts.append(f"{len(assigned_routes)} sefer")
             
         message_parts.extend([
             f"{result.total_distance:.1f} km toplam mesafe",
@@ -627,15 +1789,111 @@ class ClarkeWrightVRP:
         
         if result.total_rental_cost > 0:
             message_parts.append(f"(Kiralık: {result.total_rental_cost:.1f}₺)")
+
+        if result.total_time_cost > 0:
+            message_parts.append(f"(Süre: {result.total_time_cost:.1f}₺)")
         
         result.message = ", ".join(message_parts)
         
         return result
 
 
+# ============================================
+# ÇOKLU BAŞLANGIÇ (PARALEL)
+# ============================================
+
+PARALLEL_SAVINGS_NOISE = 0.15  # Rastgele varyantların kazanç bozulması üst sınırı
+SOLVER_MODES = ("cw", "alns", "exact")  # cw: Clarke-Wright, alns: süre sınırlı ALNS, exact: dal ve sınır
+
+
+def _solver_class(mode: str) -> type:
+    """Çözüm moduna göre çözücü sınıfı."""
+    if mode == "alns":
+        from .alns import ALNSVRP  # alns bu modülü içe aktarır
+        return ALNSVRP
+    if mode == "exact":
+        from .exact_solver import ExactVRP
+        return ExactVRP
+    return ClarkeWrightVRP
+
+
+def _solve_variant(vehicles: List[Dict], cargos: List[Cargo], worker: int, seed: Optional[int],
+                   savings_noise: float, solve_kwargs: Dict, mode: str = "cw") -> Tuple[RoutingResult, Dict]:
+    """Tek bir varyantı çöz (ProcessPoolExecutor işçisi, üst seviyede olmalı)."""
+    started = time.perf_counter()
+    solver = _solver_class(mode)(vehicles, cargos, seed=seed, savings_noise=savings_noise)
+    result = solver.solve(**solve_kwargs)
+    stats = {
+        "worker": worker,
+        "pid": os.getpid(),
+        "seed": seed,
+        "savings_noise": savings_noise,
+        "total_cost": result.total_cost,
+        "total_distance": result.total_distance,
+        "route_count": len(result.routes),
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+    }
+    return result, stats
+
+
+def _result_rank(result: RoutingResult) -> Tuple[int, float]:
+    """Varyant karşılaştırma anahtarı: önce taşınan kargo sayısı, sonra maliyet."""
+    carried = sum(len(stop.cargo_ids) for route in result.routes for stop in route.stops)
+    return -carried, result.total_cost
+
+
+def solve_multi_start(vehicles: List[Dict], cargos: List[Cargo], parallel: int,
+                      seed: int = 0, mode: str = "cw", **solve_kwargs) -> Tuple[RoutingResult, List[Dict]]:
+    """
+    N farklı Clarke-Wright varyantını süreç havuzunda çöz, en ucuzunu seç.
+
+    0. işçi bozulmasız (deterministik) çözümdür; sonuç hiçbir zaman tek
+    geçişten kötü olmaz. Diğer işçiler farklı tohum ve bozulma
+    oranlarıyla kazanç sırasını karıştırır. Havuz açılamazsa varyantlar
+    aynı süreçte sırayla çözülür.
+
+    Returns:
+        (en iyi sonuç, işçi istatistikleri)
+    """
+    variants = [
+        (worker, None if worker == 0 else seed + worker,
+         0.0 if worker == 0 else PARALLEL_SAVINGS_NOISE * worker / max(1, parallel - 1))
+        for worker in range(parallel)
+    ]
+
+    get_distance_provider().prepare()   # İşçiler yüklü matrisi devralsın
+    try:
+        with ProcessPoolExecutor(max_workers=min(parallel, os.cpu_count() or 1)) as pool:
+            futures = [
+                pool.submit(_solve_variant, vehicles, cargos, worker, variant_seed, noise, solve_kwargs, mode)
+                for worker, variant_seed, noise in variants
+            ]
+            outcomes = [future.result() for future in futures]
+    except (OSError, BrokenProcessPool):
+        outcomes = [
+            _solve_variant(vehicles, cargos, worker, variant_seed, noise, solve_kwargs, mode)
+            for worker, variant_seed, noise in variants
+        ]
+
+    best_result, best_stats = min(outcomes, key=lambda outcome: _result_rank(outcome[0]))
+    stats = [outcome[1] for outcome in outcomes]
+    for entry in stats:
+        entry["best"] = entry is best_stats
+    return best_result, stats
+
+
 def calculate_routes(vehicles: List[Dict], cargos: List[Dict], 
                     allow_rental: bool = True, 
-                    allow_multi_trip: bool = True) -> Dict:
+                    allow_multi_trip: bool = True,
+                    time_budget_ms: Optional[float] = None,
+                    parallel: int = 1,
+                    mode: str = "cw",
+                    time_limit_ms: Optional[float] = None,
+                    target_gap: Optional[float] = None,
+                    max_vehicles: Optional[int] = None,
+                    fleet_search: bool = False,
+                    rental_options: Optional[List[Tuple[float, float]]] = None,
+                    departure_time: Optional[str] = None) -> Dict:
     """
     Rota hesaplama ana fonksiyonu.
     
@@ -644,39 +1902,101 @@ def calculate_routes(vehicles: List[Dict], cargos: List[Dict],
         cargos: [{"id": 1, "station_name": "İzmit", "weight": 10, "quantity": 1, "sender_id": 1}, ...]
         allow_rental: Araç kiralama izni
         allow_multi_trip: Çoklu sefer izni
+        time_budget_ms: Rota iyileştirme süre bütçesi (ms)
+        parallel: Paralel çözülecek varyant sayısı (1: tek geçiş)
+        mode: "cw" (Clarke-Wright), "alns" (süre sınırlı arama) veya
+              "exact" (küçük örneklerde kesin optimum)
+        time_limit_ms: ALNS / kesin çözücü toplam arama süresi (ms)
+        target_gap: ALNS bu optimallik açığına (%) ulaşınca erken durur
+        max_vehicles: En fazla araç sayısı (kiralık dahil); talep aşarsa
+                      taşınacak kargolar sırt çantası ile seçilir, kalanlar
+                      unassigned_cargos'ta döner
+        fleet_search: Kiralık araç sayısı / kapasitesi adaylarını eşzamanlı
+                      çözüp toplam maliyeti en düşük filoyu seç (allow_rental gerekir)
+        rental_options: Filo aramasında kiralama seçenekleri [(kapasite, ücret), ...]
+        departure_time: Kalkış saati ("HH:MM"); verilirse E-5 / TEM gibi
+                        yoğun güzergâhlarda saate bağlı süreler kullanılır ve
+                        sefer süreleri de maliyete girer
     
     Returns:
         Rota sonuçları dict olarak
     """
-    # Cargo objelerine dönüştür
-    cargo_objects = [
+    cargo_objects = cargos_from_dicts(cargos)
+    
+    solve_kwargs = {
+        "allow_rental": allow_rental,
+        "allow_multi_trip": allow_multi_trip,
+        "time_budget_ms": time_budget_ms,
+        "max_vehicles": max_vehicles,
+        "departure_time": departure_time,
+    }
+    if mode == "alns":
+        solve_kwargs["time_limit_ms"] = time_limit_ms
+        solve_kwargs["target_gap"] = target_gap
+    elif mode == "exact":
+        solve_kwargs["time_limit_ms"] = time_limit_ms
+
+    # VRP çöz
+    if fleet_search and allow_rental:
+        from .fleet_optimizer import optimize_fleet  # fleet_optimizer bu modülü içe aktarır
+        output, report = optimize_fleet(
+            vehicles, cargo_objects, rental_options=rental_options, mode=mode,
+            workers=parallel if parallel > 1 else None, **solve_kwargs
+        )
+        output["fleet_search"] = report
+        return output
+
+    if parallel > 1:
+        result, worker_stats = solve_multi_start(vehicles, cargo_objects, parallel, mode=mode, **solve_kwargs)
+        output = result_to_dict(result)
+        output["parallel"] = {"workers": parallel, "runs": worker_stats}
+        return output
+
+    solver = _solver_class(mode)(vehicles, cargo_objects)
+    result = solver.solve(**solve_kwargs)
+    return result_to_dict(result)
+
+
+def cargos_from_dicts(cargos: List[Dict]) -> List[Cargo]:
+    """API kargo sözlüklerini Cargo objelerine dönüştür."""
+    return [
         Cargo(
             id=c["id"],
             station_name=c["station_name"],
             weight=c["weight"],
             quantity=c["quantity"],
             sender_id=c["sender_id"],
-            sender_name=c.get("sender_name", "")
+            sender_name=c.get("sender_name", ""),
+            window_start=parse_clock(c.get("window_start")),
+            window_end=parse_clock(c.get("window_end")),
+            priority=c.get("priority")
         )
         for c in cargos
     ]
-    
-    # VRP çöz
-    solver = ClarkeWrightVRP(vehicles, cargo_objects)
-    result = solver.solve(allow_rental=allow_rental, allow_multi_trip=allow_multi_trip)
-    
-    # Dict'e dönüştür
+
+
+def result_to_dict(result: RoutingResult) -> Dict:
+    """RoutingResult'ı JSON'a uygun dict'e dönüştür."""
     return {
         "success": result.success,
+        "complete": result.complete,
         "message": result.message,
         "warnings": result.warnings,
         "total_distance": result.total_distance,
         "total_fuel_cost": result.total_fuel_cost,
         "total_rental_cost": result.total_rental_cost,
+        "total_time_cost": result.total_time_cost,
         "total_cost": result.total_cost,
+        "departure_time": format_clock(result.departure_time),
         "needs_rental": result.needs_rental,
         "rental_count_needed": result.rental_count_needed,
         "needs_multi_trip": result.needs_multi_trip,
+        "search_stats": result.search_stats,
+        "lower_bound": result.lower_bound,
+        "gap_percent": result.gap_percent,
+        "cargo_selection": result.cargo_selection,
+        "carried_weight": result.carried_weight,
+        "unassigned_weight": result.unassigned_weight,
         "routes": [
             {
                 "vehicle_id": r.vehicle_id,
@@ -686,14 +2006,25 @@ def calculate_routes(vehicles: List[Dict], cargos: List[Dict],
                 "start_station": r.start_station,
                 "total_distance": r.total_distance,
                 "fuel_cost": r.fuel_cost,
+                "time_cost": r.time_cost,
                 "total_cost": r.total_cost,
                 "trip_number": r.trip_number,
+                "deadhead_distance": r.deadhead_distance,
+                "start_time": format_clock(r.start_time),
+                "end_time": format_clock(r.end_time),
+                "duration_minutes": round(r.duration_minutes, 1),
+                "time_feasible": r.time_feasible,
                 "stops": [
                     {
                         "station_name": s.station_name,
                         "cargo_ids": s.cargo_ids,
                         "total_weight": s.total_weight,
-                        "coords": list(s.coords)
+                        "coords": list(s.coords),
+                        "arrival_time": format_clock(s.arrival_time),
+                        "service_start": format_clock(s.service_start),
+                        "window_start": format_clock(s.window[0]) if s.window[0] > 0 else None,
+                        "window_end": format_clock(s.window[1]),
+                        "slack_minutes": None if math.isinf(s.slack) else round(s.slack, 1)
                     }
                     for s in r.stops
                 ]
@@ -701,7 +2032,7 @@ def calculate_routes(vehicles: List[Dict], cargos: List[Dict],
             for r in result.routes
         ],
         "unassigned_cargos": [
-            {"id": c.id, "station_name": c.station_name, "weight": c.weight}
+            {"id": c.id, "station_name": c.station_name, "weight": c.total_weight}
             for c in result.unassigned_cargos
         ],
         "depot": {
@@ -0,0 +1,73 @@
+"""
+Rota Girdileri
+
+Veritabanı kayıtlarını (Cargo, Vehicle) calculate_routes'un beklediği
+sözlüklere çevirir. Rota görünümleri ve plan_routes yönetim komutu aynı
+girdileri buradan alır.
+"""
+
+from collections import defaultdict
+
+from .models import Cargo, Vehicle
+from .time_windows import format_clock, intersect_windows, parse_clock
+
+
+def pending_cargos(target_date, include_all=False):
+    """
+    Tarihteki bekleyen kargoları rota algoritmasının beklediği formatta döndür.
+    include_all: durumdan bağımsız tüm kargolar (senaryo karşılaştırması için)
+    """
+    cargos = Cargo.objects.filter(target_date=target_date)
+    if not include_all:
+        cargos = cargos.filter(status="pending")
+    cargos = cargos.select_related("station", "sender")
+    return [routing_cargo(c) for c in cargos]
+
+
+def pending_cargos_by_date(start_date, end_date):
+    """Tarih aralığındaki bekleyen kargoları tek sorguda çek, target_date'e göre grupla."""
+    cargos = Cargo.objects.filter(
+        target_date__range=(start_date, end_date),
+        status="pending"
+    ).select_related("station", "sender").order_by("target_date", "id")
+    grouped = defaultdict(list)
+    for c in cargos:
+        grouped[c.target_date].append(routing_cargo(c))
+    return grouped
+
+
+def routing_cargo(c):
+    """
+    Cargo kaydını rota algoritmasının beklediği sözlüğe çevir.
+    Alım penceresi istasyon ve kargo pencerelerinin kesişimidir.
+    """
+    window_start, window_end = intersect_windows([
+        (parse_clock(c.station.window_start), parse_clock(c.station.window_end)),
+        (parse_clock(c.window_start), parse_clock(c.window_end)),
+    ])
+    return {
+        "id": c.id,
+        "station_name": c.station.name,
+        "weight": c.weight,
+        "quantity": c.quantity,
+        "sender_id": c.sender.id,
+        "sender_name": f"{c.sender.first_name} {c.sender.last_name}",
+        "window_start": format_clock(window_start) if window_start > 0 else None,
+        "window_end": format_clock(window_end),
+    }
+
+
+def routing_vehicles():
+    """Tüm araçları rota algoritmasının beklediği formatta döndür."""
+    return [
+        {
+            "id": v.id,
+            "capacity": v.capacity,
+            "is_rented": v.is_rented,
+            "rental_cost": v.rental_cost,
+            "shift_start": v.shift_start.strftime("%H:%M") if v.shift_start else None,
+            "max_shift_minutes": v.max_shift_minutes,
+            "speed_kmh": v.speed_kmh,
+        }
+        for v in Vehicle.objects.all()
+    ]
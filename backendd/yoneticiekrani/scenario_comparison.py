@@ -0,0 +1,139 @@
+"""
+Senaryo Karşılaştırması
+
+Dört senaryo tarihinin (SCENARIO_DATES) kargoları dört filo varyantıyla
+çözülür:
+
+1. Sınırsız araç, 500 kg kapasite   - 3 × 500 kg özmal + kiralık, tek sefer
+2. Sınırsız araç, karışık kapasite  - 500 / 750 / 1000 kg özmal + kiralık, tek sefer
+3. 3 araç limiti, 500 kg kapasite   - 3 × 500 kg, kiralama yok, çoklu sefer
+4. 3 araç limiti, karışık kapasite  - 500 / 750 / 1000 kg, kiralama yok, çoklu sefer
+
+Araç limitli varyantlar max_vehicles=3 ile çözülür; günün seferlerine
+sığmayan kargolar ertelenir ve "unassigned_count" / "deferred_weight"
+olarak raporlanır.
+
+On altı çözüm önbellekli olarak süreç havuzunda eşzamanlı yapılır;
+kargo değişmedikçe sonuçlar önbellekten döner.
+"""
+
+from typing import Dict, List, Optional
+
+from .route_cache import cached_calculate_many
+
+FLEET_VARIANTS = [
+    {
+        "id": 1,
+        "name": "Senaryo 1",
+        "description": "Sınırsız araç, 500kg kapasite",
+        "capacities": (500, 500, 500),
+        "allow_rental": True,
+        "allow_multi_trip": False,
+        "max_vehicles": None,
+    },
+    {
+        "id": 2,
+        "name": "Senaryo 2",
+        "description": "Sınırsız araç, karışık kapasite",
+        "capacities": (500, 750, 1000),
+        "allow_rental": True,
+        "allow_multi_trip": False,
+        "max_vehicles": None,
+    },
+    {
+        "id": 3,
+        "name": "Senaryo 3",
+        "description": "3 araç limiti, 500kg kapasite",
+        "capacities": (500, 500, 500),
+        "allow_rental": False,
+        "allow_multi_trip": True,
+        "max_vehicles": 3,
+    },
+    {
+        "id": 4,
+        "name": "Senaryo 4",
+        "description": "3 araç limiti, karışık kapasite",
+        "capacities": (500, 750, 1000),
+        "allow_rental": False,
+        "allow_multi_trip": True,
+        "max_vehicles": 3,
+    },
+]
+
+
+def variant_vehicles(variant: Dict) -> List[Dict]:
+    """Varyantın özmal araç listesi (rota algoritması formatında)."""
+    return [
+        {"id": i, "capacity": capacity, "is_rented": False, "rental_cost": 0}
+        for i, capacity in enumerate(variant["capacities"], start=1)
+    ]
+
+
+def _summary(result: Dict) -> Dict:
+    """Tek çözümün karşılaştırma özeti."""
+    routes = result.get("routes", [])
+    return {
+        "cost": result.get("total_cost", 0.0),
+        "distance": result.get("total_distance", 0.0),
+        "route_count": len(routes),
+        "rental_count": sum(1 for r in routes if r["is_rented"] and r.get("trip_number", 1) == 1),
+        "carried": sum(len(stop["cargo_ids"]) for r in routes for stop in r["stops"]),
+        "complete": result.get("complete", True),
+        "unassigned_count": len(result.get("unassigned_cargos", [])),
+        "deferred_weight": result.get("unassigned_weight", 0.0),
+        "elapsed_ms": result.get("elapsed_ms", 0.0),
+        "cache_hit": result.get("cache_hit", False),
+    }
+
+
+def compare_scenarios(cargos_by_scenario: Dict[int, List[Dict]],
+                      workers: Optional[int] = None) -> List[Dict]:
+    """
+    Her senaryo tarihi × filo varyantını eşzamanlı çöz.
+
+    Args:
+        cargos_by_scenario: {senaryo_no: bekleyen kargo listesi}
+        workers: Süreç sayısı (None: CPU sayısı)
+
+    Returns:
+        Varyant başına {id, name, description, cost, distance, elapsed_ms,
+        days: [{scenario, cargo_count, cost, distance, ...}, ...]}
+    """
+    jobs = []
+    keys = []
+    for variant in FLEET_VARIANTS:
+        vehicles = variant_vehicles(variant)
+        for scenario_num, cargos in sorted(cargos_by_scenario.items()):
+            if not cargos:
+                continue
+            options = {
+                "allow_rental": variant["allow_rental"],
+                "allow_multi_trip": variant["allow_multi_trip"],
+                "max_vehicles": variant["max_vehicles"],
+            }
+            jobs.append((vehicles, cargos, options))
+            keys.append((variant["id"], scenario_num))
+
+    solved = dict(zip(keys, cached_calculate_many(jobs, workers=workers)))
+
+    comparison = []
+    for variant in FLEET_VARIANTS:
+        days = []
+        for scenario_num, cargos in sorted(cargos_by_scenario.items()):
+            day = {"scenario": scenario_num, "cargo_count": len(cargos)}
+            result = solved.get((variant["id"], scenario_num))
+            day.update(_summary(result) if result is not None else {"cost": 0.0, "distance": 0.0})
+            days.append(day)
+
+        comparison.append({
+            "id": variant["id"],
+            "name": variant["name"],
+            "description": variant["description"],
+            "cost": sum(day["cost"] for day in days),
+            "distance": sum(day["distance"] for day in days),
+            "complete": all(day.get("complete", True) for day in days),
+            "deferred_weight": sum(day.get("deferred_weight", 0.0) for day in days),
+            "elapsed_ms": sum(day.get("elapsed_ms", 0.0) for day in days),
+            "days": days,
+        })
+    return comparison
@@ -0,0 +1,28 @@
+"""
+Model sinyalleri: kargo, araç veya istasyon değişince rota önbelleğini
+temizle; istasyon değişince mesafe matrisinin yalnızca o satırını güncelle.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .distance_providers import get_distance_provider
+from .models import Cargo, Station, Vehicle
+from .route_cache import ROUTE_RESULT_CACHE
+
+
+@receiver([post_save, post_delete], sender=Cargo)
+@receiver([post_save, post_delete], sender=Vehicle)
+@receiver([post_save, post_delete], sender=Station)
+def invalidate_route_cache(sender, **kwargs):
+    ROUTE_RESULT_CACHE.clear()
+
+
+@receiver(post_save, sender=Station)
+def update_station_distances(sender, instance, **kwargs):
+    get_distance_provider().add_station(instance.name, instance.latitude, instance.longitude, instance.id)
+
+
+@receiver(post_delete, sender=Station)
+def remove_station_distances(sender, instance, **kwargs):
+    get_distance_provider().remove_station(instance.name, instance.id)
@@ -0,0 +1,241 @@
+"""
+Mekânsal İndeks (Düzgün Izgara)
+
+Noktalar düzlemde (km) sabit boyutlu hücrelere dağıtılır. En yakın k
+sorgusu sorgu hücresinden başlayıp halka halka genişler; r. halka
+tarandıktan sonra daha dıştaki her nokta en az r · hücre uzaklıktadır,
+bu yüzden k. aday bu sınırın içindeyse arama biter. Ekleme ve silme
+O(1) olduğu için istasyon değişikliklerinde indeks yerinde güncellenir.
+
+İki kullanım:
+1. nearest_station: Müşteri kargo girişinde ham enlem/boylamdan en
+   yakın istasyon (Station tablosu değişince indeks yeniden kurulur).
+2. candidate_lists: Çözücünün rotalar arası hamleleri için düğüm başına
+   k aday komşu (granular local search). Adaylar ızgaradan geometrik
+   olarak seçilir, yol mesafesiyle sıralanır.
+"""
+
+import math
+import threading
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .distance_matrix import DEPOT_COORDS, haversine_km
+
+KM_PER_DEGREE_LAT = 110.574
+KM_PER_DEGREE_LON = 111.320            # Ekvatorda; cos(enlem) ile çarpılır
+STATION_GRID_CELL_KM = 2.0             # İstasyon indeksi hücre boyu
+MAX_STATION_DISTANCE_KM = 15.0         # Kargo girişinde kabul edilen en uzak istasyon
+PROJECTION_SLACK = 1.01                # Eşdikdörtgen izdüşümün bölgedeki göreli hata payı
+CANDIDATE_OVERSAMPLE = 3               # Yol mesafesiyle elenmek üzere alınan geometrik aday katı
+
+
+def project(lat: float, lon: float, origin_lat: float = DEPOT_COORDS[0]) -> Tuple[float, float]:
+    """Eşdikdörtgen izdüşüm: (enlem, boylam) -> düzlem (x, y) km."""
+    return (lon * KM_PER_DEGREE_LON * math.cos(math.radians(origin_lat)),
+            lat * KM_PER_DEGREE_LAT)
+
+
+class GridIndex:
+    """
+    Düzlem noktaları için düzgün ızgara.
+
+    Args:
+        cell_km: Hücre kenarı (km); nokta yoğunluğuna göre seçmek için
+                 GridIndex.from_points kullanın
+    """
+
+    def __init__(self, cell_km: float = STATION_GRID_CELL_KM):
+        self.cell = cell_km
+        self._cells: Dict[Tuple[int, int], Dict[Hashable, Tuple[float, float]]] = {}
+        self._where: Dict[Hashable, Tuple[int, int]] = {}
+        self._bounds: Optional[List[int]] = None   # [min_cx, max_cx, min_cy, max_cy]
+
+    @classmethod
+    def from_points(cls, points: Sequence[Tuple[float, float]],
+                    keys: Optional[Sequence[Hashable]] = None, per_cell: float = 2.0) -> "GridIndex":
+        """Hücre boyu, hücre başına ~per_cell nokta düşecek şekilde seçilir."""
+        if keys is None:
+            keys = range(len(points))
+        if points:
+            xs = [x for x, _ in points]
+            ys = [y for _, y in points]
+            area = max(max(xs) - min(xs), 1e-6) * max(max(ys) - min(ys), 1e-6)
+            cell = max(math.sqrt(area * per_cell / len(points)), 1e-3)
+        else:
+            cell = STATION_GRID_CELL_KM
+        index = cls(cell)
+        for key, (x, y) in zip(keys, points):
+            index.insert(key, x, y)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell)), int(math.floor(y / self.cell))
+
+    def insert(self, key: Hashable, x: float, y: float) -> None:
+        """Nokta ekle (aynı anahtar varsa yeri güncellenir)."""
+        if key in self._where:
+            self.remove(key)
+        cell = self._cell_of(x, y)
+        self._cells.setdefault(cell, {})[key] = (x, y)
+        self._where[key] = cell
+        if self._bounds is None:
+            self._bounds = [cell[0], cell[0], cell[1], cell[1]]
+        else:
+            b = self._bounds
+            b[0], b[1] = min(b[0], cell[0]), max(b[1], cell[0])
+            b[2], b[3] = min(b[2], cell[1]), max(b[3], cell[1])
+
+    def remove(self, key: Hashable) -> None:
+        cell = self._where.pop(key, None)
+        if cell is None:
+            return
+        bucket = self._cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self._cells[cell]   # Sınırlar daralmaz; arama yine doğru, en fazla biraz uzun sürer
+
+    def nearest(self, x: float, y: float, k: int = 1, max_km: float = math.inf,
+                skip: Optional[Hashable] = None) -> List[Tuple[float, Hashable]]:
+        """
+        En yakın k nokta (düzlem mesafesiyle artan sırada).
+
+        Returns:
+            [(mesafe km, anahtar), ...] - max_km içindekiler, en fazla k
+        """
+        if not self._where or k <= 0:
+            return []
+        cx, cy = self._cell_of(x, y)
+        b = self._bounds
+        last_ring = max(cx - b[0], b[1] - cx, cy - b[2], b[3] - cy, 0)
+        found: List[Tuple[float, Hashable]] = []
+
+        for ring in range(last_ring + 1):
+            if ring == 0:
+                cells = [(cx, cy)]
+            else:
+                cells = [(cx + dx, cy - ring) for dx in range(-ring, ring + 1)]
+                cells += [(cx + dx, cy + ring) for dx in range(-ring, ring + 1)]
+                cells += [(cx - ring, cy + dy) for dy in range(-ring + 1, ring)]
+                cells += [(cx + ring, cy + dy) for dy in range(-ring + 1, ring)]
+            for cell in cells:
+                for key, (px, py) in self._cells.get(cell, {}).items():
+                    if key != skip:
+                        found.append((math.hypot(px - x, py - y), key))
+
+            # Dış halkalardaki her nokta en az ring · hücre uzakta
+            reach = ring * self.cell
+            if reach >= max_km:
+                break
+            if len(found) >= k:
+                found.sort(key=lambda item: item[0])
+                if found[k - 1][0] <= reach:
+                    break
+
+        found.sort(key=lambda item: item[0])
+        return [item for item in found[:k] if item[0] <= max_km]
+
+
+# ============================================
+# İSTASYON İNDEKSİ
+# ============================================
+
+class StationIndex:
+    """Station tablosu üzerinde ızgara; tablo imzası (adet, en büyük id) değişince yeniden kurulur."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._grid = GridIndex(STATION_GRID_CELL_KM)
+        self._points: Dict[int, Tuple[str, float, float]] = {}
+        self._signature = None
+
+    def load(self, rows: Sequence[Tuple], signature=None) -> None:
+        """rows: (id, isim, enlem, boylam)."""
+        grid = GridIndex(STATION_GRID_CELL_KM)
+        points = {}
+        for station_id, name, lat, lon in rows:
+            grid.insert(station_id, *project(lat, lon))
+            points[station_id] = (name, lat, lon)
+        with self._lock:
+            self._grid = grid
+            self._points = points
+            self._signature = signature
+
+    @property
+    def signature(self):
+        return self._signature
+
+    def nearest(self, lat: float, lon: float, k: int = 1,
+                max_km: float = MAX_STATION_DISTANCE_KM) -> List[Dict]:
+        """En yakın k istasyon: [{"id", "name", "distance_km"}] (kuş uçuşu, artan)."""
+        x, y = project(lat, lon)
+        with self._lock:
+            grid, points = self._grid, self._points
+        hits = grid.nearest(x, y, k=k, max_km=max_km * PROJECTION_SLACK)
+        if hits:
+            # İzdüşüm bozulması sırayı değiştirebilir: k. adayın payla
+            # genişletilmiş yarıçapındakilerin hepsi haversine ile sıralanır
+            reach = min(hits[-1][0] * PROJECTION_SLACK + 0.01, max_km * PROJECTION_SLACK)
+            hits = grid.nearest(x, y, k=len(points), max_km=reach)
+        result = []
+        for _, station_id in hits:
+            name, s_lat, s_lon = points[station_id]
+            km = haversine_km((lat, lon), (s_lat, s_lon))
+            if km <= max_km:
+                result.append({"id": station_id, "name": name, "distance_km": round(km, 3)})
+        result.sort(key=lambda item: item["distance_km"])
+        return result[:k]
+
+
+STATION_INDEX = StationIndex()
+
+
+def nearest_station(lat: float, lon: float, max_km: float = MAX_STATION_DISTANCE_KM) -> Optional[Dict]:
+    """
+    Ham koordinata en yakın istasyon (max_km içinde yoksa None).
+
+    Tablo imzası her çağrıda tek sorguyla kontrol edilir; başka bir
+    süreçte eklenen / silinen istasyonlar indeksin yeniden kurulmasına
+    yol açar.
+    """
+    from django.db.models import Count, Max
+    from .models import Station
+
+    stats = Station.objects.aggregate(count=Count("id"), last=Max("id"))
+    signature = (stats["count"], stats["last"])
+    if signature != STATION_INDEX.signature:
+        STATION_INDEX.load(
+            list(Station.objects.values_list("id", "name", "latitude", "longitude")), signature
+        )
+    hits = STATION_INDEX.nearest(lat, lon, k=1, max_km=max_km)
+    return hits[0] if hits else None
+
+
+# ============================================
+# ÇÖZÜCÜ ADAY LİSTELERİ
+# ============================================
+
+def candidate_lists(points: Sequence[Tuple[float, float]], nodes: Sequence[int],
+                    dist: Sequence[Sequence[float]], k: int) -> Dict[int, List[int]]:
+    """
+    Her düğüm için yol mesafesine göre en yakın k aday.
+
+    Izgaradan k · CANDIDATE_OVERSAMPLE geometrik komşu alınır, dist
+    satırına göre sıralanıp ilk k tutulur; tarama O(n²) yerine O(n · k).
+
+    Args:
+        points: Düğüm indeksine göre düzlem koordinatları (km)
+        nodes: Aday listesi kurulacak düğümler
+    """
+    grid = GridIndex.from_points([points[u] for u in nodes], keys=list(nodes))
+    wanted = k * CANDIDATE_OVERSAMPLE
+    neighbors = {}
+    for u in nodes:
+        x, y = points[u]
+        others = [v for _, v in grid.nearest(x, y, k=wanted, skip=u)]
+        row = dist[u]
+        others.sort(key=lambda v: row[v])
+        neighbors[u] = others[:k]
+    return neighbors
@@ -1,3 +1,1231 @@
-from django.test import TestCase
+import heapq
+import itertools
+import json
+import math
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+from unittest import mock, skipIf
 
-# Create your tests here.
+from django.test import RequestFactory, SimpleTestCase
+
+from .batch_routing import iter_batch_routes
+from .benchmarks.instances import generate_instance, load_cvrplib
+from .benchmarks.runner import compare_reports, load_report, run_benchmark, write_report
+from .bounds import distance_lower_bound, gap_percent, vehicle_lower_bound
+from .distance_artifact import ArtifactDistanceProvider, write_artifact
+from .distance_matrix import (
+    DEPOT_NAME, DISTRICT_INDEX, DISTRICTS, ROAD_DETOUR_FACTOR, get_distance, haversine_km,
+)
+from .distance_providers import (
+    DistrictDistanceProvider, StationDistanceProvider, get_distance_provider, haversine_rows,
+    set_distance_provider,
+)
+from .fleet_optimizer import FLEET_MAX_CANDIDATES, RENTAL_ID_START, candidate_fleets
+from .held_karp import RouteOrderCache, cached_held_karp_order, held_karp_order
+from .incremental import update_routes
+from .local_search import (
+    improve_inter_route, improve_route, nearest_neighbors, or_opt, route_distance, two_opt,
+)
+from .road_network import contract
+from .route_cache import ROUTE_RESULT_CACHE, RouteResultCache, cached_calculate_routes, fingerprint
+from .routing_algorithm import ClarkeWrightVRP, calculate_routes, cargos_from_dicts
+from .scenario_comparison import FLEET_VARIANTS, compare_scenarios, variant_vehicles
+from .spatial_index import STATION_INDEX, GridIndex, StationIndex, candidate_lists, nearest_station
+from .time_windows import TimeModel, parse_clock
+from .travel_times import TravelTimeTable
+from .views import MAX_PARALLEL, MAX_SOLVE_TIME_MS, _route_options, calculate_route_batch
+
+try:
+    import numpy as np
+except ImportError:  # NumPy yolu testleri atlanır
+    np = None
+
+
+# ==================== YARDIMCILAR ====================
+
+def random_cargos(rnd: random.Random, stations: int = 10, per_station: int = 5,
+                  max_weight: int = 120, max_quantity: int = 3):
+    """Rastgele istasyonlara rastgele ağırlık / adette kargolar."""
+    cargos = []
+    for station in rnd.sample(DISTRICTS, stations):
+        for _ in range(rnd.randint(1, per_station)):
+            cargos.append({
+                "id": len(cargos) + 1,
+                "station_name": station,
+                "weight": rnd.randint(5, max_weight),
+                "quantity": rnd.randint(1, max_quantity),
+                "sender_id": 1,
+            })
+    return cargos
+
+
+def owned_fleet(*capacities):
+    return [
+        {"id": i + 1, "capacity": capacity, "is_rented": False, "rental_cost": 0}
+        for i, capacity in enumerate(capacities)
+    ]
+
+
+class RoutingTestCase(SimpleTestCase):
+    """İlçe mesafe matrisiyle (veritabanısız) çözüm testleri."""
+
+    def setUp(self):
+        self._provider = get_distance_provider()
+        set_distance_provider(DistrictDistanceProvider())
+
+    def tearDown(self):
+        set_distance_provider(self._provider)
+
+    def assertLoadsWithinCapacity(self, cargos, result):
+        """Her seferin yükü (ağırlık × adet) araç kapasitesini aşmamalı."""
+        by_id = {c["id"]: c for c in cargos}
+        for route in result["routes"]:
+            load = sum(
+                by_id[cargo_id]["weight"] * by_id[cargo_id]["quantity"]
+                for stop in route["stops"] for cargo_id in stop["cargo_ids"]
+            )
+            self.assertAlmostEqual(load, sum(stop["total_weight"] for stop in route["stops"]))
+            self.assertLessEqual(load, route["vehicle_capacity"] + 1e-6)
+
+
+# ==================== YÜK / KAPASİTE ====================
+
+class QuantityLoadTests(RoutingTestCase):
+
+    def test_quantity_counts_towards_load(self):
+        cargos = [
+            {"id": 1, "station_name": "Gebze", "weight": 100, "quantity": 4, "sender_id": 1},
+            {"id": 2, "station_name": "Darıca", "weight": 100, "quantity": 3, "sender_id": 1},
+        ]
+        result = calculate_routes(owned_fleet(500, 500), cargos, allow_rental=False)
+
+        self.assertEqual(len(result["routes"]), 2)
+        self.assertEqual(result["unassigned_cargos"], [])
+        self.assertLoadsWithinCapacity(cargos, result)
+
+    def test_random_quantities_never_overload(self):
+        for mode in ("cw", "alns", "exact"):
+            for seed in range(10):
+                rnd = random.Random(seed)
+                cargos = random_cargos(rnd, stations=rnd.randint(1, 6))
+                fleet = owned_fleet(*(rnd.choice([500, 750, 1000]) for _ in range(rnd.randint(1, 4))))
+                with self.subTest(mode=mode, seed=seed):
+                    result = calculate_routes(fleet, cargos, allow_rental=rnd.random() < 0.7,
+                                              mode=mode, time_budget_ms=50)
+                    self.assertLoadsWithinCapacity(cargos, result)
+
+
+class RentalFallbackTests(RoutingTestCase):
+
+    def assertAllCarried(self, cargos, result):
+        carried = {cargo_id for route in result["routes"]
+                   for stop in route["stops"] for cargo_id in stop["cargo_ids"]}
+        self.assertEqual(result["unassigned_cargos"], [])
+        self.assertEqual(carried, {c["id"] for c in cargos})
+        self.assertTrue(result["success"])
+
+    def test_heavy_day_is_split_onto_rentals(self):
+        # ~11 t talep, 2.25 t özmal filo: ağır ziyaretler kiralık araçlara bölünmeli
+        for allow_multi_trip in (False, True):
+            for seed in range(5):
+                rnd = random.Random(seed)
+                cargos = random_cargos(rnd, stations=len(DISTRICTS), per_station=60, max_weight=30)
+                with self.subTest(allow_multi_trip=allow_multi_trip, seed=seed):
+                    result = calculate_routes(owned_fleet(500, 750, 1000), cargos, allow_rental=True,
+                                              allow_multi_trip=allow_multi_trip)
+                    self.assertLoadsWithinCapacity(cargos, result)
+                    self.assertAllCarried(cargos, result)
+
+    def test_without_rental_unassigned_cargo_marks_plan_incomplete(self):
+        cargos = [
+            {"id": 1, "station_name": "Gebze", "weight": 400, "quantity": 1, "sender_id": 1},
+            {"id": 2, "station_name": "Darıca", "weight": 400, "quantity": 1, "sender_id": 1},
+        ]
+        result = calculate_routes(owned_fleet(500), cargos, allow_rental=False, allow_multi_trip=False)
+
+        self.assertEqual(len(result["unassigned_cargos"]), 1)
+        self.assertFalse(result["success"])
+        self.assertIn("atanamadı", result["message"])
+
+
+class MultiTripTests(RoutingTestCase):
+
+    def test_reuse_respects_daily_distance_limit(self):
+        # 1000 kg'lık araç ağır seferlerle günlük limite dayanır; sığmayan
+        # Karamürsel rotası kiralama kapalıyken boş duran 500 kg'lık araca bölünmeli
+        loads = {"Darıca": 355, "Çayırova": 475, "Gebze": 82, "Kandıra": 726,
+                 "Gölcük": 648, "Körfez": 696, "Kartepe": 520, "Karamürsel": 592}
+        cargos = []
+        for station, load in loads.items():
+            for _ in range(2):
+                cargos.append({"id": len(cargos) + 1, "station_name": station,
+                               "weight": load / 4, "quantity": 2, "sender_id": 1})
+        result = calculate_routes(owned_fleet(500, 1000), cargos, allow_rental=False)
+
+        daily_km = {}
+        for route in result["routes"]:
+            daily_km[route["vehicle_id"]] = daily_km.get(route["vehicle_id"], 0.0) + route["total_distance"]
+        self.assertEqual(result["unassigned_cargos"], [])
+        self.assertLessEqual(max(daily_km.values()), ClarkeWrightVRP.MAX_DAILY_DISTANCE_KM)
+        self.assertLoadsWithinCapacity(cargos, result)
+
+    def test_random_days_stay_within_daily_limit(self):
+        for seed in range(10):
+            rnd = random.Random(seed)
+            cargos = random_cargos(rnd, stations=len(DISTRICTS), per_station=30, max_weight=30)
+            for allow_rental in (False, True):
+                with self.subTest(seed=seed, allow_rental=allow_rental):
+                    result = calculate_routes(owned_fleet(500, 750, 1000), cargos, allow_rental=allow_rental)
+                    daily_km = {}
+                    for route in result["routes"]:
+                        key = (route["vehicle_id"], route["is_rented"])
+                        daily_km[key] = daily_km.get(key, 0.0) + route["total_distance"]
+                    self.assertLessEqual(max(daily_km.values()), ClarkeWrightVRP.MAX_DAILY_DISTANCE_KM)
+                    self.assertLoadsWithinCapacity(cargos, result)
+
+
+class RentalFeeTests(RoutingTestCase):
+
+    def test_fee_credited_only_for_single_trip_rentals(self):
+        cargos = [
+            {"id": i + 1, "station_name": station, "weight": 100, "quantity": 1, "sender_id": 1}
+            for i, station in enumerate(["Gebze", "Darıca", "Körfez"])
+        ]
+        vrp = ClarkeWrightVRP(owned_fleet(500), cargos_from_dicts(cargos))
+        vrp._prepare_result(allow_rental=True)
+        shared = {"id": 1000, "capacity": 500, "is_rented": True, "rental_cost": 200}
+        single = {"id": 1001, "capacity": 500, "is_rented": True, "rental_cost": 200}
+        assignments = [(shared, [1]), (shared, [2]), (single, [3])]
+
+        with mock.patch("yoneticiekrani.routing_algorithm.improve_inter_route",
+                        side_effect=lambda routes, **kwargs: routes) as improve:
+            vrp._improve_between_vehicles(assignments, None)
+
+        self.assertEqual(improve.call_args.kwargs["fixed_costs"], [0.0, 0.0, 200])
+
+
+class ExactSolverTests(RoutingTestCase):
+
+    def brute_force_cost(self, cargos, capacities):
+        """Her istasyonun her araca atanması × her araçta en iyi sıra."""
+        stations = [c["station_name"] for c in cargos]
+        loads = [c["weight"] * c["quantity"] for c in cargos]
+        dist = DistrictDistanceProvider().matrix(stations)
+        best_route = {}
+        best = math.inf
+        for owners in itertools.product(range(len(capacities)), repeat=len(stations)):
+            cost = 0.0
+            for vehicle, capacity in enumerate(capacities):
+                members = tuple(k + 1 for k, owner in enumerate(owners) if owner == vehicle)
+                if sum(loads[k - 1] for k in members) > capacity:
+                    break
+                if members not in best_route:
+                    best_route[members] = min(
+                        (route_distance(order, dist) for order in itertools.permutations(members)), default=0.0
+                    )
+                cost += best_route[members]
+            else:
+                best = min(best, cost)
+        return best
+
+    def test_exact_matches_brute_force(self):
+        # Kapasite bağlayıcı: Clarke-Wright bazı örneklerde (ör. seed 10) optimumu kaçırır
+        for seed in range(12):
+            rnd = random.Random(seed)
+            cargos = [
+                {"id": k + 1, "station_name": station, "weight": rnd.randint(100, 240), "quantity": 1, "sender_id": 1}
+                for k, station in enumerate(rnd.sample(DISTRICTS, 6))
+            ]
+            with self.subTest(seed=seed):
+                result = calculate_routes(owned_fleet(500, 750), cargos, allow_rental=False,
+                                          allow_multi_trip=False, mode="exact")
+                self.assertEqual(result["unassigned_cargos"], [])
+                self.assertAlmostEqual(result["total_cost"], self.brute_force_cost(cargos, [500, 750]), places=6)
+
+
+class IncrementalUpdateTests(RoutingTestCase):
+
+    def test_update_keeps_daily_distance_limit(self):
+        # Planı limitte olan güne ikinci dalga kargo: ek seferler limiti aşmamalı
+        for seed in range(6):
+            rnd = random.Random(seed)
+            allow_rental = seed % 2 == 0
+            cargos = random_cargos(rnd, stations=len(DISTRICTS), per_station=4, max_weight=60)
+            extra = random_cargos(rnd, stations=len(DISTRICTS), per_station=6, max_weight=60)
+            for cargo in extra:
+                cargo["id"] += 1000
+            fleet = owned_fleet(500, 750)
+            plan = calculate_routes(fleet, cargos, allow_rental=allow_rental)
+
+            with self.subTest(seed=seed, allow_rental=allow_rental):
+                result = update_routes(plan, fleet, cargos + extra, allow_rental=allow_rental)
+                daily_km, trips = {}, {}
+                for route in result["routes"]:
+                    key = (route["vehicle_id"], route["is_rented"])
+                    daily_km[key] = daily_km.get(key, 0.0) + route["total_distance"]
+                    trips[key] = trips.get(key, 0) + 1
+                for key, km in daily_km.items():
+                    if trips[key] > 1:
+                        self.assertLessEqual(km, ClarkeWrightVRP.MAX_DAILY_DISTANCE_KM + 1e-6)
+                self.assertLoadsWithinCapacity(cargos + extra, result)
+                if allow_rental:
+                    self.assertEqual(result["unassigned_cargos"], [])
+
+
+class VisitSplitTests(RoutingTestCase):
+
+    def test_visits_split_by_fleet_levels(self):
+        # 500 kg'ı aşan üç ziyaret, 500 kg'ı aşan iki araç: biri kiralık
+        # kapasitesine bölünmeli (en büyük araca göre bölme yetmez)
+        loads = {"Gebze": 591, "Darıca": 565, "İzmit": 553, "Kartepe": 120}
+        cargos = []
+        for station, load in loads.items():
+            for _ in range(4):
+                cargos.append({"id": len(cargos) + 1, "station_name": station,
+                               "weight": load / 8, "quantity": 2, "sender_id": 1})
+        vrp = ClarkeWrightVRP(owned_fleet(750, 1000), cargos_from_dicts(cargos))
+        vrp.allow_multi_trip = False
+        vrp._prepare_result(allow_rental=True)
+
+        self.assertEqual(sum(1 for load in vrp.demand[1:] if load > ClarkeWrightVRP.RENTAL_CAPACITY), 2)
+        self.assertEqual(sorted(c.id for cargos in vrp.node_cargos for c in cargos),
+                         [c["id"] for c in cargos])
+
+        result = calculate_routes(owned_fleet(750, 1000), cargos, allow_rental=True, allow_multi_trip=False)
+        self.assertEqual(result["unassigned_cargos"], [])
+        self.assertLoadsWithinCapacity(cargos, result)
+
+
+class PartialPlanTests(RoutingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cargos = [
+            {"id": 1, "station_name": "Gebze", "weight": 150, "quantity": 2, "sender_id": 1},
+            {"id": 2, "station_name": "Darıca", "weight": 250, "quantity": 1, "sender_id": 1},
+            {"id": 3, "station_name": "Körfez", "weight": 200, "quantity": 1, "sender_id": 1},
+        ]
+
+    def test_deferred_cargo_marks_plan_partial(self):
+        result = calculate_routes(owned_fleet(500), self.cargos, allow_multi_trip=False, max_vehicles=1)
+
+        self.assertTrue(result["success"])
+        self.assertFalse(result["complete"])
+        self.assertIn("ertelendi", result["message"])
+        self.assertAlmostEqual(result["carried_weight"] + result["unassigned_weight"], 750)
+
+    def test_batch_summary_lists_partial_days(self):
+        days = {date(2025, 1, 6): self.cargos, date(2025, 1, 7): self.cargos[:1]}
+        lines = list(iter_batch_routes(owned_fleet(500), days, workers=1, use_cache=False,
+                                       allow_multi_trip=False, max_vehicles=1))
+        summary = lines[-1]
+
+        self.assertFalse(summary["complete"])
+        self.assertEqual(summary["partial_days"], ["2025-01-06"])
+        self.assertAlmostEqual(summary["unassigned_weight"], 250)
+
+
+class BatchEndpointTests(RoutingTestCase):
+
+    def post(self, body, cargos_by_date=None):
+        request = RequestFactory().post("/calculate-route/batch/", json.dumps(body),
+                                        content_type="application/json")
+        with mock.patch("yoneticiekrani.views._get_authenticated_admin", return_value=object()), \
+                mock.patch("yoneticiekrani.views.routing_vehicles", return_value=owned_fleet(500, 750)), \
+                mock.patch("yoneticiekrani.views.pending_cargos_by_date", return_value=cargos_by_date or {}):
+            response = calculate_route_batch(request)
+            if response.streaming:
+                lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+                return response, [json.loads(line) for line in lines]
+        return response, None
+
+    def test_days_stream_as_ndjson(self):
+        rnd = random.Random(50)
+        start = date(2025, 3, 3)
+        cargos_by_date = {start: random_cargos(rnd, stations=6), start + timedelta(days=2): random_cargos(rnd, stations=9)}
+        response, lines = self.post({"start_date": "2025-03-03", "end_date": "2025-03-06",
+                                     "workers": 2, "use_cache": False}, cargos_by_date)
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        days, summary = lines[:-1], lines[-1]
+        self.assertEqual(summary["type"], "summary")
+        self.assertEqual(sorted(day["target_date"] for day in days),
+                         ["2025-03-03", "2025-03-04", "2025-03-05", "2025-03-06"])
+        self.assertEqual((summary["days"], summary["solved_days"], summary["cache_hits"]), (4, 2, 0))
+        for day in days:
+            target = date.fromisoformat(day["target_date"])
+            cargos = cargos_by_date.get(target, [])
+            self.assertEqual(day["cargo_count"], len(cargos))
+            if cargos:
+                self.assertAlmostEqual(day["result"]["total_cost"],
+                                       calculate_routes(owned_fleet(500, 750), cargos)["total_cost"])
+        self.assertAlmostEqual(summary["total_cost"], sum(day["result"]["total_cost"] for day in days))
+
+    def test_invalid_ranges_are_rejected(self):
+        for body in ({"start_date": "2025-03-06", "end_date": "2025-03-03"},
+                     {"start_date": "2025-03-01", "end_date": "2025-04-15"},
+                     {"start_date": "03.03.2025", "end_date": "2025-03-06"},
+                     {"start_date": "2025-03-03", "end_date": "2025-03-06", "workers": "çok"},
+                     {"start_date": "2025-03-03", "end_date": "2025-03-06", "time_limit_ms": -5}):
+            with self.subTest(body=body):
+                response, lines = self.post(body)
+                self.assertEqual(response.status_code, 400)
+                self.assertIsNone(lines)
+
+
+# ==================== ÇÖZÜCÜ ÇEKİRDEĞİ ====================
+
+class NodeIndexTests(RoutingTestCase):
+
+    def test_nodes_map_back_to_station_names(self):
+        rnd = random.Random(2)
+        cargos = random_cargos(rnd, stations=8)
+        solver = ClarkeWrightVRP(owned_fleet(2000), cargos_from_dicts(cargos))
+        names = solver.node_names
+
+        self.assertEqual(names[0], DEPOT_NAME)
+        self.assertEqual(solver.nodes, list(range(1, len(names))))
+        for a in range(len(names)):
+            for b in range(len(names)):
+                expected = get_distance(names[a], names[b]) if names[a] != names[b] else 0
+                self.assertEqual(solver.dist[a][b], expected)
+        for node in solver.nodes:
+            self.assertEqual({c.station_name for c in solver.node_cargos[node]}, {names[node]})
+            self.assertAlmostEqual(solver.demand[node],
+                                   sum(c.total_weight for c in solver.node_cargos[node]))
+        self.assertEqual(DISTRICT_INDEX, {name: DISTRICTS.index(name) for name in DISTRICTS})
+
+        result = calculate_routes(owned_fleet(2000), cargos)
+        visited = sorted(stop["station_name"] for route in result["routes"] for stop in route["stops"])
+        self.assertEqual(visited, sorted({c["station_name"] for c in cargos}))
+
+
+@skipIf(np is None, "NumPy kurulu değil")
+class NumpyPathTests(SimpleTestCase):
+
+    def solver(self, instance):
+        return ClarkeWrightVRP(instance.vehicles, instance.cargo_objects(),
+                               distance_provider=instance.provider())
+
+    def test_vectorized_savings_and_distances_match_pure_python(self):
+        instance = generate_instance(40, seed=1)
+        vectorized = self.solver(instance)
+        with mock.patch("yoneticiekrani.routing_algorithm.np", None):
+            pure = self.solver(instance)
+        self.assertTrue(vectorized._use_numpy(len(vectorized.nodes)))
+        self.assertFalse(pure._use_numpy(len(pure.nodes)))
+
+        for positive in (True, False):
+            fast = vectorized._calculate_savings(positive)
+            slow = {(i, j): saving for i, j, saving in pure._calculate_savings(positive)}
+            values = [saving for _, _, saving in fast]
+            self.assertEqual(values, sorted(values, reverse=True))
+            self.assertEqual({(i, j) for i, j, _ in fast}, set(slow))
+            for i, j, saving in fast:
+                self.assertAlmostEqual(saving, slow[i, j])
+
+        rnd = random.Random(1)
+        for _ in range(20):
+            route = rnd.sample(vectorized.nodes, 20)
+            self.assertAlmostEqual(vectorized._calculate_route_distance(route),
+                                   pure._calculate_route_distance(route))
+
+    def test_plans_match_pure_python(self):
+        instance = generate_instance(40, seed=2)
+        fast = self.solver(instance).solve(time_budget_ms=0)
+        with mock.patch("yoneticiekrani.routing_algorithm.np", None):
+            slow = self.solver(instance).solve(time_budget_ms=0)
+        self.assertAlmostEqual(fast.total_cost, slow.total_cost)
+        self.assertEqual([route.stops for route in fast.routes], [route.stops for route in slow.routes])
+
+
+class LocalSearchTests(SimpleTestCase):
+
+    def random_matrix(self, rnd, size):
+        points = [(rnd.random() * 50, rnd.random() * 50) for _ in range(size + 1)]
+        return [[math.dist(a, b) for b in points] for a in points]
+
+    def neighborhood(self, route):
+        """Tüm 2-opt ters çevirmeleri ve 1..3 uzunluklu Or-opt taşımaları."""
+        n = len(route)
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                yield route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+        for length in range(1, 4):
+            for i in range(n - length + 1):
+                segment, rest = route[i:i + length], route[:i] + route[i + length:]
+                for pos in range(len(rest) + 1):
+                    yield rest[:pos] + segment + rest[pos:]
+                    yield rest[:pos] + segment[::-1] + rest[pos:]
+
+    def test_moves_only_improve(self):
+        rnd = random.Random(4)
+        for _ in range(30):
+            size = rnd.randint(3, 12)
+            dist = self.random_matrix(rnd, size)
+            route = rnd.sample(range(1, size + 1), size)
+            for move in (two_opt, or_opt):
+                candidate = list(route)
+                before = route_distance(candidate, dist)
+                changed = move(candidate, dist)
+                after = route_distance(candidate, dist)
+                self.assertEqual(sorted(candidate), sorted(route))
+                if changed:
+                    self.assertLess(after, before - 1e-9)
+                else:
+                    self.assertEqual(candidate, route)
+
+    def test_result_is_local_optimum(self):
+        rnd = random.Random(6)
+        for _ in range(20):
+            size = rnd.randint(4, 11)
+            dist = self.random_matrix(rnd, size)
+            route = rnd.sample(range(1, size + 1), size)
+            best = improve_route(route, dist)
+            cost = route_distance(best, dist)
+            self.assertLessEqual(cost, route_distance(route, dist) + 1e-9)
+            for candidate in self.neighborhood(best):
+                self.assertGreaterEqual(route_distance(candidate, dist), cost - 1e-9)
+
+    def test_expired_budget_keeps_order(self):
+        rnd = random.Random(8)
+        dist = self.random_matrix(rnd, 12)
+        route = rnd.sample(range(1, 13), 12)
+        self.assertEqual(improve_route(route, dist, deadline=0.0), route)
+
+
+class HeldKarpTests(SimpleTestCase):
+
+    def test_order_matches_brute_force(self):
+        rnd = random.Random(9)
+        for size in range(1, 8):
+            points = [(rnd.random() * 50, rnd.random() * 50) for _ in range(size + 1)]
+            dist = [[math.dist(a, b) for b in points] for a in points]
+            route = list(range(1, size + 1))
+            with self.subTest(size=size):
+                order, cost = held_karp_order(route, dist)
+                best = min(route_distance(p, dist) for p in itertools.permutations(route))
+                self.assertEqual(sorted(order), route)
+                self.assertAlmostEqual(route_distance(order, dist), cost)
+                self.assertAlmostEqual(cost, best)
+
+    def test_cache_is_keyed_by_names_and_matrix(self):
+        rnd = random.Random(10)
+        points = [(rnd.random() * 50, rnd.random() * 50) for _ in range(7)]
+        dist = [[math.dist(a, b) for b in points] for a in points]
+        labels = ["depo"] + [f"S{k}" for k in range(1, 7)]
+        cache = RouteOrderCache(maxsize=2)
+
+        first = cached_held_karp_order([1, 2, 3, 4, 5, 6], labels, dist, cache=cache)
+        self.assertEqual(first, held_karp_order([1, 2, 3, 4, 5, 6], dist)[0])
+        # Aynı isimler farklı düğüm sırasıyla: önbellekten, yine aynı istasyon sırası
+        shuffled = [labels.index(name) for name in ["depo", "S6", "S5", "S4", "S3", "S2", "S1"]]
+        relabeled = [labels[k] for k in shuffled]
+        moved = [[dist[shuffled[a]][shuffled[b]] for b in range(7)] for a in range(7)]
+        again = cached_held_karp_order([1, 2, 3, 4, 5, 6], relabeled, moved, cache=cache)
+        self.assertEqual([relabeled[node] for node in again], [labels[node] for node in first])
+        self.assertEqual(len(cache), 1)
+
+        # Mesafe değişince eski sıra kullanılmaz
+        changed = [row[:] for row in dist]
+        changed[first[0]][0] = changed[0][first[0]] = 0.0
+        order = cached_held_karp_order([1, 2, 3, 4, 5, 6], labels, changed, cache=cache)
+        self.assertEqual(order, held_karp_order([1, 2, 3, 4, 5, 6], changed)[0])
+
+        for k in range(1, 4):
+            cached_held_karp_order([k, k + 1], labels, dist, cache=cache)
+        self.assertEqual(len(cache), 2)
+
+
+class MultiStartTests(RoutingTestCase):
+
+    def check_best_of_n(self, cargos, parallel):
+        single = calculate_routes(owned_fleet(500, 750), cargos)
+        result = calculate_routes(owned_fleet(500, 750), cargos, parallel=parallel)
+        runs = result["parallel"]["runs"]
+
+        self.assertEqual(result["parallel"]["workers"], parallel)
+        self.assertEqual([run["worker"] for run in runs], list(range(parallel)))
+        self.assertEqual(runs[0]["savings_noise"], 0.0)
+        self.assertEqual(sum(run["best"] for run in runs), 1)
+        best = next(run for run in runs if run["best"])
+        self.assertAlmostEqual(best["total_cost"], result["total_cost"])
+        # 0. işçi tek geçişin aynısıdır; seçilen plan ondan kötü olamaz
+        self.assertAlmostEqual(runs[0]["total_cost"], single["total_cost"])
+        self.assertLessEqual(len(result["unassigned_cargos"]), len(single["unassigned_cargos"]))
+        self.assertLessEqual(result["total_cost"], single["total_cost"] + 1e-9)
+        return runs
+
+    def test_process_pool(self):
+        cargos = random_cargos(random.Random(11), stations=10)
+        self.check_best_of_n(cargos, parallel=2)
+
+    def test_in_process_fallback(self):
+        cargos = random_cargos(random.Random(12), stations=10)
+        with mock.patch("yoneticiekrani.routing_algorithm.ProcessPoolExecutor", side_effect=OSError):
+            runs = self.check_best_of_n(cargos, parallel=3)
+        self.assertEqual({run["pid"] for run in runs}, {os.getpid()})
+
+
+class AlnsModeTests(RoutingTestCase):
+
+    def test_search_never_worse_than_seed(self):
+        for seed in range(3):
+            cargos = random_cargos(random.Random(20 + seed), stations=12, max_weight=200)
+            with self.subTest(seed=seed):
+                result = calculate_routes(owned_fleet(500, 750, 1000), cargos, mode="alns", time_limit_ms=150)
+                stats = result["search_stats"]
+                self.assertEqual(result["unassigned_cargos"], [])
+                self.assertLessEqual(stats["best_cost"], stats["seed_cost"] + 1e-9)
+                self.assertAlmostEqual(result["total_cost"], stats["best_cost"])
+                self.assertLess(stats["elapsed_ms"], 150 + 1000)
+                self.assertLoadsWithinCapacity(cargos, result)
+
+
+class RouteOptionTests(SimpleTestCase):
+
+    def test_invalid_options_are_rejected(self):
+        invalid = [
+            {"time_limit_ms": "nan"}, {"time_limit_ms": float("inf")}, {"time_budget_ms": -1},
+            {"time_budget_ms": "abc"}, {"target_gap": -0.5}, {"parallel": "x"},
+            {"max_vehicles": 0}, {"max_vehicles": "bir"}, {"departure_time": "25:00"},
+            {"departure_time": "24:00"}, {"mode": "tabu"}, {"rental_options": []},
+            {"rental_options": [{"capacity": 0, "cost": 100}]}, {"rental_options": [{"cost": 100}]},
+        ]
+        for data in invalid:
+            with self.subTest(data=data):
+                options, error = _route_options(data)
+                self.assertIsNone(options)
+                self.assertTrue(error)
+
+    def test_limits_are_clamped(self):
+        options, error = _route_options({
+            "time_limit_ms": 10 ** 9, "time_budget_ms": "250", "parallel": 10 ** 6,
+            "mode": "alns", "departure_time": "07:30",
+            "rental_options": [{"capacity": "750", "cost": 300}],
+        })
+        self.assertIsNone(error)
+        self.assertEqual(options["time_limit_ms"], MAX_SOLVE_TIME_MS)
+        self.assertEqual(options["time_budget_ms"], 250)
+        self.assertEqual(options["parallel"], MAX_PARALLEL)
+        self.assertEqual(options["rental_options"], [(750.0, 300.0)])
+        self.assertEqual(_route_options({})[0]["parallel"], 1)
+
+
+class RouteCacheTests(RoutingTestCase):
+
+    def test_fingerprint_ignores_order_but_not_content(self):
+        rnd = random.Random(13)
+        cargos = random_cargos(rnd, stations=6)
+        fleet = owned_fleet(500, 750)
+        key = fingerprint(fleet, cargos, allow_rental=True, mode="cw")
+
+        shuffled = rnd.sample(cargos, len(cargos))
+        self.assertEqual(fingerprint(fleet[::-1], shuffled, mode="cw", allow_rental=True), key)
+
+        heavier = [dict(c, weight=c["weight"] + 1) if k == 0 else c for k, c in enumerate(cargos)]
+        windowed = [dict(c, window_end="12:00") if k == 0 else c for k, c in enumerate(cargos)]
+        changed = [
+            fingerprint(fleet, heavier, allow_rental=True, mode="cw"),
+            fingerprint(fleet, windowed, allow_rental=True, mode="cw"),
+            fingerprint(owned_fleet(500, 1000), cargos, allow_rental=True, mode="cw"),
+            fingerprint(fleet, cargos, allow_rental=False, mode="cw"),
+            fingerprint(fleet, cargos, allow_rental=True, mode="alns"),
+        ]
+        self.assertNotIn(key, changed)
+        self.assertEqual(len(set(changed)), len(changed))
+
+    def test_ttl_and_lru_eviction(self):
+        cache = RouteResultCache(maxsize=2, ttl_seconds=10)
+        with mock.patch("yoneticiekrani.route_cache.time.monotonic", return_value=100.0) as clock:
+            cache.put("a", {"total_cost": 1})
+            cache.put("b", {"total_cost": 2})
+            self.assertEqual(cache.get("a"), {"total_cost": 1})
+            cache.put("c", {"total_cost": 3})   # En eski kullanılan "b" çıkar
+            self.assertIsNone(cache.get("b"))
+            self.assertEqual(len(cache), 2)
+
+            clock.return_value = 111.0
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(len(cache), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_hits_return_copies(self):
+        cargos = random_cargos(random.Random(14), stations=5)
+        cache = RouteResultCache()
+        with mock.patch("yoneticiekrani.route_cache.calculate_routes", wraps=calculate_routes) as solve:
+            first = cached_calculate_routes(owned_fleet(500, 750), cargos, cache=cache, allow_rental=True)
+            first["routes"].clear()
+            second = cached_calculate_routes(owned_fleet(500, 750), cargos, cache=cache, allow_rental=True)
+        self.assertEqual(solve.call_count, 1)
+        self.assertFalse(first["cache_hit"])
+        self.assertTrue(second["cache_hit"])
+        self.assertTrue(second["routes"])
+
+
+class LowerBoundTests(RoutingTestCase):
+
+    def test_bound_never_exceeds_plan_cost(self):
+        rnd = random.Random(15)
+        for day in range(12):
+            cargos = random_cargos(rnd, stations=rnd.randint(3, 12), max_weight=250)
+            options = {"allow_rental": rnd.random() < 0.7, "allow_multi_trip": rnd.random() < 0.7}
+            for mode in ("cw", "alns"):
+                with self.subTest(day=day, mode=mode, **options):
+                    extra = {"time_limit_ms": 50} if mode == "alns" else {}
+                    result = calculate_routes(owned_fleet(500, 750), cargos, mode=mode, **options, **extra)
+                    self.assertLessEqual(result["lower_bound"], result["total_cost"] + 1e-6)
+                    self.assertAlmostEqual(result["gap_percent"],
+                                           gap_percent(result["total_cost"], result["lower_bound"]))
+
+    def test_distance_bound_below_any_split(self):
+        rnd = random.Random(16)
+        for _ in range(20):
+            size = rnd.randint(1, 7)
+            points = [(rnd.random() * 50, rnd.random() * 50) for _ in range(size + 1)]
+            dist = [[math.dist(a, b) for b in points] for a in points]
+            nodes = list(range(1, size + 1))
+            bound = distance_lower_bound(nodes, dist)
+            single = min(route_distance(p, dist) for p in itertools.permutations(nodes))
+            self.assertLessEqual(bound, single + 1e-9)
+            self.assertLessEqual(bound, sum(dist[k][0] for k in nodes) + 1e-9)
+
+    def test_vehicle_bound(self):
+        self.assertEqual(vehicle_lower_bound([300, 300, 300], 500), 3)   # Hepsi C/2'den ağır
+        self.assertEqual(vehicle_lower_bound([100] * 9, 500), 2)
+        self.assertEqual(vehicle_lower_bound([], 500), 0)
+
+
+class FleetSearchTests(RoutingTestCase):
+
+    def test_candidate_fleets(self):
+        fleet = owned_fleet(500)
+        cargos = cargos_from_dicts([
+            {"id": k + 1, "station_name": station, "weight": 300, "quantity": 1, "sender_id": 1}
+            for k, station in enumerate(DISTRICTS[:4])
+        ])
+        # Açık 700 kg: 500 kg'lık seçenekle 2 kiralık + 2 ek
+        candidates = candidate_fleets(fleet, cargos, [(500, 200), (1000, 350)], extra_rentals=2)
+        counts = [len(capacities) for capacities, _ in candidates]
+        self.assertEqual(counts, sorted(counts))
+        self.assertEqual((counts[0], counts[-1]), (0, 4))
+        self.assertEqual(len(candidates), 1 + 2 + 3 + 4 + 5)
+        for capacities, vehicles in candidates:
+            rentals = vehicles[len(fleet):]
+            self.assertEqual(vehicles[:len(fleet)], fleet)
+            self.assertEqual([v["id"] for v in rentals], list(range(RENTAL_ID_START, RENTAL_ID_START + len(rentals))))
+            self.assertEqual([v["capacity"] for v in rentals], list(capacities))
+            self.assertTrue(all(v["rental_cost"] == {500: 200, 1000: 350}[v["capacity"]] for v in rentals))
+
+        many = candidate_fleets(fleet, cargos, [(100, 50), (200, 80), (300, 110)], extra_rentals=4)
+        self.assertEqual(len(many), FLEET_MAX_CANDIDATES)
+
+    def test_search_is_never_worse_than_automatic_rental(self):
+        for seed in range(3):
+            cargos = random_cargos(random.Random(30 + seed), stations=10, max_weight=200)
+            with self.subTest(seed=seed):
+                automatic = calculate_routes(owned_fleet(500), cargos, allow_multi_trip=False)
+                result = calculate_routes(owned_fleet(500), cargos, allow_multi_trip=False, fleet_search=True,
+                                          rental_options=[(500, 200), (750, 260)])
+                report = result["fleet_search"]
+                best = [c for c in report["candidates"] if c["best"]]
+                self.assertEqual(len(best), 1)
+                self.assertAlmostEqual(best[0]["total_cost"], result["total_cost"])
+                self.assertEqual(report["candidates"][0]["fleet"], "otomatik")
+                self.assertAlmostEqual(report["candidates"][0]["total_cost"], automatic["total_cost"])
+                self.assertLessEqual(len(result["unassigned_cargos"]), len(automatic["unassigned_cargos"]))
+                self.assertLessEqual(result["total_cost"], automatic["total_cost"] + 1e-9)
+                counts = [point["rental_count"] for point in report["cost_curve"]]
+                self.assertEqual(counts, sorted(set(counts)))
+                self.assertLoadsWithinCapacity(cargos, result)
+
+
+class ScenarioComparisonTests(RoutingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        ROUTE_RESULT_CACHE.clear()
+
+    def tearDown(self):
+        ROUTE_RESULT_CACHE.clear()
+        super().tearDown()
+
+    def test_every_variant_solves_every_day(self):
+        rnd = random.Random(40)
+        days = {1: random_cargos(rnd, stations=8, max_weight=200), 2: [],
+                3: random_cargos(rnd, stations=12, max_weight=200)}
+        comparison = compare_scenarios(days, workers=2)
+
+        self.assertEqual([variant["id"] for variant in comparison], [v["id"] for v in FLEET_VARIANTS])
+        for variant, summary in zip(FLEET_VARIANTS, comparison):
+            with self.subTest(variant=variant["id"]):
+                self.assertEqual([day["scenario"] for day in summary["days"]], [1, 2, 3])
+                self.assertEqual(summary["days"][1]["cost"], 0.0)
+                for day in summary["days"]:
+                    cargos = days[day["scenario"]]
+                    if not cargos:
+                        continue
+                    direct = calculate_routes(
+                        variant_vehicles(variant), cargos, allow_rental=variant["allow_rental"],
+                        allow_multi_trip=variant["allow_multi_trip"], max_vehicles=variant["max_vehicles"],
+                    )
+                    self.assertAlmostEqual(day["cost"], direct["total_cost"])
+                    self.assertEqual(day["carried"] + day["unassigned_count"], day["cargo_count"])
+                    if variant["max_vehicles"]:
+                        self.assertEqual(day["rental_count"], 0)
+                self.assertAlmostEqual(summary["cost"], sum(day["cost"] for day in summary["days"]))
+
+        again = compare_scenarios(days, workers=2)
+        self.assertTrue(all(day["cache_hit"] for variant in again for day in variant["days"] if day["cargo_count"]))
+
+
+# ==================== KIYASLAMA ====================
+
+CVRP_EUC = """NAME : tiny-n5-k2
+TYPE : CVRP
+DIMENSION : 5
+EDGE_WEIGHT_TYPE : EUC_2D
+CAPACITY : 10
+NODE_COORD_SECTION
+ 1 0 0
+ 2 3 4
+ 3 6 8
+ 4 -5 0
+ 5 0 7
+DEMAND_SECTION
+1 0
+2 4
+3 6
+4 5
+5 3
+DEPOT_SECTION
+ 1
+ -1
+EOF
+"""
+
+CVRP_EXPLICIT = """NAME : tiny-explicit
+TYPE : CVRP
+DIMENSION : 4
+EDGE_WEIGHT_TYPE : EXPLICIT
+EDGE_WEIGHT_FORMAT : LOWER_ROW
+CAPACITY : 10
+EDGE_WEIGHT_SECTION
+ 5
+ 10 7
+ 6 8 9
+DEMAND_SECTION
+1 0
+2 4
+3 6
+4 5
+DEPOT_SECTION
+ 1
+ -1
+EOF
+"""
+
+
+class BenchmarkTests(SimpleTestCase):
+
+    def write(self, directory, name, text):
+        path = os.path.join(directory, name)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        return path
+
+    def test_cvrplib_loader(self):
+        with tempfile.TemporaryDirectory() as directory:
+            euc = load_cvrplib(self.write(directory, "tiny.vrp", CVRP_EUC))
+            explicit = load_cvrplib(self.write(directory, "explicit.vrp", CVRP_EXPLICIT))
+
+        self.assertEqual(euc.name, "tiny-n5-k2")
+        self.assertEqual(euc.names, ["N2", "N3", "N4", "N5"])
+        self.assertEqual(len(euc.vehicles), 2)
+        self.assertEqual({v["capacity"] for v in euc.vehicles}, {10})
+        self.assertEqual([c["weight"] for c in euc.cargos], [4, 6, 5, 3])
+        self.assertEqual(euc.matrix[0][1:], [5.0, 10.0, 5.0, 7.0])
+        self.assertEqual(euc.matrix[1][2], 5.0)
+        self.assertEqual(euc.matrix[3][4], 9.0)   # √74 ≈ 8.6 -> en yakın tam sayı
+
+        self.assertEqual(explicit.matrix, [[0, 5, 10, 6], [5, 0, 7, 8], [10, 7, 0, 9], [6, 8, 9, 0]])
+        self.assertEqual(len(explicit.vehicles), 2)   # ⌈15 / 10⌉
+
+        result = ClarkeWrightVRP(euc.vehicles, euc.cargo_objects(),
+                                 distance_provider=euc.provider()).solve(**euc.options)
+        self.assertEqual(result.unassigned_cargos, [])
+        for route in result.routes:
+            self.assertLessEqual(sum(stop.total_weight for stop in route.stops), 10)
+
+    def test_generator_is_deterministic(self):
+        first = generate_instance(30, seed=4, clustered=True)
+        self.assertEqual(first.matrix, generate_instance(30, seed=4, clustered=True).matrix)
+        self.assertNotEqual(first.matrix, generate_instance(30, seed=5, clustered=True).matrix)
+        self.assertEqual(first.station_count, 30)
+        self.assertEqual({c["station_name"] for c in first.cargos}, set(first.names))
+        for bad in (5, 5000):
+            with self.assertRaises(ValueError):
+                generate_instance(bad)
+
+    def test_report_round_trip(self):
+        instances = [generate_instance(12, seed=0), generate_instance(15, seed=1)]
+        report = run_benchmark(instances, ["cw"], seeds=[0], measure_memory=False)
+        self.assertEqual([row["instance"] for row in report["results"]], [i.name for i in instances])
+        for row in report["results"]:
+            self.assertLessEqual(row["lower_bound"], row["total_cost"])
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("report.json", "report.csv"):
+                path = os.path.join(directory, name)
+                write_report(report, path)
+                comparison = compare_reports(report, load_report(path))
+                self.assertEqual(comparison["missing"], [])
+                self.assertTrue(all(row["cost_delta_percent"] == 0 for row in comparison["rows"]))
+
+
+# ==================== MESAFE MATRİSİ DOSYASI ====================
+
+class DistanceArtifactTests(RoutingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        rnd = random.Random(3)
+        self.rows = [(i, f"S{i}", 40.6 + rnd.random() * 0.4, 29.3 + rnd.random() * 0.8) for i in range(1, 30)]
+        self.names = [name for _, name, _, _ in self.rows]
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "matrix.bin")
+        write_artifact(self.path, StationDistanceProvider(self.rows).snapshot())
+
+    def test_station_edited_elsewhere_uses_fallback(self):
+        # Başka süreçte taşınan istasyon: bu sürecin sinyali hiç çalışmadı
+        edited = [(i, name, lat + 0.05, lon) if i == 5 else (i, name, lat, lon)
+                  for i, name, lat, lon in self.rows]
+        provider = ArtifactDistanceProvider(self.path, fallback=StationDistanceProvider(self.rows))
+
+        with mock.patch("yoneticiekrani.distance_artifact.station_rows", return_value=self.rows):
+            unchanged = provider.matrix(self.names)
+        with mock.patch("yoneticiekrani.distance_artifact.station_rows", return_value=edited):
+            moved = provider.matrix(self.names)
+            # Dosyanın yeniden eşlenmesi bayat istasyonu unutturmamalı
+            write_artifact(self.path, StationDistanceProvider(self.rows).snapshot())
+            reopened = provider.matrix(self.names)
+
+        expected = StationDistanceProvider(edited).matrix(self.names)
+        self.assertNotEqual(unchanged, expected)
+        self.assertEqual(moved, expected)
+        self.assertEqual(reopened, expected)
+        self.assertEqual(provider.version, 2)
+
+    def test_rebuilt_artifact_changes_cache_key(self):
+        provider = ArtifactDistanceProvider(self.path, fallback=StationDistanceProvider(self.rows))
+        set_distance_provider(provider)
+        cargos = [{"id": 1, "station_name": "S1", "weight": 10, "quantity": 1, "sender_id": 1}]
+
+        before = fingerprint(owned_fleet(500), cargos)
+        write_artifact(self.path, StationDistanceProvider(self.rows).snapshot())
+        self.assertNotEqual(fingerprint(owned_fleet(500), cargos), before)
+
+
+class StationMatrixTests(SimpleTestCase):
+
+    def setUp(self):
+        rnd = random.Random(70)
+        self.rows = [(i, f"S{i}", 40.6 + rnd.random() * 0.4, 29.3 + rnd.random() * 0.8) for i in range(1, 25)]
+        self.points = {name: (lat, lon) for _, name, lat, lon in self.rows}
+
+    def test_table_pairs_and_haversine_fallback(self):
+        names = list(self.points) + DISTRICTS[:4]
+        matrix = StationDistanceProvider(self.rows).matrix(names)
+        districts = DistrictDistanceProvider()
+        nodes = [DEPOT_NAME] + names
+        for a, first in enumerate(nodes):
+            for b, second in enumerate(nodes):
+                if a == b:
+                    self.assertEqual(matrix[a][b], 0.0)
+                elif first in self.points or second in self.points:
+                    # Tabloda olmayan istasyon: kuş uçuşu × dolambaç katsayısı
+                    km = haversine_km(self.points.get(first) or districts.locate(first),
+                                      self.points.get(second) or districts.locate(second))
+                    self.assertAlmostEqual(matrix[a][b], round(km * ROAD_DETOUR_FACTOR, 1))
+                else:
+                    self.assertEqual(matrix[a][b], get_distance(first, second))
+
+    @skipIf(np is None, "NumPy kurulu değil")
+    def test_vectorized_haversine_matches_scalar(self):
+        lats = [lat for lat, _ in self.points.values()]
+        lons = [lon for _, lon in self.points.values()]
+        rows = haversine_rows(lats, lons, lats[:5], lons[:5])
+        for i, a in enumerate(self.points.values()):
+            for j, b in enumerate(list(self.points.values())[:5]):
+                self.assertAlmostEqual(rows[i][j], haversine_km(a, b), places=9)
+
+        fast = StationDistanceProvider(self.rows).matrix(list(self.points))
+        with mock.patch("yoneticiekrani.distance_providers.np", None):
+            slow = StationDistanceProvider(self.rows).matrix(list(self.points))
+        self.assertEqual(fast, slow)
+
+    def test_incremental_updates_match_rebuild(self):
+        provider = StationDistanceProvider(self.rows)
+        provider.add_station("Yeni", 40.75, 29.9, station_id=100)
+        provider.add_station("S3", 40.7, 29.5, station_id=3)
+        provider.remove_station("S7", station_id=7)
+
+        rows = [(i, name, lat, lon) for i, name, lat, lon in self.rows if i not in (3, 7)]
+        rows += [(100, "Yeni", 40.75, 29.9), (3, "S3", 40.7, 29.5)]
+        names = ["Yeni", "S3", "S1", "S20", DISTRICTS[0]]
+        self.assertEqual(provider.matrix(names), StationDistanceProvider(rows).matrix(names))
+
+
+class SpatialIndexTests(SimpleTestCase):
+
+    def setUp(self):
+        rnd = random.Random(80)
+        self.rows = [(i, f"S{i}", 40.6 + rnd.random() * 0.3, 29.3 + rnd.random() * 0.9) for i in range(1, 200)]
+        self.rnd = rnd
+
+    def brute_nearest(self, lat, lon, max_km, rows=None):
+        hits = sorted((haversine_km((lat, lon), (s_lat, s_lon)), station_id)
+                      for station_id, _, s_lat, s_lon in rows or self.rows)
+        return [station_id for km, station_id in hits if km <= max_km]
+
+    def test_grid_matches_brute_force(self):
+        points = [(self.rnd.uniform(-30, 30), self.rnd.uniform(-30, 30)) for _ in range(300)]
+        grid = GridIndex.from_points(points)
+        for key in range(0, 300, 7):
+            grid.remove(key)
+        grid.insert(1000, 0.5, 0.5)
+        alive = {key: point for key, point in enumerate(points) if key % 7}
+        alive[1000] = (0.5, 0.5)
+        for _ in range(50):
+            x, y = self.rnd.uniform(-40, 40), self.rnd.uniform(-40, 40)
+            k = self.rnd.randint(1, 12)
+            max_km = self.rnd.choice([math.inf, 5.0, 15.0])
+            expected = sorted((math.hypot(px - x, py - y), key) for key, (px, py) in alive.items())
+            expected = [key for d, key in expected if d <= max_km][:k]
+            self.assertEqual([key for _, key in grid.nearest(x, y, k=k, max_km=max_km)], expected)
+
+    def test_station_index_ranks_by_haversine(self):
+        index = StationIndex()
+        index.load(self.rows)
+        for _ in range(40):
+            lat, lon = 40.55 + self.rnd.random() * 0.4, 29.25 + self.rnd.random() * 1.0
+            hits = index.nearest(lat, lon, k=5, max_km=6.0)
+            self.assertEqual([hit["id"] for hit in hits], self.brute_nearest(lat, lon, 6.0)[:5])
+
+    def test_nearest_station_reloads_on_table_change(self):
+        self.addCleanup(STATION_INDEX.load, [], None)
+        rows = list(self.rows)
+        station = mock.MagicMock()
+        station.objects.aggregate.side_effect = lambda **_: {"count": len(rows), "last": max(r[0] for r in rows)}
+        station.objects.values_list.side_effect = lambda *_: list(rows)
+
+        with mock.patch("yoneticiekrani.models.Station", station):
+            lat, lon = 40.7, 29.7
+            first = nearest_station(lat, lon)
+            nearest_station(lat + 0.01, lon)
+            self.assertEqual(station.objects.values_list.call_count, 1)
+            self.assertEqual(first["id"], self.brute_nearest(lat, lon, 15.0)[0])
+
+            rows.append((500, "Yeni", lat, lon))
+            self.assertEqual(nearest_station(lat, lon)["name"], "Yeni")
+            self.assertEqual(station.objects.values_list.call_count, 2)
+            self.assertIsNone(nearest_station(38.0, 27.0))
+
+    def test_candidate_lists_are_k_nearest(self):
+        points = [(0.0, 0.0)] + [(self.rnd.uniform(0, 50), self.rnd.uniform(0, 50)) for _ in range(150)]
+        dist = [[math.dist(a, b) for b in points] for a in points]
+        nodes = list(range(1, len(points)))
+        self.assertEqual(candidate_lists(points, nodes, dist, 6), nearest_neighbors(dist, nodes, 6))
+
+
+# ==================== SAATE BAĞLI SÜRELER ====================
+
+class TravelTimeFifoTests(SimpleTestCase):
+
+    def test_scaled_arrival_stays_monotonic(self):
+        # 120 dk'dan 30 dk'ya düşen süre: 2 kat yavaş araçta geç çıkan erken varmamalı
+        data = [[[0, minutes], [minutes, 0]] for minutes in (120, 30, 30, 120, 10)]
+        scale = 2.0
+        table = TravelTimeTable.from_array(data, start=0, bucket_minutes=60, max_scale=scale)
+
+        departures = [minute / 4 for minute in range(0, 5 * 60 * 4)]
+        arrivals = [depart + scale * table.travel(0, 1, depart) for depart in departures]
+        for earlier, later in zip(arrivals, arrivals[1:]):
+            self.assertLessEqual(earlier, later + 1e-4)
+
+        for arrive_by in range(300, 700, 7):
+            depart = table.depart_by(0, 1, arrive_by, scale)
+            self.assertAlmostEqual(depart + scale * table.travel(0, 1, depart), arrive_by, places=3)
+
+
+# ==================== YOL AĞI ====================
+
+class RoadNetworkTests(SimpleTestCase):
+
+    def test_contraction_matches_dijkstra(self):
+        # Tek yönlü ve eksik kenarlı rastgele ızgara
+        rnd = random.Random(7)
+        size = 10
+        lats = [40.7 + (k // size) * 0.005 for k in range(size * size)]
+        lons = [29.8 + (k % size) * 0.006 for k in range(size * size)]
+        edges = []
+        for v in range(size * size):
+            for w in (v + 1 if (v + 1) % size else None, v + size if v + size < size * size else None):
+                if w is None or rnd.random() < 0.05:
+                    continue
+                km = round(rnd.uniform(0.3, 1.2), 3)
+                minutes = km / rnd.choice([30, 50, 70]) * 60
+                direction = rnd.random()
+                if direction >= 0.15:
+                    edges.append((v, w, km, minutes))
+                if direction < 0.15 or direction >= 0.3:
+                    edges.append((w, v, km, minutes))
+
+        adjacency = [[] for _ in lats]
+        for u, v, km, _ in edges:
+            adjacency[u].append((v, km))
+
+        def dijkstra(source):
+            best = [math.inf] * len(lats)
+            best[source] = 0.0
+            heap = [(0.0, source)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > best[u]:
+                    continue
+                for v, km in adjacency[u]:
+                    if d + km < best[v]:
+                        best[v] = d + km
+                        heapq.heappush(heap, (best[v], v))
+            return best
+
+        network = contract(lats, lons, edges)
+        sources = rnd.sample(range(size * size), 12)
+        targets = rnd.sample(range(size * size), 12)
+        km, _ = network.many_to_many(sources, targets)
+        for a, source in enumerate(sources):
+            expected = dijkstra(source)
+            for b, target in enumerate(targets):
+                if math.isinf(expected[target]):
+                    self.assertTrue(math.isinf(km[a][b]))
+                else:
+                    self.assertAlmostEqual(km[a][b], expected[target], places=9)
+
+
+# ==================== ZAMAN PENCERELERİ ====================
+
+class ClockParsingTests(SimpleTestCase):
+
+    def test_parse_clock_bounds(self):
+        self.assertEqual(parse_clock("08:30"), 510)
+        self.assertEqual(parse_clock("23:59:30"), 23 * 60 + 59.5)
+        self.assertEqual(parse_clock("24:00"), 24 * 60)
+        self.assertIsNone(parse_clock(""))
+        for text in ("24:59", "24:00:01", "25:00", "12:60", "-1:00", "8"):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_clock(text)
+
+
+class TimeWindowPlanTests(RoutingTestCase):
+
+    def test_insert_and_append_checks_match_full_schedule(self):
+        rnd = random.Random(60)
+        for _ in range(200):
+            size = rnd.randint(2, 7)
+            points = [(rnd.random() * 40, rnd.random() * 40) for _ in range(size + 1)]
+            dist = [[math.dist(a, b) for b in points] for a in points]
+            windows = [(0.0, math.inf)] + [(480 + rnd.random() * 180, 600 + rnd.random() * 240) for _ in range(size)]
+            model = TimeModel(dist, windows, [0.0] + [10.0] * size)
+            nodes = rnd.sample(range(1, size + 1), size)
+            first, second, node = nodes[:size // 2], nodes[size // 2:-1], nodes[-1]
+
+            schedule = model.schedule(first, 480, 1080)
+            for position in range(len(first) + 1):
+                candidate = first[:position] + [node] + first[position:]
+                self.assertEqual(model.can_insert(schedule, position, node),
+                                 schedule.feasible and model.schedule(candidate, 480, 1080).feasible)
+            if first and second:
+                tail = model.schedule(second, 480, 1080)
+                self.assertEqual(model.can_append(schedule, tail),
+                                 schedule.feasible and tail.feasible
+                                 and model.schedule(first + second, 480, 1080).feasible)
+
+    def test_windowed_days_are_time_feasible(self):
+        rnd = random.Random(61)
+        for day in range(8):
+            cargos = random_cargos(rnd, stations=rnd.randint(4, 10), max_weight=150)
+            windows = {c["station_name"]: rnd.randint(8, 12) for c in cargos}
+            for c in cargos:
+                if windows[c["station_name"]] < 11:
+                    c["window_start"] = f"{windows[c['station_name']]:02d}:00"
+                    c["window_end"] = f"{windows[c['station_name']] + 3:02d}:00"
+            fleet = [dict(v, max_shift_minutes=480) for v in owned_fleet(500, 750)]
+            for mode in ("cw", "alns"):
+                with self.subTest(day=day, mode=mode):
+                    extra = {"time_limit_ms": 50} if mode == "alns" else {}
+                    result = calculate_routes(fleet, cargos, mode=mode, **extra)
+                    for route in result["routes"]:
+                        self.assertTrue(route["time_feasible"])
+                        for stop in route["stops"]:
+                            if stop["window_end"] is not None:
+                                self.assertLessEqual(parse_clock(stop["service_start"]),
+                                                     parse_clock(stop["window_end"]))
+
+
+class SlackFeasibilityTests(SimpleTestCase):
+    """Local search hamleleri gevşeklik dizileriyle pencere içinde kalmalı."""
+
+    def random_model(self, rnd, size):
+        points = [(rnd.random() * 40, rnd.random() * 40) for _ in range(size + 1)]
+        dist = [[math.dist(a, b) for b in points] for a in points]
+        windows = [(0.0, math.inf)] + [
+            (rnd.choice([0.0, 480 + rnd.random() * 120]), 560 + rnd.random() * 200)
+            for _ in range(size)
+        ]
+        return dist, TimeModel(dist, windows, [0.0] + [10.0] * size)
+
+    def test_replace_check_matches_full_schedule(self):
+        rnd = random.Random(3)
+        checked = 0
+        while checked < 2000:
+            size = rnd.randint(2, 9)
+            _, model = self.random_model(rnd, size)
+            route = rnd.sample(range(1, size + 1), size)
+            schedule = model.schedule(route, 480, 900)
+            if not schedule.feasible:
+                continue
+            for _ in range(40):
+                start = rnd.randint(0, size)
+                end = rnd.randint(start, size)
+                middle = rnd.sample(route[start:end], end - start)
+                candidate = route[:start] + middle + route[end:]
+                self.assertEqual(model.can_replace(schedule, start, end, middle),
+                                 model.schedule(candidate, 480, 900).feasible)
+                checked += 1
+
+    def test_moves_keep_feasible_routes_feasible(self):
+        rnd = random.Random(5)
+        for _ in range(60):
+            size = rnd.randint(4, 10)
+            dist, model = self.random_model(rnd, size)
+            nodes = rnd.sample(range(1, size + 1), size)
+            routes = [nodes[:size // 2], nodes[size // 2:]]
+            if not all(model.schedule(route, 480, 900).feasible for route in routes):
+                continue
+
+            ordered = improve_route(routes[0], dist, None, 0, model, (480, 900))
+            self.assertTrue(model.schedule(ordered, 480, 900).feasible)
+            self.assertLessEqual(route_distance(ordered, dist), route_distance(routes[0], dist) + 1e-9)
+
+            moved = improve_inter_route(
+                routes, capacities=[math.inf, math.inf], demand=[0.0] * (size + 1), dist=dist,
+                neighbors=nearest_neighbors(dist, nodes, 5),
+                time_models=[model, model], shifts=[(480, 900), (480, 900)],
+            )
+            for route in moved:
+                self.assertTrue(model.schedule(route, 480, 900).feasible)
+            self.assertLessEqual(sum(route_distance(r, dist) for r in moved),
+                                 sum(route_distance(r, dist) for r in routes) + 1e-9)
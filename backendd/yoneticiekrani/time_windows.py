@@ -0,0 +1,219 @@
+"""
+Zaman Pencereleri ve Vardiya Kısıtları
+
+Süreler gece yarısından itibaren dakika cinsindendir. Her ziyaretin bir
+alım penceresi [e, l] (istasyon ve kargo pencerelerinin kesişimi) ve
+sabit bir servis süresi vardır; iki nokta arası süre hız modelinden
+(km / hız) veya verilmişse saate bağlı süre tablosundan
+(travel_times.py) gelir. Araç pencereden önce gelirse bekler.
+
+Rota başına iki dizi tutulur (Savelsbergh):
+
+    earliest[k] = k. durakta servisin en erken başlangıcı (ileri geçiş)
+    latest[k]   = rotanın geri kalanı uygun kalacak şekilde k. durakta
+                  servisin en geç başlangıcı (geri geçiş; depo için
+                  vardiya bitişi)
+
+Bu dizilerle ekleme ve iki rotayı uç uca ekleme fizibilitesi O(1),
+bir parçanın yerine başka durak dizisi koymak (local search hamleleri)
+yalnızca yeni parça yürünerek kontrol edilir; rota değiştiğinde diziler O(n)'de yeniden kurulur.
+Saate bağlı sürelerde geri geçiş "en geç çıkış" ile (depart_by) yapılır;
+tablo FIFO olduğu için dizilerin anlamı değişmez.
+"""
+
+import math
+from dataclasses import dataclass, field
+from datetime import time as clock_time
+from typing import List, Optional, Sequence, Tuple
+
+from .travel_times import TravelTimeTable
+
+DAY_START_MINUTES = 8 * 60     # Varsayılan vardiya başlangıcı (08:00)
+AVERAGE_SPEED_KMH = 50.0       # Varsayılan ortalama hız
+SERVICE_MINUTES = 10.0         # Durak başına yükleme süresi
+UNBOUNDED = math.inf
+
+
+def parse_clock(value) -> Optional[float]:
+    """"HH:MM[:SS]" (gün sonu: "24:00"), datetime.time veya dakika değerini dakikaya çevir."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, clock_time):
+        return value.hour * 60 + value.minute + value.second / 60
+    if isinstance(value, (int, float)):
+        return float(value)
+    parts = [int(part) for part in str(value).split(":")]
+    if len(parts) < 2 or len(parts) > 3:
+        raise ValueError(f"Geçersiz saat: {value}")
+    hours, minutes = parts[0], parts[1]
+    seconds = parts[2] if len(parts) == 3 else 0
+    end_of_day = (hours, minutes, seconds) == (24, 0, 0)   # 24 yalnızca "24:00" olarak
+    if not end_of_day and not (0 <= hours < 24 and 0 <= minutes < 60 and 0 <= seconds < 60):
+        raise ValueError(f"Geçersiz saat: {value}")
+    return hours * 60 + minutes + seconds / 60
+
+
+def format_clock(minutes: Optional[float]) -> Optional[str]:
+    """Dakikayı "HH:MM" metnine çevir (sınırsız / None için None)."""
+    if minutes is None or math.isinf(minutes):
+        return None
+    total = int(round(minutes))
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+
+def intersect_windows(windows: Sequence[Tuple[Optional[float], Optional[float]]]) -> Tuple[float, float]:
+    """Pencerelerin kesişimi; boş sınır kısıtsız sayılır."""
+    start, end = 0.0, UNBOUNDED
+    for window_start, window_end in windows:
+        if window_start is not None:
+            start = max(start, window_start)
+        if window_end is not None:
+            end = min(end, window_end)
+    return start, end
+
+
+@dataclass
+class RouteSchedule:
+    """Bir rotanın zaman çizelgesi ve gevşeklik dizileri."""
+    route: List[int]
+    start_time: float                   # İlk durağa varış
+    deadline: float                     # Depoya en geç dönüş
+    arrival: List[float] = field(default_factory=list)
+    earliest: List[float] = field(default_factory=list)
+    latest: List[float] = field(default_factory=list)
+    end_time: float = 0.0               # Depoya varış
+    feasible: bool = True
+
+    def slack(self) -> List[float]:
+        """Durak başına kaydırma payı (latest - earliest)."""
+        return [late - early for early, late in zip(self.earliest, self.latest)]
+
+
+class TimeModel:
+    """Düğüm pencereleri, servis süreleri ve hız modeli."""
+
+    def __init__(self, dist: Sequence[Sequence[float]], windows: List[Tuple[float, float]],
+                 service: List[float], speed_kmh: float = AVERAGE_SPEED_KMH, depot: int = 0,
+                 travel_times: Optional[TravelTimeTable] = None):
+        """
+        Args:
+            windows: windows[node] = (e, l); depo için (0, sınırsız)
+            service: service[node] servis süresi (dakika)
+            travel_times: Saate bağlı süre tablosu (None: sabit hız);
+                          tablo başka hızla kurulduysa oranla ölçeklenir
+        """
+        self.dist = dist
+        self.windows = windows
+        self.service = service
+        self.minutes_per_km = 60.0 / speed_kmh
+        self.depot = depot
+        self.travel_times = travel_times
+        self.time_scale = (travel_times.speed_kmh / speed_kmh
+                           if travel_times is not None and travel_times.speed_kmh else 1.0)
+        self.active = any(
+            start > 0 or end < UNBOUNDED
+            for node, (start, end) in enumerate(windows) if node != depot
+        )
+
+    def travel(self, a: int, b: int, depart: Optional[float] = None) -> float:
+        """a'dan b'ye sürüş süresi (dakika); tablo varsa depart anındaki süre."""
+        if self.travel_times is None or depart is None:
+            return self.dist[a][b] * self.minutes_per_km
+        return self.travel_times.travel(a, b, depart) * self.time_scale
+
+    def depart_by(self, a: int, b: int, arrive_by: float) -> float:
+        """b'ye en geç arrive_by'da varmak için a'dan en geç çıkış."""
+        if self.travel_times is None:
+            return arrive_by - self.dist[a][b] * self.minutes_per_km
+        return self.travel_times.depart_by(a, b, arrive_by, self.time_scale)
+
+    def schedule(self, route: Sequence[int], start_time: float,
+                 deadline: float = UNBOUNDED) -> RouteSchedule:
+        """
+        İleri / geri geçişle çizelgeyi kur - O(n).
+
+        Args:
+            start_time: Araç ilk durakta hazır olduğu an (ek seferde
+                        depodan çıkış + boş gidiş süresi)
+            deadline: Depoya en geç dönüş (vardiya bitişi)
+        """
+        schedule = RouteSchedule(route=list(route), start_time=start_time, deadline=deadline)
+        if not route:
+            schedule.end_time = start_time
+            return schedule
+
+        windows, service = self.windows, self.service
+        arrival = start_time
+        previous = None
+        for node in route:
+            if previous is not None:
+                leave = schedule.earliest[-1] + service[previous]
+                arrival = leave + self.travel(previous, node, leave)
+            begin = max(arrival, windows[node][0])
+            schedule.arrival.append(arrival)
+            schedule.earliest.append(begin)
+            if begin > windows[node][1] + 1e-9:
+                schedule.feasible = False
+            previous = node
+        leave = schedule.earliest[-1] + service[previous]
+        schedule.end_time = leave + self.travel(previous, self.depot, leave)
+        if schedule.end_time > deadline + 1e-9:
+            schedule.feasible = False
+
+        latest = [0.0] * len(route)
+        bound = self.depart_by(route[-1], self.depot, deadline) - service[route[-1]]
+        for k in range(len(route) - 1, -1, -1):
+            node = route[k]
+            latest[k] = min(windows[node][1], bound)
+            if k:
+                prev = route[k - 1]
+                bound = self.depart_by(prev, node, latest[k]) - service[prev]
+        schedule.latest = latest
+        return schedule
+
+    def can_insert(self, schedule: RouteSchedule, position: int, node: int) -> bool:
+        """node'u position'a (0: yeni ilk durak) eklemek zamanca uygun mu? - O(1)"""
+        return self.can_replace(schedule, position, position, [node])
+
+    def can_replace(self, schedule: RouteSchedule, start: int, end: int,
+                    middle: Sequence[int]) -> bool:
+        """
+        route[start:end] yerine middle sürmek zamanca uygun mu?
+
+        Değişmeyen baş earliest[start - 1] ile, değişmeyen kuyruk
+        latest[end] ile özetlenir; yalnızca middle ileri yürünür
+        - O(len(middle)). Local search hamleleri (2-opt, Or-opt,
+        rotalar arası) rota yeniden çizelgelenmeden bununla elenir.
+        """
+        if not schedule.feasible:
+            return False
+        route = schedule.route
+        previous = route[start - 1] if start > 0 else None
+        clock = (schedule.earliest[start - 1] + self.service[previous]
+                 if previous is not None else schedule.start_time)
+        for node in middle:
+            arrival = clock + self.travel(previous, node, clock) if previous is not None else clock
+            begin = max(arrival, self.windows[node][0])
+            if begin > self.windows[node][1] + 1e-9:
+                return False
+            clock = begin + self.service[node]
+            previous = node
+
+        if end < len(route):
+            after = route[end]
+            arrival = clock + self.travel(previous, after, clock) if previous is not None else clock
+            return arrival <= schedule.latest[end] + 1e-9
+        if previous is None:
+            return True
+        return clock + self.travel(previous, self.depot, clock) <= schedule.deadline + 1e-9
+
+    def can_append(self, first: RouteSchedule, second: RouteSchedule) -> bool:
+        """first rotasının ardından second'ı sürmek uygun mu? - O(1)"""
+        if not (first.feasible and second.feasible):
+            return False
+        if not first.route or not second.route:
+            return True
+        last, head = first.route[-1], second.route[0]
+        leave = first.earliest[-1] + self.service[last]
+        arrival = leave + self.travel(last, head, leave)
+        return arrival <= second.latest[0] + 1e-9
@@ -0,0 +1,276 @@
+"""
+Günün Saatine Bağlı Sürüş Süreleri
+
+Sabit hız modelinde (km / hız) sabah 08:00'de Gebze -> İzmit ile öğlen
+aynı sürer; E-5 / TEM koridorunda zirve saatte süre neredeyse iki
+katına çıkar. TravelTimeTable sürüş sürelerini saat dilimi × çıkış ×
+varış boyutlarında tek bir float32 dizide tutar:
+
+    data[k][i][j] = k. dilimin ortasında i'den j'ye çıkışta süre (dakika)
+
+Dilim ortaları arasında doğrusal ara değer alınır; ufuk dışında uç
+dilim geçerlidir. Kurulurken her dilim bir öncekinden en fazla dilim
+boyu / max_scale kadar kısa olacak şekilde düzeltilir (FIFO): geç çıkan
+araç hiçbir zaman erken çıkandan önce varmaz. Tablodan daha yavaş
+araçların süreleri (TimeModel) en fazla max_scale katına çıkar; varış
+fonksiyonu bu ölçekte de monoton kalır ve "en geç çıkış" (geri geçiş)
+tam olarak tersine çevrilebilir.
+
+Satır / sütunlar istasyon başınadır; bölünmüş ziyaretler (aynı
+istasyonun birden fazla düğümü) node_index ile aynı satıra eşlenir.
+Ölçülmüş süreler (ör. trafik servisi) from_array ile verilebilir;
+build ise serbest akış süresini saatlik yoğunluk profiliyle çarpar.
+"""
+
+import math
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy yoksa dilimler array('f') ile tutulur
+    np = None
+
+from .distance_matrix import DISTRICT_COORDS
+from .spatial_index import project
+
+BUCKET_MINUTES = 60                  # Saat dilimi boyu
+TRAVEL_TIME_HORIZON_MINUTES = 14 * 60  # Çıkıştan itibaren tabloda tutulan süre
+CORRIDOR_BUFFER_KM = 3.0             # Koridora bu mesafedeki istasyonlar koridor trafiğine girer
+
+# Yoğunluk profilleri: (saat, serbest akışa göre süre katı); aralarda
+# doğrusal, gün sonunda başa sarar
+GENERAL_PROFILE = [
+    ("00:00", 1.00), ("06:30", 1.00), ("08:00", 1.25), ("09:30", 1.05),
+    ("12:30", 1.10), ("16:30", 1.10), ("18:00", 1.30), ("19:30", 1.05),
+    ("22:00", 1.00), ("24:00", 1.00),
+]
+CORRIDOR_PROFILE = [
+    ("00:00", 1.00), ("06:30", 1.05), ("08:00", 1.90), ("09:30", 1.25),
+    ("12:30", 1.20), ("16:30", 1.35), ("18:00", 2.10), ("19:30", 1.30),
+    ("22:00", 1.00), ("24:00", 1.00),
+]
+# E-5 / TEM koridoru (Gebze - İzmit) güzergâhı
+CORRIDOR_WAYPOINTS = ["Gebze", "Dilovası", "Körfez", "Derince", "İzmit"]
+
+
+def _profile_points(profile: Sequence[Tuple[str, float]]) -> List[Tuple[float, float]]:
+    points = []
+    for clock, factor in profile:
+        hours, minutes = clock.split(":")
+        points.append((int(hours) * 60 + int(minutes), factor))
+    return points
+
+
+_GENERAL = _profile_points(GENERAL_PROFILE)
+_CORRIDOR = _profile_points(CORRIDOR_PROFILE)
+
+
+def _interpolate(points: List[Tuple[float, float]], minute: float) -> float:
+    minute %= 24 * 60
+    for (t0, f0), (t1, f1) in zip(points, points[1:]):
+        if minute <= t1:
+            return f0 + (f1 - f0) * (minute - t0) / (t1 - t0) if t1 > t0 else f1
+    return points[-1][1]
+
+
+def congestion_factors(minute: float) -> Tuple[float, float]:
+    """Verilen saatte (genel, koridor) süre katı."""
+    return _interpolate(_GENERAL, minute), _interpolate(_CORRIDOR, minute)
+
+
+def corridor_exposure(points: Sequence[Optional[Tuple[float, float]]]) -> List[float]:
+    """
+    İstasyon başına koridor payı: güzergâha CORRIDOR_BUFFER_KM içindeyse
+    1, değilse 0 (koordinatı bilinmeyen: 0).
+    """
+    route = [project(*DISTRICT_COORDS[name]) for name in CORRIDOR_WAYPOINTS]
+    exposure = []
+    for point in points:
+        if point is None:
+            exposure.append(0.0)
+            continue
+        x, y = project(*point)
+        nearest = math.inf
+        for (ax, ay), (bx, by) in zip(route, route[1:]):
+            dx, dy = bx - ax, by - ay
+            t = max(0.0, min(1.0, ((x - ax) * dx + (y - ay) * dy) / (dx * dx + dy * dy)))
+            nearest = min(nearest, math.hypot(ax + t * dx - x, ay + t * dy - y))
+        exposure.append(1.0 if nearest <= CORRIDOR_BUFFER_KM else 0.0)
+    return exposure
+
+
+class TravelTimeTable:
+    """
+    Dilim × çıkış × varış sürüş süresi tablosu (float32, satır düzeni).
+
+    Args:
+        data: (dilim, n, n) NumPy dizisi veya dilim başına n·n'lik düz dizi
+        start: İlk dilimin başlangıcı (gece yarısından dakika)
+        bucket_minutes: Dilim boyu
+        node_index: Çözücü düğümü -> tablo satırı (None: birebir)
+        speed_kmh: Serbest akış sürelerinin hesaplandığı hız
+        max_scale: Sürelerin çarpılabileceği en büyük kat (tablo hızı /
+                   en yavaş araç hızı); FIFO bu ölçekte sağlanır
+    """
+
+    def __init__(self, data, start: float, bucket_minutes: float = BUCKET_MINUTES,
+                 node_index: Optional[Sequence[int]] = None, speed_kmh: Optional[float] = None,
+                 max_scale: float = 1.0):
+        if np is not None and hasattr(data, "shape"):
+            data = np.ascontiguousarray(data, dtype=np.float32)
+            buckets, size = data.shape[0], data.shape[1]
+            self._flat = memoryview(data.reshape(-1))
+        else:
+            buckets = len(data)
+            size = math.isqrt(len(data[0])) if buckets else 0
+            self._flat = array("f")
+            for bucket in data:
+                self._flat.extend(bucket)
+            data = None   # Dilimler _flat'e kopyalandı
+        self.data = data
+        self.buckets = buckets
+        self.size = size
+        self.start = start
+        self.bucket_minutes = bucket_minutes
+        self.speed_kmh = speed_kmh
+        self.max_scale = max(1.0, max_scale)
+        self.node_index = list(node_index) if node_index is not None else list(range(size))
+        self._enforce_fifo()
+
+    @classmethod
+    def from_array(cls, data, start: float, bucket_minutes: float = BUCKET_MINUTES,
+                   node_index: Optional[Sequence[int]] = None,
+                   max_scale: float = 1.0) -> "TravelTimeTable":
+        """Ölçülmüş süreler: data[k][i][j] dakika (iç içe liste veya NumPy)."""
+        if np is not None:
+            return cls(np.asarray(data, dtype=np.float32), start, bucket_minutes, node_index,
+                       max_scale=max_scale)
+        flat = [[value for row in bucket for value in row] for bucket in data]
+        return cls(flat, start, bucket_minutes, node_index, max_scale=max_scale)
+
+    @classmethod
+    def build(cls, dist: Sequence[Sequence[float]], speed_kmh: float, start: float,
+              end: Optional[float] = None, exposure: Optional[Sequence[float]] = None,
+              bucket_minutes: float = BUCKET_MINUTES,
+              node_index: Optional[Sequence[int]] = None,
+              max_scale: float = 1.0) -> "TravelTimeTable":
+        """
+        Serbest akış süresi (dist / hız) × saatlik yoğunluk katı.
+
+        Bir kenarın katı, uçlarının koridor paylarının ortalamasıyla
+        genel ve koridor profilleri arasında karıştırılır.
+
+        Args:
+            dist: İstasyon mesafe matrisi (km)
+            start, end: Kapsanan zaman aralığı (None: start + ufuk)
+            exposure: corridor_exposure çıktısı (None: koridor yok)
+        """
+        if end is None:
+            end = start + TRAVEL_TIME_HORIZON_MINUTES
+        buckets = max(1, math.ceil((end - start) / bucket_minutes))
+        size = len(dist)
+        minutes_per_km = 60.0 / speed_kmh
+        exposure = list(exposure) if exposure is not None else [0.0] * size
+        factors = [congestion_factors(start + (k + 0.5) * bucket_minutes) for k in range(buckets)]
+
+        if np is not None:
+            base = np.asarray(dist, dtype=np.float32) * np.float32(minutes_per_km)
+            share = np.asarray(exposure, dtype=np.float32)
+            share = (share[:, None] + share[None, :]) / 2
+            data = np.empty((buckets, size, size), dtype=np.float32)
+            for k, (general, corridor) in enumerate(factors):
+                np.multiply(base, general + (corridor - general) * share, out=data[k])
+        else:
+            data = []
+            for general, corridor in factors:
+                bucket = array("f")
+                for i in range(size):
+                    row = dist[i]
+                    for j in range(size):
+                        share = (exposure[i] + exposure[j]) / 2
+                        bucket.append(row[j] * minutes_per_km * (general + (corridor - general) * share))
+                data.append(bucket)
+        return cls(data, start, bucket_minutes, node_index, speed_kmh, max_scale)
+
+    def _enforce_fifo(self) -> None:
+        """
+        Her dilim bir öncekinden en fazla dilim boyu / max_scale kısa
+        olabilir: scale ≤ max_scale katına çıkan süreler de FIFO kalır.
+        """
+        width = self.bucket_minutes / self.max_scale
+        if self.data is not None:
+            for k in range(1, self.buckets):
+                np.maximum(self.data[k], self.data[k - 1] - width, out=self.data[k])
+            return
+        cells = self.size * self.size
+        flat = self._flat
+        for k in range(1, self.buckets):
+            for cell in range(k * cells, (k + 1) * cells):
+                floor = flat[cell - cells] - width
+                if flat[cell] < floor:
+                    flat[cell] = floor
+
+    @property
+    def nbytes(self) -> int:
+        return self.buckets * self.size * self.size * 4
+
+    def _cell(self, a: int, b: int) -> int:
+        index = self.node_index
+        return index[a] * self.size + index[b]
+
+    def travel(self, a: int, b: int, depart: float) -> float:
+        """depart anında a'dan çıkışta b'ye süre (dakika) - O(1)."""
+        flat = self._flat
+        cell = self._cell(a, b)
+        position = (depart - self.start) / self.bucket_minutes - 0.5
+        if position <= 0 or self.buckets == 1:
+            return flat[cell]
+        last = self.buckets - 1
+        if position >= last:
+            return flat[last * self.size * self.size + cell]
+        k = int(position)
+        low = flat[k * self.size * self.size + cell]
+        high = flat[(k + 1) * self.size * self.size + cell]
+        return low + (high - low) * (position - k)
+
+    def depart_by(self, a: int, b: int, arrive_by: float, scale: float = 1.0) -> float:
+        """
+        b'ye en geç arrive_by'da varmak için a'dan en geç çıkış - O(log dilim).
+
+        Varış fonksiyonu d + scale · süre(d) dilim ortaları arasında
+        doğrusal ve (scale ≤ max_scale iken FIFO sayesinde) monoton;
+        ilgili parça ikili aramayla bulunup doğrudan tersine çevrilir.
+        """
+        if math.isinf(arrive_by):
+            return arrive_by
+        flat = self._flat
+        cell = self._cell(a, b)
+        cells = self.size * self.size
+        width = self.bucket_minutes
+        first_center = self.start + width / 2
+
+        def arrival(k: int) -> Tuple[float, float]:
+            center = first_center + k * width
+            return center, center + scale * flat[k * cells + cell]
+
+        center, reach = arrival(0)
+        if arrive_by <= reach:
+            return arrive_by - scale * flat[cell]
+        last = self.buckets - 1
+        center, reach = arrival(last)
+        if arrive_by >= reach:
+            return arrive_by - scale * flat[last * cells + cell]
+
+        low, high = 0, last
+        while high - low > 1:
+            middle = (low + high) // 2
+            if arrival(middle)[1] <= arrive_by:
+                low = middle
+            else:
+                high = middle
+        low_center, low_reach = arrival(low)
+        _, high_reach = arrival(high)
+        if high_reach <= low_reach:
+            return low_center + width
+        return low_center + (arrive_by - low_reach) * width / (high_reach - low_reach)
@@ -30,6 +30,8 @@ urlpatterns = [
     
     # Rota Hesaplama
     path("calculate-route/", views.calculate_route, name="admin-calculate-route"),
+    path("calculate-route/batch/", views.calculate_route_batch, name="admin-calculate-route-batch"),
+    path("update-route/", views.update_route, name="admin-update-route"),
     path("cargo-summary/", views.get_cargo_summary, name="admin-cargo-summary"),
     path("confirm-route/", views.confirm_route, name="admin-confirm-route"),
     
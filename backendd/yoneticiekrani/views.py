@@ -1,17 +1,21 @@
 import json
-from datetime import date, timedelta
-from collections import defaultdict
+import math
+import os
+import time
+from datetime import date, time as clock_time, timedelta
 
 from django.contrib.auth import get_user_model
 from django.contrib.sessions.models import Session
 from django.db.models import Sum, Count
 from django.db.models.functions import TruncDate
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from .models import Station, Vehicle, Cargo, Trip
+from .routing_inputs import pending_cargos, pending_cargos_by_date, routing_vehicles
+from .time_windows import parse_clock
 
 User = get_user_model()
 
@@ -26,6 +30,21 @@ def _json_body(request):
         return None
 
 
+def _clock_field(data, key):
+    """Gövdedeki "HH:MM" alanını datetime.time'a çevir (boş: None, hatalı: ValueError)."""
+    minutes = parse_clock(data.get(key))
+    if minutes is None:
+        return None
+    if not 0 <= minutes < 24 * 60:
+        raise ValueError(f"Geçersiz saat: {data.get(key)}")
+    return clock_time(int(minutes // 60), int(minutes % 60))
+
+
+def _clock_text(value):
+    """datetime.time değerini "HH:MM" metnine çevir (boş: None)."""
+    return value.strftime("%H:%M") if value else None
+
+
 def _get_authenticated_admin(request):
     """Session token ile admin kullanıcıyı doğrula."""
     # Cookie-based session kontrolü
@@ -186,6 +205,8 @@ def stations(request):
                 "name": s.name,
                 "lat": s.latitude,
                 "lng": s.longitude,
+                "window_start": _clock_text(s.window_start),
+                "window_end": _clock_text(s.window_end),
             }
             for s in Station.objects.all().order_by("id")
         ]
@@ -203,13 +224,27 @@ def stations(request):
     except (TypeError, ValueError):
         return JsonResponse({"message": "Geçerli koordinat girin."}, status=400)
 
+    try:
+        window_start = _clock_field(data, "window_start")
+        window_end = _clock_field(data, "window_end")
+    except ValueError:
+        return JsonResponse({"message": "Alım penceresi HH:MM formatında olmalı."}, status=400)
+    if window_start and window_end and window_end < window_start:
+        return JsonResponse({"message": "Alım penceresi bitişi başlangıçtan önce olamaz."}, status=400)
+
     if not name:
         return JsonResponse({"message": "İstasyon adı zorunludur."}, status=400)
 
     if Station.objects.filter(name=name).exists():
         return JsonResponse({"message": "Bu isimde istasyon zaten var."}, status=409)
 
-    station = Station.objects.create(name=name, latitude=lat, longitude=lng)
+    station = Station.objects.create(
+        name=name,
+        latitude=lat,
+        longitude=lng,
+        window_start=window_start,
+        window_end=window_end,
+    )
 
     return JsonResponse({
         "message": "İstasyon eklendi.",
@@ -218,6 +253,8 @@ def stations(request):
             "name": station.name,
             "lat": station.latitude,
             "lng": station.longitude,
+            "window_start": _clock_text(station.window_start),
+            "window_end": _clock_text(station.window_end),
         }
     }, status=201)
 
@@ -314,6 +351,9 @@ def vehicles(request):
                 "capacity": v.capacity,
                 "is_rented": v.is_rented,
                 "rental_cost": v.rental_cost,
+                "shift_start": _clock_text(v.shift_start),
+                "max_shift_minutes": v.max_shift_minutes,
+                "speed_kmh": v.speed_kmh,
             }
             for v in Vehicle.objects.all().order_by("id")
         ]
@@ -332,10 +372,24 @@ def vehicles(request):
     is_rented = bool(data.get("is_rented", False))
     rental_cost = float(data.get("rental_cost", 200.0)) if is_rented else 0.0
 
+    try:
+        shift_start = _clock_field(data, "shift_start")
+        max_shift = data.get("max_shift_minutes")
+        max_shift_minutes = int(max_shift) if max_shift not in (None, "") else None
+        speed = data.get("speed_kmh")
+        speed_kmh = float(speed) if speed not in (None, "") else None
+    except (TypeError, ValueError):
+        return JsonResponse({"message": "Geçerli vardiya ve hız bilgisi girin."}, status=400)
+    if (max_shift_minutes is not None and max_shift_minutes <= 0) or (speed_kmh is not None and speed_kmh <= 0):
+        return JsonResponse({"message": "Vardiya süresi ve hız sıfırdan büyük olmalı."}, status=400)
+
     vehicle = Vehicle.objects.create(
         capacity=capacity,
         is_rented=is_rented,
         rental_cost=rental_cost,
+        shift_start=shift_start,
+        max_shift_minutes=max_shift_minutes,
+        speed_kmh=speed_kmh,
     )
 
     return JsonResponse({
@@ -345,6 +399,9 @@ def vehicles(request):
             "capacity": vehicle.capacity,
             "is_rented": vehicle.is_rented,
             "rental_cost": vehicle.rental_cost,
+            "shift_start": _clock_text(vehicle.shift_start),
+            "max_shift_minutes": vehicle.max_shift_minutes,
+            "speed_kmh": vehicle.speed_kmh,
         }
     }, status=201)
 
@@ -552,25 +609,122 @@ def trip_detail(request, trip_id):
 @csrf_exempt
 @require_http_methods(["GET"])
 def scenario_comparison(request):
-    """4 senaryo için maliyet karşılaştırması (placeholder - algoritma entegrasyonu sonra)."""
+    """
+    4 senaryo tarihi × 4 filo varyantı için gerçek maliyet karşılaştırması.
+    Çözümler süreç havuzunda eşzamanlı yapılır ve önbelleğe alınır.
+    """
     admin = _get_authenticated_admin(request)
     if admin is None:
         return JsonResponse({"message": "Yetki gerekiyor."}, status=403)
 
-    # Bu kısım algoritma entegrasyonunda doldurulacak
-    # Şimdilik boş/placeholder değerler dönüyor
-    scenarios = [
-        {"id": 1, "name": "Senaryo 1", "description": "Sınırsız araç, 500kg kapasite", "cost": None, "distance": None},
-        {"id": 2, "name": "Senaryo 2", "description": "Sınırsız araç, karışık kapasite", "cost": None, "distance": None},
-        {"id": 3, "name": "Senaryo 3", "description": "3 araç limiti, 500kg kapasite", "cost": None, "distance": None},
-        {"id": 4, "name": "Senaryo 4", "description": "3 araç limiti, karışık kapasite", "cost": None, "distance": None},
-    ]
+    from .management.commands.seed_scenarios import SCENARIO_DATES
+    from .scenario_comparison import compare_scenarios
 
-    return JsonResponse({"scenarios": scenarios}, status=200)
+    started = time.perf_counter()
+    cargos_by_scenario = {
+        scenario_num: pending_cargos(target_date, include_all=True)
+        for scenario_num, target_date in SCENARIO_DATES.items()
+    }
+    scenarios = compare_scenarios(cargos_by_scenario)
+
+    return JsonResponse({
+        "scenarios": scenarios,
+        "dates": {num: str(target_date) for num, target_date in SCENARIO_DATES.items()},
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+    }, status=200)
 
 
 # ==================== ROTA HESAPLAMA ====================
 
+MAX_PARALLEL = os.cpu_count() or 1  # İstek başına paralel çözüm üst sınırı
+MAX_SOLVE_TIME_MS = 60000           # İstekle verilebilecek en uzun süre bütçesi / limiti
+
+
+def _bounded_number(value, maximum=None):
+    """
+    Sayısal seçeneği float'a çevir; sonsuz, NaN ve negatif değerler
+    ValueError verir, maximum verilmişse değer ona kırpılır.
+    """
+    value = float(value)
+    if not math.isfinite(value) or value < 0:
+        raise ValueError(f"Geçersiz değer: {value}")
+    return min(value, maximum) if maximum is not None else value
+
+
+def _route_options(data):
+    """
+    İstek gövdesinden calculate_routes seçeneklerini oku ve doğrula.
+
+    Returns:
+        (seçenekler, hata_mesajı) - hata yoksa hata_mesajı None
+    """
+    from .routing_algorithm import SOLVER_MODES
+
+    options = {
+        "allow_rental": data.get("allow_rental", True),
+        "allow_multi_trip": data.get("allow_multi_trip", True),
+        "fleet_search": bool(data.get("fleet_search", False)),
+    }
+
+    # (alan, hata mesajı, üst sınır) - sonsuz, NaN ve negatif değerler reddedilir
+    numeric = [
+        ("time_budget_ms", "Geçersiz süre bütçesi.", MAX_SOLVE_TIME_MS),
+        ("time_limit_ms", "Geçersiz süre limiti.", MAX_SOLVE_TIME_MS),
+        ("target_gap", "Geçersiz hedef açık.", None),
+    ]
+    for key, message, maximum in numeric:
+        value = data.get(key)
+        if value is not None:
+            try:
+                value = _bounded_number(value, maximum)
+            except (TypeError, ValueError):
+                return None, message
+        options[key] = value
+
+    try:
+        options["parallel"] = min(MAX_PARALLEL, max(1, int(data.get("parallel", 1))))
+    except (TypeError, ValueError, OverflowError):
+        return None, "Geçersiz paralel çözüm sayısı."
+
+    max_vehicles = data.get("max_vehicles")
+    if max_vehicles is not None:
+        try:
+            max_vehicles = int(max_vehicles)
+        except (TypeError, ValueError):
+            return None, "Geçersiz araç sınırı."
+        if max_vehicles < 1:
+            return None, "Araç sınırı en az 1 olmalı."
+    options["max_vehicles"] = max_vehicles
+
+    departure_time = data.get("departure_time") or None
+    if departure_time is not None:
+        try:
+            minutes = parse_clock(departure_time)
+        except ValueError:
+            minutes = None
+        if minutes is None or not 0 <= minutes < 24 * 60:
+            return None, "Kalkış saati HH:MM formatında olmalı."
+    options["departure_time"] = departure_time
+
+    options["mode"] = data.get("mode", "cw")
+    if options["mode"] not in SOLVER_MODES:
+        return None, "Geçersiz çözüm modu."
+
+    rental_options = data.get("rental_options")
+    if rental_options is not None:
+        try:
+            rental_options = [
+                (float(option["capacity"]), float(option["cost"])) for option in rental_options
+            ]
+        except (TypeError, ValueError, KeyError):
+            return None, "Geçersiz kiralama seçenekleri."
+        if not rental_options or any(capacity <= 0 for capacity, _ in rental_options):
+            return None, "Geçersiz kiralama seçenekleri."
+    options["rental_options"] = rental_options
+
+    return options, None
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def calculate_route(request):
@@ -598,16 +752,16 @@ def calculate_route(request):
         return JsonResponse({"message": "Geçersiz tarih formatı. YYYY-MM-DD kullanın."}, status=400)
 
     # Opsiyonlar
-    allow_rental = data.get("allow_rental", True)
-    allow_multi_trip = data.get("allow_multi_trip", True)
+    options, error = _route_options(data)
+    if error:
+        return JsonResponse({"message": error}, status=400)
+    from .routing_algorithm import calculate_routes
+    from .route_cache import cached_calculate_routes
 
     # O tarihteki kargoları çek
-    cargos = Cargo.objects.filter(
-        target_date=target_date,
-        status="pending"
-    ).select_related("station", "sender")
+    cargo_list = pending_cargos(target_date)
 
-    if not cargos.exists():
+    if not cargo_list:
         return JsonResponse({
             "success": True,
             "message": f"{target_date_str} tarihinde taşınacak kargo bulunmuyor.",
@@ -615,30 +769,8 @@ def calculate_route(request):
             "total_cost": 0
         }, status=200)
 
-    # Kargo verilerini hazırla
-    cargo_list = [
-        {
-            "id": c.id,
-            "station_name": c.station.name,
-            "weight": c.weight,
-            "quantity": c.quantity,
-            "sender_id": c.sender.id,
-            "sender_name": f"{c.sender.first_name} {c.sender.last_name}"
-        }
-        for c in cargos
-    ]
-
     # Araçları çek
-    vehicles = Vehicle.objects.all()
-    vehicle_list = [
-        {
-            "id": v.id,
-            "capacity": v.capacity,
-            "is_rented": v.is_rented,
-            "rental_cost": v.rental_cost
-        }
-        for v in vehicles
-    ]
+    vehicle_list = routing_vehicles()
 
     if not vehicle_list:
         return JsonResponse({
@@ -646,13 +778,122 @@ def calculate_route(request):
             "message": "Sistemde araç bulunmuyor. Önce araç ekleyin.",
         }, status=400)
 
-    # Rota hesapla
-    from .routing_algorithm import calculate_routes
-    result = calculate_routes(
-        vehicles=vehicle_list,
-        cargos=cargo_list,
-        allow_rental=allow_rental,
-        allow_multi_trip=allow_multi_trip
+    # Rota hesapla (girdiler değişmediyse önbellekten)
+    solve = cached_calculate_routes if data.get("use_cache", True) else calculate_routes
+    result = solve(vehicles=vehicle_list, cargos=cargo_list, **options)
+
+    return JsonResponse(result, status=200)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def calculate_route_batch(request):
+    """
+    Tarih aralığındaki her gün için rota hesapla.
+
+    Kargolar ve araçlar tek seferde çekilir, günler süreç havuzunda
+    eşzamanlı çözülür. Yanıt NDJSON akışıdır: her gün bittikçe bir satır,
+    en sonda özet satırı ("type": "summary").
+    """
+    from .batch_routing import MAX_BATCH_DAYS, iter_batch_routes
+
+    admin = _get_authenticated_admin(request)
+    if admin is None:
+        return JsonResponse({"message": "Yetki gerekiyor."}, status=403)
+
+    data = _json_body(request)
+    if data is None:
+        return JsonResponse({"message": "Geçersiz JSON."}, status=400)
+
+    try:
+        from datetime import datetime
+        start_date = datetime.strptime(data.get("start_date"), "%Y-%m-%d").date()
+        end_date = datetime.strptime(data.get("end_date"), "%Y-%m-%d").date()
+    except (ValueError, TypeError):
+        return JsonResponse({"message": "Geçersiz tarih aralığı. YYYY-MM-DD kullanın."}, status=400)
+    if end_date < start_date:
+        return JsonResponse({"message": "Bitiş tarihi başlangıçtan önce olamaz."}, status=400)
+    if (end_date - start_date).days + 1 > MAX_BATCH_DAYS:
+        return JsonResponse({"message": f"En fazla {MAX_BATCH_DAYS} günlük aralık hesaplanabilir."}, status=400)
+
+    options, error = _route_options(data)
+    if error:
+        return JsonResponse({"message": error}, status=400)
+    try:
+        workers = data.get("workers")
+        workers = min(MAX_PARALLEL, max(1, int(workers))) if workers is not None else None
+    except (TypeError, ValueError, OverflowError):
+        return JsonResponse({"message": "Geçersiz işçi sayısı."}, status=400)
+
+    vehicle_list = routing_vehicles()
+    if not vehicle_list:
+        return JsonResponse({
+            "success": False,
+            "message": "Sistemde araç bulunmuyor. Önce araç ekleyin.",
+        }, status=400)
+
+    cargos_by_date = pending_cargos_by_date(start_date, end_date)
+    days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    stream = iter_batch_routes(
+        vehicle_list,
+        {day: cargos_by_date.get(day, []) for day in days},
+        workers=workers,
+        use_cache=data.get("use_cache", True),
+        **options
+    )
+    return StreamingHttpResponse(
+        (json.dumps(line, ensure_ascii=False) + "\n" for line in stream),
+        content_type="application/x-ndjson",
+    )
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def update_route(request):
+    """
+    Hesaplanmış planı yeni / iptal edilen kargolarla artımlı güncelle.
+    Planı baştan çözmez; yeni kargolar en ucuz uygun konuma eklenir.
+    """
+    admin = _get_authenticated_admin(request)
+    if admin is None:
+        return JsonResponse({"message": "Yetki gerekiyor."}, status=403)
+
+    data = _json_body(request)
+    if data is None:
+        return JsonResponse({"message": "Geçersiz JSON."}, status=400)
+
+    try:
+        from datetime import datetime
+        target_date = datetime.strptime(data.get("target_date"), "%Y-%m-%d").date()
+    except (ValueError, TypeError):
+        return JsonResponse({"message": "Geçersiz tarih."}, status=400)
+
+    plan = data.get("plan")
+    if not isinstance(plan, dict) or not isinstance(plan.get("routes"), list):
+        return JsonResponse({"message": "Geçerli bir önceki plan gerekli."}, status=400)
+
+    added_ids = data.get("added_cargo_ids")
+    removed_ids = data.get("removed_cargo_ids", [])
+    try:
+        added_ids = None if added_ids is None else [int(i) for i in added_ids]
+        removed_ids = [int(i) for i in removed_ids]
+    except (TypeError, ValueError):
+        return JsonResponse({"message": "Geçersiz kargo id listesi."}, status=400)
+    try:
+        repair_ms = _bounded_number(data.get("repair_ms", 0), MAX_SOLVE_TIME_MS)
+    except (TypeError, ValueError):
+        return JsonResponse({"message": "Geçersiz onarım süresi."}, status=400)
+
+    from .incremental import update_routes
+    result = update_routes(
+        plan,
+        vehicles=routing_vehicles(),
+        cargos=pending_cargos(target_date),
+        added_ids=added_ids,
+        removed_ids=removed_ids,
+        allow_rental=data.get("allow_rental", True),
+        allow_multi_trip=data.get("allow_multi_trip", True),
+        repair_ms=repair_ms,
     )
 
     return JsonResponse(result, status=200)
@@ -736,17 +977,22 @@ def confirm_route(request):
         return JsonResponse({"message": "Geçersiz tarih."}, status=400)
 
     created_trips = []
+    # Çoklu seferde aynı kiralık araç birden fazla rotada görünür
+    rented_vehicles = {}
     
     for route in routes:
         vehicle_id = route.get("vehicle_id")
         
-        # Kiralık araç ise yeni araç oluştur
+        # Kiralık araç ise (ilk seferinde) yeni araç oluştur
         if route.get("is_rented"):
-            vehicle = Vehicle.objects.create(
-                capacity=route.get("vehicle_capacity", 500),
-                is_rented=True,
-                rental_cost=route.get("rental_cost", 200)
-            )
+            vehicle = rented_vehicles.get(vehicle_id)
+            if vehicle is None:
+                vehicle = Vehicle.objects.create(
+                    capacity=route.get("vehicle_capacity", 500),
+                    is_rented=True,
+                    rental_cost=route.get("rental_cost") or 200
+                )
+                rented_vehicles[vehicle_id] = vehicle
         else:
             try:
                 vehicle = Vehicle.objects.get(id=vehicle_id)
@@ -761,7 +1007,11 @@ def confirm_route(request):
             route_data={
                 "start_station": route.get("start_station"),
                 "stops": route.get("stops", []),
-                "depot": route.get("depot")
+                "depot": route.get("depot"),
+                "trip_number": route.get("trip_number", 1),
+                "deadhead_distance": route.get("deadhead_distance", 0),
+                "start_time": route.get("start_time"),
+                "end_time": route.get("end_time"),
             },
             planned_date=target_date
         )